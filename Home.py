@@ -4,7 +4,8 @@ import logging
 from dotenv import load_dotenv
 import db_queries_refactored as db_queries 
 from utils.state import init_session_state
-from utils.cached_queries import get_basic_db_stats_cached
+from utils.cached_queries import get_basic_db_stats_cached, get_search_index, get_base_league_name_from_display
+from utils.search_index import SearchEntry, ENTITY_TYPE_LABELS, MIN_QUERY_LENGTH
 
 # --- Logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
@@ -54,28 +55,43 @@ Nutze die Navigation in der Seitenleiste oder die Suchfunktionen unten, um versc
 st.markdown("---") #
 st.subheader("Direktsuche") #
 
-# NEU: Direktsuche implementiert
-col_club, col_player = st.columns(2) #
-with col_club:
-    home_club_search = st.text_input("Verein suchen:", key="home_club_search_main_page", placeholder="z.B. SG Handball Steinfurt") #
-    if st.button("Verein finden", key="home_club_find_btn_page"): #
-        if home_club_search:
-            st.session_state.club_search_term = home_club_search #
-            st.session_state.selected_team_id = None 
-            st.session_state.selected_team_name = None
-            st.switch_page("pages/2_Vereine.py")
-        else:
-            st.warning("Bitte einen Vereinsnamen eingeben.") #
-with col_player:
-    home_player_search = st.text_input("Spieler suchen:", key="home_player_search_main_page", placeholder="z.B. Felix 'The Goat' Leiß") #
-    if st.button("Spieler finden", key="home_player_find_btn_page"): #
-        if home_player_search:
-            st.session_state.player_search_term = home_player_search #
-            st.session_state.selected_player_id = None 
-            st.session_state.selected_player_name = None
-            st.switch_page("pages/3_Spieler.py")
-        else:
-            st.warning("Bitte einen Spielernamen eingeben.") #
+# Eine Suche über Vereine, Teams, Ligen und Spieler (In-Memory-Index, siehe utils/search_index.py)
+def open_search_hit(hit: SearchEntry) -> None:
+    if hit.typ == "verein":
+        st.session_state.club_search_term = hit.name
+        st.session_state.selected_club_aggregated_name = hit.name
+        st.session_state.selected_team_id = None
+        st.session_state.selected_team_name = None
+        st.switch_page("pages/2_Vereine.py")
+    elif hit.typ == "team":
+        st.session_state.selected_team_id = hit.id
+        st.session_state.selected_team_name = hit.name
+        st.switch_page("pages/2_Vereine.py")
+    elif hit.typ == "liga":
+        st.session_state.selected_league_id = hit.id
+        st.session_state.selected_base_league_name = get_base_league_name_from_display(hit.name)
+        st.session_state.selected_saison_for_league = hit.detail
+        st.session_state.selected_league_name_display = hit.name
+        st.switch_page("pages/1_Ligen.py")
+    else:
+        st.session_state.selected_player_id = hit.id
+        st.session_state.selected_player_name = hit.name
+        st.session_state.player_context_team_id = None
+        st.session_state.player_context_league_id = None
+        st.session_state.player_context_season = None
+        st.session_state.player_context_team_name = None
+        st.switch_page("pages/3_Spieler.py")
+
+omnibox_term = st.text_input("Verein, Team, Liga oder Spieler suchen:", key="home_omnibox_search", placeholder="z.B. Steinfurt, Leiß oder Oberliga") #
+if omnibox_term:
+    search_hits = get_search_index().search(omnibox_term, limit=15)
+    if search_hits:
+        for hit in search_hits:
+            label = f"{ENTITY_TYPE_LABELS[hit.typ]}: {hit.name}" + (f" ({hit.detail})" if hit.detail else "")
+            if st.button(label, key=f"home_omnibox_hit_{hit.typ}_{hit.id}", use_container_width=True):
+                open_search_hit(hit)
+    elif len(omnibox_term.strip()) >= MIN_QUERY_LENGTH:
+        st.info(f"Nichts passend zu '{omnibox_term}' gefunden.")
 
 st.markdown("---") #
 st.subheader("Datenbank-Überblick") #
@@ -2,14 +2,20 @@ import streamlit as st # Hinzufügen für st.secrets
 import psycopg2
 import psycopg2.extras
 import requests
+import io
 import json
 import time
 import re
+import bisect
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Tuple, Optional, Set
 import os
 from dotenv import load_dotenv # Behalten für lokalen Fallback
+from utils.query_cache import bump_cache_versions, scopes_for_touched
+from utils.league_names import FILTER_ALL, GENDER_UNKNOWN, league_dimensions
+from utils.score_timeline import encode_score_timeline
+from utils.team_ratings import HISTORY_COLUMNS, RatingGame, RatingState, rate_games
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
@@ -30,11 +36,18 @@ for path_to_try in env_paths_to_try:
             break
 
 # --- Datenbank-Credentials laden (st.secrets primär, dann os.environ) ---
-DB_NAME_PG = st.secrets.get("PG_DB_NAME", os.environ.get("PG_DB_NAME"))
-DB_USER_PG = st.secrets.get("PG_DB_USER", os.environ.get("PG_DB_USER"))
-DB_PASSWORD_PG = st.secrets.get("PG_DB_PASSWORD", os.environ.get("PG_DB_PASSWORD"))
-DB_HOST_PG = st.secrets.get("PG_DB_HOST", os.environ.get("PG_DB_HOST"))
-DB_PORT_PG = st.secrets.get("PG_DB_PORT", os.environ.get("PG_DB_PORT", "5432"))
+def _get_credential(key: str, default: Optional[str] = None) -> Optional[str]:
+    # Ohne secrets.toml (z.B. in Skripten wie benchmarks/) wirft st.secrets einen FileNotFoundError
+    try:
+        return st.secrets.get(key, os.environ.get(key, default))
+    except FileNotFoundError:
+        return os.environ.get(key, default)
+
+DB_NAME_PG = _get_credential("PG_DB_NAME")
+DB_USER_PG = _get_credential("PG_DB_USER")
+DB_PASSWORD_PG = _get_credential("PG_DB_PASSWORD")
+DB_HOST_PG = _get_credential("PG_DB_HOST")
+DB_PORT_PG = _get_credential("PG_DB_PORT", "5432")
 
 # Logging der geladenen Variablen (ohne Passwort) für Debugging
 logger.info(f"analyse_game_json - DB_NAME_PG: '{DB_NAME_PG}'") #
@@ -55,17 +68,45 @@ TABLE_SPIELER: str = "\"Spieler\"" #
 TABLE_HALLEN: str = "\"Hallen\"" #
 TABLE_SPIELE: str = "\"Spiele\"" #
 TABLE_KADER_STATS: str = "\"Spiel_Kader_Statistiken\"" #
-TABLE_EREIGNISSE: str = "\"Ereignisse\"" #
+TABLE_EREIGNISSE: str = "\"Ereignisse_Daten\"" # Gelesen wird über die Sicht "Ereignisse" (Migration 0009)
+TABLE_SPIELVERLAEUFE: str = "\"Spielverlaeufe\"" # Score-Verlauf je Spiel (Migration 0010, utils/score_timeline.py)
+TABLE_LIGA_SPIELER_SUMMEN: str = "\"Liga_Spieler_Summen\""
+TABLE_LIGA_KENNZAHLEN: str = "\"Liga_Kennzahlen\""
+TABLE_SAISON_SPIELER_SUMMEN: str = "\"Saison_Spieler_Summen\"" # Ligaübergreifende Ranglisten (Migration 0012)
+TABLE_TEAM_RATING_VERLAUF: str = "\"Team_Rating_Verlauf\"" # Elo je Spiel und Team (Migration 0011, utils/team_ratings.py)
+TABLE_TEAM_RATINGS: str = "\"Team_Ratings\""
 
 # Spaltennamen für execute_values (ohne Anführungszeichen für Dict-Keys, mit für SQL)
-LEAGUE_COLS = ["Liga_ID", "Name", "Akronym", "Saison", "Altersgruppe", "Typ"]
+LEAGUE_COLS = ["Liga_ID", "Name", "Akronym", "Saison", "Altersgruppe", "Typ", "Basisname", "Geschlecht", "Altersgruppe_Anzeige"]
 TEAM_COLS = ["Team_ID", "Name", "Akronym", "Logo_URL"]
 HALL_COLS = ["Hallen_ID", "Name", "Stadt", "Hallen_Nummer"]
 PLAYER_COLS = ["Spieler_ID", "Vorname", "Nachname", "Ist_NN", "Ist_Offizieller"] # Position, etc. werden hier nicht gebatcht, da sie nicht immer vorhanden sind
-GAME_COLS_INITIAL = ["Spiel_ID", "Liga_ID", "Phase_ID", "Hallen_ID", "Spiel_Nummer", "Start_Zeit", "Heim_Team_ID", "Gast_Team_ID", "Status", "PDF_URL", "SchiedsrichterInfo"]
+GAME_COLS_INITIAL = ["Spiel_ID", "Liga_ID", "Phase_ID", "Hallen_ID", "Spiel_Nummer", "Start_Zeit", "Heim_Team_ID", "Gast_Team_ID", "Status", "PDF_URL", "SchiedsrichterInfo", "Saison"]
 GAME_COLS_RESULTS = ["Tore_Heim", "Tore_Gast", "Tore_Heim_HZ", "Tore_Gast_HZ", "Punkte_Heim_Offiziell", "Punkte_Gast_Offiziell"]
 KADER_STATS_COLS = ["Spiel_ID", "Spieler_ID", "Team_ID", "Rueckennummer", "Tore_Gesamt", "Tore_7m", "Fehlwurf_7m", "Gelbe_Karten", "Rote_Karten", "Blaue_Karten", "Zwei_Minuten_Strafen"]
-EVENT_COLS = ["H4A_Ereignis_ID", "Spiel_ID", "Zeitstempel", "Spiel_Minute", "Typ", "Score_Heim", "Score_Gast", "Team_Seite", "Nachricht", "Referenz_Spieler_ID"]
+SCORE_TIMELINE_COLS = ["Spiel_ID", "Spielverlauf"]
+EVENT_COLS = ["H4A_Ereignis_ID", "Spiel_ID", "Zeitstempel", "Spiel_Minute", "Typ_Code", "Score_Heim", "Score_Gast", "Seite_Code", "Vorlage_ID",
+              "Nachricht_Parameter", "Referenz_Spieler_ID", "Spiel_Sekunde", "Halbzeit", "Tor_Art", "Saison"]
+# "Ereignisse" ist nach "Saison" partitioniert (Migration 0008), die Eindeutigkeit enthält daher die Saison
+EVENT_UNIQUE_COLS = ["Spiel_ID", "H4A_Ereignis_ID", "Saison"]
+
+# Kompakte Ereignisspalten (Migration 0009): Klartext im Ereignis -> (Nachschlagetabelle, Code-Spalte, Wert-Spalte)
+EVENT_LOOKUPS: Dict[str, Tuple[str, str, str]] = {
+    "Typ": ("\"Ereignis_Typen\"", "Typ_Code", "Typ"),
+    "Team_Seite": ("\"Ereignis_Seiten\"", "Seite_Code", "Team_Seite"),
+    "Nachricht_Vorlage": ("\"Ereignis_Vorlagen\"", "Vorlage_ID", "Vorlage"),
+}
+# Nachrichten mit Spielerangabe -> Vorlagen-Endung; die Migration zerlegt den Bestand mit denselben Regeln.
+# "Tor durch Max Muster (7.)" (Name, Nummer) und "Tor durch 7. (Max Muster)" (Nummer, Name, vgl. parse_player_from_message)
+EVENT_MESSAGE_PATTERNS: Tuple[Tuple[re.Pattern, str], ...] = (
+    (re.compile(r"(.* (?:durch|für) )(.+) \((\d+)\.\)", re.DOTALL), '%s (%s.)'),
+    (re.compile(r"(.* (?:durch|für) )(\d+)\. \((.+)\)", re.DOTALL), '%s. (%s)'),
+)
+EVENT_PARAMETER_SEPARATOR: str = "\x1f"
+
+# Beim Import aus "Spiel_Minute" und "Typ" abgeleitete Ereignisspalten (Migration 0006 füllt Altbestände gleich)
+GAME_CLOCK_PATTERN: re.Pattern = re.compile(r"^(\d+):(\d{2})$")
+GOAL_KINDS: Dict[str, str] = {"Goal": "Feldtor", "SevenMeterGoal": "7m"}
 
 # --- Hilfsfunktionen ---
 def get_db_connection() -> Optional[psycopg2.extensions.connection]: #
@@ -105,6 +146,36 @@ def parse_player_from_message(message: str) -> Optional[int]: #
     if match_direct: return int(match_direct.group(1)) #
     return None
 
+def parse_game_second(minute_str: Optional[str]) -> Optional[int]:
+    """Spieluhr 'MM:SS' -> Sekunden seit Spielbeginn ('12:34' -> 754), None bei anderem Format."""
+    match = GAME_CLOCK_PATTERN.match(minute_str or "")
+    return int(match.group(1)) * 60 + int(match.group(2)) if match else None
+
+def get_game_half(game_second: Optional[int], typ: str, period_starts: List[int]) -> Optional[int]:
+    """
+    Halbzeit (1, 2, ab 3 Verlängerung) aus den Anpfiff-Sekunden der StartPeriod-Ereignisse des Spiels,
+    damit auch kürzere Halbzeiten (Jugend) stimmen. Ein Ereignis genau auf dem Wechsel gehört zur
+    endenden Halbzeit, nur das StartPeriod-Ereignis selbst zur neuen. None ohne StartPeriod-Ereignisse.
+    """
+    if game_second is None or not period_starts: return None
+    started = bisect.bisect_right(period_starts, game_second) if typ == "StartPeriod" else bisect.bisect_left(period_starts, game_second)
+    return max(started, 1)
+
+def split_event_message(message: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Zerlegt eine Ereignis-Nachricht in Vorlage und Parameter, z.B. "Tor durch Max Muster (7.)" ->
+    ("Tor durch %s (%s.)", "Max Muster\x1f7") und "Tor durch 7. (Max Muster)" -> ("Tor durch %s. (%s)", "7\x1fMax Muster").
+    Andere Nachrichten werden selbst zur Vorlage (% als %%).
+    Die Sicht "Ereignisse" setzt beides mit ereignis_nachricht() (format) wieder zusammen.
+    """
+    if message is None: return None, None
+    if EVENT_PARAMETER_SEPARATOR not in message:
+        for pattern, template_suffix in EVENT_MESSAGE_PATTERNS:
+            match = pattern.fullmatch(message)
+            if match:
+                return match.group(1).replace('%', '%%') + template_suffix, EVENT_PARAMETER_SEPARATOR.join(match.group(2, 3))
+    return message.replace('%', '%%'), None
+
 def get_saison_from_timestamp(timestamp_ms: Optional[int]) -> str: #
     if timestamp_ms is None: return "Unbekannt" #
     try:
@@ -123,7 +194,7 @@ def extract_data_from_game_json(game_json_data: Dict[str, Any], game_id_for_url:
     extracted_batch_data = {
         "leagues": set(), "teams": set(), "halls": set(), "players": set(),
         "game_initial_data": None, "game_result_data": None,
-        "kader_stats": [], "events": [], "spiel_id_full": None,
+        "kader_stats": [], "events": [], "score_timeline": None, "spiel_id_full": None,
         "player_map_for_events": {}
     }
 
@@ -147,6 +218,7 @@ def extract_data_from_game_json(game_json_data: Dict[str, Any], game_id_for_url:
     tournament_data = summary.get('tournament') #
     round_data = summary.get('round') #
     db_liga_id_fuer_spiel = None
+    saison = None
     if tournament_data: #
         saison = get_saison_from_timestamp(round_data.get('startsAt') if round_data else tournament_data.get('startsAt')) #
         original_tournament_id = tournament_data['id'] #
@@ -177,7 +249,7 @@ def extract_data_from_game_json(game_json_data: Dict[str, Any], game_id_for_url:
         'Spiel_Nummer': summary.get('gameNumber'), 'Start_Zeit': summary.get('startsAt', 0) // 1000,
         'Heim_Team_ID': home_team_id, 'Gast_Team_ID': away_team_id,
         'Status': summary.get('state'), 'PDF_URL': summary.get('pdfUrl'),
-        'SchiedsrichterInfo': summary.get('refereeInfo')
+        'SchiedsrichterInfo': summary.get('refereeInfo'), 'Saison': saison
     }
 
     # 3. Spieler und Kader
@@ -221,6 +293,11 @@ def extract_data_from_game_json(game_json_data: Dict[str, Any], game_id_for_url:
     final_score_event = (None, None) #
     half_time_score_event = (None, None) #
 
+    period_starts = sorted(
+        second for second in (parse_game_second(e.get('time')) for e in events_raw if isinstance(e, dict) and e.get('type') == "StartPeriod")
+        if second is not None
+    )
+
     for event_json in events_raw: #
         if not isinstance(event_json, dict) or 'id' not in event_json: continue #
         h4a_id = event_json['id'] #
@@ -230,6 +307,8 @@ def extract_data_from_game_json(game_json_data: Dict[str, Any], game_id_for_url:
         score_h, score_g = parse_score(event_json.get('score')) #
         team_seite = event_json.get('team') #
         nachricht = event_json.get('message', '') #
+        vorlage, parameter = split_event_message(nachricht)
+        game_second = parse_game_second(minute_val)
         ref_spieler_id = None
         nummer = parse_player_from_message(nachricht) #
         if nummer is not None and team_seite is not None: #
@@ -245,7 +324,10 @@ def extract_data_from_game_json(game_json_data: Dict[str, Any], game_id_for_url:
         extracted_batch_data["events"].append({ #
             'H4A_Ereignis_ID': h4a_id, 'Spiel_ID': spiel_id_full, 'Zeitstempel': timestamp,
             'Spiel_Minute': minute_val, 'Typ': typ_val, 'Score_Heim': score_h, 'Score_Gast': score_g,
-            'Team_Seite': team_seite, 'Nachricht': nachricht, 'Referenz_Spieler_ID': ref_spieler_id
+            'Team_Seite': team_seite, 'Nachricht': nachricht, 'Nachricht_Vorlage': vorlage, 'Nachricht_Parameter': parameter,
+            'Referenz_Spieler_ID': ref_spieler_id,
+            'Spiel_Sekunde': game_second, 'Halbzeit': get_game_half(game_second, typ_val, period_starts),
+            'Tor_Art': GOAL_KINDS.get(typ_val), 'Saison': saison
         })
 
     # Update Kader-Stats mit 2-Minuten-Strafen
@@ -282,10 +364,22 @@ def extract_data_from_game_json(game_json_data: Dict[str, Any], game_id_for_url:
         'Tore_Heim_HZ': hzh_final, 'Tore_Gast_HZ': hzg_final,
         'Punkte_Heim_Offiziell': punkte_h_offiziell, 'Punkte_Gast_Offiziell': punkte_g_offiziell
     }
+    timeline = encode_score_timeline(extracted_batch_data["events"])
+    if timeline is not None:
+        extracted_batch_data["score_timeline"] = {'Spiel_ID': spiel_id_full, 'Spielverlauf': timeline}
     
     return extracted_batch_data
 
 # --- Batch Datenbankfunktionen ---
+def league_row(league: Tuple) -> Tuple:
+    """
+    Zeile für "Ligen" in LEAGUE_COLS-Reihenfolge aus dem Liga-Tupel von extract_data_from_game_json:
+    (original_id, name, acronym, ageGroup, tournamentType, saison, db_liga_id_fuer_spiel, display_name).
+    Basisname, Geschlecht und übersetzte Altersgruppe werden hier einmal berechnet (utils/league_names.py).
+    """
+    return (league[6], league[7], league[2], league[5], league[3], league[4]) + league_dimensions(league[7], league[3])
+
+
 def batch_upsert_entities(cursor: psycopg2.extensions.cursor, data_set: Set[Tuple], table_name: str, pk_col_name: str, column_names: List[str]):
     if not data_set: return
     
@@ -297,12 +391,9 @@ def batch_upsert_entities(cursor: psycopg2.extensions.cursor, data_set: Set[Tupl
 
     # Für Ligen müssen wir das Tupel anpassen, da wir spezifische Werte aus dem größeren Tupel brauchen
     if table_name == TABLE_LIGEN:
-        # (original_id, name, acronym, ageGroup, tournamentType, saison, db_liga_id_fuer_spiel, display_name)
-        # Zielspalten: Liga_ID (db_liga_id_fuer_spiel), Name (display_name), Akronym, Saison, Altersgruppe, Typ
-        formatted_data_list = [
-            (item[6], item[7], item[2], item[5], item[3], item[4]) for item in data_list
-        ]
-        sql = f"""INSERT INTO {table_name} ("Liga_ID", "Name", "Akronym", "Saison", "Altersgruppe", "Typ") VALUES %s
+        formatted_data_list = [league_row(item) for item in data_list]
+        cols_league_sql = ", ".join([f'"{col}"' for col in LEAGUE_COLS])
+        sql = f"""INSERT INTO {table_name} ({cols_league_sql}) VALUES %s
                   ON CONFLICT ("Liga_ID") DO NOTHING;"""
         psycopg2.extras.execute_values(cursor, sql, formatted_data_list, page_size=len(data_list))
     else:
@@ -312,6 +403,41 @@ def batch_upsert_entities(cursor: psycopg2.extensions.cursor, data_set: Set[Tupl
     logger.info(f"{len(data_list)} Entitäten in {table_name} verarbeitet (INSERT/IGNORE).")
 
 
+def ensure_event_partitions(cursor: psycopg2.extensions.cursor, seasons: Set[str]):
+    """
+    Legt fehlende Saison-Partitionen von "Ereignisse_Daten" an (SQL-Funktion aus Migration 0008/0009).
+    Eine neue Partition sperrt die Elterntabelle kurz, daher nur für Saisons, die es noch nicht gibt.
+    """
+    if not seasons: return
+    cursor.execute("SELECT ereignisse_partition_anlegen(s) FROM UNNEST(%s::TEXT[]) AS s", (sorted(seasons),))
+
+
+def encode_events(cursor: psycopg2.extensions.cursor, events: List[Dict[str, Any]],
+                  codes: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Ergänzt die Ereignisse um "Typ_Code", "Seite_Code" und "Vorlage_ID" (EVENT_LOOKUPS) und legt
+    unbekannte Werte in den Nachschlagetabellen an. codes ({Schlüssel: {Wert: Code}}) merkt sich die
+    Codes über mehrere Aufrufe, aber nur innerhalb derselben Transaktion; wird zurückgegeben.
+    """
+    codes = {} if codes is None else codes
+    for key, (table, code_col, value_col) in EVENT_LOOKUPS.items():
+        known = codes.setdefault(key, {})
+        missing = sorted({e[key] for e in events if e.get(key) is not None} - known.keys())
+        if missing:
+            select_sql = f'SELECT "{value_col}", "{code_col}" FROM {table} WHERE "{value_col}" = ANY(%s)'
+            cursor.execute(select_sql, (missing,))
+            known.update(cursor.fetchall())
+            new_values = [value for value in missing if value not in known]
+            if new_values:
+                # Erst nachschlagen, dann einfügen: jeder ON-CONFLICT-Treffer verbraucht sonst einen Identity-Wert
+                cursor.execute(f'INSERT INTO {table} ("{value_col}") SELECT UNNEST(%s::TEXT[]) ON CONFLICT ("{value_col}") DO NOTHING', (new_values,))
+                cursor.execute(select_sql, (new_values,))
+                known.update(cursor.fetchall())
+        for event in events:
+            event[code_col] = known.get(event.get(key))
+    return codes
+
+
 def batch_upsert_spiele(cursor: psycopg2.extensions.cursor, games_initial_list: List[Dict[str, Any]], games_results_list: List[Dict[str, Any]]):
     if not games_initial_list: return
 
@@ -381,6 +507,392 @@ def batch_insert_data(cursor: psycopg2.extensions.cursor,
         logger.error(f"SQL: {cursor.mogrify(sql, [tuples_to_insert[0]] if tuples_to_insert else None)}") # Logge Beispiel-SQL
         raise # Fehler weiterleiten, damit Transaktion zurückgerollt wird
 
+# --- Liga-Zusammenfassungen (Liga_Spieler_Summen, Liga_Kennzahlen) ---
+# Liga_Spieler_Summen ist der Rollup Spieler x Team x Liga x Saison. Er wird beim Import
+# inkrementell aus den Kader-Zeilen der betroffenen Spiele gepflegt (alte Werte abziehen,
+# neue addieren), eine vollständige Neuberechnung ist nur für Backfills nötig.
+SQL_LIGA_SPIELER_SUMMEN_SELECT: str = f"""
+SELECT sp."Liga_ID", l."Saison", sks."Team_ID", sks."Spieler_ID", %(sign)s * COUNT(*),
+       %(sign)s * SUM(sks."Tore_Gesamt"), %(sign)s * SUM(sks."Tore_7m"), %(sign)s * SUM(sks."Fehlwurf_7m"),
+       %(sign)s * SUM(sks."Gelbe_Karten"), %(sign)s * SUM(sks."Rote_Karten"), %(sign)s * SUM(sks."Blaue_Karten"),
+       %(sign)s * SUM(sks."Zwei_Minuten_Strafen")
+FROM {TABLE_KADER_STATS} sks
+JOIN {TABLE_SPIELE} sp ON sks."Spiel_ID" = sp."Spiel_ID"
+JOIN {TABLE_LIGEN} l ON sp."Liga_ID" = l."Liga_ID"
+"""
+
+SQL_REFRESH_LIGA_SPIELER_SUMMEN: str = f"""
+INSERT INTO {TABLE_LIGA_SPIELER_SUMMEN} ("Liga_ID", "Saison", "Team_ID", "Spieler_ID", "Spiele", "Tore_Gesamt",
+    "Tore_7m", "Fehlwurf_7m", "Gelbe_Karten", "Rote_Karten", "Blaue_Karten", "Zwei_Minuten_Strafen")
+{SQL_LIGA_SPIELER_SUMMEN_SELECT}
+WHERE sp."Liga_ID" = ANY(%(league_ids)s)
+GROUP BY sp."Liga_ID", l."Saison", sks."Team_ID", sks."Spieler_ID"
+RETURNING "Saison", "Spieler_ID";
+"""
+
+SQL_DELTA_LIGA_SPIELER_SUMMEN: str = f"""
+INSERT INTO {TABLE_LIGA_SPIELER_SUMMEN} AS r ("Liga_ID", "Saison", "Team_ID", "Spieler_ID", "Spiele", "Tore_Gesamt",
+    "Tore_7m", "Fehlwurf_7m", "Gelbe_Karten", "Rote_Karten", "Blaue_Karten", "Zwei_Minuten_Strafen")
+{SQL_LIGA_SPIELER_SUMMEN_SELECT}
+WHERE sks."Spiel_ID" = ANY(%(game_ids)s)
+GROUP BY sp."Liga_ID", l."Saison", sks."Team_ID", sks."Spieler_ID"
+ON CONFLICT ("Liga_ID", "Team_ID", "Spieler_ID") DO UPDATE SET
+    "Spiele" = r."Spiele" + excluded."Spiele",
+    "Tore_Gesamt" = r."Tore_Gesamt" + excluded."Tore_Gesamt",
+    "Tore_7m" = r."Tore_7m" + excluded."Tore_7m",
+    "Fehlwurf_7m" = r."Fehlwurf_7m" + excluded."Fehlwurf_7m",
+    "Gelbe_Karten" = r."Gelbe_Karten" + excluded."Gelbe_Karten",
+    "Rote_Karten" = r."Rote_Karten" + excluded."Rote_Karten",
+    "Blaue_Karten" = r."Blaue_Karten" + excluded."Blaue_Karten",
+    "Zwei_Minuten_Strafen" = r."Zwei_Minuten_Strafen" + excluded."Zwei_Minuten_Strafen"
+RETURNING r."Saison", r."Spieler_ID";
+"""
+
+SQL_REFRESH_LIGA_KENNZAHLEN: str = f"""
+INSERT INTO {TABLE_LIGA_KENNZAHLEN} ("Liga_ID", "Saison", "Spiele_Gewertet", "Heimsiege", "Auswaertssiege",
+    "Unentschieden", "Spiele_Mit_Toren", "Tore_Heim_Summe", "Tore_Gast_Summe")
+SELECT sp."Liga_ID", l."Saison",
+       COUNT(*) FILTER (WHERE sp."Punkte_Heim_Offiziell" IS NOT NULL AND sp."Punkte_Gast_Offiziell" IS NOT NULL),
+       COUNT(*) FILTER (WHERE sp."Punkte_Heim_Offiziell" = 2 AND sp."Punkte_Gast_Offiziell" IS NOT NULL),
+       COUNT(*) FILTER (WHERE sp."Punkte_Gast_Offiziell" = 2 AND sp."Punkte_Heim_Offiziell" IS NOT NULL),
+       COUNT(*) FILTER (WHERE sp."Punkte_Heim_Offiziell" = 1 AND sp."Punkte_Gast_Offiziell" = 1),
+       COUNT(*) FILTER (WHERE sp."Tore_Heim" IS NOT NULL AND sp."Tore_Gast" IS NOT NULL),
+       COALESCE(SUM(sp."Tore_Heim") FILTER (WHERE sp."Tore_Heim" IS NOT NULL AND sp."Tore_Gast" IS NOT NULL), 0),
+       COALESCE(SUM(sp."Tore_Gast") FILTER (WHERE sp."Tore_Heim" IS NOT NULL AND sp."Tore_Gast" IS NOT NULL), 0)
+FROM {TABLE_SPIELE} sp
+JOIN {TABLE_LIGEN} l ON sp."Liga_ID" = l."Liga_ID"
+WHERE sp."Liga_ID" = ANY(%(league_ids)s) AND sp."Status" = 'Post'
+GROUP BY sp."Liga_ID", l."Saison";
+"""
+
+# Saison_Spieler_Summen fasst Liga_Spieler_Summen je Saison und Spieler über die Ligen einer Auswahl
+# (Altersgruppe, Geschlecht, jeweils auch 'Alle') zusammen, Grundlage der ligaübergreifenden Ranglisten.
+# Neu berechnet werden nur die (Saison, Spieler), deren Rollup-Zeilen sich geändert haben. Dieselbe Regel
+# steht in Migration 0012_saison_ranglisten.
+
+def _season_player_summaries_sql(condition: str) -> str:
+    return f"""
+INSERT INTO {TABLE_SAISON_SPIELER_SUMMEN} ("Saison", "Altersgruppe", "Geschlecht", "Spieler_ID", "Team_ID", "Liga_ID",
+    "Spiele", "Tore_Gesamt", "Tore_7m", "Gelbe_Karten", "Rote_Karten", "Blaue_Karten", "Zwei_Minuten_Strafen")
+SELECT lss."Saison",
+       CASE WHEN GROUPING(l."Altersgruppe_Anzeige") = 1 THEN '{FILTER_ALL}' ELSE l."Altersgruppe_Anzeige" END,
+       CASE WHEN GROUPING(COALESCE(l."Geschlecht", '{GENDER_UNKNOWN}')) = 1 THEN '{FILTER_ALL}' ELSE COALESCE(l."Geschlecht", '{GENDER_UNKNOWN}') END,
+       lss."Spieler_ID",
+       (ARRAY_AGG(lss."Team_ID" ORDER BY lss."Spiele" DESC, lss."Liga_ID", lss."Team_ID"))[1],
+       (ARRAY_AGG(lss."Liga_ID" ORDER BY lss."Spiele" DESC, lss."Liga_ID", lss."Team_ID"))[1],
+       SUM(lss."Spiele"), SUM(lss."Tore_Gesamt"), SUM(lss."Tore_7m"), SUM(lss."Gelbe_Karten"),
+       SUM(lss."Rote_Karten"), SUM(lss."Blaue_Karten"), SUM(lss."Zwei_Minuten_Strafen")
+FROM {TABLE_LIGA_SPIELER_SUMMEN} lss
+JOIN {TABLE_LIGEN} l ON l."Liga_ID" = lss."Liga_ID"
+JOIN {TABLE_SPIELER} s ON s."Spieler_ID" = lss."Spieler_ID" AND s."Ist_Offizieller" = 0
+WHERE TRUE{condition}
+GROUP BY lss."Saison", lss."Spieler_ID",
+         GROUPING SETS ((l."Altersgruppe_Anzeige", COALESCE(l."Geschlecht", '{GENDER_UNKNOWN}')), (l."Altersgruppe_Anzeige"),
+                        (COALESCE(l."Geschlecht", '{GENDER_UNKNOWN}')), ())
+"""
+
+SQL_PLAYER_SEASON_KEYS: str = 'unnest(%(seasons)s::TEXT[], %(player_ids)s::TEXT[]) AS k("Saison", "Spieler_ID")'
+SQL_REFRESH_SAISON_SPIELER_SUMMEN: str = _season_player_summaries_sql(
+    f' AND (lss."Saison", lss."Spieler_ID") IN (SELECT "Saison", "Spieler_ID" FROM {SQL_PLAYER_SEASON_KEYS})')
+SQL_REBUILD_SAISON_SPIELER_SUMMEN: str = _season_player_summaries_sql("")
+
+def apply_player_rollup_delta(cursor: psycopg2.extensions.cursor, game_ids: List[str], sign: int) -> Set[Tuple[str, str]]:
+    """
+    Addiert (sign=1) bzw. subtrahiert (sign=-1) die aktuellen Kader-Zeilen der Spiele im Rollup.
+    Vor dem Löschen alter Kader-Zeilen mit -1 aufrufen, nach dem Einfügen der neuen mit +1,
+    so bleibt der Rollup auch bei Re-Importen innerhalb der Batch-Transaktion konsistent.
+    Gibt die geänderten (Saison, Spieler_ID) zurück, für refresh_season_player_summaries.
+    """
+    if not game_ids: return set()
+    params = {"game_ids": list(game_ids), "sign": sign}
+    cursor.execute(SQL_DELTA_LIGA_SPIELER_SUMMEN, params)
+    changed = set(cursor.fetchall())
+    if sign < 0:
+        # Kombinationen ohne verbleibende Spiele entfernen (werden beim Addieren ggf. neu angelegt)
+        cursor.execute(f"""DELETE FROM {TABLE_LIGA_SPIELER_SUMMEN} WHERE "Spiele" <= 0 AND "Liga_ID" IN
+                           (SELECT DISTINCT "Liga_ID" FROM {TABLE_SPIELE} WHERE "Spiel_ID" = ANY(%(game_ids)s))""", params)
+    return changed
+
+def refresh_season_player_summaries(cursor: psycopg2.extensions.cursor, keys: Optional[Set[Tuple[str, str]]] = None):
+    """
+    Berechnet Saison_Spieler_Summen für die übergebenen (Saison, Spieler_ID) aus Liga_Spieler_Summen neu
+    (None = alles). Läuft in der Transaktion des Aufrufers, nach den Änderungen am Spieler-Rollup.
+    """
+    if keys is None:
+        cursor.execute(f"DELETE FROM {TABLE_SAISON_SPIELER_SUMMEN}")
+        cursor.execute(SQL_REBUILD_SAISON_SPIELER_SUMMEN)
+        logger.info(f"Saison-Ranglisten neu berechnet ({cursor.rowcount} Zeilen).")
+        return
+    if not keys:
+        return
+    seasons, player_ids = (list(column) for column in zip(*sorted(keys)))
+    params = {"seasons": seasons, "player_ids": player_ids}
+    cursor.execute(f'DELETE FROM {TABLE_SAISON_SPIELER_SUMMEN} ssr USING {SQL_PLAYER_SEASON_KEYS} '
+                   'WHERE ssr."Saison" = k."Saison" AND ssr."Spieler_ID" = k."Spieler_ID"', params)
+    cursor.execute(SQL_REFRESH_SAISON_SPIELER_SUMMEN, params)
+
+def refresh_league_summaries(cursor: psycopg2.extensions.cursor, league_ids: Optional[Set[str]] = None, include_player_rollup: bool = True):
+    """
+    Berechnet die Liga-Zusammenfassungen für die übergebenen Ligen neu (None = alle Ligen).
+    Der Spieler-Rollup wird beim Import per Delta gepflegt, daher kann er hier mit
+    include_player_rollup=False ausgelassen werden. Läuft in der Transaktion des Aufrufers.
+    """
+    all_leagues = league_ids is None
+    if all_leagues:
+        cursor.execute(f'SELECT "Liga_ID" FROM {TABLE_LIGEN}')
+        league_ids = {row[0] for row in cursor.fetchall()}
+    if not league_ids:
+        return
+    params = {"league_ids": sorted(league_ids), "sign": 1}
+    if include_player_rollup:
+        cursor.execute(f'DELETE FROM {TABLE_LIGA_SPIELER_SUMMEN} WHERE "Liga_ID" = ANY(%(league_ids)s) RETURNING "Saison", "Spieler_ID"', params)
+        changed = set(cursor.fetchall())
+        cursor.execute(SQL_REFRESH_LIGA_SPIELER_SUMMEN, params)
+        changed.update(cursor.fetchall())
+        refresh_season_player_summaries(cursor, None if all_leagues else changed)
+    cursor.execute(f'DELETE FROM {TABLE_LIGA_KENNZAHLEN} WHERE "Liga_ID" = ANY(%(league_ids)s)', params)
+    cursor.execute(SQL_REFRESH_LIGA_KENNZAHLEN, params)
+    logger.info(f"Liga-Zusammenfassungen für {len(league_ids)} Ligen aktualisiert.")
+
+# --- Team-Ratings (Team_Rating_Verlauf, Team_Ratings) ---
+# Elo über alle gewerteten Spiele in zeitlicher Reihenfolge (utils/team_ratings.py). Beim Import wird ab dem
+# frühesten Spiel nachgerechnet, dessen Wertung sich geändert hat (neu gewertet, Ergebnis, Anstoß oder Teams
+# korrigiert, nicht mehr gewertet); der Verlauf davor bleibt stehen. Neue Spiele am Saisonende kosten damit
+# nur ihre eigene Verrechnung. rebuild_team_ratings rechnet alles neu.
+SQL_RATING_GAMES: str = f"""
+SELECT "Spiel_ID", "Start_Zeit", "Saison", "Heim_Team_ID", "Gast_Team_ID", "Tore_Heim", "Tore_Gast"
+FROM {TABLE_SPIELE}
+WHERE "Status" = 'Post' AND "Punkte_Heim_Offiziell" IS NOT NULL AND "Punkte_Gast_Offiziell" IS NOT NULL
+  AND "Tore_Heim" IS NOT NULL AND "Tore_Gast" IS NOT NULL
+"""
+
+SQL_RATED_GAMES_IN_HISTORY: str = f"""
+SELECT "Spiel_ID", "Start_Zeit", "Saison",
+       MAX("Team_ID") FILTER (WHERE "Heim"), MAX("Team_ID") FILTER (WHERE NOT "Heim"),
+       MAX("Tore") FILTER (WHERE "Heim"), MAX("Tore") FILTER (WHERE NOT "Heim")
+FROM {TABLE_TEAM_RATING_VERLAUF}
+WHERE "Spiel_ID" = ANY(%(game_ids)s)
+GROUP BY "Spiel_ID", "Start_Zeit", "Saison"
+"""
+
+# Ab (Start_Zeit, Spiel_ID) einschließlich; die einzelne Bedingung auf "Start_Zeit" grenzt den Indexbereich ein
+SQL_FROM_GAME: str = ' AND "Start_Zeit" >= %(zeit)s AND ("Start_Zeit", "Spiel_ID") >= (%(zeit)s, %(spiel_id)s)'
+
+# Letzter Stand je Team vor einem Spiel, ein Indexzugriff je Team
+SQL_RATING_STATE_BEFORE: str = f"""
+SELECT t."Team_ID", v."Rating_Nachher", v."Spiel_Nr", v."Saison"
+FROM unnest(%(team_ids)s::TEXT[]) AS t("Team_ID")
+CROSS JOIN LATERAL (
+    SELECT "Rating_Nachher", "Spiel_Nr", "Saison" FROM {TABLE_TEAM_RATING_VERLAUF} v
+    WHERE v."Team_ID" = t."Team_ID" AND v."Start_Zeit" <= %(zeit)s AND (v."Start_Zeit", v."Spiel_ID") < (%(zeit)s, %(spiel_id)s)
+    ORDER BY v."Start_Zeit" DESC, v."Spiel_ID" DESC LIMIT 1
+) v
+"""
+
+FULL_REBUILD_SHARE: float = 0.4
+
+SQL_REPLAY_SHARE: str = f"""
+SELECT (SELECT COUNT(*) FROM {TABLE_TEAM_RATING_VERLAUF} WHERE TRUE{SQL_FROM_GAME}),
+       (SELECT reltuples FROM pg_class WHERE oid = '{TABLE_TEAM_RATING_VERLAUF}'::regclass)
+"""
+
+SQL_REFRESH_TEAM_RATINGS: str = f"""
+INSERT INTO {TABLE_TEAM_RATINGS} ("Team_ID", "Rating", "Spiele", "Saison", "Stand_Zeit")
+SELECT DISTINCT ON ("Team_ID") "Team_ID", "Rating_Nachher", "Spiel_Nr", "Saison", "Start_Zeit"
+FROM {TABLE_TEAM_RATING_VERLAUF}
+WHERE "Team_ID" = ANY(%(team_ids)s)
+ORDER BY "Team_ID", "Start_Zeit" DESC, "Spiel_ID" DESC
+"""
+
+# Bisherige Liga und Teams neu importierter Spiele: wechselt ein Spiel die Liga, ändern sich auch deren Kennzahlen
+SQL_PREVIOUS_GAME_ASSIGNMENT: str = f"""
+SELECT "Liga_ID", "Heim_Team_ID", "Gast_Team_ID" FROM {TABLE_SPIELE} WHERE "Spiel_ID" = ANY(%(game_ids)s)
+"""
+
+# Fremdschlüssel und Sekundärindizes einer Tabelle als (Löschen, Anlegen), für load_into_empty_table
+SQL_DEFERRABLE_DDL: str = """
+SELECT format('ALTER TABLE %%s DROP CONSTRAINT %%I', conrelid::regclass, conname),
+       format('ALTER TABLE %%s ADD CONSTRAINT %%I %%s', conrelid::regclass, conname, pg_get_constraintdef(oid))
+FROM pg_constraint WHERE conrelid = %(table)s::regclass AND contype = 'f'
+UNION ALL
+SELECT format('DROP INDEX %%s', indexrelid::regclass), pg_get_indexdef(indexrelid)
+FROM pg_index WHERE indrelid = %(table)s::regclass AND NOT indisprimary AND NOT indisunique
+"""
+
+def copy_rows(cursor: psycopg2.extensions.cursor, table_name: str, column_names: List[str], rows: List[tuple]):
+    """Schreibt viele Zeilen per COPY (Textformat); für Massendaten deutlich schneller als execute_values."""
+    if not rows: return
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join("\\N" if v is None else str(v).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+                               for v in row) + "\n")
+    buffer.seek(0)
+    cols_sql = ", ".join([f'"{col}"' for col in column_names])
+    cursor.copy_expert(f"COPY {table_name} ({cols_sql}) FROM STDIN", buffer)
+
+def load_into_empty_table(cursor: psycopg2.extensions.cursor, table_name: str, column_names: List[str], rows: List[tuple]):
+    """
+    COPY in eine in dieser Transaktion geleerte Tabelle. Sekundärindizes werden danach in einem Sortiervorgang
+    angelegt und Fremdschlüssel mit einer Abfrage geprüft statt je Zeile; bei 200k Zeilen etwa dreimal schneller.
+    Die Tabelle ist bis zum Commit gesperrt (wie schon durch TRUNCATE).
+    """
+    cursor.execute(SQL_DEFERRABLE_DDL, {"table": table_name})
+    statements = cursor.fetchall()
+    for drop_sql, _ in statements:
+        cursor.execute(drop_sql)
+    copy_rows(cursor, table_name, column_names, rows)
+    for _, create_sql in statements:
+        cursor.execute(create_sql)
+
+def _replay_team_ratings(cursor: psycopg2.extensions.cursor, start: Optional[Tuple[int, str]]) -> Set[str]:
+    """
+    Rechnet die Ratings ab dem Spiel start = (Start_Zeit, Spiel_ID) einschließlich neu (None = alle Spiele)
+    und gibt die Teams zurück, deren Verlauf sich dadurch geändert haben kann.
+    """
+    state = RatingState()
+    affected: Set[str] = set()
+    if start is None:
+        cursor.execute(f"TRUNCATE {TABLE_TEAM_RATING_VERLAUF}, {TABLE_TEAM_RATINGS}")
+        cursor.execute(SQL_RATING_GAMES + ' ORDER BY "Start_Zeit", "Spiel_ID"')
+        games = [RatingGame._make(row) for row in cursor.fetchall()]
+    else:
+        params: Dict[str, Any] = {"zeit": start[0], "spiel_id": start[1]}
+        cursor.execute(f'DELETE FROM {TABLE_TEAM_RATING_VERLAUF} WHERE TRUE{SQL_FROM_GAME} RETURNING "Team_ID"', params)
+        affected.update(row[0] for row in cursor.fetchall())
+        cursor.execute(SQL_RATING_GAMES + SQL_FROM_GAME + ' ORDER BY "Start_Zeit", "Spiel_ID"', params)
+        games = [RatingGame._make(row) for row in cursor.fetchall()]
+        params["team_ids"] = sorted({t for g in games for t in (g.heim_team_id, g.gast_team_id)})
+        cursor.execute(SQL_RATING_STATE_BEFORE, params)
+        for team_id, rating, game_no, season in cursor.fetchall():
+            state.ratings[team_id], state.games[team_id], state.seasons[team_id] = rating, game_no, season
+    history = rate_games(games, state)
+    (load_into_empty_table if start is None else copy_rows)(cursor, TABLE_TEAM_RATING_VERLAUF, HISTORY_COLUMNS, history)
+    affected.update(row[1] for row in history)
+
+    team_ids = sorted(affected)
+    if start is not None:
+        cursor.execute(f'DELETE FROM {TABLE_TEAM_RATINGS} WHERE "Team_ID" = ANY(%(team_ids)s)', {"team_ids": team_ids})
+    cursor.execute(SQL_REFRESH_TEAM_RATINGS, {"team_ids": team_ids})
+    logger.info(f"Team-Ratings: {len(history) // 2} Spiele verrechnet, {len(team_ids)} Teams aktualisiert.")
+    return affected
+
+def update_team_ratings(cursor: psycopg2.extensions.cursor, game_ids: List[str]) -> Set[str]:
+    """
+    Pflegt die Ratings nach dem Schreiben der Spiele game_ids (in der Transaktion des Aufrufers). Gibt die
+    Teams mit geändertem Verlauf zurück. Ohne vorhandenen Verlauf (z.B. direkt nach Migration 0011) wird
+    einmal alles berechnet.
+    """
+    if not game_ids: return set()
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {TABLE_TEAM_RATING_VERLAUF})")
+    if not cursor.fetchone()[0]:
+        return _replay_team_ratings(cursor, None)
+    params = {"game_ids": list(game_ids)}
+    cursor.execute(SQL_RATING_GAMES + ' AND "Spiel_ID" = ANY(%(game_ids)s)', params)
+    current = {row[0]: row[1:] for row in cursor.fetchall()}
+    cursor.execute(SQL_RATED_GAMES_IN_HISTORY, params)
+    rated = {row[0]: row[1:] for row in cursor.fetchall()}
+    changed = [(values[0], spiel_id) for source, other in ((current, rated), (rated, current))
+               for spiel_id, values in source.items() if other.get(spiel_id) != values]
+    if not changed:
+        return set()
+    start = min(changed)
+    # Nachrechnen kostet je Zeile etwa das Doppelte der Neuberechnung (Löschen, Indexpflege); ab
+    # FULL_REBUILD_SHARE des Verlaufs ist alles neu schneller. reltuples ist eine Schätzung (-1 ohne ANALYZE).
+    cursor.execute(SQL_REPLAY_SHARE, {"zeit": start[0], "spiel_id": start[1]})
+    replay_rows, total_rows = cursor.fetchone()
+    if total_rows > 0 and replay_rows > FULL_REBUILD_SHARE * total_rows:
+        return _replay_team_ratings(cursor, None)
+    return _replay_team_ratings(cursor, start)
+
+def rebuild_team_ratings(cursor: psycopg2.extensions.cursor) -> Set[str]:
+    """Berechnet Verlauf und Stand aller Team-Ratings neu (Backfill, nach manuellen Datenänderungen)."""
+    return _replay_team_ratings(cursor, None)
+
+def write_game_batch(cursor: psycopg2.extensions.cursor, extracted_games: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """
+    Schreibt die Ergebnisse von extract_data_from_game_json für mehrere Spiele in die DB
+    (Stammdaten, Spiele, Kader, Ereignisse, Zusammenfassungen). Läuft in der Transaktion des
+    Aufrufers, der Commit erfolgt dort. Gibt die berührten IDs zurück (siehe new_touched_ids).
+    """
+    leagues_batch: Set[Tuple] = set()
+    teams_batch: Set[Tuple] = set()
+    halls_batch: Set[Tuple] = set()
+    players_batch: Set[Tuple] = set()
+    games_initial_batch: List[Dict[str, Any]] = []
+    games_results_batch: List[Dict[str, Any]] = []
+    kader_stats_batch: List[Dict[str, Any]] = []
+    events_batch: List[Dict[str, Any]] = []
+    timelines_batch: List[Dict[str, Any]] = []
+    game_ids_in_current_batch: List[str] = []
+    for extracted_data in extracted_games:
+        leagues_batch.update(extracted_data["leagues"])
+        teams_batch.update(extracted_data["teams"])
+        halls_batch.update(extracted_data["halls"])
+        players_batch.update(extracted_data["players"])
+        if extracted_data["game_initial_data"]: games_initial_batch.append(extracted_data["game_initial_data"])
+        if extracted_data["game_result_data"]: games_results_batch.append(extracted_data["game_result_data"])
+        kader_stats_batch.extend(extracted_data["kader_stats"])
+        events_batch.extend(extracted_data["events"])
+        if extracted_data["score_timeline"]: timelines_batch.append(extracted_data["score_timeline"])
+        game_ids_in_current_batch.append(extracted_data["spiel_id_full"])
+
+    # 1. Eindeutige Entitäten (upsert)
+    batch_upsert_entities(cursor, leagues_batch, TABLE_LIGEN, "Liga_ID", LEAGUE_COLS)
+    batch_upsert_entities(cursor, teams_batch, TABLE_TEAMS, "Team_ID", TEAM_COLS)
+    batch_upsert_entities(cursor, halls_batch, TABLE_HALLEN, "Hallen_ID", HALL_COLS)
+    batch_upsert_entities(cursor, players_batch, TABLE_SPIELER, "Spieler_ID", PLAYER_COLS)
+
+    # 2. Alte Kader-Werte aus dem Spieler-Rollup abziehen (noch mit der bisherigen Liga des Spiels)
+    changed_player_seasons = apply_player_rollup_delta(cursor, game_ids_in_current_batch, sign=-1)
+
+    # 3. Spiele (upsert initial, dann update results); bisherige Liga/Teams zuvor als berührt merken
+    touched = new_touched_ids()
+    if game_ids_in_current_batch:
+        cursor.execute(SQL_PREVIOUS_GAME_ASSIGNMENT, {"game_ids": game_ids_in_current_batch})
+        for previous_league_id, previous_home_id, previous_away_id in cursor.fetchall():
+            if previous_league_id: touched["leagues"].add(previous_league_id)
+            touched["teams"].update(t for t in (previous_home_id, previous_away_id) if t)
+    batch_upsert_spiele(cursor, games_initial_batch, games_results_batch)
+
+    # 4. Kader, Events & Spielverlauf (delete old for batch, then batch insert)
+    if game_ids_in_current_batch:
+        # Erstelle eine Zeichenkette von Platzhaltern: (%s, %s, ...)
+        placeholders = ", ".join(["%s"] * len(game_ids_in_current_batch))
+        
+        logger.info(f"Lösche alte Kader-Statistiken für {len(game_ids_in_current_batch)} Spiele im Batch...")
+        cursor.execute(f"DELETE FROM {TABLE_KADER_STATS} WHERE \"Spiel_ID\" IN ({placeholders})", tuple(game_ids_in_current_batch))
+        
+        logger.info(f"Lösche alte Ereignisse für {len(game_ids_in_current_batch)} Spiele im Batch...")
+        cursor.execute(f"DELETE FROM {TABLE_EREIGNISSE} WHERE \"Spiel_ID\" IN ({placeholders})", tuple(game_ids_in_current_batch))
+        cursor.execute(f"DELETE FROM {TABLE_SPIELVERLAEUFE} WHERE \"Spiel_ID\" IN ({placeholders})", tuple(game_ids_in_current_batch))
+    
+    batch_insert_data(cursor, kader_stats_batch, TABLE_KADER_STATS, KADER_STATS_COLS, unique_constraint_cols=["Spiel_ID", "Spieler_ID"], do_nothing_on_conflict=True)
+    ensure_event_partitions(cursor, {g["Saison"] for g in games_initial_batch if g.get("Saison")})
+    encode_events(cursor, events_batch)
+    batch_insert_data(cursor, events_batch, TABLE_EREIGNISSE, EVENT_COLS, unique_constraint_cols=EVENT_UNIQUE_COLS, do_nothing_on_conflict=True)
+    batch_insert_data(cursor, timelines_batch, TABLE_SPIELVERLAEUFE, SCORE_TIMELINE_COLS, unique_constraint_cols=["Spiel_ID"])
+
+    # 5. Neue Kader-Werte in den Spieler-Rollup, Team-Ratings ab dem frühesten geänderten Spiel,
+    #    Liga-Kennzahlen nur für die Ligen dieses Batches, Saison-Ranglisten nur für die geänderten Spieler
+    changed_player_seasons |= apply_player_rollup_delta(cursor, game_ids_in_current_batch, sign=1)
+    touched["leagues"].update(g["Liga_ID"] for g in games_initial_batch if g.get("Liga_ID"))
+    touched["teams"].update(t for g in games_initial_batch for t in (g.get("Heim_Team_ID"), g.get("Gast_Team_ID")) if t)
+    touched["teams"].update(row["Team_ID"] for row in kader_stats_batch if row.get("Team_ID"))
+    touched["players"].update(row["Spieler_ID"] for row in kader_stats_batch if row.get("Spieler_ID"))
+    touched["players"].update(player_id for _, player_id in changed_player_seasons) # auch aus dem Kader entfernte
+    touched["games"].update(game_ids_in_current_batch)
+    touched["teams"].update(update_team_ratings(cursor, game_ids_in_current_batch))
+    refresh_league_summaries(cursor, touched["leagues"], include_player_rollup=False)
+    refresh_season_player_summaries(cursor, changed_player_seasons)
+
+    # 6. Gecachte Ergebnisse nur für die berührten Ligen, Teams, Spieler und Spiele ungültig machen (utils/query_cache.py)
+    bump_cache_versions(cursor, scopes_for_touched(touched))
+    return touched
+
+def new_touched_ids() -> Dict[str, Set[str]]:
+    """Berührte IDs eines Imports: {"leagues": ..., "teams": ..., "players": ..., "games": ...}"""
+    return {"leagues": set(), "teams": set(), "players": set(), "games": set()}
+
 # --- Haupt-Batch-Verarbeitungsfunktion ---
 def main_batched(game_ids_to_process: List[str], batch_size: int = DEFAULT_BATCH_SIZE):
     if not all([DB_NAME_PG, DB_USER_PG, DB_PASSWORD_PG, DB_HOST_PG, DB_PORT_PG]): #
@@ -399,19 +911,12 @@ def main_batched(game_ids_to_process: List[str], batch_size: int = DEFAULT_BATCH
     processed_successfully_count = 0
     error_count = 0
     total_to_process = len(game_ids_to_process)
+    touched = new_touched_ids() # Nur aus erfolgreich geschriebenen Batches
     
     logger.info(f"Starte Batch-Verarbeitung von {total_to_process} Spielen mit Batch-Größe {batch_size}...")
 
-    # Sammelbehälter für einen Batch
-    leagues_batch: Set[Tuple] = set()
-    teams_batch: Set[Tuple] = set()
-    halls_batch: Set[Tuple] = set()
-    players_batch: Set[Tuple] = set()
-    games_initial_batch: List[Dict[str, Any]] = []
-    games_results_batch: List[Dict[str, Any]] = []
-    kader_stats_batch: List[Dict[str, Any]] = []
-    events_batch: List[Dict[str, Any]] = []
-    game_ids_in_current_batch: List[str] = []
+    # Sammelbehälter für einen Batch (Ergebnisse von extract_data_from_game_json)
+    extracted_games_batch: List[Dict[str, Any]] = []
 
     cursor: Optional[psycopg2.extensions.cursor] = None
     try:
@@ -441,61 +946,30 @@ def main_batched(game_ids_to_process: List[str], batch_size: int = DEFAULT_BATCH
                 continue
             
             # Daten sammeln
-            leagues_batch.update(extracted_data["leagues"])
-            teams_batch.update(extracted_data["teams"])
-            halls_batch.update(extracted_data["halls"])
-            players_batch.update(extracted_data["players"])
-            if extracted_data["game_initial_data"]: games_initial_batch.append(extracted_data["game_initial_data"])
-            if extracted_data["game_result_data"]: games_results_batch.append(extracted_data["game_result_data"])
-            kader_stats_batch.extend(extracted_data["kader_stats"])
-            events_batch.extend(extracted_data["events"])
-            game_ids_in_current_batch.append(extracted_data["spiel_id_full"])
+            extracted_games_batch.append(extracted_data)
 
             # Batch verarbeiten, wenn Größe erreicht oder letztes Element
             if (i + 1) % batch_size == 0 or (i + 1) == total_to_process:
-                logger.info(f"Verarbeite Batch (Spiele {i+1-len(game_ids_in_current_batch)+1} bis {i+1})...")
+                logger.info(f"Verarbeite Batch (Spiele {i+1-len(extracted_games_batch)+1} bis {i+1})...")
                 try:
-                    # 1. Eindeutige Entitäten (upsert)
-                    batch_upsert_entities(cursor, leagues_batch, TABLE_LIGEN, "Liga_ID", ["Liga_ID", "Name", "Akronym", "Saison", "Altersgruppe", "Typ"]) # Angepasste Spalten
-                    batch_upsert_entities(cursor, teams_batch, TABLE_TEAMS, "Team_ID", TEAM_COLS)
-                    batch_upsert_entities(cursor, halls_batch, TABLE_HALLEN, "Hallen_ID", HALL_COLS)
-                    batch_upsert_entities(cursor, players_batch, TABLE_SPIELER, "Spieler_ID", PLAYER_COLS)
-
-                    # 2. Spiele (upsert initial, dann update results)
-                    batch_upsert_spiele(cursor, games_initial_batch, games_results_batch)
-
-                    # 3. Kader & Events (delete old for batch, then batch insert)
-                    if game_ids_in_current_batch:
-                        # Erstelle eine Zeichenkette von Platzhaltern: (%s, %s, ...)
-                        placeholders = ", ".join(["%s"] * len(game_ids_in_current_batch))
-                        
-                        logger.info(f"Lösche alte Kader-Statistiken für {len(game_ids_in_current_batch)} Spiele im Batch...")
-                        cursor.execute(f"DELETE FROM {TABLE_KADER_STATS} WHERE \"Spiel_ID\" IN ({placeholders})", tuple(game_ids_in_current_batch))
-                        
-                        logger.info(f"Lösche alte Ereignisse für {len(game_ids_in_current_batch)} Spiele im Batch...")
-                        cursor.execute(f"DELETE FROM {TABLE_EREIGNISSE} WHERE \"Spiel_ID\" IN ({placeholders})", tuple(game_ids_in_current_batch))
-                    
-                    batch_insert_data(cursor, kader_stats_batch, TABLE_KADER_STATS, KADER_STATS_COLS, unique_constraint_cols=["Spiel_ID", "Spieler_ID"], do_nothing_on_conflict=True)
-                    batch_insert_data(cursor, events_batch, TABLE_EREIGNISSE, EVENT_COLS, unique_constraint_cols=["Spiel_ID", "H4A_Ereignis_ID"], do_nothing_on_conflict=True) 
-
+                    batch_touched = write_game_batch(cursor, extracted_games_batch)
                     conn.commit() # Commit nach erfolgreichem Batch
-                    processed_successfully_count += len(game_ids_in_current_batch)
-                    logger.info(f"Batch erfolgreich verarbeitet. {len(game_ids_in_current_batch)} Spiele.")
+                    for key, ids in batch_touched.items():
+                        touched[key].update(ids)
+                    processed_successfully_count += len(extracted_games_batch)
+                    logger.info(f"Batch erfolgreich verarbeitet. {len(extracted_games_batch)} Spiele.")
 
                 except psycopg2.Error as db_err: #
                     logger.error(f"Datenbankfehler während Batch-Verarbeitung: {db_err}", exc_info=True) #
                     conn.rollback() #
-                    error_count += len(game_ids_in_current_batch) # Angenommen, der ganze Batch ist betroffen
+                    error_count += len(extracted_games_batch) # Angenommen, der ganze Batch ist betroffen
                 except Exception as e_batch: #
                     logger.error(f"Allgemeiner Fehler während Batch-Verarbeitung: {e_batch}", exc_info=True) #
                     conn.rollback() #
-                    error_count += len(game_ids_in_current_batch)
+                    error_count += len(extracted_games_batch)
                 finally:
                     # Reset für nächsten Batch
-                    leagues_batch.clear(); teams_batch.clear(); halls_batch.clear(); players_batch.clear()
-                    games_initial_batch.clear(); games_results_batch.clear()
-                    kader_stats_batch.clear(); events_batch.clear()
-                    game_ids_in_current_batch.clear()
+                    extracted_games_batch.clear()
             
             # Kurze Pause, um die API nicht zu überlasten (optional, aber empfohlen)
             # time.sleep(0.1) 
@@ -515,7 +989,7 @@ def main_batched(game_ids_to_process: List[str], batch_size: int = DEFAULT_BATCH
     logger.info(f"  Erfolgreich verarbeitet: {processed_successfully_count}") #
     logger.info(f"  Fehlerhaft: {error_count}") #
     logger.info("-" * 30) #
-    return {"success": processed_successfully_count, "error": error_count, "total": total_to_process}
+    return {"success": processed_successfully_count, "error": error_count, "total": total_to_process, "touched": touched}
 
 
 # Am Ende der Datei zur Sicherheit:
@@ -0,0 +1,99 @@
+import os
+import sys
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlalchemy
+
+# Fügt das Hauptverzeichnis zum Suchpfad hinzu, damit wir die Module des Projekts importieren können
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+SQL_DIR: str = os.path.join(ROOT_DIR, 'sql')
+
+# Benchmarks laufen nie gegen die Produktionsdatenbank, sondern gegen eine eigene DSN,
+# z.B. postgresql+psycopg2://postgres@/handball_bench?host=/tmp
+BENCH_DSN_ENV: str = "HANDBALL_BENCH_DSN"
+
+# Repräsentative Parameter: jeweils die Liga / das Team / der Spieler mit den meisten Daten,
+# damit die Messungen den teuersten realistischen Fall abbilden.
+SQL_SAMPLE_PARAMS: str = """
+WITH liga AS (
+    SELECT sp."Liga_ID", l."Saison" FROM "Spiele" sp JOIN "Ligen" l ON sp."Liga_ID" = l."Liga_ID"
+    GROUP BY sp."Liga_ID", l."Saison" ORDER BY COUNT(*) DESC, sp."Liga_ID" LIMIT 1
+), spiel AS (
+    SELECT sp."Spiel_ID", sp."Heim_Team_ID", sp."Gast_Team_ID" FROM "Spiele" sp JOIN liga ON sp."Liga_ID" = liga."Liga_ID"
+    WHERE sp."Status" = 'Post' ORDER BY sp."Start_Zeit", sp."Spiel_ID" LIMIT 1
+), spieler AS (
+    SELECT sks."Spieler_ID" FROM "Spiel_Kader_Statistiken" sks JOIN spiel ON sks."Team_ID" = spiel."Heim_Team_ID"
+    GROUP BY sks."Spieler_ID" ORDER BY SUM(sks."Tore_Gesamt") DESC, sks."Spieler_ID" LIMIT 1
+)
+SELECT liga."Liga_ID", liga."Saison", spiel."Spiel_ID", spiel."Heim_Team_ID", spiel."Gast_Team_ID", spieler."Spieler_ID",
+       s."Vorname", s."Nachname"
+FROM liga, spiel, spieler JOIN "Spieler" s ON s."Spieler_ID" = spieler."Spieler_ID";
+"""
+
+
+def get_bench_engine(dsn: Optional[str] = None) -> sqlalchemy.engine.Engine:
+    dsn = dsn or os.environ.get(BENCH_DSN_ENV)
+    if not dsn:
+        raise SystemExit(f"FEHLER: Bitte {BENCH_DSN_ENV} auf eine Benchmark-Datenbank setzen.")
+    return sqlalchemy.create_engine(dsn)
+
+
+def psycopg2_dsn(engine: sqlalchemy.engine.Engine) -> Dict[str, Any]:
+    """Verbindungsparameter der Engine für psycopg2.connect (für den Migrations-Runner)."""
+    url = engine.url
+    params = {"dbname": url.database, "user": url.username, "password": url.password, "host": url.host, "port": url.port}
+    params.update(url.query)
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def load_sql_file(filename: str) -> str:
+    with open(os.path.join(SQL_DIR, filename), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def resolve_sample_params(conn: sqlalchemy.engine.Connection) -> Dict[str, Any]:
+    """Belegt alle in sql/ verwendeten :parameter mit repräsentativen Werten aus der Datenbank."""
+    row = conn.execute(sqlalchemy.text(SQL_SAMPLE_PARAMS)).fetchone()
+    if row is None:
+        raise SystemExit("FEHLER: Die Benchmark-Datenbank enthält keine beendeten Spiele.")
+    league_id, season, game_id, home_team_id, away_team_id, player_id, first_name, last_name = row
+    return {
+        "league_id": league_id, "season": season, "game_id": game_id,
+        "team_id": home_team_id, "team1_id": home_team_id, "team2_id": away_team_id,
+        "opponent_team_id": away_team_id, "player_id": player_id, "limit": 10,
+        "team_ids": [home_team_id, away_team_id], "league_ids": [league_id], "player_ids": [player_id],
+        "scopes": ["alle", "stammdaten", f"liga:{league_id}", f"spieler:{player_id}"], "since": 0,
+        # Ligaübergreifende Ranglisten ohne Filter: größte Auswahl einer Saison
+        "age_group": "Alle", "gender": "Alle",
+        # Typische Eingabe im Suchfeld: Anfang des Vornamens und Nachnamens
+        "search_term": f"{(first_name or '')[:3]} {(last_name or '')[:4]}".strip(),
+    }
+
+
+def _collect_plan_nodes(node: Dict[str, Any], nodes: List[Dict[str, Any]]) -> None:
+    nodes.append(node)
+    for child in node.get("Plans", []):
+        _collect_plan_nodes(child, nodes)
+
+
+def explain_analyze(conn: sqlalchemy.engine.Connection, sql: str, params: Dict[str, Any],
+                    runs: int = 5) -> Tuple[float, List[str], Dict[str, Any]]:
+    """
+    Führt EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) runs-mal aus (ein zusätzlicher Lauf wärmt den Cache).
+    Gibt (Median der Ausführungszeit in ms, verwendete Indizes, Plan des letzten Laufs) zurück.
+    """
+    statement = sqlalchemy.text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql.strip().rstrip(';'))
+    timings: List[float] = []
+    plan: Dict[str, Any] = {}
+    for i in range(runs + 1):
+        result = conn.execute(statement, {k: v for k, v in params.items() if f":{k}" in sql}).scalar()
+        plan = result[0]
+        if i > 0:
+            timings.append(plan["Execution Time"])
+    nodes: List[Dict[str, Any]] = []
+    _collect_plan_nodes(plan["Plan"], nodes)
+    indexes = sorted({n["Index Name"] for n in nodes if "Index Name" in n})
+    return statistics.median(timings), indexes, plan
@@ -0,0 +1,448 @@
+"""
+Reproduzierbarer, skalierbarer Testdatensatz für Benchmarks.
+
+Erzeugt Spiele im Format der handball.net "combined"-API (wie sie analyse_game_json abruft):
+mehrere Regionen, beliebig viele Saisons mit Hin- und Rückrunde, Teams und Spieler, die über
+die Saisons bestehen bleiben (mit Fluktuation), N.N.-Spieler, Offizielle, Tore, 7m, Zeitstrafen,
+Verwarnungen, Disqualifikationen und Auszeiten. Gleicher Seed und gleiche Konfiguration ergeben
+immer dieselben Daten.
+
+Ziele:
+    load_via_copy    - schnell per COPY direkt in die Tabellen (für 100k+ Spiele)
+    load_via_import  - über den regulären Importpfad (extract_data_from_game_json + write_game_batch)
+    write_json_files - eine combined-JSON-Datei je Spiel
+
+Beispiel (ca. 100.000 Spiele, 6-7 Mio. Ereignisse):
+    python benchmarks/dataset.py --regions 8 --seasons 12 --leagues-per-region 10 --teams-per-league 10 --target copy
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+from common import get_bench_engine, psycopg2_dsn
+import analyse_game_json as importer
+import createDB_postgresql as schema
+
+logger = logging.getLogger(__name__)
+
+REGIONS: List[str] = ["westfalen", "niederrhein", "mittelrhein", "baden", "wuerttemberg", "bayern",
+                      "hessen", "sachsen", "niedersachsen", "hamburg", "berlin", "pfalz"]
+LEAGUE_LEVELS: List[str] = ["Oberliga", "Verbandsliga", "Landesliga", "Bezirksliga", "Kreisliga"]
+# (Geschlecht im Liganamen, ageGroup der API)
+LEAGUE_CATEGORIES: List[Tuple[str, str]] = [("Männer", "Adults"), ("Frauen", "Adults"),
+                                            ("männliche A-Jugend", "AYouth"), ("weibliche A-Jugend", "AYouth"),
+                                            ("männliche B-Jugend", "BYouth"), ("weibliche B-Jugend", "BYouth"),
+                                            ("männliche C-Jugend", "CYouth"), ("weibliche C-Jugend", "CYouth")]
+CLUB_PREFIXES: List[str] = ["TV", "TSV", "SG", "HSG", "SV", "TuS", "HC", "DJK", "VfL", "ASV"]
+CITIES: List[str] = ["Aachen", "Bielefeld", "Bochum", "Dortmund", "Essen", "Hagen", "Hamm", "Herne", "Lemgo",
+                     "Minden", "Münster", "Paderborn", "Siegen", "Soest", "Unna", "Verl", "Gütersloh", "Detmold"]
+TEAM_SUFFIXES: List[str] = ["", "", "", " 2", " II", " 3"]
+FIRST_NAMES: List[str] = ["Max", "Jörg", "Lena", "Ünal", "Paul", "Jonas", "Mia", "Lukas", "Sophie", "Tim",
+                          "Finn", "Lea", "Ben", "Emma", "Noah", "Hannah", "Elias", "Marie", "Jan", "Clara"]
+LAST_NAMES: List[str] = ["Müller", "Schmidt", "Weiß", "Öztürk", "Meier", "Schulz", "Becker", "Hoffmann",
+                         "Koch", "Richter", "Wolf", "Schröder", "Neumann", "Schwarz", "Braun", "Krüger"]
+GAME_ID_OFFSET: int = 7000000
+GAME_SECONDS: int = 3600
+
+
+@dataclass
+class DatasetConfig:
+    seed: int = 1
+    regions: int = 2
+    seasons: int = 2
+    first_season: int = 2022          # Startjahr der ersten Saison (Saison 2022/2023)
+    leagues_per_region: int = 10
+    teams_per_league: int = 8
+    roster_size: int = 14             # Spieler je Mannschaft und Spiel
+    squad_size: int = 20              # Spielerpool je Team, aus dem der Spieltagskader gezogen wird
+    squad_turnover: float = 0.2       # Anteil des Pools, der zu jeder neuen Saison ersetzt wird
+    nn_share: float = 0.02            # Anteil N.N.-Einträge im Kader
+    goals_per_game: float = 54.0      # Mittelwert beider Teams zusammen
+    events_per_game: float = 14.0     # Mittelwert der Nicht-Tor-Ereignisse (Strafen, Verwarnungen, Auszeiten, 7m-Fehlwürfe)
+    played_share: float = 0.85        # Anteil gespielter Spiele in der letzten Saison (ältere Saisons sind komplett)
+    walkover_share: float = 0.005     # Anteil Spiele mit Wertung am grünen Tisch
+    number_first_share: float = 0.3   # Anteil Ligen mit Tor-Nachrichten im Format "Tor durch 7. (Max Muster)"
+
+    @property
+    def total_games(self) -> int:
+        return self.regions * self.seasons * self.leagues_per_region * self.teams_per_league * (self.teams_per_league - 1)
+
+
+def _season_start_ms(year: int) -> int:
+    """Erster Spieltag: zweites Septemberwochenende."""
+    return int(datetime(year, 9, 9, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _event(event_id: int, start_ms: int, second: int, typ: str, score: Tuple[int, int], side: Optional[str], message: str) -> Dict[str, Any]:
+    return {"id": event_id, "timestamp": start_ms + second * 1000, "time": f"{second // 60:02d}:{second % 60:02d}",
+            "type": typ, "score": f"{score[0]}:{score[1]}", "team": side, "message": message}
+
+
+def _player_label(player: Dict[str, Any], number_first: bool = False) -> str:
+    if number_first:
+        return f"{player['number']}. ({player['firstname']} {player['lastname']})"
+    return f"{player['firstname']} {player['lastname']} ({player['number']}.)"
+
+
+def _poisson(rnd: random.Random, mean: float) -> int:
+    # Normalapproximation reicht für Mittelwerte im zweistelligen Bereich und ist deutlich schneller
+    return max(0, int(round(rnd.gauss(mean, mean ** 0.5))))
+
+
+def _play_game(rnd: random.Random, config: DatasetConfig, start_ms: int, lineups: Dict[str, List[Dict[str, Any]]],
+               strength: Tuple[float, float], number_first: bool = False
+               ) -> Tuple[List[Dict[str, Any]], Tuple[int, int], Tuple[int, int], Dict[str, Dict[str, int]]]:
+    """
+    Simuliert ein Spiel. Gibt (Ereignisse, Endstand, Halbzeitstand, Statistik je Spieler-ID) zurück;
+    die Statistik wird in die Lineup-Einträge übernommen, damit Kader und Ereignisse zusammenpassen.
+    number_first: Tor- und 7m-Nachrichten als "durch 7. (Max Muster)" statt "durch Max Muster (7.)" (die Form,
+    die analyse_game_json.parse_player_from_message neben der üblichen kennt).
+    """
+    home_share = strength[0] / (strength[0] + strength[1])
+    goals_total = _poisson(rnd, config.goals_per_game)
+    other_total = _poisson(rnd, config.events_per_game)
+    # (Sekunde, Art) - Art: goal, other
+    timeline = sorted([(rnd.randint(1, GAME_SECONDS - 1), "goal") for _ in range(goals_total)] +
+                      [(rnd.randint(1, GAME_SECONDS - 1), "other") for _ in range(other_total)])
+    stats: Dict[str, Dict[str, int]] = {}
+    events: List[Dict[str, Any]] = [_event(1, start_ms, 0, "StartPeriod", (0, 0), None, "Spielbeginn")]
+    score = [0, 0]
+    half_time: Optional[Tuple[int, int]] = None
+    timeouts = {"Home": 0, "Away": 0}
+
+    for second, kind in timeline:
+        if half_time is None and second > GAME_SECONDS // 2:
+            half_time = (score[0], score[1])
+            events.append(_event(len(events) + 1, start_ms, GAME_SECONDS // 2, "StopPeriod", half_time, None, "Spielstand 1. Halbzeit"))
+            events.append(_event(len(events) + 1, start_ms, GAME_SECONDS // 2, "StartPeriod", half_time, None, "Beginn 2. Halbzeit"))
+        side = "Home" if rnd.random() < (home_share if kind == "goal" else 0.5) else "Away"
+        field_players = [p for p in lineups[side] if not p["is_nn"]] or lineups[side]
+        # Rückraum- und Außenspieler werfen mehr Tore: einfache Gewichtung über die Position im Kader
+        player = rnd.choices(field_players, weights=[len(field_players) - i for i in range(len(field_players))])[0]
+        player_stats = stats.setdefault(player["id"], {"goals": 0, "penaltyGoals": 0, "penaltyMissed": 0,
+                                                       "yellowCards": 0, "redCards": 0, "blueCards": 0})
+        if kind == "goal":
+            seven_meter = rnd.random() < 0.12
+            score[0 if side == "Home" else 1] += 1
+            player_stats["goals"] += 1
+            if seven_meter:
+                player_stats["penaltyGoals"] += 1
+            events.append(_event(len(events) + 1, start_ms, second, "SevenMeterGoal" if seven_meter else "Goal", tuple(score), side,
+                                 f"{'7m-Tor' if seven_meter else 'Tor'} durch {_player_label(player, number_first)}"))
+            continue
+        r = rnd.random()
+        if r < 0.5:
+            events.append(_event(len(events) + 1, start_ms, second, "TwoMinutePenalty", tuple(score), side, f"2-min Strafe für {_player_label(player)}"))
+        elif r < 0.75 and player_stats["yellowCards"] == 0:
+            player_stats["yellowCards"] += 1
+            events.append(_event(len(events) + 1, start_ms, second, "Warning", tuple(score), side, f"Verwarnung für {_player_label(player)}"))
+        elif r < 0.9:
+            player_stats["penaltyMissed"] += 1
+            events.append(_event(len(events) + 1, start_ms, second, "SevenMeterMissed", tuple(score), side, f"7m, KEIN Tor durch {_player_label(player, number_first)}"))
+        elif r < 0.98 and timeouts[side] < 3:
+            timeouts[side] += 1
+            events.append(_event(len(events) + 1, start_ms, second, "Timeout", tuple(score), side, "Auszeit"))
+        elif player_stats["redCards"] == 0:
+            player_stats["redCards"] += 1
+            if rnd.random() < 0.3:
+                player_stats["blueCards"] += 1
+            events.append(_event(len(events) + 1, start_ms, second, "Disqualification", tuple(score), side, f"Disqualifikation für {_player_label(player)}"))
+
+    if half_time is None:
+        half_time = (score[0], score[1])
+        events.append(_event(len(events) + 1, start_ms, GAME_SECONDS // 2, "StopPeriod", half_time, None, "Spielstand 1. Halbzeit"))
+    events.append(_event(len(events) + 1, start_ms, GAME_SECONDS, "StopPeriod", tuple(score), None, "Spielstand 2. Halbzeit"))
+    return events, (score[0], score[1]), half_time, stats
+
+
+def _region_names(count: int) -> List[str]:
+    """Regionsnamen; bei mehr Regionen als Vorlagen werden sie durchnummeriert (westfalen1, ...)."""
+    return [REGIONS[i % len(REGIONS)] + (str(i // len(REGIONS)) if i >= len(REGIONS) else "") for i in range(count)]
+
+
+def _new_player(rnd: random.Random, config: DatasetConfig, player_ids: Iterator[int], region: str, number: Optional[int] = None) -> Dict[str, Any]:
+    player_id = next(player_ids)
+    if rnd.random() < config.nn_share:
+        return {"id": f"handball4all.{region}.p{player_id}", "firstname": "N.N.", "lastname": "N.N.", "number": number, "is_nn": True}
+    return {"id": f"handball4all.{region}.p{player_id}", "firstname": rnd.choice(FIRST_NAMES),
+            "lastname": rnd.choice(LAST_NAMES), "number": number, "is_nn": False}
+
+
+def generate_games(config: Optional[DatasetConfig] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Erzeugt die Spiele als (URL-Spiel-ID, combined-JSON), Saison für Saison. Als Generator,
+    damit auch sehr große Datensätze nicht komplett im Speicher liegen.
+    """
+    config = config or DatasetConfig()
+    rnd = random.Random(config.seed)
+    # Eigener Zufallsstrom für das Nachrichtenformat, damit der übrige Datensatz unverändert bleibt
+    message_rnd = random.Random(f"{config.seed}-nachrichten")
+    player_ids = iter(range(1, 10 ** 12))
+    game_number = GAME_ID_OFFSET
+
+    # Ligen-Slots je Region mit festen Teams, Kaderpools und Spielstärken über alle Saisons
+    slots: List[Dict[str, Any]] = []
+    for region in _region_names(config.regions):
+        for slot_index in range(config.leagues_per_region):
+            category, age_group = LEAGUE_CATEGORIES[slot_index % len(LEAGUE_CATEGORIES)]
+            level = LEAGUE_LEVELS[(slot_index // len(LEAGUE_CATEGORIES)) % len(LEAGUE_LEVELS)]
+            teams = []
+            for team_index in range(config.teams_per_league):
+                club = f"{rnd.choice(CLUB_PREFIXES)} {rnd.choice(CITIES)}"
+                team_id = f"handball4all.{region}.{slot_index}_{team_index}"
+                teams.append({
+                    "json": {"id": team_id, "name": f"{club}{rnd.choice(TEAM_SUFFIXES)}", "acronym": club[:3].upper(), "logo": None},
+                    "hall": {"id": f"handball4all.{region}.h{slot_index}_{team_index}", "name": f"Sporthalle {club}",
+                             "city": club.split(" ", 1)[1], "fieldNumber": str(rnd.randint(100000, 999999))},
+                    # Rückennummern bleiben am Kaderplatz, Neuzugänge übernehmen die Nummer ihres Vorgängers
+                    "squad": [_new_player(rnd, config, player_ids, region, number) for number in rnd.sample(range(1, 100), config.squad_size)],
+                    "officials": [_new_player(rnd, config, player_ids, region) for _ in range(rnd.randint(2, 4))],
+                    "strength": rnd.uniform(0.7, 1.3),
+                })
+            slots.append({"region": region, "index": slot_index, "category": category, "age_group": age_group,
+                          "level": level, "teams": teams, "number_first": message_rnd.random() < config.number_first_share})
+
+    for season_offset in range(config.seasons):
+        year = config.first_season + season_offset
+        is_current_season = season_offset == config.seasons - 1
+        season_start = _season_start_ms(year)
+        for slot in slots:
+            if season_offset > 0:
+                for team in slot["teams"]:
+                    for i in range(len(team["squad"])):
+                        if rnd.random() < config.squad_turnover:
+                            team["squad"][i] = _new_player(rnd, config, player_ids, slot["region"], team["squad"][i]["number"])
+                    team["strength"] = min(1.5, max(0.5, team["strength"] + rnd.gauss(0, 0.1)))
+            tournament = {"id": f"handball4all.{slot['region']}.t{slot['index']}_{year}",
+                          "name": f"{slot['level']} {slot['category']} {slot['region'].capitalize()} {slot['index'] + 1}",
+                          "acronym": f"{slot['level'][:2].upper()}{slot['index'] + 1}", "ageGroup": slot["age_group"],
+                          "tournamentType": "League", "startsAt": season_start}
+            teams = slot["teams"]
+            # Doppelrunde: jedes Paar einmal mit Heimrecht, verteilt auf Wochenenden ab September
+            pairings = [(h, a) for h in range(len(teams)) for a in range(len(teams)) if h != a]
+            rnd.shuffle(pairings)
+            games_per_round = max(1, len(teams) // 2)
+            for game_index, (home_index, away_index) in enumerate(pairings):
+                home, away = teams[home_index], teams[away_index]
+                round_number = game_index // games_per_round
+                kickoff = datetime.fromtimestamp(season_start / 1000, tz=timezone.utc) + timedelta(
+                    days=7 * round_number + rnd.choice([0, 1]), hours=rnd.choice([11, 13, 15, 17, 19]), minutes=rnd.choice([0, 15, 30]))
+                start_ms = int(kickoff.timestamp() * 1000)
+                game_number += 1
+                is_played = not is_current_season or (game_index + 1) / len(pairings) <= config.played_share
+
+                lineups: Dict[str, List[Dict[str, Any]]] = {}
+                for side, team in (("Home", home), ("Away", away)):
+                    lineups[side] = rnd.sample(team["squad"], min(config.roster_size, len(team["squad"])))
+
+                extra_states: List[str] = []
+                events: List[Dict[str, Any]] = []
+                stats: Dict[str, Dict[str, int]] = {}
+                final = half = (None, None)
+                if is_played and rnd.random() < config.walkover_share:
+                    extra_states = [rnd.choice(["WoHome", "WoAway"])]
+                elif is_played:
+                    events, final, half, stats = _play_game(rnd, config, start_ms, lineups, (home["strength"] * 1.05, away["strength"]),
+                                                             slot["number_first"])
+
+                def lineup_json(side: str) -> List[Dict[str, Any]]:
+                    return [{"id": p["id"], "firstname": p["firstname"], "lastname": p["lastname"], "number": p["number"],
+                             "goals": stats.get(p["id"], {}).get("goals", 0), "penaltyGoals": stats.get(p["id"], {}).get("penaltyGoals", 0),
+                             "penaltyMissed": stats.get(p["id"], {}).get("penaltyMissed", 0), "yellowCards": stats.get(p["id"], {}).get("yellowCards", 0),
+                             "redCards": stats.get(p["id"], {}).get("redCards", 0), "blueCards": stats.get(p["id"], {}).get("blueCards", 0)}
+                            for p in lineups[side]]
+
+                def officials_json(team: Dict[str, Any]) -> List[Dict[str, Any]]:
+                    return [{"id": o["id"], "firstname": o["firstname"], "lastname": o["lastname"]} for o in team["officials"]]
+
+                game_json = {"data": {
+                    "summary": {
+                        "id": f"handball4all.{slot['region']}.{game_number}", "tournament": tournament, "round": {"startsAt": season_start},
+                        "homeTeam": home["json"], "awayTeam": away["json"], "field": home["hall"], "phase": {"id": f"ph{year}"},
+                        "gameNumber": str(game_number), "startsAt": start_ms, "state": "Post" if is_played else "Pre",
+                        "pdfUrl": None, "refereeInfo": None, "extraStates": extra_states,
+                        "homeGoals": final[0], "awayGoals": final[1], "homeGoalsHalf": half[0], "awayGoalsHalf": half[1],
+                    },
+                    "lineup": {"home": lineup_json("Home"), "away": lineup_json("Away"),
+                               "homeOfficials": officials_json(home), "awayOfficials": officials_json(away)},
+                    "events": events,
+                }}
+                yield str(game_number), game_json
+
+
+# --- Ziele ---
+
+def reset_schema(pg_conn: psycopg2.extensions.connection) -> None:
+    """Setzt das Schema über die Migrationen zurück (alle down, dann alle up)."""
+    schema.rollback_migrations(pg_conn, 0)
+    schema.run_migrations(pg_conn)
+
+
+def _vacuum_analyze(pg_conn: psycopg2.extensions.connection) -> None:
+    """Statistiken und Visibility Map direkt nach dem Laden aktualisieren, damit die Pläne nicht
+    vom Zeitpunkt des nächsten Autovacuum-Laufs abhängen (VACUUM geht nur außerhalb einer Transaktion)."""
+    pg_conn.autocommit = True
+    try:
+        with pg_conn.cursor() as cursor:
+            cursor.execute("VACUUM ANALYZE")
+    finally:
+        pg_conn.autocommit = False
+
+
+def load_via_import(pg_conn: psycopg2.extensions.connection, games: Iterator[Tuple[str, Dict[str, Any]]], batch_size: int = 200) -> int:
+    """Importiert die Spiele über den regulären Importpfad. Gibt die Anzahl Spiele zurück."""
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    with pg_conn.cursor() as cursor:
+        for game_id, game_json in games:
+            extracted = importer.extract_data_from_game_json(game_json, game_id)
+            if extracted:
+                batch.append(extracted)
+                count += 1
+            if len(batch) >= batch_size:
+                importer.write_game_batch(cursor, batch)
+                batch.clear()
+        if batch:
+            importer.write_game_batch(cursor, batch)
+    pg_conn.commit()
+    _vacuum_analyze(pg_conn)
+    return count
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bytes):
+        return "\\\\x" + value.hex()  # BYTEA im Hex-Format, der Backslash selbst maskiert
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+# Zielspalten je Tabelle, in Reihenfolge der Fremdschlüssel (Stammdaten vor Spielen vor Kader/Ereignissen)
+COPY_TABLES: List[Tuple[str, List[str]]] = [
+    (importer.TABLE_LIGEN, importer.LEAGUE_COLS),
+    (importer.TABLE_TEAMS, importer.TEAM_COLS),
+    (importer.TABLE_HALLEN, importer.HALL_COLS),
+    (importer.TABLE_SPIELER, importer.PLAYER_COLS),
+    (importer.TABLE_SPIELE, importer.GAME_COLS_INITIAL + importer.GAME_COLS_RESULTS),
+    (importer.TABLE_KADER_STATS, importer.KADER_STATS_COLS),
+    (importer.TABLE_EREIGNISSE, importer.EVENT_COLS),
+    (importer.TABLE_SPIELVERLAEUFE, importer.SCORE_TIMELINE_COLS),
+]
+
+
+def load_via_copy(pg_conn: psycopg2.extensions.connection, games: Iterator[Tuple[str, Dict[str, Any]]], chunk_games: int = 2000) -> int:
+    """
+    Schreibt die Spiele per COPY in die Tabellen. Die Zeilen entstehen über extract_data_from_game_json,
+    sind also identisch mit einem regulären Import. Die Zusammenfassungen und Team-Ratings werden am
+    Ende einmal vollständig berechnet. Gibt die Anzahl Spiele zurück.
+    """
+    seen: Dict[str, set] = {table: set() for table, _ in COPY_TABLES[:4]}
+    seasons: set = set()
+    event_codes: Dict[str, Dict[str, int]] = {}
+    buffers: Dict[str, io.StringIO] = {table: io.StringIO() for table, _ in COPY_TABLES}
+    count = 0
+    start = time.perf_counter()
+
+    def write_row(table: str, values: Tuple[Any, ...]) -> None:
+        buffers[table].write("\t".join(_copy_value(v) for v in values) + "\n")
+
+    def flush(cursor: psycopg2.extensions.cursor) -> None:
+        importer.ensure_event_partitions(cursor, seasons)  # COPY verteilt auf die Saison-Partitionen
+        for table, columns in COPY_TABLES:
+            buffers[table].seek(0)
+            cols_sql = ", ".join(f'"{col}"' for col in columns)
+            cursor.copy_expert(f"COPY {table} ({cols_sql}) FROM STDIN", buffers[table])
+            buffers[table] = io.StringIO()
+
+    with pg_conn.cursor() as cursor:
+        for game_id, game_json in games:
+            extracted = importer.extract_data_from_game_json(game_json, game_id)
+            if not extracted:
+                continue
+            for league in extracted["leagues"]:
+                # Gleiche Abbildung wie batch_upsert_entities (LEAGUE_COLS)
+                if league[6] not in seen[importer.TABLE_LIGEN]:
+                    seen[importer.TABLE_LIGEN].add(league[6])
+                    write_row(importer.TABLE_LIGEN, importer.league_row(league))
+            for table, key in ((importer.TABLE_TEAMS, "teams"), (importer.TABLE_HALLEN, "halls"), (importer.TABLE_SPIELER, "players")):
+                for entity in extracted[key]:
+                    if entity[0] not in seen[table]:
+                        seen[table].add(entity[0])
+                        write_row(table, entity)
+            game_row = dict(extracted["game_initial_data"], **(extracted["game_result_data"] or {}))
+            seasons.add(game_row["Saison"])
+            write_row(importer.TABLE_SPIELE, tuple(game_row.get(col) for col in importer.GAME_COLS_INITIAL + importer.GAME_COLS_RESULTS))
+            for kader_entry in extracted["kader_stats"]:
+                write_row(importer.TABLE_KADER_STATS, tuple(kader_entry.get(col) for col in importer.KADER_STATS_COLS))
+            importer.encode_events(cursor, extracted["events"], event_codes)  # legt neue Codes sofort an, vor dem COPY
+            for event in extracted["events"]:
+                write_row(importer.TABLE_EREIGNISSE, tuple(event.get(col) for col in importer.EVENT_COLS))
+            if extracted["score_timeline"]:
+                write_row(importer.TABLE_SPIELVERLAEUFE, tuple(extracted["score_timeline"][col] for col in importer.SCORE_TIMELINE_COLS))
+            count += 1
+            if count % chunk_games == 0:
+                flush(cursor)
+                logger.info(f"{count} Spiele per COPY geschrieben ({time.perf_counter() - start:.1f}s).")
+        flush(cursor)
+        importer.refresh_league_summaries(cursor)
+        importer.rebuild_team_ratings(cursor)
+    pg_conn.commit()
+    _vacuum_analyze(pg_conn)
+    logger.info(f"{count} Spiele in {time.perf_counter() - start:.1f}s per COPY geladen.")
+    return count
+
+
+def write_json_files(games: Iterator[Tuple[str, Dict[str, Any]]], out_dir: str) -> int:
+    """Schreibt je Spiel eine Datei <URL-Spiel-ID>.json im combined-Format. Gibt die Anzahl Dateien zurück."""
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    for game_id, game_json in games:
+        with open(os.path.join(out_dir, f"{game_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump(game_json, f, ensure_ascii=False)
+        count += 1
+    return count
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(description="Synthetischer handball.net-Datensatz für Benchmarks")
+    for field_name, value in vars(defaults).items():
+        parser.add_argument(f"--{field_name.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--target", choices=["copy", "import", "json"], default="copy")
+    parser.add_argument("--json-dir", default="benchmark_games", help="Zielverzeichnis für --target json")
+    args = parser.parse_args()
+    config = DatasetConfig(**{name: getattr(args, name) for name in vars(defaults)})
+    logger.info(f"Erzeuge {config.total_games} Spiele: {config}")
+
+    if args.target == "json":
+        count = write_json_files(generate_games(config), args.json_dir)
+        logger.info(f"{count} JSON-Dateien nach {args.json_dir} geschrieben.")
+        return
+
+    engine = get_bench_engine()
+    pg_conn = psycopg2.connect(**psycopg2_dsn(engine))
+    try:
+        # Import-Logs je Batch würden die Ausgabe bei großen Datensätzen fluten
+        logging.getLogger(importer.__name__).setLevel(logging.WARNING)
+        reset_schema(pg_conn)
+        loader = load_via_copy if args.target == "copy" else load_via_import
+        count = loader(pg_conn, generate_games(config))
+        logger.info(f"{count} Spiele geladen.")
+    finally:
+        pg_conn.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Zeilen pro Sekunde: pd.read_sql_query (bisheriger Weg in execute_query) gegen den spaltenorientierten
+Abruf per COPY + pyarrow (utils/columnar.py, execute_query(..., columnar=True)).
+
+Gemessen werden große Ergebnisse auf dem aktuellen Datenbestand: alle Ereignisse einer Liga-Saison,
+ein Export aller Kaderzeilen, die Punkteverläufe aller Ligen und die Einträge für den Suchindex.
+Vorher z.B. einen größeren Datensatz laden:
+    python benchmarks/dataset.py --target copy --leagues-per-region 40
+
+Aufruf (gegen eine Benchmark-Datenbank, niemals gegen Produktion):
+    HANDBALL_BENCH_DSN=postgresql+psycopg2://... python benchmarks/fetch_benchmark.py
+"""
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+import sqlalchemy
+
+from common import get_bench_engine, load_sql_file, resolve_sample_params
+from utils.columnar import read_sql_columnar
+
+BENCH_QUERIES: Dict[str, str] = {
+    "ereignisse_liga_saison": """
+        SELECT e."Spiel_ID", e."Zeitstempel", e."Spiel_Minute", e."Typ", e."Score_Heim", e."Score_Gast",
+               e."Team_Seite", e."Nachricht", e."Referenz_Spieler_ID"
+        FROM "Ereignisse" e
+        WHERE e."Saison" = :season""",
+    "kader_export": """
+        SELECT sks.*, s."Vorname", s."Nachname", sp."Liga_ID", sp."Start_Zeit"
+        FROM "Spiel_Kader_Statistiken" sks
+        JOIN "Spieler" s ON s."Spieler_ID" = sks."Spieler_ID"
+        JOIN "Spiele" sp ON sp."Spiel_ID" = sks."Spiel_ID"
+    """,
+    "punkteverlauf_alle_ligen": load_sql_file("fetch_points_progression_for_league.sql")
+        .replace('sp."Liga_ID" = :league_id AND sp."Saison" = :season', "TRUE"),
+    "suchindex_eintraege": load_sql_file("fetch_search_index_entries.sql"),
+}
+
+
+def _median_seconds(func: Callable[[], pd.DataFrame], runs: int) -> Tuple[float, pd.DataFrame]:
+    result = func()  # Aufwärmen (Spaltentypen, Plan-Cache, Buffer)
+    timings: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark read_sql_query vs. COPY + pyarrow")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    with engine.connect() as conn:
+        params: Dict[str, Any] = resolve_sample_params(conn)
+
+    print(f"\n{'Abfrage':<26} {'Zeilen':>9} {'read_sql [Z/s]':>15} {'numpy [Z/s]':>13} {'pyarrow [Z/s]':>14} {'Faktor':>7}")
+    raw_connection = engine.raw_connection()
+    try:
+        for name, sql in BENCH_QUERIES.items():
+            query_params = {k: v for k, v in params.items() if f":{k}" in sql}
+
+            def via_read_sql() -> pd.DataFrame:
+                with engine.connect() as conn:
+                    return pd.read_sql_query(sqlalchemy.text(sql), conn, params=query_params)
+
+            def via_columnar(dtype_backend: str) -> Callable[[], pd.DataFrame]:
+                def run() -> pd.DataFrame:
+                    df = read_sql_columnar(raw_connection.driver_connection, sql, query_params, dtype_backend)
+                    raw_connection.commit()
+                    return df
+                return run
+
+            s_rows, df_rows = _median_seconds(via_read_sql, args.runs)
+            s_numpy, df_numpy = _median_seconds(via_columnar("numpy"), args.runs)
+            s_arrow, _ = _median_seconds(via_columnar("pyarrow"), args.runs)
+            assert len(df_rows) == len(df_numpy) and list(df_rows.columns) == list(df_numpy.columns), name
+            rows = len(df_rows)
+            print(f"{name:<26} {rows:>9} {rows / s_rows:>15,.0f} {rows / s_numpy:>13,.0f} {rows / s_arrow:>14,.0f} "
+                  f"{s_rows / s_numpy:>6.1f}x")
+    finally:
+        raw_connection.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
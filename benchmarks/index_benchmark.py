@@ -0,0 +1,76 @@
+"""
+Vergleicht alle Abfragen in sql/ mit und ohne die Indizes einer Migration.
+
+Ablauf: Migration zurücknehmen -> messen -> Migration anwenden -> messen. Ausgegeben werden
+Median-Ausführungszeit (EXPLAIN ANALYZE) und die im Plan verwendeten Indizes je Abfrage.
+
+Aufruf (gegen eine Benchmark-Datenbank, niemals gegen Produktion):
+    HANDBALL_BENCH_DSN=postgresql+psycopg2://... python benchmarks/index_benchmark.py [VERSION]
+"""
+import glob
+import os
+import sys
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import psycopg2
+import sqlalchemy
+
+from common import explain_analyze, get_bench_engine, load_sql_file, psycopg2_dsn, resolve_sample_params, SQL_DIR
+
+import createDB_postgresql as schema
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIGRATION_VERSION: int = 2
+RUNS_PER_QUERY: int = 7
+
+
+def measure_all(engine, params: Dict[str, Any]) -> Dict[str, Optional[Tuple[float, list]]]:
+    """Misst alle Abfragen; fehlerhafte Abfragen werden mit None vermerkt statt den Lauf abzubrechen."""
+    results: Dict[str, Optional[Tuple[float, list]]] = {}
+    with engine.connect() as conn:
+        for path in sorted(glob.glob(os.path.join(SQL_DIR, '*.sql'))):
+            filename = os.path.basename(path)
+            try:
+                ms, indexes, _ = explain_analyze(conn, load_sql_file(filename), params, RUNS_PER_QUERY)
+                results[filename] = (ms, indexes)
+            except sqlalchemy.exc.DBAPIError as e:
+                conn.rollback()
+                logger.warning(f"{filename} fehlgeschlagen: {e.orig}")
+                results[filename] = None
+    return results
+
+
+def main() -> None:
+    version = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MIGRATION_VERSION
+    engine = get_bench_engine()
+    pg_conn = psycopg2.connect(**psycopg2_dsn(engine))
+    try:
+        schema.run_migrations(pg_conn, version)
+        with engine.connect() as conn:
+            params = resolve_sample_params(conn)
+        logger.info(f"Parameter: {params}")
+
+        schema.rollback_migrations(pg_conn, version - 1)
+        without = measure_all(engine, params)
+        schema.run_migrations(pg_conn, version)
+        with_index = measure_all(engine, params)
+    finally:
+        pg_conn.close()
+        engine.dispose()
+
+    print(f"\n{'Abfrage':<45} {'ohne [ms]':>10} {'mit [ms]':>10} {'Faktor':>7}  Indizes (mit Migration {version:04d})")
+    for filename, measured_without in without.items():
+        measured_with = with_index[filename]
+        if measured_without is None or measured_with is None:
+            print(f"{filename:<45} {'FEHLER':>10}")
+            continue
+        ms_without, ms_with, indexes = measured_without[0], measured_with[0], measured_with[1]
+        factor = ms_without / ms_with if ms_with > 0 else float('inf')
+        print(f"{filename:<45} {ms_without:>10.3f} {ms_with:>10.3f} {factor:>7.1f}  {', '.join(indexes)}")
+
+
+if __name__ == "__main__":
+    main()
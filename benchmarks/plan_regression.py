@@ -0,0 +1,175 @@
+"""
+Regressionstest für die Abfragepläne aller sql/*.sql Dateien.
+
+Jede Datei wird mit repräsentativen Parametern unter EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+ausgeführt. Ausführungszeit, gelesene Buffer und die Planform (Seq Scan vs. Index-Zugriff je Tabelle)
+werden mit einer Baseline-Datei verglichen. Der Lauf schlägt fehl (Exit-Code 1), wenn eine Abfrage
+um mehr als den Schwellwert langsamer wird, deutlich mehr Buffer liest oder eine Tabelle, die bisher
+per Index gelesen wurde, nun sequenziell gescannt wird.
+
+Aufruf (gegen eine eigene Benchmark-Datenbank, niemals gegen Produktion):
+    export HANDBALL_BENCH_DSN=postgresql+psycopg2://...
+    python benchmarks/plan_regression.py --load              # Datensatz neu laden, dann prüfen
+    python benchmarks/plan_regression.py --update-baseline   # aktuelle Messung als Baseline speichern
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import logging
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+import sqlalchemy
+
+from common import explain_analyze, get_bench_engine, load_sql_file, psycopg2_dsn, resolve_sample_params, SQL_DIR
+import dataset
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plan_baseline.json')
+DEFAULT_TIME_THRESHOLD: float = 1.5     # Faktor gegenüber der Baseline
+DEFAULT_MIN_DELTA_MS: float = 2.0       # Kleinere absolute Abweichungen gelten als Messrauschen
+DEFAULT_BUFFER_THRESHOLD: float = 1.5
+RUNS_PER_QUERY: int = 7
+SEQ_SCAN_NODES = {"Seq Scan", "Parallel Seq Scan"}
+# Bei Tabellen mit wenigen Seiten wechselt der Planer je nach Statistik zwischen Seq Scan und Index,
+# ohne dass das messbar wäre. Deren Zugriffsart wird daher nicht verglichen.
+MIN_RELATION_PAGES: int = 10
+
+
+def _plan_shape(node: Dict[str, Any], depth: int = 0, lines: Optional[List[str]] = None) -> List[str]:
+    """
+    Planbaum als eingerückte Zeilen 'Knotentyp [Tabelle] (Index)', ohne Kosten und Zeiten.
+    Partitionsausschluss wird mitgeschrieben: beim Planen entfernte Partitionen als '{N ausgeschlossen}'
+    am Append, zur Laufzeit ausgeschlossene als '<nicht ausgeführt>'.
+    """
+    lines = [] if lines is None else lines
+    label = node["Node Type"]
+    if "Relation Name" in node: label += f" [{node['Relation Name']}]"
+    if "Index Name" in node: label += f" ({node['Index Name']})"
+    if node.get("Subplans Removed"): label += f" {{{node['Subplans Removed']} ausgeschlossen}}"
+    if node.get("Actual Loops") == 0: label += " <nicht ausgeführt>"
+    lines.append("  " * depth + label)
+    for child in node.get("Plans", []):
+        _plan_shape(child, depth + 1, lines)
+    return lines
+
+
+def _access_paths(node: Dict[str, Any], relation_pages: Dict[str, int], paths: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Zugriffsart je Tabelle: 'seq' oder 'index' (Index hat Vorrang, falls eine Tabelle mehrfach gelesen wird).
+    Tabellen unter MIN_RELATION_PAGES und nicht ausgeführte (ausgeschlossene) Partitionen werden ausgelassen.
+    """
+    paths = {} if paths is None else paths
+    relation = node.get("Relation Name")
+    if relation and relation_pages.get(relation, 0) >= MIN_RELATION_PAGES and node.get("Actual Loops") != 0:
+        kind = "seq" if node["Node Type"] in SEQ_SCAN_NODES else "index"
+        if paths.get(relation) != "index":
+            paths[relation] = kind
+    for child in node.get("Plans", []):
+        _access_paths(child, relation_pages, paths)
+    return paths
+
+
+def measure_queries(engine: sqlalchemy.engine.Engine) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    with engine.connect() as conn:
+        params = resolve_sample_params(conn)
+        relation_pages = dict(conn.execute(sqlalchemy.text(
+            "SELECT relname, relpages FROM pg_class WHERE relkind IN ('r', 'p') AND relnamespace = 'public'::regnamespace"
+        )).fetchall())
+        for path in sorted(glob.glob(os.path.join(SQL_DIR, '*.sql'))):
+            filename = os.path.basename(path)
+            try:
+                ms, _, plan = explain_analyze(conn, load_sql_file(filename), params, RUNS_PER_QUERY)
+            except sqlalchemy.exc.DBAPIError as e:
+                conn.rollback()
+                results[filename] = {"error": str(e.orig).splitlines()[0]}
+                continue
+            root = plan["Plan"]
+            results[filename] = {
+                "execution_ms": round(ms, 3),
+                "shared_buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+                "access_paths": _access_paths(root, relation_pages),
+                "plan": _plan_shape(root),
+            }
+    return results
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]], time_threshold: float,
+            min_delta_ms: float, buffer_threshold: float) -> List[str]:
+    """Gibt die Liste der Regressionen zurück (leer = alles in Ordnung)."""
+    regressions: List[str] = []
+    for filename, now in current.items():
+        before = baseline.get(filename)
+        if before is None:
+            logger.info(f"{filename}: neu, keine Baseline vorhanden.")
+            continue
+        if "error" in now:
+            if "error" not in before:
+                regressions.append(f"{filename}: schlägt fehl ({now['error']})")
+            else:
+                logger.warning(f"{filename}: schlägt weiterhin fehl ({now['error']})")
+            continue
+        if "error" in before:
+            logger.info(f"{filename}: läuft wieder fehlerfrei.")
+            continue
+        ms_before, ms_now = before["execution_ms"], now["execution_ms"]
+        if ms_now > ms_before * time_threshold and ms_now - ms_before > min_delta_ms:
+            regressions.append(f"{filename}: Ausführungszeit {ms_before:.3f} -> {ms_now:.3f} ms")
+        if now["shared_buffers"] > max(before["shared_buffers"], 1) * buffer_threshold:
+            regressions.append(f"{filename}: Buffer {before['shared_buffers']} -> {now['shared_buffers']}")
+        for relation, kind in now["access_paths"].items():
+            if kind == "seq" and before["access_paths"].get(relation) == "index":
+                regressions.append(f"{filename}: {relation} wird jetzt sequenziell statt per Index gelesen")
+    for filename in baseline.keys() - current.keys():
+        logger.info(f"{filename}: in der Baseline, aber nicht mehr in sql/ vorhanden.")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN-basierter Regressionstest für sql/*.sql")
+    parser.add_argument("--load", action="store_true", help="Schema zurücksetzen und reproduzierbaren Datensatz (benchmarks/dataset.py, Standardgröße) laden")
+    parser.add_argument("--seed", type=int, default=dataset.DatasetConfig.seed)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Aktuelle Messung als neue Baseline speichern")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    parser.add_argument("--buffer-threshold", type=float, default=DEFAULT_BUFFER_THRESHOLD)
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    try:
+        if args.load:
+            pg_conn = psycopg2.connect(**psycopg2_dsn(engine))
+            try:
+                dataset.reset_schema(pg_conn)
+                count = dataset.load_via_copy(pg_conn, dataset.generate_games(dataset.DatasetConfig(seed=args.seed)))
+                logger.info(f"Datensatz geladen: {count} Spiele (Seed {args.seed}).")
+            finally:
+                pg_conn.close()
+        current = measure_queries(engine)
+    finally:
+        engine.dispose()
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write("\n")
+        logger.info(f"Baseline mit {len(current)} Abfragen nach {args.baseline} geschrieben.")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, current, args.time_threshold, args.min_delta_ms, args.buffer_threshold)
+    for regression in regressions:
+        logger.error(f"REGRESSION {regression}")
+    logger.info(f"{len(current)} Abfragen geprüft, {len(regressions)} Regressionen.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Latenz der Spielersuche bei großer Spielerzahl: bisherige LIKE-Suche gegen die indizierte Suche
+(sql/fetch_players_by_name_search.sql, Migration 0003).
+
+Legt bei Bedarf zusätzliche synthetische Spieler an, bis --players erreicht ist (IDs mit Präfix
+"bench.suche."), und misst für eine Reihe typischer Eingaben den Median aus --runs Läufen.
+
+Aufruf (gegen eine Benchmark-Datenbank, niemals gegen Produktion):
+    HANDBALL_BENCH_DSN=postgresql+psycopg2://... python benchmarks/player_search_benchmark.py --players 1000000
+"""
+import argparse
+import io
+import logging
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+import psycopg2
+import sqlalchemy
+
+from common import get_bench_engine, load_sql_file, psycopg2_dsn
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+PLAYER_ID_PREFIX: str = "bench.suche."
+SYLLABLES: List[str] = ["ma", "mü", "ler", "schm", "idt", "we", "iß", "ö", "ztürk", "mei", "er", "ko", "ch", "ri", "cht",
+                        "wo", "lf", "bra", "un", "kr", "üg", "jo", "nas", "lu", "kas", "so", "phie", "el", "ias", "ha", "nn",
+                        "fi", "nn", "le", "on", "ie", "sa", "ra", "pa", "ul", "ti", "mo", "th", "ée", "ço", "ña"]
+SEARCH_TERMS: List[str] = ["müller", "Mueller", "max mül", "jonas", "schmidt", "ler", "Ko", "sophie kr", "zzzz", "ñaño"]
+
+# Bisherige Abfrage aus db_queries_refactored.fetch_players_by_name_search, ein LIKE-Paar je Wort
+def legacy_query(search_term: str) -> Tuple[str, Dict[str, Any]]:
+    conditions = []
+    params: Dict[str, Any] = {"limit": 50}
+    for i, word in enumerate(search_term.lower().split()):
+        conditions.append(f'(LOWER(s."Vorname") LIKE :vor_{i} OR LOWER(s."Nachname") LIKE :nach_{i})')
+        params[f"vor_{i}"] = params[f"nach_{i}"] = f"%{word}%"
+    sql = f"""SELECT DISTINCT s."Spieler_ID", s."Vorname", s."Nachname" FROM "Spieler" s
+              WHERE s."Ist_Offizieller" = 0 AND ({' AND '.join(conditions)})
+              ORDER BY s."Nachname", s."Vorname" LIMIT :limit"""
+    return sql, params
+
+
+def _name(rnd: random.Random) -> str:
+    return "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))).capitalize()
+
+
+def ensure_players(engine: sqlalchemy.engine.Engine, target: int, seed: int) -> None:
+    with engine.connect() as conn:
+        existing = conn.execute(sqlalchemy.text('SELECT COUNT(*) FROM "Spieler"')).scalar()
+    missing = target - existing
+    if missing <= 0:
+        return
+    logger.info(f"Lege {missing} synthetische Spieler an ({existing} vorhanden)...")
+    rnd = random.Random(seed)
+    buffer = io.StringIO()
+    for i in range(missing):
+        buffer.write(f"{PLAYER_ID_PREFIX}{seed}.{i}\t{_name(rnd)}\t{_name(rnd)}\t0\t{1 if rnd.random() < 0.1 else 0}\n")
+    buffer.seek(0)
+    pg_conn = psycopg2.connect(**psycopg2_dsn(engine))
+    try:
+        with pg_conn.cursor() as cursor:
+            cursor.copy_expert('COPY "Spieler" ("Spieler_ID", "Vorname", "Nachname", "Ist_NN", "Ist_Offizieller") FROM STDIN', buffer)
+        pg_conn.commit()
+        pg_conn.autocommit = True
+        with pg_conn.cursor() as cursor:
+            cursor.execute('VACUUM ANALYZE "Spieler"')
+    finally:
+        pg_conn.close()
+
+
+def time_query(conn: sqlalchemy.engine.Connection, sql: str, params: Dict[str, Any], runs: int) -> Tuple[float, List[str]]:
+    statement = sqlalchemy.text(sql)
+    rows: List[str] = []
+    timings: List[float] = []
+    for i in range(runs + 1):
+        start = time.perf_counter()
+        rows = [row[0] for row in conn.execute(statement, params).fetchall()]
+        if i > 0:
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der Spielersuche")
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    ensure_players(engine, args.players, args.seed)
+    search_sql = load_sql_file("fetch_players_by_name_search.sql")
+    print(f"\n{'Suchbegriff':<14} {'LIKE [ms]':>10} {'Index [ms]':>11} {'Treffer':>8}  stabil")
+    with engine.connect() as conn:
+        total = conn.execute(sqlalchemy.text('SELECT COUNT(*) FROM "Spieler"')).scalar()
+        for term in SEARCH_TERMS:
+            ms_legacy, _ = time_query(conn, *legacy_query(term), args.runs)
+            ms_new, rows = time_query(conn, search_sql, {"search_term": term, "limit": 50}, args.runs)
+            _, rows_again = time_query(conn, search_sql, {"search_term": term, "limit": 50}, 1)
+            print(f"{term:<14} {ms_legacy:>10.2f} {ms_new:>11.2f} {len(rows):>8}  {'ja' if rows == rows_again else 'NEIN'}")
+    engine.dispose()
+    print(f"({total} Spieler, Median aus {args.runs} Läufen)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Laufzeit der Team-Ratings (utils/team_ratings.py, analyse_game_json.update_team_ratings).
+
+Misst die vollständige Neuberechnung, aufgeteilt in Lesen der Spiele, Verrechnen und Schreiben (COPY plus
+"Team_Ratings"), und zwei inkrementelle Fälle des Imports:
+    Saisonende  - die letzten --new-games Spiele kommen neu hinzu (Normalfall beim Import)
+    Korrektur   - das Ergebnis eines älteren Spiels (Position --correction-at) wird nachträglich geändert; liegt
+                  es vor FULL_REBUILD_SHARE des Verlaufs, rechnet update_team_ratings alles neu
+Nach jedem Fall wird geprüft, dass der inkrementelle Stand exakt der Neuberechnung entspricht. Die Korrektur
+wird am Ende zurückgerollt.
+
+Aufruf (gegen eine Benchmark-Datenbank, niemals gegen Produktion):
+    HANDBALL_BENCH_DSN=postgresql+psycopg2://... python benchmarks/rating_benchmark.py --load --regions 10 --leagues-per-region 50
+"""
+import argparse
+import logging
+import time
+from typing import List
+
+import psycopg2
+
+import dataset
+from common import get_bench_engine, psycopg2_dsn
+import analyse_game_json as importer
+from utils.team_ratings import RatingGame, RatingState, rate_games
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SQL_HISTORY_SNAPSHOT: str = f"""
+SELECT "Spiel_ID", "Team_ID", "Spiel_Nr", "Rating_Vorher", "Rating_Nachher"
+FROM {importer.TABLE_TEAM_RATING_VERLAUF} ORDER BY "Spiel_ID", "Team_ID"
+"""
+
+
+def history_snapshot(cursor: psycopg2.extensions.cursor) -> List[tuple]:
+    cursor.execute(SQL_HISTORY_SNAPSHOT)
+    return cursor.fetchall()
+
+
+def max_difference(left: List[tuple], right: List[tuple]) -> float:
+    """Größte Abweichung eines Ratings; unendlich, wenn sich Spiele, Teams oder Spielnummern unterscheiden."""
+    if len(left) != len(right) or any(a[:3] != b[:3] for a, b in zip(left, right)):
+        return float("inf")
+    return max((abs(x - y) for a, b in zip(left, right) for x, y in zip(a[3:], b[3:])), default=0.0)
+
+
+def main() -> None:
+    defaults = dataset.DatasetConfig()
+    parser = argparse.ArgumentParser(description="Benchmark der Team-Ratings")
+    parser.add_argument("--load", action="store_true", help="Schema zurücksetzen und Datensatz (benchmarks/dataset.py) laden")
+    parser.add_argument("--regions", type=int, default=defaults.regions)
+    parser.add_argument("--seasons", type=int, default=defaults.seasons)
+    parser.add_argument("--leagues-per-region", type=int, default=defaults.leagues_per_region)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--new-games", type=int, default=200, help="Anzahl neuer Spiele im Fall Saisonende")
+    parser.add_argument("--correction-at", type=float, default=0.9, help="Position des korrigierten Spiels (0 = ältestes, 1 = neuestes)")
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    pg_conn = psycopg2.connect(**psycopg2_dsn(engine))
+    try:
+        logging.getLogger(importer.__name__).setLevel(logging.WARNING)
+        if args.load:
+            config = dataset.DatasetConfig(regions=args.regions, seasons=args.seasons,
+                                           leagues_per_region=args.leagues_per_region, seed=args.seed)
+            dataset.reset_schema(pg_conn)
+            count = dataset.load_via_copy(pg_conn, dataset.generate_games(config))
+            logger.info(f"Datensatz geladen: {count} Spiele.")
+
+        with pg_conn.cursor() as cursor:
+            # Einzelschritte der Neuberechnung (Lesen, Verrechnen), Schreiben ergibt sich aus der Gesamtzeit
+            start = time.perf_counter()
+            cursor.execute(importer.SQL_RATING_GAMES + ' ORDER BY "Start_Zeit", "Spiel_ID"')
+            games = [RatingGame._make(row) for row in cursor.fetchall()]
+            fetch_s = time.perf_counter() - start
+            start = time.perf_counter()
+            rate_games(games, RatingState())
+            compute_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            teams = importer.rebuild_team_ratings(cursor)
+            pg_conn.commit()
+            rebuild_s = time.perf_counter() - start
+            print(f"\nNeuberechnung: {len(games)} Spiele, {len(teams)} Teams in {rebuild_s:.2f}s "
+                  f"({len(games) / rebuild_s:,.0f} Spiele/s)")
+            print(f"  Lesen {fetch_s:.2f}s, Verrechnen {compute_s:.2f}s, Schreiben {max(rebuild_s - fetch_s - compute_s, 0):.2f}s")
+            rebuilt = history_snapshot(cursor)
+
+            # Saisonende: die letzten Spiele sind neu gewertet, ihr Verlauf fehlt noch
+            new_ids = [g.spiel_id for g in games[-args.new_games:]]
+            cursor.execute(f'DELETE FROM {importer.TABLE_TEAM_RATING_VERLAUF} WHERE "Spiel_ID" = ANY(%(ids)s)', {"ids": new_ids})
+            start = time.perf_counter()
+            teams = importer.update_team_ratings(cursor, new_ids)
+            update_s = time.perf_counter() - start
+            diff = max_difference(history_snapshot(cursor), rebuilt)
+            pg_conn.commit()
+            print(f"Saisonende: {len(new_ids)} neue Spiele, {len(teams)} Teams in {update_s * 1000:.0f} ms, "
+                  f"Abweichung zur Neuberechnung {diff:g}")
+
+            # Korrektur: ein älteres Ergebnis ändert sich, nachgerechnet wird ab diesem Spiel
+            position = min(int(args.correction_at * len(games)), len(games) - 1)
+            corrected = games[position]
+            cursor.execute(f'UPDATE {importer.TABLE_SPIELE} SET "Tore_Heim" = "Tore_Heim" + 3 WHERE "Spiel_ID" = %s',
+                           (corrected.spiel_id,))
+            start = time.perf_counter()
+            teams = importer.update_team_ratings(cursor, [corrected.spiel_id])
+            update_s = time.perf_counter() - start
+            incremental = history_snapshot(cursor)
+            importer.rebuild_team_ratings(cursor)
+            diff = max_difference(incremental, history_snapshot(cursor))
+            pg_conn.rollback()
+            print(f"Korrektur: ab Spiel {position + 1} von {len(games)}, {len(teams)} Teams in {update_s:.2f}s, "
+                  f"Abweichung zur Neuberechnung {diff:g}")
+    finally:
+        pg_conn.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
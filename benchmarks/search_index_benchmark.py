@@ -0,0 +1,87 @@
+"""
+Aufbauzeit, Speicher und Abfragelatenz des In-Memory-Suchindex (utils/search_index.py).
+
+Füllt die Benchmark-Datenbank bei Bedarf auf --players Spieler auf (wie player_search_benchmark.py),
+baut den Index aus sql/fetch_search_index_entries.sql auf und misst die Latenz typischer Eingaben.
+Zusätzlich wird geprüft, dass normalize_search_text für alle Namen dasselbe liefert wie handball_suchtext
+in der Datenbank, und wie lange eine inkrementelle Aktualisierung mit --refresh neuen Spielern dauert.
+
+Aufruf (gegen eine Benchmark-Datenbank, niemals gegen Produktion):
+    HANDBALL_BENCH_DSN=postgresql+psycopg2://... python benchmarks/search_index_benchmark.py --players 1000000
+"""
+import argparse
+import logging
+import resource
+import statistics
+import time
+from typing import List
+
+import sqlalchemy
+
+from common import get_bench_engine, load_sql_file
+from player_search_benchmark import SEARCH_TERMS, ensure_players
+from utils.search_index import SearchEntry, SearchIndex, normalize_search_text
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+OMNIBOX_TERMS: List[str] = SEARCH_TERMS + ["verein 1", "oberliga", "2023", "tsv", "sg ha"]
+
+
+def load_entries(conn: sqlalchemy.engine.Connection) -> List[SearchEntry]:
+    rows = conn.execute(sqlalchemy.text(load_sql_file("fetch_search_index_entries.sql"))).fetchall()
+    return [SearchEntry(typ, entity_id, name or "", detail) for typ, entity_id, name, detail in rows]
+
+
+def check_normalization(conn: sqlalchemy.engine.Connection, entries: List[SearchEntry]) -> int:
+    names = [e.name for e in entries]
+    db_normalized = conn.execute(sqlalchemy.text("SELECT handball_suchtext(n) FROM unnest(CAST(:names AS TEXT[])) AS n"),
+                                 {"names": names}).scalars().all()
+    return sum(1 for name, expected in zip(names, db_normalized) if normalize_search_text(name) != expected)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des In-Memory-Suchindex")
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--refresh", type=int, default=1000, help="Anzahl neuer Spieler für die inkrementelle Aktualisierung")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    ensure_players(engine, args.players, args.seed)
+    with engine.connect() as conn:
+        entries = load_entries(conn)
+        mismatches = check_normalization(conn, entries)
+    engine.dispose()
+
+    # Speicher grob über den Anstieg des maximalen RSS (Linux: KiB); enthält auch temporäre Arrays des Aufbaus
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    index = SearchIndex()
+    index.build(entries)
+    build_s = time.perf_counter() - start
+    index_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+    print(f"\n{len(entries)} Einträge, Aufbau {build_s:.1f}s, max. RSS +{index_mb:.0f} MB, "
+          f"{mismatches} Abweichungen zu handball_suchtext\n")
+    print(f"{'Suchbegriff':<14} {'Median [µs]':>12} {'p99 [µs]':>10} {'Treffer':>8}  erster Treffer")
+    for term in OMNIBOX_TERMS:
+        timings = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            hits = index.search(term)
+            timings.append((time.perf_counter() - t0) * 1e6)
+        timings.sort()
+        first = f"{hits[0].typ}: {hits[0].name}" if hits else "-"
+        print(f"{term:<14} {statistics.median(timings):>12.0f} {timings[int(len(timings) * 0.99) - 1]:>10.0f} {len(hits):>8}  {first}")
+
+    new_entries = [SearchEntry("spieler", f"bench.neu.{i}", f"Neu Spieler{i}") for i in range(args.refresh)]
+    start = time.perf_counter()
+    changed = index.refresh(entries + new_entries)
+    print(f"\nInkrementelle Aktualisierung (voller Abgleich, {changed} neue Einträge): {time.perf_counter() - start:.2f}s, "
+          f"Treffer für 'neu spieler1': {len(index.search('neu spieler1'))}")
+
+
+if __name__ == "__main__":
+    main()
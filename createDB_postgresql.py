@@ -1,7 +1,10 @@
 import psycopg2
 import os
+import re
+import sys
+import hashlib
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv #
 
 # --- Logging Configuration ---
@@ -35,73 +38,175 @@ DB_HOST = os.environ.get("PG_DB_HOST") #
 DB_PORT = os.environ.get("PG_DB_PORT", "5432") #
 
 
-SQL_SCHEMA_POSTGRESQL: str = """
--- SQL-Anweisungen zur Erstellung der HandballAnalyseDB für PostgreSQL
--- Alle Tabellen- und Spaltennamen in Anführungszeichen, um Groß-/Kleinschreibung beizubehalten.
+# --- Schema-Migrationen ---
+# Das Schema wird über versionierte Migrationen in sql/migrations gepflegt:
+#   NNNN_name.up.sql   -> wendet die Änderung an (idempotent, IF [NOT] EXISTS)
+#   NNNN_name.down.sql -> nimmt sie wieder zurück
+# Angewendete Versionen stehen in "Schema_Migrationen". Jede Migration läuft in einer eigenen Transaktion.
+MIGRATIONS_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sql', 'migrations')
+TABLE_SCHEMA_MIGRATIONEN: str = '"Schema_Migrationen"'
+MIGRATION_LOCK_ID: int = 4242001  # pg_advisory_xact_lock, verhindert parallele Migrationsläufe
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_([a-z0-9_]+)\.(up|down)\.sql$')
 
-CREATE TABLE IF NOT EXISTS "Ligen" (
-    "Liga_ID" TEXT PRIMARY KEY, "Name" TEXT NOT NULL, "Akronym" TEXT,
-    "Saison" TEXT NOT NULL, "Altersgruppe" TEXT, "Typ" TEXT
+SQL_CREATE_MIGRATIONS_TABLE: str = f"""
+CREATE TABLE IF NOT EXISTS {TABLE_SCHEMA_MIGRATIONEN} (
+    "Version" INTEGER PRIMARY KEY, "Name" TEXT NOT NULL,
+    "Checksumme" TEXT NOT NULL, "Angewendet_Am" TIMESTAMPTZ NOT NULL DEFAULT now()
 );
-CREATE TABLE IF NOT EXISTS "Vereine" (
-    "Verein_ID" SERIAL PRIMARY KEY,
-    "Name" TEXT NOT NULL UNIQUE,
-    "Manuell_Korrigiert" BOOLEAN DEFAULT FALSE
-);
-CREATE TABLE IF NOT EXISTS "Teams" (
-    "Team_ID" TEXT PRIMARY KEY, 
-    "Name" TEXT NOT NULL, 
-    "Akronym" TEXT, 
-    "Logo_URL" TEXT,
-    "Verein_ID" INTEGER REFERENCES "Vereine"("Verein_ID") ON DELETE SET NULL -- NEUE SPALTE
-);
-CREATE TABLE IF NOT EXISTS "Spieler" (
-    "Spieler_ID" TEXT PRIMARY KEY, "Vorname" TEXT, "Nachname" TEXT,
-    "Ist_NN" INTEGER NOT NULL DEFAULT 0, "Ist_Offizieller" INTEGER NOT NULL DEFAULT 0,
-    "Position" TEXT, "Spitzname" TEXT, "Bild_URL" TEXT
-);
-CREATE TABLE IF NOT EXISTS "Hallen" (
-    "Hallen_ID" TEXT PRIMARY KEY, "Name" TEXT NOT NULL, "Stadt" TEXT, "Hallen_Nummer" TEXT
-);
-CREATE TABLE IF NOT EXISTS "Spiele" (
-    "Spiel_ID" TEXT PRIMARY KEY,
-    "Liga_ID" TEXT NOT NULL REFERENCES "Ligen"("Liga_ID") ON DELETE CASCADE,
-    "Phase_ID" TEXT, "Hallen_ID" TEXT REFERENCES "Hallen"("Hallen_ID") ON DELETE SET NULL,
-    "Spiel_Nummer" TEXT, "Start_Zeit" BIGINT NOT NULL, 
-    "Heim_Team_ID" TEXT NOT NULL REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
-    "Gast_Team_ID" TEXT NOT NULL REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
-    "Tore_Heim" INTEGER, "Tore_Gast" INTEGER, "Tore_Heim_HZ" INTEGER, "Tore_Gast_HZ" INTEGER,
-    "Status" TEXT, "PDF_URL" TEXT, "SchiedsrichterInfo" TEXT,
-    "Punkte_Heim_Offiziell" INTEGER, "Punkte_Gast_Offiziell" INTEGER
-);
-CREATE TABLE IF NOT EXISTS "Spiel_Kader_Statistiken" (
-    "Kader_Eintrag_ID" SERIAL PRIMARY KEY,
-    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
-    "Spieler_ID" TEXT NOT NULL REFERENCES "Spieler"("Spieler_ID") ON DELETE CASCADE,
-    "Team_ID" TEXT NOT NULL REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
-    "Rueckennummer" INTEGER, "Tore_Gesamt" INTEGER NOT NULL DEFAULT 0,
-    "Tore_7m" INTEGER NOT NULL DEFAULT 0, "Fehlwurf_7m" INTEGER NOT NULL DEFAULT 0,
-    "Gelbe_Karten" INTEGER NOT NULL DEFAULT 0, "Rote_Karten" INTEGER NOT NULL DEFAULT 0,
-    "Blaue_Karten" INTEGER NOT NULL DEFAULT 0, "Zwei_Minuten_Strafen" INTEGER NOT NULL DEFAULT 0,
-    UNIQUE ("Spiel_ID", "Spieler_ID")
-);
-CREATE TABLE IF NOT EXISTS "Ereignisse" (
-    "Ereignis_Auto_ID" SERIAL PRIMARY KEY, "H4A_Ereignis_ID" INTEGER NOT NULL,
-    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
-    "Zeitstempel" BIGINT NOT NULL, "Spiel_Minute" TEXT NOT NULL, "Typ" TEXT NOT NULL,
-    "Score_Heim" INTEGER, "Score_Gast" INTEGER, "Team_Seite" TEXT, "Nachricht" TEXT,
-    "Referenz_Spieler_ID" TEXT REFERENCES "Spieler"("Spieler_ID") ON DELETE SET NULL,
-    UNIQUE("Spiel_ID", "H4A_Ereignis_ID")
-);
-CREATE INDEX IF NOT EXISTS idx_spiele_liga ON "Spiele" ("Liga_ID");
-CREATE INDEX IF NOT EXISTS idx_spiele_datum ON "Spiele" ("Start_Zeit");
-CREATE INDEX IF NOT EXISTS idx_kader_spieler ON "Spiel_Kader_Statistiken" ("Spieler_ID");
-CREATE INDEX IF NOT EXISTS idx_kader_spiel ON "Spiel_Kader_Statistiken" ("Spiel_ID");
-CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel ON "Ereignisse" ("Spiel_ID");
-CREATE INDEX IF NOT EXISTS idx_ereignisse_typ ON "Ereignisse" ("Typ");
-CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler ON "Ereignisse" ("Referenz_Spieler_ID");
 """
 
+def lade_migrationen(migrations_dir: str = MIGRATIONS_DIR) -> List[Dict[str, Any]]:
+    """Liest alle Migrationen aus dem Verzeichnis, sortiert nach Version."""
+    migrations: Dict[int, Dict[str, Any]] = {}
+    for filename in sorted(os.listdir(migrations_dir)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        version, name, direction = int(match.group(1)), match.group(2), match.group(3)
+        with open(os.path.join(migrations_dir, filename), 'r', encoding='utf-8') as f:
+            sql = f.read()
+        migration = migrations.setdefault(version, {"version": version, "name": name, "up": None, "down": None})
+        if migration["name"] != name:
+            raise ValueError(f"Migration {version:04d} hat widersprüchliche Namen: '{migration['name']}' und '{name}'.")
+        migration[direction] = sql
+    for migration in migrations.values():
+        if migration["up"] is None or migration["down"] is None:
+            raise ValueError(f"Migration {migration['version']:04d}_{migration['name']} benötigt eine .up.sql und eine .down.sql Datei.")
+        migration["checksum"] = hashlib.md5(migration["up"].encode('utf-8')).hexdigest()
+    return [migrations[v] for v in sorted(migrations)]
+
+def get_applied_migrations(cursor: psycopg2.extensions.cursor) -> Dict[int, str]:
+    """Gibt {Version: Checksumme} der bereits angewendeten Migrationen zurück."""
+    cursor.execute(SQL_CREATE_MIGRATIONS_TABLE)
+    cursor.execute(f'SELECT "Version", "Checksumme" FROM {TABLE_SCHEMA_MIGRATIONEN}')
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+def _invalidate_result_cache(cursor: psycopg2.extensions.cursor) -> None:
+    """Migrationen ändern Schema und Bestand (z.B. 0012 "Ligen"."Geschlecht"): alle gecachten Ergebnisse ungültig."""
+    from utils.query_cache import SCOPE_ALL, bump_cache_versions  # erst hier, zieht db_queries_refactored und streamlit nach
+    cursor.execute("SELECT to_regclass('cache_versionen_aenderung_seq') IS NOT NULL")
+    if cursor.fetchone()[0]:
+        bump_cache_versions(cursor, [SCOPE_ALL])
+
+def run_migrations(conn: psycopg2.extensions.connection, target_version: Optional[int] = None) -> List[int]:
+    """
+    Wendet alle ausstehenden Migrationen bis einschließlich target_version an (None = alle).
+    Bereits angewendete Migrationen werden übersprungen, ein erneuter Aufruf ist also gefahrlos.
+    Gibt die neu angewendeten Versionen zurück.
+    """
+    applied_now: List[int] = []
+    for migration in lade_migrationen():
+        version = migration["version"]
+        if target_version is not None and version > target_version:
+            break
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+            applied = get_applied_migrations(cursor)
+            if version in applied:
+                if applied[version] != migration["checksum"]:
+                    logger.warning(f"Migration {version:04d}_{migration['name']} wurde nach dem Anwenden geändert (Checksumme weicht ab).")
+                conn.commit()
+                continue
+            logger.info(f"Wende Migration {version:04d}_{migration['name']} an...")
+            try:
+                cursor.execute(migration["up"])
+                cursor.execute(
+                    f'INSERT INTO {TABLE_SCHEMA_MIGRATIONEN} ("Version", "Name", "Checksumme") VALUES (%s, %s, %s)',
+                    (version, migration["name"], migration["checksum"])
+                )
+                _invalidate_result_cache(cursor)
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+        applied_now.append(version)
+    return applied_now
+
+def rollback_migrations(conn: psycopg2.extensions.connection, target_version: int) -> List[int]:
+    """
+    Nimmt alle angewendeten Migrationen mit Version > target_version in absteigender Reihenfolge zurück
+    (target_version=0 entfernt das komplette Schema). Gibt die zurückgenommenen Versionen zurück.
+    """
+    reverted: List[int] = []
+    for migration in reversed(lade_migrationen()):
+        version = migration["version"]
+        if version <= target_version:
+            break
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+            if version not in get_applied_migrations(cursor):
+                conn.commit()
+                continue
+            logger.info(f"Nehme Migration {version:04d}_{migration['name']} zurück...")
+            try:
+                cursor.execute(migration["down"])
+                cursor.execute(f'DELETE FROM {TABLE_SCHEMA_MIGRATIONEN} WHERE "Version" = %s', (version,))
+                _invalidate_result_cache(cursor)
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+        reverted.append(version)
+    return reverted
+
+def migration_status(conn: psycopg2.extensions.connection) -> List[Tuple[int, str, bool]]:
+    """(Version, Name, angewendet?) für alle bekannten Migrationen."""
+    with conn.cursor() as cursor:
+        applied = get_applied_migrations(cursor)
+    conn.commit()
+    return [(m["version"], m["name"], m["version"] in applied) for m in lade_migrationen()]
+
+
+# --- Saison-Partitionen von "Ereignisse_Daten" (Migration 0008, seit 0009 hinter der Sicht "Ereignisse") ---
+# Abgeschlossene Saisons lassen sich abhängen: die Partition bleibt als eigene Tabelle bestehen
+# (z.B. für pg_dump -t und DROP), ist aber für Abfragen und Importe unsichtbar. Anhängen macht sie wieder sichtbar.
+SQL_EREIGNIS_PARTITIONEN: str = """
+SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.relispartition, c.reltuples::BIGINT
+FROM pg_class c
+WHERE c.relkind = 'r' AND c.relname LIKE 'Ereignisse\\_%'
+  AND (NOT c.relispartition OR EXISTS (SELECT 1 FROM pg_inherits i
+                                       WHERE i.inhrelid = c.oid AND i.inhparent = '"Ereignisse_Daten"'::regclass))
+ORDER BY c.relname
+"""
+
+def ereignis_partitionen(conn: psycopg2.extensions.connection) -> List[Tuple[str, Optional[str], bool, int]]:
+    """(Partition, Wertebereich, angehängt?, geschätzte Zeilen) aller angehängten und abgehängten Saison-Partitionen."""
+    with conn.cursor() as cursor:
+        cursor.execute(SQL_EREIGNIS_PARTITIONEN)
+        rows = cursor.fetchall()
+    conn.commit()
+    return rows
+
+def _aendere_ereignis_partition(conn: psycopg2.extensions.connection, saison: str, attach: bool) -> str:
+    from utils.query_cache import SCOPE_ALL, bump_cache_versions  # erst hier, siehe _invalidate_result_cache
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT ereignisse_partition_name(%s)", (saison,))
+            partition = cursor.fetchone()[0]
+            if attach:
+                cursor.execute('ALTER TABLE "Ereignisse_Daten" ATTACH PARTITION "{}" FOR VALUES IN (%s)'.format(partition), (saison,))
+            else:
+                cursor.execute('ALTER TABLE "Ereignisse_Daten" DETACH PARTITION "{}"'.format(partition))
+            bump_cache_versions(cursor, [SCOPE_ALL])  # gecachte Spielereignisse und Torverteilungen der Saison
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return partition
+
+def haenge_saison_ab(conn: psycopg2.extensions.connection, saison: str) -> str:
+    """Hängt die Ereignis-Partition einer Saison ab (Archivierung). Gibt den Tabellennamen zurück."""
+    partition = _aendere_ereignis_partition(conn, saison, attach=False)
+    logger.info(f"Ereignisse der Saison {saison} abgehängt, Tabelle \"{partition}\" bleibt bestehen.")
+    return partition
+
+def haenge_saison_an(conn: psycopg2.extensions.connection, saison: str) -> str:
+    """Hängt eine zuvor abgehängte Ereignis-Partition wieder an. Gibt den Tabellennamen zurück."""
+    partition = _aendere_ereignis_partition(conn, saison, attach=True)
+    logger.info(f"Ereignisse der Saison {saison} wieder angehängt (\"{partition}\").")
+    return partition
+
+
 def get_postgresql_connection() -> Optional[psycopg2.extensions.connection]:
     if not all([DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT]):
         logger.error("PG-Verbindungsinformationen unvollständig.")
@@ -114,7 +219,7 @@ def get_postgresql_connection() -> Optional[psycopg2.extensions.connection]:
         logger.error(f"Fehler bei PG-Verbindung: {e}")
         return None
 
-def erstelle_postgres_datenbank_schema() -> None:
+def erstelle_postgres_datenbank_schema(target_version: Optional[int] = None) -> None:
     conn: Optional[psycopg2.extensions.connection] = None
     cursor: Optional[psycopg2.extensions.cursor] = None # type: ignore
     try:
@@ -122,11 +227,9 @@ def erstelle_postgres_datenbank_schema() -> None:
         if conn is None: 
             logger.error("Konnte keine Datenbankverbindung herstellen. Schemaerstellung abgebrochen.")
             return
-        cursor = conn.cursor()
-        logger.info("Führe PostgreSQL-Schema aus...")
-        cursor.execute(SQL_SCHEMA_POSTGRESQL)
-        conn.commit()
-        logger.info("PostgreSQL-Schema erfolgreich erstellt/aktualisiert.")
+        logger.info("Führe PostgreSQL-Schemamigrationen aus...")
+        applied = run_migrations(conn, target_version)
+        logger.info(f"PostgreSQL-Schema erfolgreich erstellt/aktualisiert ({len(applied)} Migrationen angewendet).")
     except psycopg2.Error as e:
         logger.error(f"PG-Fehler bei Schemaerstellung: {e}")
         if conn: conn.rollback()
@@ -149,5 +252,46 @@ if __name__ == "__main__":
     if not all([DB_NAME, DB_USER, DB_PASSWORD, DB_HOST]):
         print("FEHLER: Bitte setze die Umgebungsvariablen: PG_DB_NAME, PG_DB_USER, PG_DB_PASSWORD, PG_DB_HOST in deiner .env oder database.env Datei.")
     else:
-        logger.info("Starte die Erstellung des PostgreSQL-Datenbankschemas...")
-        # erstelle_postgres_datenbank_schema() # Ausführen der Funktion
\ No newline at end of file
+        # Aufruf: python createDB_postgresql.py [up [VERSION] | down VERSION | status | partitionen | detach SAISON | attach SAISON]
+        command = sys.argv[1] if len(sys.argv) > 1 else "up"
+        season_arg = sys.argv[2] if command in ("detach", "attach") and len(sys.argv) > 2 else None
+        version_arg = int(sys.argv[2]) if len(sys.argv) > 2 and season_arg is None else None
+        if command == "up":
+            logger.info("Starte die Erstellung des PostgreSQL-Datenbankschemas...")
+            erstelle_postgres_datenbank_schema(version_arg)
+        elif command in ("down", "status"):
+            if command == "down" and version_arg is None:
+                print("FEHLER: 'down' benötigt die Zielversion, z.B. 'down 1' (0 entfernt das komplette Schema).")
+                sys.exit(1)
+            conn = get_postgresql_connection()
+            if conn is None:
+                sys.exit(1)
+            try:
+                if command == "down":
+                    reverted = rollback_migrations(conn, version_arg)
+                    logger.info(f"{len(reverted)} Migrationen zurückgenommen: {reverted}")
+                else:
+                    for version, name, is_applied in migration_status(conn):
+                        print(f"{version:04d}_{name}: {'angewendet' if is_applied else 'ausstehend'}")
+            finally:
+                conn.close()
+        elif command in ("partitionen", "detach", "attach"):
+            if command != "partitionen" and season_arg is None:
+                print(f"FEHLER: '{command}' benötigt die Saison, z.B. '{command} 2022/2023'.")
+                sys.exit(1)
+            conn = get_postgresql_connection()
+            if conn is None:
+                sys.exit(1)
+            try:
+                if command == "detach":
+                    haenge_saison_ab(conn, season_arg)
+                elif command == "attach":
+                    haenge_saison_an(conn, season_arg)
+                else:
+                    for partition, bound, attached, rows in ereignis_partitionen(conn):
+                        print(f"{partition}: {bound if attached else 'abgehängt'} (~{max(rows, 0)} Zeilen)")
+            finally:
+                conn.close()
+        else:
+            print(f"FEHLER: Unbekannter Befehl '{command}'. Erlaubt: up, down, status, partitionen, detach, attach.")
+            sys.exit(1)
\ No newline at end of file
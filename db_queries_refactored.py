@@ -2,12 +2,21 @@ import streamlit as st # Hinzufügen für st.secrets
 import psycopg2
 import psycopg2.extras
 import pandas as pd
+import numpy as np
 import logging
 import os
+import threading
 import sqlalchemy
 from sqlalchemy.engine.url import URL
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv # Behalten für lokalen Fallback
+from utils.columnar import read_sql_columnar
+from utils.result_schema import apply_result_schema, ResultSchema, EPOCH_DATETIME, INT32, FLOAT32, CATEGORY
+from utils.standings import LeagueStandings, build_league_standings
+from utils.score_timeline import decode_score_timeline
+from utils.momentum import LeagueMomentum, build_league_momentum
+from utils.league_names import FILTER_ALL
+from utils.search_index import normalize_search_text
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
@@ -61,21 +70,65 @@ COL_PUNKTE_HEIM_OFFIZIELL: str = "Punkte_Heim_Offiziell"
 COL_PUNKTE_GAST_OFFIZIELL: str = "Punkte_Gast_Offiziell"
 COL_TORE_GESAMT: str = "Tore_Gesamt"
 
+# --- Ergebnistypen je Abfrage (utils/result_schema.py) ---
+# Zeitpunkte kommen als Epoch-Sekunden aus der DB und werden erst bei der Anzeige formatiert.
+_SCHEMA_KADER_STATS: ResultSchema = {
+    "Rueckennummer": INT32, COL_TORE_GESAMT: INT32, "Tore_7m": INT32, "Fehlwurf_7m": INT32,
+    "Gelbe_Karten": INT32, "Zwei_Minuten_Strafen": INT32, "Rote_Karten": INT32, "Blaue_Karten": INT32,
+}
+SCHEMA_SCHEDULE: ResultSchema = {"Spieldatum": EPOCH_DATETIME, "Heimteam": CATEGORY, "Gastteam": CATEGORY, "Halle": CATEGORY}
+SCHEMA_PLAYER_GAME_LOG: ResultSchema = {"Spieldatum": EPOCH_DATETIME, "Heimteam": CATEGORY, "Gastteam": CATEGORY, **_SCHEMA_KADER_STATS}
+SCHEMA_GAME_DETAILS: ResultSchema = {"Datum": EPOCH_DATETIME}
+SCHEMA_POINTS_PROGRESSION: ResultSchema = {
+    "Spieldatum": EPOCH_DATETIME, COL_TEAM_ID: CATEGORY, "Team_Name": CATEGORY, "Spiel_Nr": INT32, "Kumulierte_Punkte": INT32,
+}
+SCHEMA_HEAD_TO_HEAD: ResultSchema = {
+    "Spieldatum": EPOCH_DATETIME, "Heimteam": CATEGORY, "Gastteam": CATEGORY,
+    "Tore_Heim_Spiel": INT32, "Tore_Gast_Spiel": INT32, "Punkte_Heim": INT32, "Punkte_Gast": INT32,
+}
+SCHEMA_LEAGUE_TABLE: ResultSchema = {"Platz": INT32, "Spiele": INT32, "S": INT32, "U": INT32, "N": INT32, "Diff": INT32}
+SCHEMA_GOAL_TIMING: ResultSchema = {
+    "Spielminute": INT32, "Anzahl_Tore": INT32, "Feldtore": INT32, "Tore_7m": INT32, "Tore": INT32, "Gegentore": INT32,
+}
+SCHEMA_TEAM_RATING_HISTORY: ResultSchema = {"Spieldatum": EPOCH_DATETIME, "Saison": CATEGORY, "Liga": CATEGORY, "Ort": CATEGORY}
+SCHEMA_SEASON_TEAM_RATINGS: ResultSchema = {"Rang": INT32, "Liga": CATEGORY, "Spiele": INT32}
+# Ranglisten im Langformat: je Zeile "Rangliste" (Tore, 2-Minuten, ...), Spieler und "Wert"
+SCHEMA_LEADERBOARDS: ResultSchema = {"Rangliste": CATEGORY, "Team": CATEGORY, "Wert": INT32, "Spiele_gespielt": INT32, "Pro_Spiel": FLOAT32}
+SCHEMA_SEASON_LEADERBOARDS: ResultSchema = {**SCHEMA_LEADERBOARDS, "Platz": INT32, "Liga": CATEGORY}
+
 # --- DB Connection & SQL Loader ---
+# Eine Engine (mit Connection-Pool) pro Prozess. Wird von allen Sessions und
+# von parallelen Prefetch-Threads (utils/prefetch.py) gemeinsam genutzt.
+DB_POOL_SIZE: int = int(os.environ.get("PG_POOL_SIZE", "5"))
+DB_POOL_MAX_OVERFLOW: int = int(os.environ.get("PG_POOL_MAX_OVERFLOW", "10"))
+# "numpy" (Typen wie pd.read_sql_query) oder "pyarrow" (ArrowDtype-Spalten) für execute_query(..., columnar=True)
+COLUMNAR_DTYPE_BACKEND: str = os.environ.get("COLUMNAR_DTYPE_BACKEND", "numpy")
+_engine: Optional[sqlalchemy.engine.Engine] = None
+_engine_lock = threading.Lock()
+
 def get_db_engine() -> Optional[sqlalchemy.engine.Engine]:
+    global _engine
+    if _engine is not None:
+        return _engine
     # Verwende die global geladenen Credentials
     if not all([DB_NAME_PG, DB_USER_PG, DB_PASSWORD_PG, DB_HOST_PG, DB_PORT_PG]):
         logger.error("Unvollständige PostgreSQL-Verbindungsinformationen (get_db_engine).")
         return None
-    try:
-        db_url = URL.create(
-            drivername="postgresql+psycopg2", username=DB_USER_PG, password=DB_PASSWORD_PG,
-            host=DB_HOST_PG.strip(), port=int(DB_PORT_PG), database=DB_NAME_PG
-        )
-        engine = sqlalchemy.create_engine(db_url, connect_args={'sslmode': 'require'})
-        return engine
-    except Exception as e:
-        logger.error(f"Fehler beim Erstellen der SQLAlchemy Engine: {e}", exc_info=True)
+    with _engine_lock:
+        if _engine is not None:
+            return _engine
+        try:
+            db_url = URL.create(
+                drivername="postgresql+psycopg2", username=DB_USER_PG, password=DB_PASSWORD_PG,
+                host=DB_HOST_PG.strip(), port=int(DB_PORT_PG), database=DB_NAME_PG
+            )
+            _engine = sqlalchemy.create_engine(
+                db_url, connect_args={'sslmode': 'require'},
+                pool_size=DB_POOL_SIZE, max_overflow=DB_POOL_MAX_OVERFLOW, pool_pre_ping=True
+            )
+            return _engine
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen der SQLAlchemy Engine: {e}", exc_info=True)
     return None
 
 def get_db_connection() -> Optional[psycopg2.extensions.connection]:
@@ -110,21 +163,39 @@ def load_sql(filename: str) -> str:
         logger.error(f"Error loading SQL file {path}: {e}")
         return ""
 
-def execute_query(query_str: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+def _execute_query_columnar(engine: sqlalchemy.engine.Engine, query_str: str, params: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    raw_connection = engine.raw_connection()
+    try:
+        df = read_sql_columnar(raw_connection.driver_connection, query_str, params, COLUMNAR_DTYPE_BACKEND)
+        raw_connection.commit() # Lesetransaktion beenden, bevor die Verbindung zurück in den Pool geht
+        return df
+    finally:
+        raw_connection.close()
+
+def execute_query(query_str: str, params: Optional[Dict[str, Any]] = None, columnar: bool = False) -> pd.DataFrame:
+    """
+    columnar=True: Abruf per COPY + pyarrow (utils/columnar.py) statt pd.read_sql_query.
+    Für Abfragen mit vielen Zeilen, siehe benchmarks/fetch_benchmark.py.
+    """
     engine = get_db_engine()
     if engine and query_str: 
         try:
+            if columnar:
+                return _execute_query_columnar(engine, query_str, params)
             with engine.connect() as connection:
                 df = pd.read_sql_query(sql=sqlalchemy.text(query_str), con=connection, params=params)
             return df
         except Exception as e:
             logger.error(f"Fehler bei SQL-Abfrage: {query_str[:100]}... | Fehler: {e}", exc_info=True)
-        finally:
-            engine.dispose()
     elif not query_str:
         logger.warning("Leere SQL-Abfrage erhalten, wahrscheinlich wurde die .sql-Datei nicht gefunden.")
     return pd.DataFrame()
 
+def _transpose_single_row(df: pd.DataFrame) -> pd.DataFrame:
+    """Erste Zeile als 'Statistik'/'Wert'-Tabelle. Die Werte behalten ihren Typ, Anzeigeformat siehe utils/ui.py."""
+    row = df.iloc[0]
+    return pd.DataFrame({'Statistik': row.index, 'Wert': pd.Series(row.to_numpy(dtype=object), dtype=object)})
+
 # --- Refaktorierte Query-Funktionen ---
 
 def fetch_all_leagues() -> pd.DataFrame:
@@ -144,15 +215,43 @@ def fetch_players_for_team(team_id: str) -> pd.DataFrame:
 def fetch_league_table(league_id: str, season: str) -> pd.DataFrame:
     if not league_id or not season: return pd.DataFrame()
     query = load_sql("fetch_league_table.sql")
-    return execute_query(query, params={'league_id': league_id, 'season': season})
+    return apply_result_schema(execute_query(query, params={'league_id': league_id, 'season': season}), SCHEMA_LEAGUE_TABLE)
+
+def fetch_league_standings(league_id: str, season: str) -> LeagueStandings:
+    """Präfixsummen der gewerteten Spiele einer Liga-Saison (Tabelle zu jedem Spieltag/Zeitpunkt, siehe utils/standings.py)."""
+    if not league_id or not season: return build_league_standings(pd.DataFrame())
+    query = load_sql("fetch_league_results_for_standings.sql")
+    return build_league_standings(execute_query(query, params={'league_id': league_id, 'season': season}))
+
+def fetch_league_momentum(league_id: str, season: str) -> LeagueMomentum:
+    """Führungswechsel, Läufe, Aufholjagden und Schlussphasen aller Spiele einer Liga-Saison (utils/momentum.py)."""
+    if not league_id or not season: return build_league_momentum(pd.DataFrame())
+    query = load_sql("fetch_league_score_timelines.sql")
+    return build_league_momentum(execute_query(query, params={'league_id': league_id, 'season': season}))
+
+def fetch_team_rating_history(team_id: str) -> pd.DataFrame:
+    """Rating vor und nach jedem gewerteten Spiel des Teams, über alle Ligen und Saisons (utils/team_ratings.py)."""
+    if not team_id: return pd.DataFrame()
+    query = load_sql("fetch_team_rating_history.sql")
+    return apply_result_schema(execute_query(query, params={'team_id': team_id}), SCHEMA_TEAM_RATING_HISTORY)
+
+def fetch_season_team_ratings(season: str) -> pd.DataFrame:
+    """Rating aller Teams am Ende der Saison, ligaübergreifend gereiht."""
+    if not season: return pd.DataFrame()
+    query = load_sql("fetch_season_team_ratings.sql")
+    return apply_result_schema(execute_query(query, params={'season': season}), SCHEMA_SEASON_TEAM_RATINGS)
+
+def fetch_season_leaderboards(season: str, age_group: str = FILTER_ALL, gender: str = FILTER_ALL, limit: int = 10) -> pd.DataFrame:
+    """Ligaübergreifende Ranglisten (Tore, 2-Minuten, Karten) einer Saison, je "Rangliste" die ersten limit Spieler."""
+    if not season: return pd.DataFrame()
+    query = load_sql("fetch_season_leaderboards.sql")
+    params = {'season': season, 'age_group': age_group or FILTER_ALL, 'gender': gender or FILTER_ALL, 'limit': limit}
+    return apply_result_schema(execute_query(query, params=params), SCHEMA_SEASON_LEADERBOARDS)
 
 def fetch_schedule_for_league(league_id: str, season: str) -> pd.DataFrame:
     if not league_id or not season: return pd.DataFrame()
     query = load_sql("fetch_schedule_for_league.sql")
-    df = execute_query(query, params={'league_id': league_id, 'season': season})
-    if not df.empty and 'Spieldatum' in df.columns:
-        df['Spieldatum'] = pd.to_datetime(df['Spieldatum'], format='%d.%m.%Y %H:%M', errors='coerce')
-    return df
+    return apply_result_schema(execute_query(query, params={'league_id': league_id, 'season': season}), SCHEMA_SCHEDULE)
 
 def fetch_player_season_stats(player_id: str, season: str) -> pd.DataFrame:
     if not player_id or not season: return pd.DataFrame()
@@ -166,21 +265,20 @@ def fetch_player_season_stats(player_id: str, season: str) -> pd.DataFrame:
 def fetch_player_game_log(player_id: str, season: str) -> pd.DataFrame:
     if not player_id or not season: return pd.DataFrame()
     query = load_sql("fetch_player_game_log.sql")
-    df = execute_query(query, params={'player_id': player_id, 'season': season})
-    if not df.empty and 'Spieldatum' in df.columns:
-        df['Spieldatum'] = pd.to_datetime(df['Spieldatum'], format='%d.%m.%Y %H:%M', errors='coerce')
-    return df
+    return apply_result_schema(execute_query(query, params={'player_id': player_id, 'season': season}), SCHEMA_PLAYER_GAME_LOG)
 
 def fetch_game_details(game_id: str) -> Optional[Dict[str, Any]]:
     if not game_id: return None
     query = load_sql("fetch_game_details.sql")
-    df = execute_query(query, params={'game_id': game_id})
+    df = apply_result_schema(execute_query(query, params={'game_id': game_id}), SCHEMA_GAME_DETAILS)
     if not df.empty:
         details = df.iloc[0].to_dict()
         if details.get(COL_TORE_HEIM) is not None and details.get(COL_TORE_GAST) is not None:
             details['Ergebnis'] = f"{details[COL_TORE_HEIM]}:{details[COL_TORE_GAST]}"
         if details.get('Tore_Heim_HZ') is not None and details.get('Tore_Gast_HZ') is not None:
             details['Halbzeit'] = f"{details['Tore_Heim_HZ']}:{details['Tore_Gast_HZ']}"
+        # Beim Import gespeicherter Score-Verlauf (utils/score_timeline.py), int16-Array (Punkte, 3)
+        details['Spielverlauf'] = decode_score_timeline(details.get('Spielverlauf'))
         return details
     return None
 
@@ -199,10 +297,7 @@ def fetch_player_all_time_stats(player_id: str) -> pd.DataFrame:
     query = load_sql("fetch_player_all_time_stats.sql")
     df = execute_query(query, params={'player_id': player_id})
     if not df.empty and "Spiele" in df.columns and df["Spiele"].iloc[0] > 0:
-        df_transposed = df.T.reset_index().rename(columns={'index':'Statistik', 0:'Wert'})
-        # NEU: Konvertiere 'Wert'-Spalte zu String
-        df_transposed['Wert'] = df_transposed['Wert'].astype(str)
-        return df_transposed
+        return _transpose_single_row(df)
     return pd.DataFrame()
 
 def fetch_player_stats_vs_opponent(player_id: str, opponent_team_id: str, season: Optional[str] = None) -> pd.DataFrame:
@@ -212,10 +307,7 @@ def fetch_player_stats_vs_opponent(player_id: str, opponent_team_id: str, season
     params['season'] = season if season and season != "Alle Saisons" else None
     df = execute_query(query, params=params)
     if not df.empty and "Spiele_gg_Gegner" in df.columns and df.iloc[0]['Spiele_gg_Gegner'] > 0:
-        df_transposed = df.T.reset_index().rename(columns={'index':'Statistik', 0:'Wert'})
-        # NEU: Konvertiere 'Wert'-Spalte zu String
-        df_transposed['Wert'] = df_transposed['Wert'].astype(str)
-        return df_transposed
+        return _transpose_single_row(df)
     return pd.DataFrame()
 
 def fetch_player_stats_in_game(player_id: str, game_id: str) -> pd.DataFrame:
@@ -223,10 +315,7 @@ def fetch_player_stats_in_game(player_id: str, game_id: str) -> pd.DataFrame:
     query = load_sql("fetch_player_stats_in_game.sql")
     df = execute_query(query, params={'player_id': player_id, 'game_id': game_id})
     if not df.empty:
-        df_transposed = df.T.reset_index().rename(columns={'index':'Statistik', 0:'Wert'})
-        # NEU: Konvertiere 'Wert'-Spalte zu String
-        df_transposed['Wert'] = df_transposed['Wert'].astype(str)
-        return df_transposed
+        return _transpose_single_row(df)
     return pd.DataFrame()
 
 def fetch_all_teams_simple() -> pd.DataFrame:
@@ -248,65 +337,21 @@ def fetch_opponents_for_player(player_id: str, season: Optional[str] = None) ->
 def fetch_points_progression_for_league(league_id: str, season: str) -> pd.DataFrame:
     if not league_id or not season: return pd.DataFrame()
     query = load_sql("fetch_points_progression_for_league.sql")
-    df = execute_query(query, params={'league_id': league_id, 'season': season})
-    if not df.empty and 'Spieldatum' in df.columns:
-        df['Spieldatum'] = pd.to_datetime(df['Spieldatum'], format='%d.%m.%Y %H:%M', errors='coerce')
-    return df
+    df = execute_query(query, params={'league_id': league_id, 'season': season}, columnar=True)
+    return apply_result_schema(df, SCHEMA_POINTS_PROGRESSION)
 
-def fetch_league_top_scorers(league_id: str, season: str, limit: int = 10) -> pd.DataFrame:
+def fetch_league_leaderboards(league_id: str, season: str, limit: int = 10) -> pd.DataFrame:
+    """Alle Ranglisten der Liga-Saison (Tore und Strafen) in einer Abfrage, je "Rangliste" die ersten limit Spieler."""
     if not league_id or not season: return pd.DataFrame()
-    query = load_sql("fetch_league_top_scorers.sql")
-    return execute_query(query, params={'league_id': league_id, 'season': season, 'limit': limit})
+    query = load_sql("fetch_league_leaderboards.sql")
+    return apply_result_schema(execute_query(query, params={'league_id': league_id, 'season': season, 'limit': limit}), SCHEMA_LEADERBOARDS)
 
-def fetch_league_penalty_leaders(league_id: str, season: str, penalty_column_name: str, column_alias: str, limit: int = 10) -> pd.DataFrame:
-    if not league_id or not season: return pd.DataFrame()
-    
-    penalty_map = {
-        "Zwei_Minuten_Strafen": "fetch_league_penalty_zwei_minuten_strafen.sql",
-        "Gelbe_Karten": "fetch_league_penalty_gelbe_karten.sql",
-        "Rote_Karten": "fetch_league_penalty_rote_karten.sql",
-        "Blaue_Karten": "fetch_league_penalty_blaue_karten.sql"
-    }
-    
-    sql_filename = penalty_map.get(penalty_column_name)
-    if not sql_filename:
-        logger.error(f"Ungültiger penalty_column_name: {penalty_column_name}")
-        return pd.DataFrame()
-
-    query = load_sql(sql_filename)
-    df = execute_query(query, params={'league_id': league_id, 'season': season, 'limit': limit})
-    # Umbenennung, falls der Alias in SQL-Datei nicht direkt `column_alias` ist
-    # (Die SQL-Dateien sind so geschrieben, dass sie bereits den korrekten Alias haben)
-    if df.columns[2] != column_alias and column_alias in penalty_map.get(penalty_column_name,""): # Kleiner Check
-         df = df.rename(columns={df.columns[2]: column_alias})
-    return df
-
-def fetch_team_top_scorers(team_id: str, league_id: str, season: str, limit: int = 5) -> pd.DataFrame:
+def fetch_team_leaderboards(team_id: str, league_id: str, season: str, limit: int = 5) -> pd.DataFrame:
+    """Wie fetch_league_leaderboards, beschränkt auf die Spieler eines Teams."""
     if not team_id or not league_id or not season: return pd.DataFrame()
-    query = load_sql("fetch_team_top_scorers.sql")
-    return execute_query(query, params={'team_id': team_id, 'league_id': league_id, 'season': season, 'limit': limit})
-
-def fetch_team_penalty_leaders(team_id: str, league_id: str, season: str, penalty_column_name: str, column_alias: str, limit: int = 5) -> pd.DataFrame:
-    if not team_id or not league_id or not season: return pd.DataFrame()
-
-    penalty_map = {
-        "Zwei_Minuten_Strafen": "fetch_team_penalty_zwei_minuten_strafen.sql",
-        "Gelbe_Karten": "fetch_team_penalty_gelbe_karten.sql",
-        "Rote_Karten": "fetch_team_penalty_rote_karten.sql",
-        "Blaue_Karten": "fetch_team_penalty_blaue_karten.sql"
-    }
-
-    sql_filename = penalty_map.get(penalty_column_name)
-    if not sql_filename:
-        logger.error(f"Ungültiger penalty_column_name für Team: {penalty_column_name}")
-        return pd.DataFrame()
-
-    query = load_sql(sql_filename)
-    df = execute_query(query, params={'team_id': team_id, 'league_id': league_id, 'season': season, 'limit': limit})
-    # Umbenennung wie oben, falls nötig
-    if df.columns[1] != column_alias and column_alias in penalty_map.get(penalty_column_name,""):
-         df = df.rename(columns={df.columns[1]: column_alias})
-    return df
+    query = load_sql("fetch_team_leaderboards.sql")
+    params = {'team_id': team_id, 'league_id': league_id, 'season': season, 'limit': limit}
+    return apply_result_schema(execute_query(query, params=params), SCHEMA_LEADERBOARDS)
 
 def fetch_league_home_away_balance(league_id: str, season: str) -> pd.DataFrame:
     if not league_id or not season: return pd.DataFrame()
@@ -329,49 +374,112 @@ def fetch_team_performance_halves(team_id: str, league_id: str, season: str) ->
         return pd.DataFrame(columns=['Tore_HZ1_Erziehlt', 'Tore_HZ1_Kassiert', 'Tore_HZ2_Erziehlt', 'Tore_HZ2_Kassiert', 'Diff_HZ1', 'Diff_HZ2'])
     return df
 
-def fetch_team_head_to_head_with_stats(team1_id: str, team2_id: str, league_id: Optional[str] = None, season: Optional[str] = None) -> Dict[str, Any]:
+# --- Direktvergleiche: alle Paarungen einer Liga in einem Durchlauf ---
+H2H_PAIR_COLUMNS: List[str] = ["Team_ID", "Gegner_ID", "Spiele", "Siege", "Unentschieden", "Niederlagen", "Tore", "Gegentore"]
+
+def head_to_head_pairs(games: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bilanz je geordnetem Paar (Team_ID, Gegner_ID) aus Spielen im Format von fetch_league_head_to_head_games.sql.
+    Jedes Spiel zählt einmal aus Heim- und einmal aus Gastsicht; Sieg/Unentschieden wie bisher über die
+    offiziellen Punkte (2 bzw. 1).
+    """
+    if games.empty:
+        return pd.DataFrame(columns=H2H_PAIR_COLUMNS)
+    home_points = games["Punkte_Heim"].to_numpy(dtype="float64", na_value=np.nan)
+    away_points = games["Punkte_Gast"].to_numpy(dtype="float64", na_value=np.nan)
+    home_goals = games["Tore_Heim_Spiel"].fillna(0).to_numpy(dtype="int64")
+    away_goals = games["Tore_Gast_Spiel"].fillna(0).to_numpy(dtype="int64")
+    home_ids = games["Heim_Team_ID_H2H"].astype(str).to_numpy()
+    away_ids = games["Gast_Team_ID_H2H"].astype(str).to_numpy()
+    home_wins = home_points == 2
+    away_wins = (away_points == 2) & ~home_wins
+    draws = (home_points == 1) & ~home_wins & ~away_wins
+    both_sides = pd.DataFrame({
+        "Team_ID": np.concatenate([home_ids, away_ids]),
+        "Gegner_ID": np.concatenate([away_ids, home_ids]),
+        "Spiele": 1,
+        "Siege": np.concatenate([home_wins, away_wins]).astype("int32"),
+        "Unentschieden": np.concatenate([draws, draws]).astype("int32"),
+        "Niederlagen": np.concatenate([away_wins, home_wins]).astype("int32"),
+        "Tore": np.concatenate([home_goals, away_goals]),
+        "Gegentore": np.concatenate([away_goals, home_goals]),
+    })
+    return both_sides.groupby(["Team_ID", "Gegner_ID"], sort=True, as_index=False).sum()
+
+def head_to_head_for_pair(games: pd.DataFrame, pairs: pd.DataFrame, team1_id: str, team2_id: str) -> Dict[str, Any]:
+    """Direktvergleich zweier Teams aus den Ergebnissen von head_to_head_pairs (Format wie bisher: spiele_df, stats)."""
     results: Dict[str, Any] = {"spiele_df": pd.DataFrame(), "stats": {}}
-    if not team1_id or not team2_id: return results
-    
+    if games.empty or pairs.empty:
+        return results
+    home_ids = games["Heim_Team_ID_H2H"].astype(str)
+    away_ids = games["Gast_Team_ID_H2H"].astype(str)
+    pair_games = games[((home_ids == team1_id) & (away_ids == team2_id)) | ((home_ids == team2_id) & (away_ids == team1_id))]
+    if pair_games.empty:
+        return results
+    pair_games = pair_games.assign(Ergebnis=pair_games["Tore_Heim_Spiel"].astype(str) + ':' + pair_games["Tore_Gast_Spiel"].astype(str))
+    results["spiele_df"] = pair_games[["Spieldatum", "Heimteam", "Gastteam", "Ergebnis"]].reset_index(drop=True)
+    row = pairs[(pairs["Team_ID"] == team1_id) & (pairs["Gegner_ID"] == team2_id)].iloc[0]
+    results["stats"] = {
+        "Siege_Team1": int(row["Siege"]), "Siege_Team2": int(row["Niederlagen"]),
+        "Unentschieden": int(row["Unentschieden"]), "Torverhaeltnis": f"{int(row['Tore'])}:{int(row['Gegentore'])}"
+    }
+    return results
+
+def head_to_head_matrix(pairs: pd.DataFrame, team_names: Dict[str, str]) -> pd.DataFrame:
+    """
+    Rivalitätsmatrix (Zeile = Team, Spalte = Gegner) mit 'Siege-Unentschieden-Niederlagen' je Zelle.
+    Gruppiert wird über die Team-IDs; gleichnamige Teams (z.B. über mehrere Saisons) erhalten die ID als Zusatz.
+    """
+    if pairs.empty:
+        return pd.DataFrame()
+    cells = pairs.assign(
+        Bilanz=pairs["Siege"].astype(str) + "-" + pairs["Unentschieden"].astype(str) + "-" + pairs["Niederlagen"].astype(str),
+    )
+    matrix = cells.pivot(index="Team_ID", columns="Gegner_ID", values="Bilanz")
+    names = {team_id: team_names.get(team_id) or team_id for team_id in set(matrix.index) | set(matrix.columns)}
+    order = sorted(names, key=lambda team_id: (names[team_id], team_id))
+    name_counts = pd.Series(list(names.values())).value_counts()
+    labels = {team_id: f"{name} ({team_id})" if name_counts[name] > 1 else name for team_id, name in names.items()}
+    matrix = matrix.reindex(index=order, columns=order).fillna("")
+    matrix.index = [labels[team_id] for team_id in order]
+    matrix.columns = [labels[team_id] for team_id in order]
+    return matrix
+
+def fetch_league_head_to_head(league_id: str, all_time: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    Spiele und Paarungsbilanzen einer Liga-Saison in einer Abfrage ({"spiele": ..., "paare": ...}).
+    all_time=True: alle Spiele zwischen Teams dieser Liga über alle Ligen und Saisons.
+    Einzelne Paarungen dann mit head_to_head_for_pair.
+    """
+    if not league_id: return {"spiele": pd.DataFrame(), "paare": head_to_head_pairs(pd.DataFrame())}
+    query = load_sql("fetch_league_head_to_head_games_all_time.sql" if all_time else "fetch_league_head_to_head_games.sql")
+    games = apply_result_schema(execute_query(query, params={'league_id': league_id}), SCHEMA_HEAD_TO_HEAD)
+    return {"spiele": games, "paare": head_to_head_pairs(games)}
+
+def fetch_team_head_to_head_with_stats(team1_id: str, team2_id: str, league_id: Optional[str] = None, season: Optional[str] = None) -> Dict[str, Any]:
+    if not team1_id or not team2_id: return {"spiele_df": pd.DataFrame(), "stats": {}}
     query = load_sql("fetch_team_head_to_head_with_stats.sql")
     params = {
         'team1_id': team1_id, 'team2_id': team2_id,
         'league_id': league_id, 'season': season
     }
-    df = execute_query(query, params=params)
-
-    if not df.empty:
-        if 'Spieldatum' in df.columns:
-            df['Spieldatum'] = pd.to_datetime(df['Spieldatum'], format='%d.%m.%Y %H:%M', errors='coerce')
-        df["Ergebnis"] = df["Tore_Heim_Spiel"].astype(str) + ':' + df["Tore_Gast_Spiel"].astype(str)
-        results["spiele_df"] = df[["Spieldatum", "Heimteam", "Gastteam", "Ergebnis"]]
-
-        team1_name_df = execute_query(f'SELECT "Name" FROM "Teams" WHERE "Team_ID" = :id', {'id': team1_id})
-        team1_name = team1_name_df.iloc[0,0] if not team1_name_df.empty else "Team 1"
-        
-        siege_team1, siege_team2, unentschieden = 0, 0, 0
-        tore_team1, tore_team2 = 0, 0
-
-        for _, row in df.iterrows():
-            is_team1_home = row["Heim_Team_ID_H2H"] == team1_id
-            
-            if row["Punkte_Heim"] == 2: siege_team1 += 1 if is_team1_home else 0; siege_team2 += 0 if is_team1_home else 1
-            elif row["Punkte_Gast"] == 2: siege_team1 += 0 if is_team1_home else 1; siege_team2 += 1 if is_team1_home else 0
-            elif row["Punkte_Heim"] == 1: unentschieden += 1
-
-            tore_team1 += row["Tore_Heim_Spiel"] if is_team1_home else row["Tore_Gast_Spiel"]
-            tore_team2 += row["Tore_Gast_Spiel"] if is_team1_home else row["Tore_Heim_Spiel"]
-
-        results["stats"] = {
-            "Siege_Team1": siege_team1, "Siege_Team2": siege_team2,
-            "Unentschieden": unentschieden, "Torverhaeltnis": f"{tore_team1}:{tore_team2}"
-        }
-    return results
+    df = apply_result_schema(execute_query(query, params=params), SCHEMA_HEAD_TO_HEAD)
+    return head_to_head_for_pair(df, head_to_head_pairs(df), team1_id, team2_id)
 
 def fetch_player_goal_timing_stats(player_id: str, season: str) -> pd.DataFrame:
     if not player_id or not season: return pd.DataFrame()
     query = load_sql("fetch_player_goal_timing_stats.sql")
-    return execute_query(query, params={'player_id': player_id, 'season': season})
+    return apply_result_schema(execute_query(query, params={'player_id': player_id, 'season': season}), SCHEMA_GOAL_TIMING)
+
+def fetch_league_goal_timing(league_id: str) -> pd.DataFrame:
+    if not league_id: return pd.DataFrame()
+    query = load_sql("fetch_league_goal_timing.sql")
+    return apply_result_schema(execute_query(query, params={'league_id': league_id}), SCHEMA_GOAL_TIMING)
+
+def fetch_team_goal_timing(team_id: str, league_id: str) -> pd.DataFrame:
+    if not team_id or not league_id: return pd.DataFrame()
+    query = load_sql("fetch_team_goal_timing.sql")
+    return apply_result_schema(execute_query(query, params={'team_id': team_id, 'league_id': league_id}), SCHEMA_GOAL_TIMING)
 
 def fetch_player_goal_contribution_to_team(player_id: str, team_id: str, league_id: str, season: str) -> pd.DataFrame:
     if not all([player_id, team_id, league_id, season]): return pd.DataFrame()
@@ -393,42 +501,18 @@ def fetch_player_goal_contribution_to_team(player_id: str, team_id: str, league_
         'Statistik': ['Spieler Tore', 'Team Gesamttore (Saison)', 'Anteil Spieler an Teamtoren (%)'],
         'Wert': [spieler_tore, team_gesamttore, round(anteil, 2)]
     })
-    # NEU: Konvertiere 'Wert'-Spalte zu String
-    result_df['Wert'] = result_df['Wert'].astype(str)
     return result_df
 
 def fetch_players_by_name_search(search_term: str, limit: int = 50) -> pd.DataFrame:
-    engine = get_db_engine()
-    if engine and search_term:
-        try:
-            search_words = search_term.lower().split()
-            conditions = []
-            params_dict: Dict[str, Any] = {'limit': limit}
-            
-            for i, word in enumerate(search_words):
-                param_name_vor = f"search_word_vor_{i}"
-                param_name_nach = f"search_word_nach_{i}"
-                conditions.append(f"""(LOWER(s."Vorname") LIKE :{param_name_vor} OR 
-                                     LOWER(s."Nachname") LIKE :{param_name_nach})""")
-                params_dict[param_name_vor] = f"%{word}%"
-                params_dict[param_name_nach] = f"%{word}%"
-
-            if not conditions: return pd.DataFrame()
-            where_clause = " AND ".join(conditions)
-
-            query_str = f"""
-                SELECT DISTINCT
-                    s."Spieler_ID", s."Vorname", s."Nachname"
-                FROM "Spieler" s
-                WHERE s."Ist_Offizieller" = 0 AND ({where_clause})
-                ORDER BY s."Nachname", s."Vorname"
-                LIMIT :limit;
-            """
-            return execute_query(query_str, params=params_dict)
-        except Exception as e:
-            logger.error(f"Fehler bei Spielersuche '{search_term}': {e}", exc_info=True)
-        finally: 
-            if engine: engine.dispose() 
+    # Nur Satz- oder Sonderzeichen ("_", "-") ergeben nach der Normalisierung (handball_suchtext) keinen
+    # Suchbegriff; to_tsquery(':*') wäre ein Syntaxfehler
+    if not normalize_search_text(search_term):
+        return pd.DataFrame()
+    try:
+        query = load_sql("fetch_players_by_name_search.sql")
+        return execute_query(query, params={"search_term": search_term, "limit": limit})
+    except Exception as e:
+        logger.error(f"Fehler bei Spielersuche '{search_term}': {e}", exc_info=True)
     return pd.DataFrame()
 
 def fetch_basic_db_stats() -> Dict[str, int]:
@@ -443,14 +527,44 @@ def fetch_basic_db_stats() -> Dict[str, int]:
                 stats["spieler"] = pd.read_sql_query(sql=sqlalchemy.text(load_sql("fetch_count_spieler.sql")), con=connection).iloc[0,0]
         except Exception as e:
             logger.error(f"Fehler bei DB-Basisstatistiken: {e}", exc_info=True)
-        finally:
-            engine.dispose()
     return stats
 
+def fetch_cache_versions(scopes: List[str]) -> Optional[Dict[str, int]]:
+    """Versionen der Cache-Bereiche (utils/query_cache.py), fehlende Bereiche fehlen im Ergebnis. None bei DB-Fehler."""
+    df = execute_query(load_sql("fetch_cache_versions.sql"), params={'scopes': list(scopes)})
+    if "Bereich" not in df.columns:
+        return None
+    return dict(zip(df["Bereich"], df["Version"].astype(int)))
+
+def fetch_cache_version_watermark() -> Optional[int]:
+    """Höchste bisher vergebene "Aenderung" der Cache-Versionen. None bei DB-Fehler."""
+    df = execute_query(load_sql("fetch_cache_version_watermark.sql"))
+    return int(df["Aenderung"].iloc[0]) if "Aenderung" in df.columns and not df.empty else None
+
+def fetch_cache_version_changes(since: int) -> Optional[pd.DataFrame]:
+    """Bereich, Version und Aenderung aller seit since geänderten Cache-Bereiche. None bei DB-Fehler."""
+    df = execute_query(load_sql("fetch_cache_version_changes.sql"), params={'since': since})
+    return df if "Aenderung" in df.columns else None
+
 def fetch_club_overview() -> pd.DataFrame:
     query = load_sql("fetch_club_overview.sql")
     return execute_query(query)
 
+def fetch_leagues_for_cache_warming(league_ids: Optional[List[str]] = None, limit: int = 20) -> pd.DataFrame:
+    """Liga_ID und Saison der Ligen mit den jüngsten beendeten Spielen (optional nur league_ids)."""
+    query = load_sql("fetch_leagues_for_cache_warming.sql")
+    return execute_query(query, params={'league_ids': list(league_ids or []), 'limit': limit})
+
+def fetch_search_index_entries() -> pd.DataFrame:
+    """Typ, ID, Name und Zusatz aller Vereine, Teams, Ligen und Spieler für den In-Memory-Suchindex."""
+    query = load_sql("fetch_search_index_entries.sql")
+    return execute_query(query, columnar=True)
+
+def fetch_search_index_entries_for_ids(team_ids: List[str], league_ids: List[str], player_ids: List[str]) -> pd.DataFrame:
+    """Wie fetch_search_index_entries, aber nur für die übergebenen IDs (z.B. die eines Imports)."""
+    query = load_sql("fetch_search_index_entries_for_ids.sql")
+    return execute_query(query, params={'team_ids': list(team_ids), 'league_ids': list(league_ids), 'player_ids': list(player_ids)})
+
 logger.info("db_queries_refactored.py module successfully loaded and all functions defined.")
 # Am Ende der Datei zur Sicherheit:
 if not all([DB_NAME_PG, DB_USER_PG, DB_HOST_PG]): # Passwort wird nicht geloggt
@@ -1,16 +1,18 @@
 import streamlit as st
 import pandas as pd
-import re
+import altair as alt
 import logging
 from utils.state import init_session_state
 from utils.cached_queries import (
-    get_leagues_cached, get_teams_for_league_cached, get_league_table_cached,
-    get_schedule_cached, get_points_progression_for_league_cached,
-    get_league_top_scorers_cached, get_league_penalty_leaders_cached,
-    get_league_home_away_balance_cached, get_league_average_goals_cached,
-    get_team_head_to_head_with_stats_cached
+    get_leagues_cached, get_league_head_to_head_cached, get_all_time_head_to_head_cached,
+    get_head_to_head_from_league, get_season_leaderboards_cached, league_page_tasks
 )
-from utils.ui import display_dataframe_with_title
+from utils.ui import display_dataframe_with_title, display_goal_timing_chart, display_leaderboard
+from utils.prefetch import prefetch_cached
+from utils.result_schema import format_datetime
+from utils.momentum import CLOSING_SECONDS, COMEBACK_MIN_DEFICIT
+from utils.season_simulation import PRIOR_GAMES
+from utils.league_names import FILTER_ALL, GENDER_LABELS, GENDER_UNKNOWN
 import db_queries_refactored as db_queries
 
 # --- Logging & Init ---
@@ -19,13 +21,6 @@ logger = logging.getLogger(__name__)
 init_session_state()
 
 # --- Hilfsfunktionen ---
-def get_base_league_name_from_display(league_display_name_with_season: str) -> str:
-    if not isinstance(league_display_name_with_season, str): return "N/A"
-    match = re.match(r"^(.*)\s*\(\d{4}/\d{4}\)$", league_display_name_with_season)
-    if match:
-        return match.group(1).strip()
-    return league_display_name_with_season
-
 def set_team_and_switch(team_id, team_name, league_id, season, base_league_name):
     """Setzt den Team-Kontext und wechselt zur Vereins-Seite."""
     st.session_state.selected_team_id = team_id
@@ -55,13 +50,6 @@ name_col = db_queries.COL_NAME
 saison_col = db_queries.COL_SAISON
 liga_id_col = db_queries.COL_LIGA_ID
 
-if base_league_name_col not in leagues_df.columns:
-    if name_col in leagues_df.columns:
-        leagues_df[base_league_name_col] = leagues_df[name_col].apply(get_base_league_name_from_display)
-    else:
-        st.error(f"Benötigte Spalte '{name_col}' nicht im Ligen-DataFrame gefunden.")
-        st.stop()
-
 unique_base_leagues = sorted(leagues_df[base_league_name_col].unique())
 if not unique_base_leagues:
     st.warning("Keine Basis-Liganamen gefunden.")
@@ -105,11 +93,25 @@ if not st.session_state.selected_league_id:
 
 st.subheader(f"{st.session_state.selected_league_name_display}")
 
-tab_titles = ["Tabelle", "Spielplan", "Ranglisten", "Liga-Statistiken", "Punkteverlauf", "Teamvergleich H2H"]
-tab_table, tab_schedule, tab_leaderboards, tab_league_stats, tab_points_prog, tab_h2h = st.tabs(tab_titles)
+# Alle unabhängigen Abfragen der Tabs parallel vorladen (bei kaltem Cache ~ langsamste Einzelabfrage)
+league_data = prefetch_cached(league_page_tasks(st.session_state.selected_league_id, st.session_state.selected_saison_for_league))
+
+tab_titles = ["Tabelle", "Prognose", "Spielplan", "Ranglisten", "Liga-Statistiken", "Punkteverlauf", "Rating", "Teamvergleich H2H"]
+tab_table, tab_forecast, tab_schedule, tab_leaderboards, tab_league_stats, tab_points_prog, tab_rating, tab_h2h = st.tabs(tab_titles)
+
+standings = league_data["standings"]
 
 with tab_table:
-    league_table_df = get_league_table_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league)
+    table_mode = st.radio("Tabellenstand:", ["Aktuell", "Nach Spieltag", "Zum Datum"], horizontal=True, key="league_table_mode")
+    if table_mode == "Nach Spieltag" and standings.rounds > 1:
+        table_round = st.slider("Nach dem Spiel Nr. (je Team):", min_value=1, max_value=standings.rounds, value=standings.rounds, key="league_table_round")
+        league_table_df = standings.table(after_round=table_round)
+    elif table_mode == "Zum Datum" and len(standings.kickoff_times) > 1:
+        game_days = standings.game_days()
+        table_day = st.select_slider("Stand am:", options=list(game_days.index), value=game_days.index[-1], format_func=lambda d: d.strftime("%d.%m.%Y"), key="league_table_day")
+        league_table_df = standings.table(at=game_days[table_day])
+    else:
+        league_table_df = standings.table()
     if not league_table_df.empty:
         cols_to_display_table = [col for col in league_table_df.columns if col not in [db_queries.COL_TEAM_ID, f'"{db_queries.COL_TEAM_ID}"']]
         st.dataframe(league_table_df[cols_to_display_table].style.set_properties(**{'text-align': 'left'}), hide_index=True, use_container_width=True)
@@ -128,8 +130,30 @@ with tab_table:
     else:
         st.info("Keine Tabellendaten für die ausgewählte Liga und Saison.")
 
+with tab_forecast:
+    st.markdown("#### Prognose der Abschlusstabelle")
+    simulation = league_data["season_simulation"]
+    if simulation.remaining_games == 0:
+        st.info("Keine offenen Spiele, die Tabelle ist endgültig." if standings.rounds > 0 else "Kein Spielplan für diese Saison.")
+    else:
+        forecast_df = simulation.position_table()
+        runs_label = f"{simulation.runs:,}".replace(",", ".")
+        st.caption(f"{runs_label} simulierte Saisons über {simulation.remaining_games} offene Spiele, ausgehend vom aktuellen Stand. "
+                   f"Tore je Spiel Poisson-verteilt nach Angriffs- und Abwehrstärke aus den bisherigen Spielen (geglättet mit {PRIOR_GAMES:g} Spielen Ligaschnitt).")
+        position_cols = [col for col in forecast_df.columns if col.isdigit()]
+        heatmap_data = forecast_df.melt(id_vars=["Team"], value_vars=position_cols, var_name="Platz", value_name="Wahrscheinlichkeit")
+        heatmap_data["Platz"] = heatmap_data["Platz"].astype(int)
+        st.altair_chart(alt.Chart(heatmap_data).mark_rect().encode(
+            x=alt.X("Platz:O", title="Endplatz"), y=alt.Y("Team:N", sort=list(forecast_df["Team"]), title=None),
+            color=alt.Color("Wahrscheinlichkeit:Q", scale=alt.Scale(scheme="blues"), legend=alt.Legend(format=".0%")),
+            tooltip=["Team", "Platz", alt.Tooltip("Wahrscheinlichkeit:Q", format=".1%")]
+        ), use_container_width=True)
+        forecast_display = forecast_df.copy()
+        forecast_display[position_cols] = (forecast_display[position_cols] * 100).round(1)
+        display_dataframe_with_title("Wahrscheinlichkeit je Endplatz (%)", forecast_display, remove_cols=[db_queries.COL_TEAM_ID])
+
 with tab_schedule:
-    schedule_df = get_schedule_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league)
+    schedule_df = league_data["schedule"]
     if not schedule_df.empty:
         for index, row in schedule_df.iterrows():
             # ... (Code für Spalten und Anzeige wie zuvor) ...
@@ -138,7 +162,7 @@ with tab_schedule:
             heim_team_name = row.get("Heimteam", "N/A")
             gast_team_name = row.get("Gastteam", "N/A")
             ergebnis = row.get("Ergebnis", "vs")
-            spieldatum = row['Spieldatum'].strftime('%d.%m.%Y %H:%M') if pd.notna(row['Spieldatum']) else "N/A"
+            spieldatum = format_datetime(row['Spieldatum'])
             halle = row.get("Halle", "N/A")
             spiel_id = row[db_queries.COL_SPIEL_ID]
 
@@ -170,53 +194,108 @@ with tab_schedule:
 with tab_leaderboards:
     st.markdown("#### Liga-Ranglisten")
     col_scorer, col_penalty_2min, col_penalty_yellow, col_penalty_red = st.columns(4)
-    with col_scorer: display_dataframe_with_title("Top Torschützen", get_league_top_scorers_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league))
-    with col_penalty_2min: display_dataframe_with_title("Meiste 2-Minuten", get_league_penalty_leaders_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league, "Zwei_Minuten_Strafen", "2-Minuten"))
-    with col_penalty_yellow: display_dataframe_with_title("Meiste Gelbe Karten", get_league_penalty_leaders_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league, "Gelbe_Karten", "Gelbe Karten"))
-    with col_penalty_red: display_dataframe_with_title("Meiste Rote Karten", get_league_penalty_leaders_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league, "Rote_Karten", "Rote Karten"))
+    leaderboards_df = league_data["leaderboards"]
+    with col_scorer: display_leaderboard("Top Torschützen", leaderboards_df, "Tore", "Gesamttore", per_game=True)
+    with col_penalty_2min: display_leaderboard("Meiste 2-Minuten", leaderboards_df, "2-Minuten", "2-Minuten")
+    with col_penalty_yellow: display_leaderboard("Meiste Gelbe Karten", leaderboards_df, "Gelbe Karten", "Gelbe Karten")
+    with col_penalty_red: display_leaderboard("Meiste Rote Karten", leaderboards_df, "Rote Karten", "Rote Karten")
+
+    st.markdown(f"#### Ligaübergreifend (Saison {st.session_state.selected_saison_for_league})")
+    season_leagues_df = leagues_df[leagues_df[saison_col] == st.session_state.selected_saison_for_league]
+    current_league = leagues_df[leagues_df[liga_id_col] == st.session_state.selected_league_id].iloc[0]
+    age_group_options = [FILTER_ALL] + sorted(season_leagues_df["Altersgruppe_Anzeige"].dropna().unique())
+    gender_options = [FILTER_ALL] + sorted(season_leagues_df["Geschlecht"].fillna(GENDER_UNKNOWN).unique())
+    current_gender = GENDER_UNKNOWN if pd.isna(current_league["Geschlecht"]) else current_league["Geschlecht"]
+    col_age_group, col_gender = st.columns(2)
+    season_age_group = col_age_group.selectbox("Altersgruppe:", options=age_group_options, key="season_leaderboard_age_group",
+                                               index=age_group_options.index(current_league["Altersgruppe_Anzeige"]) if current_league["Altersgruppe_Anzeige"] in age_group_options else 0)
+    season_gender = col_gender.selectbox("Geschlecht:", options=gender_options, format_func=lambda g: GENDER_LABELS.get(g, g), key="season_leaderboard_gender",
+                                         index=gender_options.index(current_gender) if current_gender in gender_options else 0)
+    season_boards_df = get_season_leaderboards_cached(st.session_state.selected_saison_for_league, season_age_group, season_gender)
+    if not season_boards_df.empty:
+        board_names = set(season_boards_df["Rangliste"].astype(str))
+        selected_board = st.radio("Rangliste:", options=[b for b in ["Tore", "2-Minuten", "Gelbe Karten", "Rote Karten", "Blaue Karten"] if b in board_names],
+                                  horizontal=True, key="season_leaderboard_board")
+        board_size = int((season_boards_df["Rangliste"] == selected_board).sum())
+        display_leaderboard(f"Top {board_size} aller Ligen: {selected_board}", season_boards_df, selected_board, selected_board,
+                            per_game=True, remove_cols=[db_queries.COL_SPIELER_ID])
+    else: st.info("Keine Spielerdaten für diese Auswahl.")
 
 with tab_league_stats:
     st.markdown("#### Allgemeine Liga-Statistiken")
-    balance_df = get_league_home_away_balance_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league)
+    balance_df = league_data["balance"]
     if not balance_df.empty and not balance_df["Gesamtspiele"].empty and pd.notna(balance_df["Gesamtspiele"].iloc[0]) and balance_df["Gesamtspiele"].iloc[0] > 0:
         col_hs, col_as, col_un, col_ges = st.columns(4); col_hs.metric("Heimsiege", int(balance_df["Heimsiege"].iloc[0])); col_as.metric("Auswärtssiege", int(balance_df["Auswärtssiege"].iloc[0])); col_un.metric("Unentschieden", int(balance_df["Unentschieden"].iloc[0])); col_ges.metric("Gesamtspiele gewertet", int(balance_df["Gesamtspiele"].iloc[0]))
     else: st.info("Keine Daten zur Heim-/Auswärtsbilanz.")
-    avg_goals_df = get_league_average_goals_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league)
+    avg_goals_df = league_data["avg_goals"]
     if not avg_goals_df.empty:
         col_avg_ges, col_avg_h, col_avg_g = st.columns(3); col_avg_ges.metric("Ø Tore pro Spiel", f"{avg_goals_df['Avg_Gesamttore_pro_Spiel'].iloc[0]:.2f}" if pd.notna(avg_goals_df['Avg_Gesamttore_pro_Spiel'].iloc[0]) else "N/A"); col_avg_h.metric("Ø Heimtore", f"{avg_goals_df['Avg_Heimtore_pro_Spiel'].iloc[0]:.2f}" if pd.notna(avg_goals_df['Avg_Heimtore_pro_Spiel'].iloc[0]) else "N/A"); col_avg_g.metric("Ø Gasttore", f"{avg_goals_df['Avg_Gasttore_pro_Spiel'].iloc[0]:.2f}" if pd.notna(avg_goals_df['Avg_Gasttore_pro_Spiel'].iloc[0]) else "N/A")
     else: st.info("Keine Daten zu durchschnittlichen Toren.")
+    display_goal_timing_chart("Torverteilung nach Spielminute", league_data["goal_timing"], ["Feldtore", "Tore_7m"])
+    st.markdown("#### Spielverläufe: Führungswechsel, Läufe, Schlussphasen")
+    momentum = league_data["momentum"]
+    momentum_summary = momentum.league_summary()
+    if momentum_summary:
+        col_lc, col_cb, col_run, col_lead = st.columns(4)
+        col_lc.metric("Ø Führungswechsel", f"{momentum_summary['Ø Führungswechsel']:.2f}")
+        col_cb.metric(f"Aufholjagden (≥ {COMEBACK_MIN_DEFICIT} Tore)", f"{momentum_summary['Aufholjagden']:.0%}")
+        col_run.metric("Längster Lauf", f"{momentum_summary['Längster Lauf']}:0")
+        col_lead.metric("Größte Führung", momentum_summary["Größte Führung"])
+        st.caption(f"Schlussphase = letzte {CLOSING_SECONDS // 60} Minuten der regulären Spielzeit ({momentum.regulation_seconds // 60} Minuten).")
+        display_dataframe_with_title("Momentum je Team", momentum.team_table(), remove_cols=[db_queries.COL_TEAM_ID])
+    else: st.info("Keine Spielverläufe für diese Saison.")
 
 with tab_points_prog:
     st.markdown("#### Punkteverlauf der Teams")
-    prog_data = get_points_progression_for_league_cached(st.session_state.selected_league_id, st.session_state.selected_saison_for_league)
-    if not prog_data.empty and 'Team_Name' in prog_data.columns and 'Spiel_Nr' in prog_data.columns and 'Kumulierte_Punkte' in prog_data.columns:
-        try: prog_pivot = prog_data.pivot_table(index='Spiel_Nr', columns='Team_Name', values='Kumulierte_Punkte').ffill().fillna(0); st.line_chart(prog_pivot)
-        except Exception as e: st.error(f"Fehler: {e}"); logger.error(f"Fehler Pivot: {e}", exc_info=True)
+    if standings.rounds > 0:
+        st.line_chart(standings.points_progression())
+        st.markdown("#### Platzierungsverlauf")
+        rank_data = standings.rank_progression().reset_index().melt(id_vars="Spiel_Nr", var_name="Team", value_name="Platz")
+        st.altair_chart(alt.Chart(rank_data).mark_line(point=True).encode(
+            x=alt.X("Spiel_Nr:Q", title="Spiel Nr."), y=alt.Y("Platz:Q", scale=alt.Scale(reverse=True, domainMin=1)),
+            color="Team:N", tooltip=["Team", "Spiel_Nr", "Platz"]
+        ), use_container_width=True)
     else: st.info("Keine Daten für Punkteverlauf.")
 
+with tab_rating:
+    st.markdown("#### Team-Rating (Elo, ligaübergreifend)")
+    season_ratings = league_data["season_ratings"]
+    if not season_ratings.empty:
+        league_ratings = season_ratings[season_ratings[db_queries.COL_TEAM_ID].isin(standings.team_ids)]
+        st.caption(f"Stand am Saisonende. Rang unter allen {len(season_ratings)} Teams der Saison {st.session_state.selected_saison_for_league}; "
+                   "Änderung seit dem ersten Saisonspiel.")
+        display_dataframe_with_title("Teams dieser Liga", league_ratings, remove_cols=[db_queries.COL_TEAM_ID, "Liga_ID", "Liga"])
+        display_dataframe_with_title("Top 20 aller Ligen", season_ratings.head(20), remove_cols=[db_queries.COL_TEAM_ID, "Liga_ID"])
+    else: st.info("Keine Ratings für diese Saison.")
+
 with tab_h2h:
     st.markdown("#### Direktvergleich zweier Teams")
-    teams_in_league = get_teams_for_league_cached(st.session_state.selected_league_id)
+    teams_in_league = league_data["teams"]
     if not teams_in_league.empty:
         team_options = {row[db_queries.COL_TEAM_ID]: row[db_queries.COL_NAME] for index, row in teams_in_league.iterrows()}
         col1, col2 = st.columns(2)
         team1_id = col1.selectbox("Team 1:", options=list(team_options.keys()), format_func=lambda x: team_options.get(x, x), key="h2h_league_team1_sel")
         available_opponents = {tid: name for tid, name in team_options.items() if tid != team1_id}
         team2_id = col2.selectbox("Team 2:", options=list(available_opponents.keys()), format_func=lambda x: available_opponents.get(x,x), key="h2h_league_team2_sel")
+        h2h_all_time = st.toggle("Alle Saisons (alle Spiele dieser Teams, auch in anderen Ligen)", key="h2h_league_all_time")
 
         if team1_id and team2_id and team1_id != team2_id:
-            h2h_data = get_team_head_to_head_with_stats_cached(team1_id, team2_id, st.session_state.selected_league_id, st.session_state.selected_saison_for_league)
+            h2h_data = get_head_to_head_from_league(team1_id, team2_id, st.session_state.selected_league_id, all_time=h2h_all_time)
             team1_name = team_options.get(team1_id, "Team 1")
             team2_name = team_options.get(team2_id, "Team 2")
             display_dataframe_with_title(f"Direktvergleich: {team1_name} vs {team2_name}", h2h_data["spiele_df"])
             if h2h_data["stats"]:
                 stats = h2h_data["stats"]
                 st.markdown(f"""
-                **Gesamtstatistik (Liga/Saison):**
+                **Gesamtstatistik ({'alle Saisons' if h2h_all_time else 'Liga/Saison'}):**
                 - Siege {team1_name}: {stats.get('Siege_Team1',0)}
                 - Siege {team2_name}: {stats.get('Siege_Team2',0)}
                 - Unentschieden: {stats.get('Unentschieden',0)}
                 - Torverhältnis ({team1_name} : {team2_name}): {stats.get('Torverhaeltnis', 'N/A')}
                 """)
         elif team1_id == team2_id and team1_id is not None: st.warning("Bitte zwei unterschiedliche Teams wählen.")
+
+        with st.expander("Rivalitätsmatrix (Siege-Unentschieden-Niederlagen aus Sicht der Zeile)"):
+            h2h_league = (get_all_time_head_to_head_cached if h2h_all_time else get_league_head_to_head_cached)(st.session_state.selected_league_id)
+            st.dataframe(db_queries.head_to_head_matrix(h2h_league["paare"], team_options), use_container_width=True)
     else: st.info("Keine Teams für Vergleich verfügbar.")
\ No newline at end of file
@@ -4,12 +4,12 @@ import logging
 from utils.state import init_session_state
 from utils.cached_queries import (
     get_club_overview_cached, get_leagues_for_team_cached,
-    get_all_teams_simple_cached, get_teams_for_league_cached,
-    get_schedule_cached, get_players_for_team_cached,
-    get_team_top_scorers_cached, get_team_penalty_leaders_cached,
-    get_team_performance_halves_cached, get_team_head_to_head_with_stats_cached
+    get_head_to_head_from_league, get_search_index, team_page_tasks
 )
-from utils.ui import display_dataframe_with_title, translate_age_group
+from utils.ui import display_dataframe_with_title, display_goal_timing_chart, display_leaderboard
+from utils.prefetch import prefetch_cached
+from utils.momentum import CLOSING_SECONDS, COMEBACK_MIN_DEFICIT
+from utils.result_schema import format_datetime
 import db_queries_refactored as db_queries
 
 # --- Logging & Init ---
@@ -17,14 +17,9 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%
 logger = logging.getLogger(__name__)
 init_session_state()
 
-# --- Hilfsfunktionen ---
-def get_base_league_name_from_display(league_display_name_with_season: str) -> str:
-    import re
-    if not isinstance(league_display_name_with_season, str): return "N/A"
-    match = re.match(r"^(.*)\s*\(\d{4}/\d{4}\)$", league_display_name_with_season)
-    if match: return match.group(1).strip()
-    return league_display_name_with_season
+CLUB_SEARCH_LIMIT: int = 200
 
+# --- Hilfsfunktionen ---
 def set_player_and_switch(player_id, player_name, team_id, league_id, season, team_name):
     st.session_state.selected_player_id = player_id
     st.session_state.selected_player_name = player_name
@@ -54,11 +49,6 @@ def show_team_analysis_view():
         return
 
     st.sidebar.subheader(f"Kontext für {team_name}")
-    if 'Base_League_Name' not in leagues_for_team_df.columns and db_queries.COL_NAME in leagues_for_team_df.columns:
-        leagues_for_team_df['Base_League_Name'] = leagues_for_team_df[db_queries.COL_NAME].apply(get_base_league_name_from_display)
-    elif 'Base_League_Name' not in leagues_for_team_df.columns:
-         leagues_for_team_df['Base_League_Name'] = "Unbekannte Liga"
-
     league_options_dict = {
         f"{row.get('Base_League_Name', 'N/A')} ({row[db_queries.COL_SAISON]})": {
             "league_id": row[db_queries.COL_LIGA_ID],
@@ -100,16 +90,19 @@ def show_team_analysis_view():
     st.subheader(f"{team_name}")
     st.caption(f"Analyse im Kontext: {current_league_name_display} ({current_season if current_season else 'Keine Saison gewählt'})")
 
+    # Unabhängige Abfragen aller Tabs parallel vorladen
+    team_data = prefetch_cached(team_page_tasks(team_id, current_league_id, current_season))
+
     tab_info, tab_games, tab_players, tab_team_stats, tab_h2h_team = st.tabs(["Info", "Spiele", "Kader", "Team-Statistiken", "Direktvergleich"])
 
     with tab_info:
-        team_details_df_all = get_all_teams_simple_cached() # umbenannt, um Verwechslung zu vermeiden
+        team_details_df_all = team_data["all_teams"] # umbenannt, um Verwechslung zu vermeiden
         specific_team_info = team_details_df_all[team_details_df_all[db_queries.COL_TEAM_ID] == team_id]
         if not specific_team_info.empty:
             team_info_row = specific_team_info.iloc[0]
             st.markdown(f"**Akronym:** {team_info_row.get(db_queries.COL_AKRONYM, 'N/A')}")
             if current_league_id: 
-                teams_in_current_league_df = get_teams_for_league_cached(current_league_id)
+                teams_in_current_league_df = team_data["teams_in_league"]
                 team_logo_info = teams_in_current_league_df[teams_in_current_league_df[db_queries.COL_TEAM_ID] == team_id]
                 if not team_logo_info.empty:
                     logo_url = team_logo_info.iloc[0].get(db_queries.COL_LOGO_URL)
@@ -120,18 +113,32 @@ def show_team_analysis_view():
         else:
             st.warning(f"Basisinformationen für Team {team_name} nicht gefunden.")
 
+        st.markdown("#### Team-Rating (Elo, ligaübergreifend)")
+        rating_history = team_data["rating_history"]
+        if not rating_history.empty:
+            last_game = rating_history.iloc[-1]
+            col_rating, col_games, col_peak = st.columns(3)
+            col_rating.metric("Aktuelles Rating", f"{last_game['Rating']:.0f}", f"{last_game['Änderung']:+.1f} im letzten Spiel")
+            col_games.metric("Gewertete Spiele", len(rating_history))
+            col_peak.metric("Höchstwert", f"{rating_history['Rating'].max():.0f}")
+            st.line_chart(rating_history.set_index("Spieldatum")["Rating"])
+            with st.expander("Rating je Spiel"):
+                display_dataframe_with_title("Rating-Verlauf", rating_history.iloc[::-1], remove_cols=[db_queries.COL_SPIEL_ID])
+        else:
+            st.info("Noch keine gewerteten Spiele für dieses Team.")
+
 
     with tab_games:
         if not current_league_id or not current_season:
             st.info("Bitte zuerst einen Liga-Kontext in der Seitenleiste auswählen.")
         else:
-            schedule_df = get_schedule_cached(current_league_id, current_season)
+            schedule_df = team_data["schedule"]
             if not schedule_df.empty:
                 team_games_df = schedule_df[(schedule_df['Heimteam'] == team_name) | (schedule_df['Gastteam'] == team_name)]
                 if not team_games_df.empty:
                     st.markdown(f"**Spiele von {team_name} (Saison {current_season}):**")
                     for index, row in team_games_df.iterrows():
-                        date_str = row['Spieldatum'].strftime('%d.%m.%Y %H:%M') if pd.notna(row['Spieldatum']) else "N/A"
+                        date_str = format_datetime(row['Spieldatum'])
                         label = f"{date_str}: {row['Heimteam']} {row['Ergebnis']} {row['Gastteam']}"
                         if st.button(label, key=f"team_game_btn_{row[db_queries.COL_SPIEL_ID]}_{index}", use_container_width=True):
                             set_game_and_switch(row[db_queries.COL_SPIEL_ID])
@@ -142,7 +149,7 @@ def show_team_analysis_view():
 
 
     with tab_players:
-        players_df = get_players_for_team_cached(team_id)
+        players_df = team_data["players"]
         if not players_df.empty:
             st.markdown(f"**Kader von {team_name} (Saison: {current_season if current_season else 'Alle Saisons'}):**")
             for index, row in players_df.iterrows():
@@ -162,17 +169,35 @@ def show_team_analysis_view():
         else:
             st.markdown("#### Team-Statistiken (intern, Saison)")
             col_ts, col_tp_2, col_tp_y, col_tp_r = st.columns(4)
-            with col_ts: display_dataframe_with_title("Top Torschützen (Team)", get_team_top_scorers_cached(team_id, current_league_id, current_season))
-            with col_tp_2: display_dataframe_with_title("Meiste 2-Min (Team)", get_team_penalty_leaders_cached(team_id, current_league_id, current_season, "Zwei_Minuten_Strafen", "2-Min"))
-            with col_tp_y: display_dataframe_with_title("Meiste Gelbe K. (Team)", get_team_penalty_leaders_cached(team_id, current_league_id, current_season, "Gelbe_Karten", "Gelbe K."))
-            with col_tp_r: display_dataframe_with_title("Meiste Rote K. (Team)", get_team_penalty_leaders_cached(team_id, current_league_id, current_season, "Rote_Karten", "Rote K."))
+            team_leaderboards_df = team_data["leaderboards"]
+            with col_ts: display_leaderboard("Top Torschützen (Team)", team_leaderboards_df, "Tore", "Gesamttore", per_game=True)
+            with col_tp_2: display_leaderboard("Meiste 2-Min (Team)", team_leaderboards_df, "2-Minuten", "2-Min")
+            with col_tp_y: display_leaderboard("Meiste Gelbe K. (Team)", team_leaderboards_df, "Gelbe Karten", "Gelbe K.")
+            with col_tp_r: display_leaderboard("Meiste Rote K. (Team)", team_leaderboards_df, "Rote Karten", "Rote K.")
             st.markdown("---"); st.markdown("#### Halbzeit-Performance")
-            halves_df = get_team_performance_halves_cached(team_id, current_league_id, current_season)
+            halves_df = team_data["halves"]
             if not halves_df.empty and not halves_df.isnull().all().all(): #
                 col_h1, col_h2 = st.columns(2); col_h1.metric("Tordifferenz 1. HZ", int(halves_df["Diff_HZ1"].iloc[0]) if pd.notna(halves_df["Diff_HZ1"].iloc[0]) else "N/A"); col_h2.metric("Tordifferenz 2. HZ", int(halves_df["Diff_HZ2"].iloc[0]) if pd.notna(halves_df["Diff_HZ2"].iloc[0]) else "N/A") #
                 with st.expander("Details Halbzeit-Tore"): display_dataframe_with_title("Halbzeit-Tore Details", halves_df) #
             else:
                 st.info("Keine Daten zur Halbzeit-Performance verfügbar.")
+            display_goal_timing_chart("Tore und Gegentore nach Spielminute", team_data["goal_timing"], ["Tore", "Gegentore"], stack=False)
+            st.markdown("---"); st.markdown("#### Spielverläufe: Läufe, Aufholjagden, Schlussphasen")
+            momentum = team_data["momentum"]
+            momentum_table = momentum.team_table()
+            team_momentum = momentum_table[momentum_table["Team_ID"] == team_id] if not momentum_table.empty else momentum_table
+            if not team_momentum.empty:
+                row = team_momentum.iloc[0]
+                col_run, col_run_against, col_cb, col_blown, col_closing = st.columns(5)
+                col_run.metric("Längster Lauf", f"{row['Längster Lauf']}:0")
+                col_run_against.metric("Längster Gegenlauf", f"0:{row['Längster Gegenlauf']}")
+                col_cb.metric("Aufholjagden", int(row["Aufholjagden"]), help=f"Siege nach mindestens {COMEBACK_MIN_DEFICIT} Toren Rückstand")
+                col_blown.metric("Verspielte Führungen", int(row["Verspielte Führungen"]), help=f"Niederlagen nach mindestens {COMEBACK_MIN_DEFICIT} Toren Führung")
+                col_closing.metric("Schlussphase", row["Schlussphase"], delta=int(row["Schlussphase Diff"]), help=f"Tore in den letzten {CLOSING_SECONDS // 60} Minuten der regulären Spielzeit")
+                with st.expander("Spielverläufe je Spiel"):
+                    display_dataframe_with_title("Spiele", momentum.team_games(team_id), remove_cols=["Spiel_ID"])
+            else:
+                st.info("Keine Spielverläufe für dieses Team in der gewählten Saison.")
 
 
     with tab_h2h_team:
@@ -180,13 +205,13 @@ def show_team_analysis_view():
             st.info("Bitte zuerst einen Liga-Kontext in der Seitenleiste auswählen, um H2H-Vergleiche zu ermöglichen.")
         else:
             st.markdown(f"#### Direktvergleich von {team_name}")
-            teams_in_league = get_teams_for_league_cached(current_league_id)
+            teams_in_league = team_data["teams_in_league"]
             if not teams_in_league.empty:
                 opponent_options = {row[db_queries.COL_TEAM_ID]: row[db_queries.COL_NAME] for _, row in teams_in_league.iterrows() if row[db_queries.COL_TEAM_ID] != team_id}
                 if opponent_options:
                     opponent_id = st.selectbox("Gegner auswählen:", options=list(opponent_options.keys()), format_func=lambda x: opponent_options.get(x,x), key="h2h_team_opponent_sel_page_vereine") # Eindeutiger Key
                     if opponent_id:
-                        h2h_data = get_team_head_to_head_with_stats_cached(team_id, opponent_id, current_league_id, current_season)
+                        h2h_data = get_head_to_head_from_league(team_id, opponent_id, current_league_id)
                         opponent_name = opponent_options.get(opponent_id, "Unbekannter Gegner")
                         display_dataframe_with_title(f"Direktvergleich: {team_name} vs {opponent_name}", h2h_data["spiele_df"])
                         if h2h_data["stats"]:
@@ -216,10 +241,10 @@ def show_clubs_list_view():
     st.session_state.club_search_term = search_term 
 
     if st.session_state.club_search_term:
-        # .unique() gibt ein NumPy Array zurück, das .size hat
-        filtered_clubs_data = club_overview_df[
-            club_overview_df['Vereinsname_Aggregiert'].str.contains(st.session_state.club_search_term, case=False, na=False)
-        ]['Vereinsname_Aggregiert'].unique()
+        # Wortanfang-Suche über den globalen Suchindex statt str.contains über den ganzen DataFrame
+        known_clubs = set(club_overview_df['Vereinsname_Aggregiert'].dropna())
+        club_hits = get_search_index().search(st.session_state.club_search_term, limit=CLUB_SEARCH_LIMIT, types=("verein",))
+        filtered_clubs_data = [hit.name for hit in club_hits if hit.name in known_clubs]
     else:
         # sorted(unique()) gibt eine Liste zurück
         filtered_clubs_data = sorted(club_overview_df['Vereinsname_Aggregiert'].dropna().unique())
@@ -243,16 +268,9 @@ def show_clubs_list_view():
         with st.expander(f"{club_name}", expanded=(st.session_state.selected_club_aggregated_name == club_name)): #
             teams_of_club_df = club_overview_df[club_overview_df['Vereinsname_Aggregiert'] == club_name] #
             if not teams_of_club_df.empty: #
-                for altersgruppe, teams_in_agegroup in teams_of_club_df.groupby(db_queries.COL_ALTERSGRUPPE, dropna=False): #
-                    # --- ANPASSUNG START ---
-                    # Nimm den Liganamen des ersten Teams in der Gruppe als Referenz für m/w
-                    liga_name_ref = teams_in_agegroup.iloc[0].get("Liga_Name", "") if not teams_in_agegroup.empty else ""
-                    
-                    # Rufe die bereits existierende Übersetzungsfunktion auf
-                    altersgruppe_display = translate_age_group(league_name=liga_name_ref, age_group_api=altersgruppe)
-                    # --- ANPASSUNG ENDE ---
-
-                    st.markdown(f"**{altersgruppe_display}**") # Diese Zeile bleibt, nutzt aber jetzt den übersetzten Wert
+                # "Altersgruppe_Anzeige" (z.B. mA-Jugend) wird beim Import gespeichert, utils/league_names.py
+                for altersgruppe_display, teams_in_agegroup in teams_of_club_df.groupby("Altersgruppe_Anzeige", dropna=False): #
+                    st.markdown(f"**{altersgruppe_display}**")
 
                     for index, team_row in teams_in_agegroup.sort_values(by="Team_Name").iterrows(): #
                         team_id = team_row[db_queries.COL_TEAM_ID] #
@@ -267,7 +285,7 @@ def show_clubs_list_view():
                             st.session_state.selected_team_name = team_name_display #
                             st.session_state.selected_league_id = team_row.get(db_queries.COL_LIGA_ID)  #
                             st.session_state.selected_saison_for_league = saison_display if saison_display != "N/A" else None #
-                            st.session_state.selected_base_league_name = get_base_league_name_from_display(liga_name_display) if liga_name_display != "N/A" else None #
+                            st.session_state.selected_base_league_name = team_row.get("Base_League_Name") if liga_name_display != "N/A" else None #
                             st.session_state.selected_league_name_display = liga_name_display if liga_name_display != "N/A" else None #
                             st.session_state.selected_club_aggregated_name = club_name 
                             st.rerun() 
@@ -9,7 +9,8 @@ from utils.cached_queries import (
     get_player_stats_vs_opponent_cached, get_player_all_time_stats_cached,
     get_player_goal_contribution_to_team_cached
 )
-from utils.ui import display_dataframe_with_title
+from utils.ui import display_dataframe_with_title, display_goal_timing_chart
+from utils.prefetch import prefetch_cached
 import db_queries_refactored as db_queries #
 
 # --- Logging & Init ---
@@ -66,6 +67,21 @@ def show_player_detail_analysis():
     if not saison_optionen_specific : saison_optionen_specific = sorted(list(all_leagues_df[db_queries.COL_SAISON].unique()), reverse=True) if not all_leagues_df.empty else ["2023/2024"] #
 
 
+    # Unabhängige Abfragen parallel vorladen. Für die Saison-Selectboxen wird die aktuelle
+    # Auswahl (Session State) bzw. die Default-Saison verwendet, die die Tabs gleich anzeigen.
+    default_season = context_season if context_season in saison_optionen_specific else (saison_optionen_specific[0] if saison_optionen_specific else None)
+    vo_season = st.session_state.get("player_vs_opp_season_sel_page", "Alle Saisons")
+    prefetch_tasks = {
+        "season_stats": (get_player_season_stats_cached, (player_id, st.session_state.get("player_stats_season_sel_page", default_season))),
+        "game_log": (get_player_game_log_cached, (player_id, st.session_state.get("player_gamelog_season_sel_page", default_season))),
+        "goal_timing": (get_player_goal_timing_stats_cached, (player_id, st.session_state.get("player_goaltiming_season_sel_page", default_season))),
+        "opponents": (get_opponents_for_player_cached, (player_id, vo_season if vo_season != "Alle Saisons" else None)),
+        "all_time": (get_player_all_time_stats_cached, (player_id,)),
+    }
+    if context_team_id and context_league_id and context_season:
+        prefetch_tasks["contribution"] = (get_player_goal_contribution_to_team_cached, (player_id, context_team_id, context_league_id, context_season))
+    prefetch_cached(prefetch_tasks)
+
     tab_saison, tab_gamelog, tab_goal_timing, tab_vs_opp, tab_alltime, tab_contribution = st.tabs(
         ["Saison Gesamt", "Spiel-Log", "Torverteilung", "Gegen Gegner", "All-Time", "Team-Beitrag"]
     ) #
@@ -91,17 +107,10 @@ def show_player_detail_analysis():
         if selected_gl_season: #
             gamelog_df = get_player_game_log_cached(player_id, selected_gl_season) #
             if not gamelog_df.empty: #
-                df_display = gamelog_df.copy() #
-                if 'Spieldatum' in df_display.columns: #
-                     df_display['Spieldatum_Anzeige'] = pd.to_datetime(df_display['Spieldatum']).dt.strftime('%d.%m.%Y %H:%M') #
-                     df_display = df_display.drop(columns=['Spieldatum']) #
-                     df_display = df_display.rename(columns={'Spieldatum_Anzeige': 'Spieldatum'}) #
-                display_dataframe_with_title(f"Spiel-Log {selected_gl_season}", df_display, remove_cols=[db_queries.COL_SPIEL_ID]) #
+                # 'Spieldatum' ist bereits datetime64, das Anzeigeformat setzt display_dataframe_with_title
+                display_dataframe_with_title(f"Spiel-Log {selected_gl_season}", gamelog_df, remove_cols=[db_queries.COL_SPIEL_ID]) #
                 if db_queries.COL_TORE_GESAMT in gamelog_df.columns and 'Spieldatum' in gamelog_df.columns: #
-                    # Ensure original 'Spieldatum' (datetime) is used for charting
-                    form_data = gamelog_df[['Spieldatum', db_queries.COL_TORE_GESAMT]].copy() 
-                    form_data['Spieldatum'] = pd.to_datetime(form_data['Spieldatum'], errors='coerce') 
-                    form_data = form_data.sort_values(by='Spieldatum').dropna(subset=['Spieldatum']) 
+                    form_data = gamelog_df[['Spieldatum', db_queries.COL_TORE_GESAMT]].dropna(subset=['Spieldatum']).sort_values(by='Spieldatum') 
                     if not form_data.empty: st.line_chart(form_data.set_index('Spieldatum')[db_queries.COL_TORE_GESAMT]) #
 
     with tab_goal_timing: #
@@ -112,13 +121,7 @@ def show_player_detail_analysis():
         selected_timing_season = st.selectbox("Saison für Torverteilung:", saison_optionen_specific, index=default_timing_idx, key="player_goaltiming_season_sel_page") #
         if selected_timing_season: #
             goal_timing_df = get_player_goal_timing_stats_cached(player_id, selected_timing_season) #
-            if not goal_timing_df.empty and 'Spielminute' in goal_timing_df.columns and 'Anzahl_Tore' in goal_timing_df.columns: #
-                all_minutes_df = pd.DataFrame({'Spielminute': range(1, 61)}) #
-                merged_df = pd.merge(all_minutes_df, goal_timing_df, on='Spielminute', how='left').fillna(0) #
-                merged_df['Anzahl_Tore'] = merged_df['Anzahl_Tore'].astype(int) #
-                st.bar_chart(merged_df.set_index('Spielminute')['Anzahl_Tore']) #
-            else: #
-                st.info(f"Keine Daten zur Torverteilung für Saison {selected_timing_season} verfügbar.") #
+            display_goal_timing_chart(f"Torverteilung Saison {selected_timing_season}", goal_timing_df, ["Feldtore", "Tore_7m"]) #
 
 
     with tab_vs_opp: #
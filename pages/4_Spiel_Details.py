@@ -6,6 +6,7 @@ from utils.cached_queries import (
     get_game_details_cached, get_game_lineup_cached, get_game_events_cached
 )
 from utils.ui import display_dataframe_with_title
+from utils.score_timeline import step_points
 import db_queries_refactored as db_queries
 
 # --- Logging & Init ---
@@ -45,8 +46,9 @@ st.subheader(f"{details.get('Heimteam', 'N/A')} vs {details.get('Gastteam', 'N/A
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("Ergebnis", details.get('Ergebnis', 'N/A'))
 col2.metric("Halbzeit", details.get('Halbzeit', 'N/A'))
-col3.metric("Datum", details.get('Datum', 'N/A').split(" ")[0] if details.get('Datum') else "N/A")
-col4.metric("Uhrzeit", details.get('Datum', 'N/A').split(" ")[1] if details.get('Datum') and " " in details.get('Datum') else "N/A")
+spiel_datum = details.get('Datum')
+col3.metric("Datum", spiel_datum.strftime('%d.%m.%Y') if pd.notna(spiel_datum) else "N/A")
+col4.metric("Uhrzeit", spiel_datum.strftime('%H:%M') if pd.notna(spiel_datum) else "N/A")
 
 with st.expander("Weitere Spieldetails"):
     st.markdown(f"**Liga:** {details.get('Liga_Name', 'N/A')}")
@@ -81,22 +83,15 @@ with tab_events:
 
 with tab_verlauf:
     st.markdown("#### Spielverlaufsgrafik (Score-Worm)")
-    events_for_chart_df = get_game_events_cached(game_id)
-    if not events_for_chart_df.empty and 'Score_Heim' in events_for_chart_df.columns and 'Score_Gast' in events_for_chart_df.columns:
-        score_events_df = events_for_chart_df.dropna(subset=['Score_Heim', 'Score_Gast']).copy()
-        if not score_events_df.empty:
-            score_events_df['Score_Heim'] = score_events_df['Score_Heim'].astype(int)
-            score_events_df['Score_Gast'] = score_events_df['Score_Gast'].astype(int)
-            if not (len(score_events_df) > 0 and score_events_df.iloc[0]['Score_Heim'] == 0 and score_events_df.iloc[0]['Score_Gast'] == 0):
-                start_point = pd.DataFrame({'Score_Heim': [0], 'Score_Gast': [0]})
-                score_events_df = pd.concat([start_point, score_events_df], ignore_index=True)
-
-            score_chart_data = pd.DataFrame({
-                details.get('Heimteam','Heim'): score_events_df['Score_Heim'],
-                details.get('Gastteam','Gast'): score_events_df['Score_Gast']
-            })
-            st.line_chart(score_chart_data)
-        else:
-            st.info("Nicht genügend Daten für Spielverlaufsgrafik.")
+    timeline = details['Spielverlauf'] # Beim Import gespeichert: Sekunde, Tore Heim, Tore Gast je Änderung
+    if len(timeline) > 1:
+        points = step_points(timeline)
+        score_chart_data = pd.DataFrame({
+            details.get('Heimteam','Heim'): points[:, 1],
+            details.get('Gastteam','Gast'): points[:, 2]
+        }, index=pd.Index(points[:, 0] / 60, name="Spielminute"))
+        st.line_chart(score_chart_data)
+    elif len(timeline) == 1:
+        st.info("Nicht genügend Daten für Spielverlaufsgrafik.")
     else:
         st.info("Keine Ereignisdaten für Spielverlaufsgrafik.")
\ No newline at end of file
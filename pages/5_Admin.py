@@ -5,6 +5,9 @@ import logging
 import psycopg2
 import time
 from utils.state import init_session_state
+from utils.cached_queries import clear_search_index, refresh_search_index
+from utils.query_cache import bump_cache_versions, SCOPE_ALL
+from utils.cache_warming import start_cache_warming
 import db_queries_refactored as db_queries
 from utils.club_importer import get_all_game_ids_for_club
 
@@ -16,10 +19,12 @@ except ImportError:
 
 try:
     # NEU: Importiere main_batched anstatt process_single_game
-    from analyse_game_json import main_batched #
+    from analyse_game_json import main_batched, refresh_league_summaries, rebuild_team_ratings #
 except ImportError:
     logging.warning("Modul 'analyse_game_json.py' oder Funktion 'main_batched' nicht gefunden.") #
     main_batched = None
+    refresh_league_summaries = None
+    rebuild_team_ratings = None
 
 
 # --- Logging & Init ---
@@ -104,16 +109,17 @@ if st.button("Gesamte Datenbank löschen (VORSICHT!)", key="admin_delete_db_btn_
             conn = db_queries.get_db_connection()
             if conn:
                 cursor = conn.cursor()
-                tables = ["Ereignisse", "Spiel_Kader_Statistiken", "Spiele", "Ligen", "Teams", "Spieler", "Hallen"]
+                tables = ["Ereignisse_Daten", "Spielverlaeufe", "Team_Rating_Verlauf", "Team_Ratings", "Spiel_Kader_Statistiken", "Spiele", "Ligen", "Teams", "Spieler", "Hallen"]
                 with st.spinner("Lösche Datenbank-Tabellen..."):
                     for table in tables:
                         logger.info(f"Leere Tabelle {table}...")
                         cursor.execute(f'TRUNCATE TABLE "{table}" RESTART IDENTITY CASCADE;')
+                    bump_cache_versions(cursor, [SCOPE_ALL]) # Alle gecachten Ergebnisse ungültig (alle Replikate)
                     conn.commit()
                 cursor.close()
                 conn.close()
                 st.success("Alle Tabellen erfolgreich geleert.")
-                st.cache_data.clear() 
+                clear_search_index() # Index wird beim nächsten Zugriff (leer) neu aufgebaut
                 st.session_state.confirm_db_delete_step = 0 # Zurücksetzen für nächsten Versuch
                 time.sleep(1)
                 st.rerun()
@@ -132,6 +138,62 @@ if st.button("Gesamte Datenbank löschen (VORSICHT!)", key="admin_delete_db_btn_
 
 st.markdown("---")
 
+# --- Liga-Zusammenfassungen ---
+st.subheader("Liga-Zusammenfassungen")
+st.caption("Werden nach jedem Import automatisch für die betroffenen Ligen aktualisiert. Eine vollständige Neuberechnung ist nur nach manuellen Datenänderungen nötig.")
+if st.button("Alle Liga-Zusammenfassungen neu berechnen", key="admin_refresh_summaries_btn_page"):
+    if refresh_league_summaries is None:
+        st.error("Funktion refresh_league_summaries nicht verfügbar.")
+    else:
+        conn_summary = None
+        try:
+            conn_summary = db_queries.get_db_connection()
+            if conn_summary:
+                with st.spinner("Berechne Liga-Zusammenfassungen..."):
+                    with conn_summary.cursor() as cursor_summary:
+                        refresh_league_summaries(cursor_summary)
+                        bump_cache_versions(cursor_summary, [SCOPE_ALL])
+                    conn_summary.commit()
+                st.success("Liga-Zusammenfassungen neu berechnet.")
+            else:
+                st.error("Keine DB-Verbindung.")
+        except Exception as e_summary:
+            st.error(f"Fehler bei der Neuberechnung: {e_summary}")
+            logger.error(f"Fehler Liga-Zusammenfassungen: {e_summary}", exc_info=True)
+            if conn_summary: conn_summary.rollback()
+        finally:
+            if conn_summary: conn_summary.close()
+
+st.markdown("---")
+
+# --- Team-Ratings ---
+st.subheader("Team-Ratings")
+st.caption("Werden beim Import ab dem frühesten neuen oder geänderten Spiel nachgerechnet. Eine vollständige Neuberechnung ist nur nach manuellen Datenänderungen oder geänderten Rating-Parametern nötig.")
+if st.button("Team-Ratings neu berechnen", key="admin_rebuild_ratings_btn_page"):
+    if rebuild_team_ratings is None:
+        st.error("Funktion rebuild_team_ratings nicht verfügbar.")
+    else:
+        conn_ratings = None
+        try:
+            conn_ratings = db_queries.get_db_connection()
+            if conn_ratings:
+                with st.spinner("Berechne Team-Ratings..."):
+                    with conn_ratings.cursor() as cursor_ratings:
+                        rated_teams = rebuild_team_ratings(cursor_ratings)
+                        bump_cache_versions(cursor_ratings, [SCOPE_ALL])
+                    conn_ratings.commit()
+                st.success(f"Team-Ratings für {len(rated_teams)} Teams neu berechnet.")
+            else:
+                st.error("Keine DB-Verbindung.")
+        except Exception as e_ratings:
+            st.error(f"Fehler bei der Neuberechnung: {e_ratings}")
+            logger.error(f"Fehler Team-Ratings: {e_ratings}", exc_info=True)
+            if conn_ratings: conn_ratings.rollback()
+        finally:
+            if conn_ratings: conn_ratings.close()
+
+st.markdown("---")
+
 # --- SQL Ausführung ---
 st.subheader("SQL-Befehl ausführen")
 st.warning("**VORSICHT:** Nur für erfahrene Benutzer! Kann Daten beschädigen oder löschen.")
@@ -155,9 +217,11 @@ if st.button("SQL ausführen", key="admin_execute_sql_btn_page"):
                         else:
                             st.info("Abfrage erfolgreich, keine Zeilen zurückgegeben.")
                     else:
+                        # Beliebige Änderungen: Bereich unbekannt, daher alle gecachten Ergebnisse ungültig
+                        bump_cache_versions(cursor_sql, [SCOPE_ALL])
                         conn_sql.commit()
                         st.success("SQL-Befehl erfolgreich ausgeführt (COMMIT).")
-                st.cache_data.clear() 
+                        refresh_search_index()
         except psycopg2.Error as e_sql:
             st.error(f"SQL-Fehler: {e_sql}")
             logger.error(f"SQL-Fehler Admin: {e_sql}", exc_info=True)
@@ -224,7 +288,9 @@ if st.button("Liga-Daten importieren", key="admin_add_league_btn_page"):
                 else:
                     status_text.error("Der Batch-Import hat keine Ergebnisse zurückgegeben.")
                 
-                st.cache_data.clear() # Cache leeren nach Import
+                # Gecachte Ergebnisse der berührten Ligen/Teams/Spieler/Spiele hat main_batched bereits invalidiert
+                refresh_search_index((import_results or {}).get("touched")) # Neue Teams/Spieler inkrementell in den Suchindex übernehmen
+                start_cache_warming((import_results or {}).get("touched", {}).get("leagues", set())) # Importierte Ligen im Hintergrund vorwärmen
 
             else:
                 status_text.warning("Keine Spiel-IDs von der URL extrahiert. Prüfe URL und Präfix.")
@@ -272,7 +338,8 @@ if st.button("Vereins-Daten importieren", key="admin_add_club_btn_page", type="p
                 else:
                     st.error("Der Batch-Import hat keine Ergebnisse zurückgegeben.")
 
-                st.cache_data.clear()
+                refresh_search_index((import_results or {}).get("touched"))
+                start_cache_warming((import_results or {}).get("touched", {}).get("leagues", set())) # Importierte Ligen im Hintergrund vorwärmen
 
         except Exception as e_club_import:
             st.error(f"Ein schwerwiegender Fehler ist beim Vereins-Import aufgetreten: {e_club_import}")
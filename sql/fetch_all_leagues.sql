@@ -1,3 +1,4 @@
-SELECT "Liga_ID", "Name", "Saison", "Altersgruppe", "Typ" 
+SELECT "Liga_ID", "Name", "Saison", "Altersgruppe", "Typ",
+       "Basisname" AS "Base_League_Name", "Geschlecht", "Altersgruppe_Anzeige"
 FROM "Ligen" 
-ORDER BY "Saison" DESC, "Name" ASC;
\ No newline at end of file
+ORDER BY "Saison" DESC, "Name" ASC;
@@ -0,0 +1,6 @@
+-- Seit der letzten Abfrage geänderte Cache-Bereiche (:since = höchste bisher gesehene "Aenderung").
+-- Strikt größer genügt: Schreiber vergeben "Aenderung" unter einer Sperre bis zum Commit (utils/query_cache.py).
+SELECT "Bereich", "Version", "Aenderung"
+FROM "Cache_Versionen"
+WHERE "Aenderung" > :since
+ORDER BY "Aenderung";
@@ -0,0 +1,3 @@
+-- Höchste "Aenderung" beim Start eines Prozesses, ab hier werden nur noch Änderungen gelesen
+SELECT COALESCE(MAX("Aenderung"), 0) AS "Aenderung"
+FROM "Cache_Versionen";
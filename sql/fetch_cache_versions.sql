@@ -0,0 +1,4 @@
+-- Versionen einzelner Cache-Bereiche, beim ersten Zugriff eines Prozesses auf den Bereich
+SELECT "Bereich", "Version"
+FROM "Cache_Versionen"
+WHERE "Bereich" = ANY(:scopes);
@@ -7,4 +7,5 @@ JOIN "Spiele" sp ON e."Spiel_ID" = sp."Spiel_ID"
 JOIN "Teams" sp_ht ON sp."Heim_Team_ID" = sp_ht."Team_ID"
 JOIN "Teams" sp_gt ON sp."Gast_Team_ID" = sp_gt."Team_ID"
 WHERE e."Spiel_ID" = :game_id
+  AND e."Saison" = (SELECT s."Saison" FROM "Spiele" s WHERE s."Spiel_ID" = :game_id) -- nur die Partition der Saison
 ORDER BY e."Zeitstempel" ASC;
\ No newline at end of file
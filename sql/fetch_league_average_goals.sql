@@ -1,8 +1,6 @@
 SELECT
-    AVG("Tore_Heim" + "Tore_Gast") AS "Avg_Gesamttore_pro_Spiel",
-    AVG("Tore_Heim") AS "Avg_Heimtore_pro_Spiel",
-    AVG("Tore_Gast") AS "Avg_Gasttore_pro_Spiel"
-FROM "Spiele" sp
-JOIN "Ligen" l ON sp."Liga_ID" = l."Liga_ID"
-WHERE sp."Liga_ID" = :league_id AND l."Saison" = :season AND sp."Status" = 'Post'
-  AND sp."Tore_Heim" IS NOT NULL AND sp."Tore_Gast" IS NOT NULL;
\ No newline at end of file
+    ("Tore_Heim_Summe" + "Tore_Gast_Summe") * 1.0 / NULLIF("Spiele_Mit_Toren", 0) AS "Avg_Gesamttore_pro_Spiel",
+    "Tore_Heim_Summe" * 1.0 / NULLIF("Spiele_Mit_Toren", 0) AS "Avg_Heimtore_pro_Spiel",
+    "Tore_Gast_Summe" * 1.0 / NULLIF("Spiele_Mit_Toren", 0) AS "Avg_Gasttore_pro_Spiel"
+FROM "Liga_Kennzahlen"
+WHERE "Liga_ID" = :league_id AND "Saison" = :season;
@@ -0,0 +1,14 @@
+-- Torverteilung nach Spielminute über alle beendeten Spiele einer Liga-Saison
+SELECT
+    e."Spiel_Sekunde" / 60 + 1 AS "Spielminute",
+    COUNT(*) AS "Anzahl_Tore",
+    COUNT(*) FILTER (WHERE e."Tor_Art" = 'Feldtor') AS "Feldtore",
+    COUNT(*) FILTER (WHERE e."Tor_Art" = '7m') AS "Tore_7m"
+FROM "Spiele" sp
+-- Saison im Join: zur Laufzeit wird nur die Partition der Liga-Saison gelesen
+JOIN "Ereignisse" e ON e."Spiel_ID" = sp."Spiel_ID" AND e."Saison" = sp."Saison"
+WHERE sp."Liga_ID" = :league_id AND sp."Status" = 'Post'
+  AND e."Tor_Art" IS NOT NULL
+  AND e."Spiel_Sekunde" < 3600
+GROUP BY "Spielminute"
+ORDER BY "Spielminute" ASC;
@@ -0,0 +1,17 @@
+-- Alle beendeten Spiele einer Liga(-Saison) für die Direktvergleichs-Matrix (fetch_league_head_to_head).
+-- Spalten wie fetch_team_head_to_head_with_stats.sql.
+SELECT
+    sp."Start_Zeit" AS "Spieldatum",
+    ht."Name" AS "Heimteam",
+    gt."Name" AS "Gastteam",
+    sp."Tore_Heim" AS "Tore_Heim_Spiel",
+    sp."Tore_Gast" AS "Tore_Gast_Spiel",
+    sp."Punkte_Heim_Offiziell" AS "Punkte_Heim",
+    sp."Punkte_Gast_Offiziell" AS "Punkte_Gast",
+    sp."Heim_Team_ID" AS "Heim_Team_ID_H2H",
+    sp."Gast_Team_ID" AS "Gast_Team_ID_H2H"
+FROM "Spiele" sp
+JOIN "Teams" ht ON sp."Heim_Team_ID" = ht."Team_ID"
+JOIN "Teams" gt ON sp."Gast_Team_ID" = gt."Team_ID"
+WHERE sp."Liga_ID" = :league_id AND sp."Status" = 'Post'
+ORDER BY sp."Start_Zeit" DESC, sp."Spiel_ID" DESC;
@@ -0,0 +1,24 @@
+-- Alle beendeten Spiele zwischen zwei Teams der Liga :league_id, über alle Ligen und Saisons
+-- (Direktvergleichs-Matrix "Alle Saisons"). Spalten wie fetch_league_head_to_head_games.sql.
+WITH liga_teams AS (
+    SELECT "Heim_Team_ID" AS "Team_ID" FROM "Spiele" WHERE "Liga_ID" = :league_id
+    UNION
+    SELECT "Gast_Team_ID" FROM "Spiele" WHERE "Liga_ID" = :league_id
+)
+SELECT
+    sp."Start_Zeit" AS "Spieldatum",
+    ht."Name" AS "Heimteam",
+    gt."Name" AS "Gastteam",
+    sp."Tore_Heim" AS "Tore_Heim_Spiel",
+    sp."Tore_Gast" AS "Tore_Gast_Spiel",
+    sp."Punkte_Heim_Offiziell" AS "Punkte_Heim",
+    sp."Punkte_Gast_Offiziell" AS "Punkte_Gast",
+    sp."Heim_Team_ID" AS "Heim_Team_ID_H2H",
+    sp."Gast_Team_ID" AS "Gast_Team_ID_H2H"
+FROM "Spiele" sp
+JOIN liga_teams h ON sp."Heim_Team_ID" = h."Team_ID"
+JOIN liga_teams g ON sp."Gast_Team_ID" = g."Team_ID"
+JOIN "Teams" ht ON sp."Heim_Team_ID" = ht."Team_ID"
+JOIN "Teams" gt ON sp."Gast_Team_ID" = gt."Team_ID"
+WHERE sp."Status" = 'Post'
+ORDER BY sp."Start_Zeit" DESC, sp."Spiel_ID" DESC;
@@ -0,0 +1,18 @@
+-- Alle gewerteten Spiele einer Liga-Saison in Spielreihenfolge, Grundlage von utils/standings.py
+SELECT
+    sp."Spiel_ID",
+    sp."Start_Zeit",
+    sp."Heim_Team_ID",
+    ht."Name" AS "Heimteam",
+    sp."Gast_Team_ID",
+    gt."Name" AS "Gastteam",
+    sp."Tore_Heim",
+    sp."Tore_Gast",
+    sp."Punkte_Heim_Offiziell" AS "Punkte_Heim",
+    sp."Punkte_Gast_Offiziell" AS "Punkte_Gast"
+FROM "Spiele" sp
+JOIN "Teams" ht ON sp."Heim_Team_ID" = ht."Team_ID"
+JOIN "Teams" gt ON sp."Gast_Team_ID" = gt."Team_ID"
+WHERE sp."Liga_ID" = :league_id AND sp."Saison" = :season AND sp."Status" = 'Post'
+  AND (sp."Punkte_Heim_Offiziell" IS NOT NULL OR sp."Punkte_Gast_Offiziell" IS NOT NULL)
+ORDER BY sp."Start_Zeit", sp."Spiel_ID";
@@ -0,0 +1,15 @@
+-- Gespeicherte Spielverläufe aller beendeten Spiele einer Liga-Saison, Grundlage von utils/momentum.py
+SELECT
+    sp."Spiel_ID",
+    sp."Start_Zeit",
+    sp."Heim_Team_ID",
+    ht."Name" AS "Heimteam",
+    sp."Gast_Team_ID",
+    gt."Name" AS "Gastteam",
+    sv."Spielverlauf"
+FROM "Spiele" sp
+JOIN "Spielverlaeufe" sv ON sv."Spiel_ID" = sp."Spiel_ID"
+JOIN "Teams" ht ON sp."Heim_Team_ID" = ht."Team_ID"
+JOIN "Teams" gt ON sp."Gast_Team_ID" = gt."Team_ID"
+WHERE sp."Liga_ID" = :league_id AND sp."Saison" = :season AND sp."Status" = 'Post'
+ORDER BY sp."Start_Zeit", sp."Spiel_ID";
@@ -2,16 +2,16 @@ WITH "GameResults" AS (
     SELECT sp."Spiel_ID", sp."Heim_Team_ID" AS "Team_ID_Calc", 
            sp."Tore_Heim" AS "Tore_Erziehlt", sp."Tore_Gast" AS "Tore_Kassiert",
            sp."Punkte_Heim_Offiziell" AS "Punkte_Erhalten"
-    FROM "Spiele" sp JOIN "Ligen" l ON sp."Liga_ID" = l."Liga_ID"
+    FROM "Spiele" sp
     WHERE sp."Status" = 'Post' AND sp."Punkte_Heim_Offiziell" IS NOT NULL 
-      AND sp."Liga_ID" = :league_id AND l."Saison" = :season
+      AND sp."Liga_ID" = :league_id AND sp."Saison" = :season
     UNION ALL
     SELECT sp."Spiel_ID", sp."Gast_Team_ID" AS "Team_ID_Calc",
            sp."Tore_Gast" AS "Tore_Erziehlt", sp."Tore_Heim" AS "Tore_Kassiert",
            sp."Punkte_Gast_Offiziell" AS "Punkte_Erhalten"
-    FROM "Spiele" sp JOIN "Ligen" l ON sp."Liga_ID" = l."Liga_ID"
+    FROM "Spiele" sp
     WHERE sp."Status" = 'Post' AND sp."Punkte_Gast_Offiziell" IS NOT NULL
-      AND sp."Liga_ID" = :league_id AND l."Saison" = :season
+      AND sp."Liga_ID" = :league_id AND sp."Saison" = :season
 )
 SELECT ROW_NUMBER() OVER (ORDER BY SUM(COALESCE(gr."Punkte_Erhalten", 0)) DESC, 
                                (SUM(COALESCE(gr."Tore_Erziehlt",0)) - SUM(COALESCE(gr."Tore_Kassiert",0))) DESC, 
@@ -0,0 +1,9 @@
+-- Ligen mit den zuletzt beendeten Spielen zuerst (Auswahl für utils/cache_warming.py).
+-- Ist :league_ids nicht leer, nur diese Ligen (z.B. die eines gerade abgeschlossenen Imports).
+SELECT sp."Liga_ID", sp."Saison", MAX(sp."Start_Zeit") AS "Letztes_Spiel"
+FROM "Spiele" sp
+WHERE sp."Status" = 'Post'
+  AND (cardinality(CAST(:league_ids AS TEXT[])) = 0 OR sp."Liga_ID" = ANY(:league_ids))
+GROUP BY sp."Liga_ID", sp."Saison"
+ORDER BY "Letztes_Spiel" DESC, sp."Liga_ID"
+LIMIT :limit;
@@ -1,5 +1,5 @@
-SELECT DISTINCT l."Liga_ID", l."Name", l."Saison", l."Altersgruppe"
+SELECT DISTINCT l."Liga_ID", l."Name", l."Saison", l."Altersgruppe", l."Basisname" AS "Base_League_Name", l."Altersgruppe_Anzeige"
 FROM "Ligen" l
 JOIN "Spiele" sp ON l."Liga_ID" = sp."Liga_ID"
 WHERE sp."Heim_Team_ID" = :team_id OR sp."Gast_Team_ID" = :team_id
-ORDER BY l."Saison" DESC, l."Name";
\ No newline at end of file
+ORDER BY l."Saison" DESC, l."Name";
@@ -4,7 +4,6 @@ SELECT DISTINCT
 FROM "Spiel_Kader_Statistiken" sks
 JOIN "Spieler" s ON sks."Spieler_ID" = s."Spieler_ID" 
 JOIN "Spiele" sp ON sks."Spiel_ID" = sp."Spiel_ID"
-JOIN "Ligen" l ON sp."Liga_ID" = l."Liga_ID"
 JOIN "Teams" opp ON (CASE 
                     WHEN sks."Team_ID" = sp."Heim_Team_ID" THEN sp."Gast_Team_ID" 
                     ELSE sp."Heim_Team_ID" 
@@ -12,5 +11,5 @@ JOIN "Teams" opp ON (CASE
 WHERE sks."Spieler_ID" = :player_id
   AND opp."Team_ID" != sks."Team_ID" 
   AND s."Ist_Offizieller" = 0
-  AND (:season IS NULL OR l."Saison" = :season) -- Hinzugefügt für optionalen Saison-Filter
+  AND (:season IS NULL OR sp."Saison" = :season) -- Hinzugefügt für optionalen Saison-Filter
 ORDER BY opp."Name";
\ No newline at end of file
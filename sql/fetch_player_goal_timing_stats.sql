@@ -1,15 +1,13 @@
+-- "Ereignisse" ist nach Saison partitioniert: nur die Partition der Saison wird gelesen (Index-Only-Scan)
 SELECT
-    CAST(SPLIT_PART(e."Spiel_Minute", ':', 1) AS INTEGER) + 1 AS "Spielminute", 
-    COUNT(e."H4A_Ereignis_ID") AS "Anzahl_Tore"
+    e."Spiel_Sekunde" / 60 + 1 AS "Spielminute",
+    COUNT(*) AS "Anzahl_Tore",
+    COUNT(*) FILTER (WHERE e."Tor_Art" = 'Feldtor') AS "Feldtore",
+    COUNT(*) FILTER (WHERE e."Tor_Art" = '7m') AS "Tore_7m"
 FROM "Ereignisse" e
-JOIN "Spiele" sp ON e."Spiel_ID" = sp."Spiel_ID"
-JOIN "Ligen" l ON sp."Liga_ID" = l."Liga_ID"
 WHERE e."Referenz_Spieler_ID" = :player_id
-  AND e."Typ" = 'Goal'
-  AND l."Saison" = :season
-  AND e."Spiel_Minute" IS NOT NULL 
-  AND STRPOS(e."Spiel_Minute", ':') > 0 
-  AND LENGTH(e."Spiel_Minute") >= 3 
+  AND e."Tor_Art" IS NOT NULL
+  AND e."Spiel_Sekunde" < 3600 -- Minuten 1-60, ohne Verlängerung
+  AND e."Saison" = :season
 GROUP BY "Spielminute"
-HAVING CAST(SPLIT_PART(e."Spiel_Minute", ':', 1) AS INTEGER) +1 BETWEEN 1 AND 60
-ORDER BY "Spielminute" ASC;
\ No newline at end of file
+ORDER BY "Spielminute" ASC;
@@ -13,7 +13,6 @@ SELECT
 FROM "Spiel_Kader_Statistiken" sks
 JOIN "Spieler" s ON sks."Spieler_ID" = s."Spieler_ID"
 JOIN "Spiele" sp ON sks."Spiel_ID" = sp."Spiel_ID"
-JOIN "Ligen" l ON sp."Liga_ID" = l."Liga_ID"
 JOIN "Teams" spieler_team ON sks."Team_ID" = spieler_team."Team_ID"
 JOIN "Teams" opp ON (CASE 
                     WHEN sks."Team_ID" = sp."Heim_Team_ID" THEN sp."Gast_Team_ID" 
@@ -23,5 +22,5 @@ WHERE sks."Spieler_ID" = :player_id
   AND opp."Team_ID" = :opponent_team_id
   AND sks."Team_ID" != opp."Team_ID" 
   AND s."Ist_Offizieller" = 0
-  AND (:season IS NULL OR l."Saison" = :season) -- Hinzugefügt für optionalen Saison-Filter
+  AND (:season IS NULL OR sp."Saison" = :season) -- Hinzugefügt für optionalen Saison-Filter
 GROUP BY opp."Team_ID", opp."Name";
\ No newline at end of file
@@ -0,0 +1,11 @@
+-- Jedes Wort des Suchbegriffs muss ein Wortanfang im normalisierten Namen sein (GIN-Index auf "Suchvektor").
+-- Sortierung: Anzahl exakt getroffener Namensteile, dann kürzere (ähnlichere) Namen zuerst, dann alphabetisch
+-- und über die ID, damit die Reihenfolge bei gleichen Namen stabil ist.
+SELECT s."Spieler_ID", s."Vorname", s."Nachname"
+FROM "Spieler" s
+WHERE s."Ist_Offizieller" = 0
+  AND s."Suchvektor" @@ to_tsquery('simple', regexp_replace(handball_suchtext(:search_term), ' ', ':* & ', 'g') || ':*')
+ORDER BY (SELECT COUNT(*) FROM unnest(string_to_array(handball_suchtext(:search_term), ' ')) AS wort
+          WHERE wort = ANY(string_to_array(s."Suchname", ' '))) DESC,
+         length(s."Suchname"), s."Nachname", s."Vorname", s."Spieler_ID"
+LIMIT :limit;
\ No newline at end of file
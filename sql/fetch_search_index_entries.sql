@@ -0,0 +1,14 @@
+-- Alle suchbaren Entitäten für den In-Memory-Suchindex (utils/search_index.py).
+-- "Zusatz" wird mit durchsucht und in der Trefferliste angezeigt.
+SELECT 'verein' AS "Typ", v."Verein_ID"::TEXT AS "ID", v."Name", NULL::TEXT AS "Zusatz"
+FROM "Vereine" v
+UNION ALL
+SELECT 'team', t."Team_ID", t."Name", t."Akronym"
+FROM "Teams" t
+UNION ALL
+SELECT 'liga', l."Liga_ID", l."Name", l."Saison"
+FROM "Ligen" l
+UNION ALL
+SELECT 'spieler', s."Spieler_ID", concat_ws(' ', s."Vorname", s."Nachname"), NULL
+FROM "Spieler" s
+WHERE s."Ist_Offizieller" = 0;
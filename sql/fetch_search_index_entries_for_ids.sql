@@ -0,0 +1,13 @@
+-- Suchindex-Einträge der nach einem Import geänderten Teams, Ligen und Spieler
+-- (Spalten wie fetch_search_index_entries.sql, für SearchIndex.refresh(..., complete=False)).
+SELECT 'team' AS "Typ", t."Team_ID" AS "ID", t."Name", t."Akronym" AS "Zusatz"
+FROM "Teams" t
+WHERE t."Team_ID" = ANY(:team_ids)
+UNION ALL
+SELECT 'liga', l."Liga_ID", l."Name", l."Saison"
+FROM "Ligen" l
+WHERE l."Liga_ID" = ANY(:league_ids)
+UNION ALL
+SELECT 'spieler', s."Spieler_ID", concat_ws(' ', s."Vorname", s."Nachname"), NULL
+FROM "Spieler" s
+WHERE s."Spieler_ID" = ANY(:player_ids) AND s."Ist_Offizieller" = 0;
@@ -0,0 +1,47 @@
+-- Ligaübergreifende Ranglisten einer Saison (Migration 0012): je Kennzahl die ersten :limit Spieler über
+-- den passenden Index, alle Ranglisten in einer Abfrage. :age_group / :gender = 'Alle' für ungefiltert.
+WITH top AS (
+    (SELECT 'Tore' AS "Rangliste", ssr.*, ssr."Tore_Gesamt" AS "Wert"
+     FROM "Saison_Spieler_Summen" ssr
+     WHERE ssr."Saison" = :season AND ssr."Altersgruppe" = :age_group AND ssr."Geschlecht" = :gender
+       AND ssr."Tore_Gesamt" > 0
+     ORDER BY ssr."Tore_Gesamt" DESC, ssr."Spieler_ID" LIMIT :limit)
+    UNION ALL
+    (SELECT '2-Minuten', ssr.*, ssr."Zwei_Minuten_Strafen"
+     FROM "Saison_Spieler_Summen" ssr
+     WHERE ssr."Saison" = :season AND ssr."Altersgruppe" = :age_group AND ssr."Geschlecht" = :gender
+       AND ssr."Zwei_Minuten_Strafen" > 0
+     ORDER BY ssr."Zwei_Minuten_Strafen" DESC, ssr."Spieler_ID" LIMIT :limit)
+    UNION ALL
+    (SELECT 'Gelbe Karten', ssr.*, ssr."Gelbe_Karten"
+     FROM "Saison_Spieler_Summen" ssr
+     WHERE ssr."Saison" = :season AND ssr."Altersgruppe" = :age_group AND ssr."Geschlecht" = :gender
+       AND ssr."Gelbe_Karten" > 0
+     ORDER BY ssr."Gelbe_Karten" DESC, ssr."Spieler_ID" LIMIT :limit)
+    UNION ALL
+    (SELECT 'Rote Karten', ssr.*, ssr."Rote_Karten"
+     FROM "Saison_Spieler_Summen" ssr
+     WHERE ssr."Saison" = :season AND ssr."Altersgruppe" = :age_group AND ssr."Geschlecht" = :gender
+       AND ssr."Rote_Karten" > 0
+     ORDER BY ssr."Rote_Karten" DESC, ssr."Spieler_ID" LIMIT :limit)
+    UNION ALL
+    (SELECT 'Blaue Karten', ssr.*, ssr."Blaue_Karten"
+     FROM "Saison_Spieler_Summen" ssr
+     WHERE ssr."Saison" = :season AND ssr."Altersgruppe" = :age_group AND ssr."Geschlecht" = :gender
+       AND ssr."Blaue_Karten" > 0
+     ORDER BY ssr."Blaue_Karten" DESC, ssr."Spieler_ID" LIMIT :limit)
+)
+SELECT top."Rangliste",
+       RANK() OVER (PARTITION BY top."Rangliste" ORDER BY top."Wert" DESC) AS "Platz",
+       top."Spieler_ID",
+       s."Vorname" || ' ' || s."Nachname" AS "Spieler",
+       t."Name" AS "Team",
+       l."Basisname" AS "Liga",
+       top."Wert",
+       top."Spiele" AS "Spiele_gespielt",
+       ROUND(top."Wert" * 1.0 / NULLIF(top."Spiele", 0), 2) AS "Pro_Spiel"
+FROM top
+JOIN "Spieler" s ON s."Spieler_ID" = top."Spieler_ID"
+JOIN "Teams" t ON t."Team_ID" = top."Team_ID"
+JOIN "Ligen" l ON l."Liga_ID" = top."Liga_ID"
+ORDER BY top."Rangliste", "Platz", top."Spieler_ID";
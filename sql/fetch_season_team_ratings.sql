@@ -0,0 +1,29 @@
+-- Rating aller Teams zum Ende einer Saison, ligaübergreifend gereiht. "Änderung" ist die Differenz zum
+-- Rating vor dem ersten Saisonspiel (nach dem Rückschritt zum Startwert), "Liga" die des letzten Saisonspiels.
+WITH saison AS (
+    SELECT
+        rv."Team_ID",
+        rv."Spiel_ID",
+        rv."Rating_Nachher",
+        FIRST_VALUE(rv."Rating_Vorher") OVER w AS "Rating_Start",
+        COUNT(*) OVER (PARTITION BY rv."Team_ID") AS "Spiele",
+        ROW_NUMBER() OVER (PARTITION BY rv."Team_ID" ORDER BY rv."Start_Zeit" DESC, rv."Spiel_ID" DESC) AS rn
+    FROM "Team_Rating_Verlauf" rv
+    WHERE rv."Saison" = :season
+    WINDOW w AS (PARTITION BY rv."Team_ID" ORDER BY rv."Start_Zeit", rv."Spiel_ID")
+)
+SELECT
+    RANK() OVER (ORDER BY s."Rating_Nachher" DESC)::INTEGER AS "Rang",
+    s."Team_ID",
+    t."Name" AS "Team",
+    l."Name" AS "Liga",
+    sp."Liga_ID",
+    ROUND(s."Rating_Nachher"::NUMERIC, 1)::DOUBLE PRECISION AS "Rating",
+    ROUND((s."Rating_Nachher" - s."Rating_Start")::NUMERIC, 1)::DOUBLE PRECISION AS "Änderung",
+    s."Spiele"::INTEGER AS "Spiele"
+FROM saison s
+JOIN "Teams" t ON t."Team_ID" = s."Team_ID"
+JOIN "Spiele" sp ON sp."Spiel_ID" = s."Spiel_ID"
+LEFT JOIN "Ligen" l ON l."Liga_ID" = sp."Liga_ID"
+WHERE s.rn = 1
+ORDER BY "Rang", t."Name";
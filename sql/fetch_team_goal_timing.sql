@@ -0,0 +1,14 @@
+-- Tore und Gegentore eines Teams nach Spielminute in einer Liga-Saison
+SELECT
+    e."Spiel_Sekunde" / 60 + 1 AS "Spielminute",
+    COUNT(*) FILTER (WHERE (e."Team_Seite" = 'Home') = (sp."Heim_Team_ID" = :team_id)) AS "Tore",
+    COUNT(*) FILTER (WHERE (e."Team_Seite" = 'Home') <> (sp."Heim_Team_ID" = :team_id)) AS "Gegentore"
+FROM "Spiele" sp
+-- Saison im Join: zur Laufzeit wird nur die Partition der Liga-Saison gelesen
+JOIN "Ereignisse" e ON e."Spiel_ID" = sp."Spiel_ID" AND e."Saison" = sp."Saison"
+WHERE sp."Liga_ID" = :league_id AND sp."Status" = 'Post'
+  AND (sp."Heim_Team_ID" = :team_id OR sp."Gast_Team_ID" = :team_id)
+  AND e."Tor_Art" IS NOT NULL
+  AND e."Spiel_Sekunde" < 3600
+GROUP BY "Spielminute"
+ORDER BY "Spielminute" ASC;
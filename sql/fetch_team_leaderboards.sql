@@ -0,0 +1,22 @@
+-- Ranglisten eines Teams in einer Liga-Saison, wie fetch_league_leaderboards.sql auf die Spieler des Teams beschränkt
+WITH werte AS (
+    SELECT m."Rangliste", m."Wert", lss."Spieler_ID", lss."Spiele"
+    FROM "Liga_Spieler_Summen" lss
+    JOIN "Spieler" s ON lss."Spieler_ID" = s."Spieler_ID" AND s."Ist_Offizieller" = 0
+    CROSS JOIN LATERAL (VALUES ('Tore', lss."Tore_Gesamt"), ('2-Minuten', lss."Zwei_Minuten_Strafen"),
+                               ('Gelbe Karten', lss."Gelbe_Karten"), ('Rote Karten', lss."Rote_Karten"),
+                               ('Blaue Karten', lss."Blaue_Karten")) AS m("Rangliste", "Wert")
+    WHERE lss."Liga_ID" = :league_id AND lss."Team_ID" = :team_id AND lss."Saison" = :season AND m."Wert" > 0
+), gereiht AS (
+    SELECT werte.*, ROW_NUMBER() OVER (PARTITION BY "Rangliste" ORDER BY "Wert" DESC, "Spieler_ID") AS "Nr"
+    FROM werte
+)
+SELECT g."Rangliste",
+       s."Vorname" || ' ' || s."Nachname" AS "Spieler",
+       g."Wert",
+       g."Spiele" AS "Spiele_gespielt",
+       ROUND(g."Wert" * 1.0 / NULLIF(g."Spiele", 0), 2) AS "Pro_Spiel"
+FROM gereiht g
+JOIN "Spieler" s ON g."Spieler_ID" = s."Spieler_ID"
+WHERE g."Nr" <= :limit
+ORDER BY g."Rangliste", g."Nr";
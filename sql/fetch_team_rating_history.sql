@@ -0,0 +1,18 @@
+-- Rating-Verlauf eines Teams über alle Ligen und Saisons (utils/team_ratings.py)
+SELECT
+    rv."Spiel_ID",
+    rv."Start_Zeit" AS "Spieldatum",
+    rv."Saison",
+    l."Name" AS "Liga",
+    gt."Name" AS "Gegner",
+    CASE WHEN rv."Heim" THEN 'Heim' ELSE 'Auswärts' END AS "Ort",
+    rv."Tore"::TEXT || ':' || rv."Gegentore"::TEXT AS "Ergebnis",
+    ROUND(rv."Rating_Vorher"::NUMERIC, 1)::DOUBLE PRECISION AS "Rating_Vorher",
+    ROUND(rv."Rating_Nachher"::NUMERIC, 1)::DOUBLE PRECISION AS "Rating",
+    ROUND((rv."Rating_Nachher" - rv."Rating_Vorher")::NUMERIC, 1)::DOUBLE PRECISION AS "Änderung"
+FROM "Team_Rating_Verlauf" rv
+JOIN "Spiele" sp ON sp."Spiel_ID" = rv."Spiel_ID"
+JOIN "Teams" gt ON gt."Team_ID" = CASE WHEN rv."Heim" THEN sp."Gast_Team_ID" ELSE sp."Heim_Team_ID" END
+LEFT JOIN "Ligen" l ON l."Liga_ID" = sp."Liga_ID"
+WHERE rv."Team_ID" = :team_id
+ORDER BY rv."Start_Zeit", rv."Spiel_ID";
@@ -0,0 +1,11 @@
+-- Entfernt das komplette Basisschema (inkl. aller Daten).
+DROP TABLE IF EXISTS "Liga_Kennzahlen" CASCADE;
+DROP TABLE IF EXISTS "Liga_Spieler_Summen" CASCADE;
+DROP TABLE IF EXISTS "Ereignisse" CASCADE;
+DROP TABLE IF EXISTS "Spiel_Kader_Statistiken" CASCADE;
+DROP TABLE IF EXISTS "Spiele" CASCADE;
+DROP TABLE IF EXISTS "Hallen" CASCADE;
+DROP TABLE IF EXISTS "Spieler" CASCADE;
+DROP TABLE IF EXISTS "Teams" CASCADE;
+DROP TABLE IF EXISTS "Vereine" CASCADE;
+DROP TABLE IF EXISTS "Ligen" CASCADE;
@@ -0,0 +1,89 @@
+-- Migration 0001: Basisschema der HandballAnalyseDB für PostgreSQL.
+-- Idempotent (IF NOT EXISTS), damit bestehende, vor den Migrationen angelegte Datenbanken übernommen werden.
+-- Alle Tabellen- und Spaltennamen in Anführungszeichen, um Groß-/Kleinschreibung beizubehalten.
+
+CREATE TABLE IF NOT EXISTS "Ligen" (
+    "Liga_ID" TEXT PRIMARY KEY, "Name" TEXT NOT NULL, "Akronym" TEXT,
+    "Saison" TEXT NOT NULL, "Altersgruppe" TEXT, "Typ" TEXT
+);
+CREATE TABLE IF NOT EXISTS "Vereine" (
+    "Verein_ID" SERIAL PRIMARY KEY,
+    "Name" TEXT NOT NULL UNIQUE,
+    "Manuell_Korrigiert" BOOLEAN DEFAULT FALSE
+);
+CREATE TABLE IF NOT EXISTS "Teams" (
+    "Team_ID" TEXT PRIMARY KEY, 
+    "Name" TEXT NOT NULL, 
+    "Akronym" TEXT, 
+    "Logo_URL" TEXT,
+    "Verein_ID" INTEGER REFERENCES "Vereine"("Verein_ID") ON DELETE SET NULL -- NEUE SPALTE
+);
+CREATE TABLE IF NOT EXISTS "Spieler" (
+    "Spieler_ID" TEXT PRIMARY KEY, "Vorname" TEXT, "Nachname" TEXT,
+    "Ist_NN" INTEGER NOT NULL DEFAULT 0, "Ist_Offizieller" INTEGER NOT NULL DEFAULT 0,
+    "Position" TEXT, "Spitzname" TEXT, "Bild_URL" TEXT
+);
+CREATE TABLE IF NOT EXISTS "Hallen" (
+    "Hallen_ID" TEXT PRIMARY KEY, "Name" TEXT NOT NULL, "Stadt" TEXT, "Hallen_Nummer" TEXT
+);
+CREATE TABLE IF NOT EXISTS "Spiele" (
+    "Spiel_ID" TEXT PRIMARY KEY,
+    "Liga_ID" TEXT NOT NULL REFERENCES "Ligen"("Liga_ID") ON DELETE CASCADE,
+    "Phase_ID" TEXT, "Hallen_ID" TEXT REFERENCES "Hallen"("Hallen_ID") ON DELETE SET NULL,
+    "Spiel_Nummer" TEXT, "Start_Zeit" BIGINT NOT NULL, 
+    "Heim_Team_ID" TEXT NOT NULL REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
+    "Gast_Team_ID" TEXT NOT NULL REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
+    "Tore_Heim" INTEGER, "Tore_Gast" INTEGER, "Tore_Heim_HZ" INTEGER, "Tore_Gast_HZ" INTEGER,
+    "Status" TEXT, "PDF_URL" TEXT, "SchiedsrichterInfo" TEXT,
+    "Punkte_Heim_Offiziell" INTEGER, "Punkte_Gast_Offiziell" INTEGER
+);
+CREATE TABLE IF NOT EXISTS "Spiel_Kader_Statistiken" (
+    "Kader_Eintrag_ID" SERIAL PRIMARY KEY,
+    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Spieler_ID" TEXT NOT NULL REFERENCES "Spieler"("Spieler_ID") ON DELETE CASCADE,
+    "Team_ID" TEXT NOT NULL REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
+    "Rueckennummer" INTEGER, "Tore_Gesamt" INTEGER NOT NULL DEFAULT 0,
+    "Tore_7m" INTEGER NOT NULL DEFAULT 0, "Fehlwurf_7m" INTEGER NOT NULL DEFAULT 0,
+    "Gelbe_Karten" INTEGER NOT NULL DEFAULT 0, "Rote_Karten" INTEGER NOT NULL DEFAULT 0,
+    "Blaue_Karten" INTEGER NOT NULL DEFAULT 0, "Zwei_Minuten_Strafen" INTEGER NOT NULL DEFAULT 0,
+    UNIQUE ("Spiel_ID", "Spieler_ID")
+);
+CREATE TABLE IF NOT EXISTS "Ereignisse" (
+    "Ereignis_Auto_ID" SERIAL PRIMARY KEY, "H4A_Ereignis_ID" INTEGER NOT NULL,
+    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Zeitstempel" BIGINT NOT NULL, "Spiel_Minute" TEXT NOT NULL, "Typ" TEXT NOT NULL,
+    "Score_Heim" INTEGER, "Score_Gast" INTEGER, "Team_Seite" TEXT, "Nachricht" TEXT,
+    "Referenz_Spieler_ID" TEXT REFERENCES "Spieler"("Spieler_ID") ON DELETE SET NULL,
+    UNIQUE("Spiel_ID", "H4A_Ereignis_ID")
+);
+CREATE INDEX IF NOT EXISTS idx_spiele_liga ON "Spiele" ("Liga_ID");
+CREATE INDEX IF NOT EXISTS idx_spiele_datum ON "Spiele" ("Start_Zeit");
+CREATE INDEX IF NOT EXISTS idx_kader_spieler ON "Spiel_Kader_Statistiken" ("Spieler_ID");
+CREATE INDEX IF NOT EXISTS idx_kader_spiel ON "Spiel_Kader_Statistiken" ("Spiel_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel ON "Ereignisse" ("Spiel_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_typ ON "Ereignisse" ("Typ");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler ON "Ereignisse" ("Referenz_Spieler_ID");
+
+-- Gepflegte Zusammenfassungen. Liga_Spieler_Summen ist der Rollup Spieler x Team x Liga x Saison und
+-- wird beim Import per Delta gepflegt (analyse_game_json.apply_player_rollup_delta), Liga_Kennzahlen
+-- wird nach jedem Import nur für die betroffenen Ligen neu berechnet (refresh_league_summaries).
+CREATE TABLE IF NOT EXISTS "Liga_Spieler_Summen" (
+    "Liga_ID" TEXT NOT NULL REFERENCES "Ligen"("Liga_ID") ON DELETE CASCADE,
+    "Saison" TEXT NOT NULL,
+    "Team_ID" TEXT NOT NULL REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
+    "Spieler_ID" TEXT NOT NULL REFERENCES "Spieler"("Spieler_ID") ON DELETE CASCADE,
+    "Spiele" INTEGER NOT NULL DEFAULT 0, "Tore_Gesamt" INTEGER NOT NULL DEFAULT 0,
+    "Tore_7m" INTEGER NOT NULL DEFAULT 0, "Fehlwurf_7m" INTEGER NOT NULL DEFAULT 0,
+    "Gelbe_Karten" INTEGER NOT NULL DEFAULT 0, "Rote_Karten" INTEGER NOT NULL DEFAULT 0,
+    "Blaue_Karten" INTEGER NOT NULL DEFAULT 0, "Zwei_Minuten_Strafen" INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY ("Liga_ID", "Team_ID", "Spieler_ID")
+);
+CREATE INDEX IF NOT EXISTS idx_liga_spieler_summen_spieler ON "Liga_Spieler_Summen" ("Spieler_ID", "Saison");
+CREATE TABLE IF NOT EXISTS "Liga_Kennzahlen" (
+    "Liga_ID" TEXT PRIMARY KEY REFERENCES "Ligen"("Liga_ID") ON DELETE CASCADE,
+    "Saison" TEXT NOT NULL,
+    "Spiele_Gewertet" INTEGER NOT NULL DEFAULT 0, "Heimsiege" INTEGER NOT NULL DEFAULT 0,
+    "Auswaertssiege" INTEGER NOT NULL DEFAULT 0, "Unentschieden" INTEGER NOT NULL DEFAULT 0,
+    "Spiele_Mit_Toren" INTEGER NOT NULL DEFAULT 0,
+    "Tore_Heim_Summe" BIGINT NOT NULL DEFAULT 0, "Tore_Gast_Summe" BIGINT NOT NULL DEFAULT 0
+);
@@ -0,0 +1,6 @@
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler ON "Ereignisse" ("Referenz_Spieler_ID");
+DROP INDEX IF EXISTS idx_ereignisse_spieler_typ;
+DROP INDEX IF EXISTS idx_spiele_heim_team;
+DROP INDEX IF EXISTS idx_spiele_gast_team;
+DROP INDEX IF EXISTS idx_kader_team;
+DROP INDEX IF EXISTS idx_spiele_liga_post;
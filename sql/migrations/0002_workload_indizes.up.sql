@@ -0,0 +1,28 @@
+-- Migration 0002: Indizes für die Zugriffspfade der Abfragen in sql/.
+-- Zeiten: Median EXPLAIN ANALYZE ohne -> mit Migration, gemessen mit benchmarks/index_benchmark.py
+-- (150 Ligen, 8.400 Spiele, 235.000 Kader-Zeilen, 407.000 Ereignisse).
+-- Nicht aufgenommen, weil in keinem Plan verwendet: "Ligen"("Saison") (Tabelle zu klein,
+-- immer Seq Scan) und BRIN auf "Spiele"("Start_Zeit") (keine Abfrage filtert auf Zeitbereiche).
+
+-- Team-Abfragen filtern auf Heim- ODER Gastteam (BitmapOr über beide Indizes).
+-- fetch_leagues_for_team 1,42 -> 0,14 ms, fetch_team_head_to_head_with_stats 0,12 -> 0,11 ms
+CREATE INDEX IF NOT EXISTS idx_spiele_heim_team ON "Spiele" ("Heim_Team_ID");
+CREATE INDEX IF NOT EXISTS idx_spiele_gast_team ON "Spiele" ("Gast_Team_ID");
+
+-- Kader eines Teams (Spielerauswahl auf der Vereinsseite), vorher Seq Scan über alle Kader-Zeilen.
+-- fetch_players_for_team 37,9 -> 9,7 ms
+CREATE INDEX IF NOT EXISTS idx_kader_team ON "Spiel_Kader_Statistiken" ("Team_ID");
+
+-- Tabelle und Punkteverlauf lesen nur beendete Spiele einer Liga.
+-- fetch_points_progression_for_league 1,86 -> 1,53 ms, fetch_league_table 0,70 -> 0,69 ms
+CREATE INDEX IF NOT EXISTS idx_spiele_liga_post ON "Spiele" ("Liga_ID", "Start_Zeit") WHERE "Status" = 'Post';
+
+-- Tor-Zeitpunkte eines Spielers: Spieler + Ereignistyp in einem Index. Ersetzt idx_ereignisse_spieler,
+-- dessen Zugriffe der zusammengesetzte Index mit abdeckt (fetch_player_goal_timing_stats unverändert 0,16 ms,
+-- der Typ-Filter wird aber im Index statt auf den Tabellenzeilen geprüft).
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_typ ON "Ereignisse" ("Referenz_Spieler_ID", "Typ");
+DROP INDEX IF EXISTS idx_ereignisse_spieler;
+
+ANALYZE "Spiele";
+ANALYZE "Ereignisse";
+ANALYZE "Spiel_Kader_Statistiken";
@@ -0,0 +1,4 @@
+DROP INDEX IF EXISTS idx_spieler_suchvektor;
+ALTER TABLE "Spieler" DROP COLUMN IF EXISTS "Suchvektor";
+ALTER TABLE "Spieler" DROP COLUMN IF EXISTS "Suchname";
+DROP FUNCTION IF EXISTS handball_suchtext(TEXT);
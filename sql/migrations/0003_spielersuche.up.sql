@@ -0,0 +1,25 @@
+-- Migration 0003: Indizierte Spielersuche über einen normalisierten Suchnamen.
+-- handball_suchtext faltet Groß-/Kleinschreibung, Umlaute (ä -> ae, ß -> ss) und Akzente und ersetzt
+-- Satz- und Sonderzeichen durch Leerzeichen. Dieselbe Funktion wird auf den Suchbegriff angewendet,
+-- so finden "Müller", "mueller" und "MÜLLER" dieselben Spieler.
+-- Gesucht wird per Wort-Präfix über einen GIN-Index auf dem tsvector (eingebaute Volltextsuche,
+-- keine Erweiterung wie pg_trgm nötig).
+CREATE OR REPLACE FUNCTION handball_suchtext(input TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT btrim(regexp_replace(
+        translate(
+            replace(replace(replace(replace(lower(COALESCE(input, '')), 'ä', 'ae'), 'ö', 'oe'), 'ü', 'ue'), 'ß', 'ss'),
+            'áàâãåāéèêëēėíìîïīóòôõøōúùûūçćčñńšśžźżýÿłđ',
+            'aaaaaaeeeeeeiiiiioooooouuuucccnnsszzzyyld'
+        ),
+        '[^a-z0-9]+', ' ', 'g'
+    ))
+$$;
+
+ALTER TABLE "Spieler" ADD COLUMN IF NOT EXISTS "Suchname" TEXT
+    GENERATED ALWAYS AS (handball_suchtext(COALESCE("Vorname", '') || ' ' || COALESCE("Nachname", ''))) STORED;
+ALTER TABLE "Spieler" ADD COLUMN IF NOT EXISTS "Suchvektor" TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('simple', handball_suchtext(COALESCE("Vorname", '') || ' ' || COALESCE("Nachname", '')))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_spieler_suchvektor ON "Spieler" USING GIN ("Suchvektor");
+ANALYZE "Spieler";
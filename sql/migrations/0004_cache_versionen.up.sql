@@ -0,0 +1,9 @@
+-- Migration 0004: Datenversionen für den prozessübergreifenden Ergebnis-Cache (utils/query_cache.py).
+-- Ein Bereich ist 'alle', 'stammdaten', 'saison:<Saison>' oder 'liga:<Liga_ID>'. Der Import erhöht die
+-- Versionen der betroffenen Bereiche in seiner Transaktion. Gecachte Ergebnisse enthalten die Version
+-- im Schlüssel und werden dadurch nach einem Import nur für diese Bereiche neu berechnet.
+CREATE TABLE IF NOT EXISTS "Cache_Versionen" (
+    "Bereich" TEXT PRIMARY KEY,
+    "Version" BIGINT NOT NULL DEFAULT 1,
+    "Geaendert_Am" TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,3 @@
+DROP INDEX IF EXISTS idx_cache_versionen_aenderung;
+ALTER TABLE "Cache_Versionen" DROP COLUMN IF EXISTS "Aenderung";
+DROP SEQUENCE IF EXISTS cache_versionen_aenderung_seq;
@@ -0,0 +1,10 @@
+-- Migration 0005: Cache-Versionen je Team, Spieler und Spiel (utils/query_cache.py).
+-- Mit Bereichen je Entität wächst "Cache_Versionen" auf einen Eintrag je importiertem Spieler. Die
+-- App-Prozesse laden die Tabelle daher nicht mehr komplett, sondern lesen Versionen bei Bedarf und
+-- danach nur die Änderungen seit der letzten Abfrage ("Aenderung" aus einer globalen Sequenz).
+CREATE SEQUENCE IF NOT EXISTS cache_versionen_aenderung_seq;
+ALTER TABLE "Cache_Versionen"
+    ADD COLUMN IF NOT EXISTS "Aenderung" BIGINT NOT NULL DEFAULT nextval('cache_versionen_aenderung_seq');
+CREATE INDEX IF NOT EXISTS idx_cache_versionen_aenderung ON "Cache_Versionen" ("Aenderung");
+-- Saison-Bereiche aus Migration 0004 werden nicht mehr verwendet (Spielerabfragen hängen jetzt am Spieler)
+DELETE FROM "Cache_Versionen" WHERE "Bereich" LIKE 'saison:%';
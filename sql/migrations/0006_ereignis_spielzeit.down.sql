@@ -0,0 +1,6 @@
+DROP INDEX IF EXISTS idx_ereignisse_spiel_tore;
+DROP INDEX IF EXISTS idx_ereignisse_spieler_tore;
+ALTER TABLE "Ereignisse"
+    DROP COLUMN IF EXISTS "Tor_Art",
+    DROP COLUMN IF EXISTS "Halbzeit",
+    DROP COLUMN IF EXISTS "Spiel_Sekunde";
@@ -0,0 +1,36 @@
+-- Migration 0006: Beim Import geparste Ereignisspalten (analyse_game_json.extract_data_from_game_json).
+-- Zeitanalysen zerlegten bisher "Spiel_Minute" (TEXT 'MM:SS') je Zeile mit SPLIT_PART/STRPOS, kein Index
+-- konnte helfen. Jetzt: "Spiel_Sekunde" (Sekunden seit Anpfiff), "Halbzeit" (aus den StartPeriod-Ereignissen
+-- des Spiels, 3+ = Verlängerung) und "Tor_Art" ('Feldtor' / '7m', NULL für alle anderen Ereignisse).
+ALTER TABLE "Ereignisse"
+    ADD COLUMN IF NOT EXISTS "Spiel_Sekunde" INTEGER,
+    ADD COLUMN IF NOT EXISTS "Halbzeit" SMALLINT,
+    ADD COLUMN IF NOT EXISTS "Tor_Art" TEXT;
+
+-- Altbestand wie parse_game_second bzw. GOAL_KINDS füllen
+UPDATE "Ereignisse" SET
+    "Spiel_Sekunde" = CASE WHEN "Spiel_Minute" ~ '^\d+:\d{2}$'
+                           THEN SPLIT_PART("Spiel_Minute", ':', 1)::INTEGER * 60 + SPLIT_PART("Spiel_Minute", ':', 2)::INTEGER END,
+    "Tor_Art" = CASE "Typ" WHEN 'Goal' THEN 'Feldtor' WHEN 'SevenMeterGoal' THEN '7m' END;
+
+-- Halbzeit wie get_game_half: Anzahl der Anpfiffe vor dem Ereignis (beim StartPeriod-Ereignis einschließlich)
+WITH anpfiffe AS (
+    SELECT "Spiel_ID", ARRAY_AGG("Spiel_Sekunde") AS sekunden
+    FROM "Ereignisse" WHERE "Typ" = 'StartPeriod' AND "Spiel_Sekunde" IS NOT NULL
+    GROUP BY "Spiel_ID"
+)
+UPDATE "Ereignisse" e SET "Halbzeit" = GREATEST(1, (
+    SELECT COUNT(*) FROM UNNEST(a.sekunden) s
+    WHERE s < e."Spiel_Sekunde" OR (e."Typ" = 'StartPeriod' AND s = e."Spiel_Sekunde")
+))
+FROM anpfiffe a
+WHERE a."Spiel_ID" = e."Spiel_ID" AND e."Spiel_Sekunde" IS NOT NULL;
+
+-- Tor-Zeitpunkte eines Spielers (fetch_player_goal_timing_stats): nur Tore, Spiel_ID für den Saison-Join im Index
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_tore ON "Ereignisse" ("Referenz_Spieler_ID", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Spiel_ID") WHERE "Tor_Art" IS NOT NULL;
+-- Torverteilung von Liga und Team (fetch_league_goal_timing, fetch_team_goal_timing): je Spiel nur die Tore
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel_tore ON "Ereignisse" ("Spiel_ID", "Halbzeit", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Team_Seite") WHERE "Tor_Art" IS NOT NULL;
+
+ANALYZE "Ereignisse";
@@ -0,0 +1,8 @@
+DROP INDEX IF EXISTS idx_ligen_altersgruppe;
+DROP INDEX IF EXISTS idx_ligen_basisname;
+DROP INDEX IF EXISTS idx_spiele_saison;
+ALTER TABLE "Ligen"
+    DROP COLUMN IF EXISTS "Altersgruppe_Anzeige",
+    DROP COLUMN IF EXISTS "Geschlecht",
+    DROP COLUMN IF EXISTS "Basisname";
+ALTER TABLE "Spiele" DROP COLUMN IF EXISTS "Saison";
@@ -0,0 +1,52 @@
+-- Migration 0007: Beim Import gespeicherte Liga-Merkmale und Saison je Spiel.
+-- Fast jede Liga-, Team- und Spielerabfrage joinete "Ligen" nur für l."Saison", und die Seiten zogen
+-- Basisname und deutsche Altersgruppe bei jedem Aufruf per Regex aus dem Liganamen. Jetzt:
+--   "Spiele"."Saison"                 = Saison der Liga des Spiels (analyse_game_json.GAME_COLS_INITIAL)
+--   "Ligen"."Basisname"               = Name ohne " (JJJJ/JJJJ)"        (utils/league_names.base_league_name)
+--   "Ligen"."Geschlecht"              = 'm' / 'w' / NULL aus dem Namen  (utils/league_names.league_gender)
+--   "Ligen"."Altersgruppe_Anzeige"    = z.B. 'mA-Jugend', 'Senioren'    (utils/league_names.translate_age_group)
+ALTER TABLE "Spiele" ADD COLUMN IF NOT EXISTS "Saison" TEXT;
+ALTER TABLE "Ligen"
+    ADD COLUMN IF NOT EXISTS "Basisname" TEXT,
+    ADD COLUMN IF NOT EXISTS "Geschlecht" TEXT,
+    ADD COLUMN IF NOT EXISTS "Altersgruppe_Anzeige" TEXT;
+
+UPDATE "Spiele" sp SET "Saison" = l."Saison"
+FROM "Ligen" l
+WHERE l."Liga_ID" = sp."Liga_ID";
+ALTER TABLE "Spiele" ALTER COLUMN "Saison" SET NOT NULL;
+
+-- Altbestand wie utils/league_names.py füllen
+UPDATE "Ligen" SET
+    "Basisname" = CASE WHEN "Name" ~ '^(.*)\s*\(\d{4}/\d{4}\)$'
+                       THEN REGEXP_REPLACE(SUBSTRING("Name" FROM '^(.*)\(\d{4}/\d{4}\)$'), '^\s+|\s+$', '', 'g')
+                       ELSE "Name" END,
+    "Geschlecht" = CASE WHEN LOWER("Name") LIKE ANY (ARRAY['%männlich%', '%herren%', '%jungen%']) THEN 'm'
+                        WHEN LOWER("Name") LIKE ANY (ARRAY['%weiblich%', '%frauen%', '%mädchen%']) THEN 'w' END;
+
+WITH uebersetzt AS (
+    SELECT "Liga_ID", CASE "Altersgruppe"
+        WHEN 'AYouth' THEN 'A-Jugend' WHEN 'BYouth' THEN 'B-Jugend' WHEN 'CYouth' THEN 'C-Jugend'
+        WHEN 'DYouth' THEN 'D-Jugend' WHEN 'EYouth' THEN 'E-Jugend' WHEN 'FYouth' THEN 'F-Jugend'
+        WHEN 'Adults' THEN 'Senioren' WHEN 'Mini' THEN 'Minis'
+        ELSE COALESCE("Altersgruppe", 'Senioren/Andere') END AS deutsch
+    FROM "Ligen"
+)
+UPDATE "Ligen" l SET "Altersgruppe_Anzeige" = CASE
+    WHEN u.deutsch LIKE '%Jugend%' AND l."Geschlecht" IS NOT NULL THEN l."Geschlecht" || u.deutsch
+    ELSE u.deutsch END
+FROM uebersetzt u
+WHERE u."Liga_ID" = l."Liga_ID";
+
+ALTER TABLE "Ligen"
+    ALTER COLUMN "Basisname" SET NOT NULL,
+    ALTER COLUMN "Altersgruppe_Anzeige" SET NOT NULL;
+
+-- Saisonweite Abfragen über alle Ligen (Spielerlisten, Ranglisten) ohne Umweg über "Ligen"
+CREATE INDEX IF NOT EXISTS idx_spiele_saison ON "Spiele" ("Saison", "Liga_ID");
+-- Ligenauswahl nach Basisname und Saison (Ligen- und Vereine-Seite, Suche)
+CREATE INDEX IF NOT EXISTS idx_ligen_basisname ON "Ligen" ("Basisname", "Saison");
+CREATE INDEX IF NOT EXISTS idx_ligen_altersgruppe ON "Ligen" ("Altersgruppe_Anzeige", "Geschlecht");
+
+ANALYZE "Spiele";
+ANALYZE "Ligen";
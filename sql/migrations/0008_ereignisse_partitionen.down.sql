@@ -0,0 +1,42 @@
+-- Zurück zur unpartitionierten Tabelle. Abgehängte (archivierte) Partitionen bleiben als eigene Tabellen bestehen.
+ALTER TABLE "Ereignisse" RENAME TO "Ereignisse_partitioniert";
+ALTER INDEX "Ereignisse_pkey" RENAME TO "Ereignisse_partitioniert_pkey";
+ALTER TABLE "Ereignisse_partitioniert" DROP CONSTRAINT "Ereignisse_Spiel_ID_fkey", DROP CONSTRAINT "Ereignisse_Referenz_Spieler_ID_fkey";
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY NONE;
+DROP INDEX IF EXISTS idx_ereignisse_spiel, idx_ereignisse_typ, idx_ereignisse_spieler, idx_ereignisse_spieler_typ,
+                     idx_ereignisse_spieler_tore, idx_ereignisse_spiel_tore;
+
+CREATE TABLE "Ereignisse" (
+    "Ereignis_Auto_ID" INTEGER PRIMARY KEY DEFAULT nextval('"Ereignisse_Ereignis_Auto_ID_seq"'),
+    "H4A_Ereignis_ID" INTEGER NOT NULL,
+    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Zeitstempel" BIGINT NOT NULL, "Spiel_Minute" TEXT NOT NULL, "Typ" TEXT NOT NULL,
+    "Score_Heim" INTEGER, "Score_Gast" INTEGER, "Team_Seite" TEXT, "Nachricht" TEXT,
+    "Referenz_Spieler_ID" TEXT REFERENCES "Spieler"("Spieler_ID") ON DELETE SET NULL,
+    "Spiel_Sekunde" INTEGER, "Halbzeit" SMALLINT, "Tor_Art" TEXT,
+    UNIQUE("Spiel_ID", "H4A_Ereignis_ID")
+);
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY "Ereignisse"."Ereignis_Auto_ID";
+
+INSERT INTO "Ereignisse" ("Ereignis_Auto_ID", "H4A_Ereignis_ID", "Spiel_ID", "Zeitstempel", "Spiel_Minute", "Typ",
+                          "Score_Heim", "Score_Gast", "Team_Seite", "Nachricht", "Referenz_Spieler_ID",
+                          "Spiel_Sekunde", "Halbzeit", "Tor_Art")
+SELECT "Ereignis_Auto_ID", "H4A_Ereignis_ID", "Spiel_ID", "Zeitstempel", "Spiel_Minute", "Typ",
+       "Score_Heim", "Score_Gast", "Team_Seite", "Nachricht", "Referenz_Spieler_ID",
+       "Spiel_Sekunde", "Halbzeit", "Tor_Art"
+FROM "Ereignisse_partitioniert";
+
+DROP TABLE "Ereignisse_partitioniert";
+DROP FUNCTION IF EXISTS ereignisse_partition_anlegen(TEXT);
+DROP FUNCTION IF EXISTS ereignisse_partition_name(TEXT);
+
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel ON "Ereignisse" ("Spiel_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_typ ON "Ereignisse" ("Typ");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler ON "Ereignisse" ("Referenz_Spieler_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_typ ON "Ereignisse" ("Referenz_Spieler_ID", "Typ");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_tore ON "Ereignisse" ("Referenz_Spieler_ID", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Spiel_ID") WHERE "Tor_Art" IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel_tore ON "Ereignisse" ("Spiel_ID", "Halbzeit", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Team_Seite") WHERE "Tor_Art" IS NOT NULL;
+
+ANALYZE "Ereignisse";
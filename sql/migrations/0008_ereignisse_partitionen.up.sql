@@ -0,0 +1,79 @@
+-- Migration 0008: "Ereignisse" deklarativ nach Saison partitioniert (LIST), eine Partition je Saison.
+-- Die Tabelle wächst mit jeder Saison um Dutzende Zeilen je Spiel; Torverteilungen, Spielereignisse und
+-- Spielverläufe lesen aber fast immer nur eine Saison. Mit "Saison" in jeder Zeile (wie "Spiele"."Saison")
+-- schließt der Planer die übrigen Partitionen aus, und abgeschlossene Saisons lassen sich per
+-- DETACH/ATTACH archivieren (python createDB_postgresql.py detach|attach SAISON).
+-- Neue Partitionen legt der Import über ereignisse_partition_anlegen() an (analyse_game_json.ensure_event_partitions).
+
+CREATE OR REPLACE FUNCTION ereignisse_partition_name(saison TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT 'Ereignisse_' || REGEXP_REPLACE(saison, '[^0-9A-Za-z]+', '_', 'g')
+$$;
+
+-- Legt die Partition einer Saison an, falls sie fehlt. Gibt ihren Namen zurück.
+-- Eine abgehängte (archivierte) Partition wird nicht stillschweigend ersetzt.
+CREATE OR REPLACE FUNCTION ereignisse_partition_anlegen(saison TEXT) RETURNS TEXT
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition TEXT := ereignisse_partition_name(saison);
+BEGIN
+    IF to_regclass(format('%I', partition)) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF "Ereignisse" FOR VALUES IN (%L)', partition, saison);
+    ELSIF NOT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(format('%I', partition))
+                                                  AND inhparent = '"Ereignisse"'::regclass) THEN
+        RAISE EXCEPTION 'Partition % der Saison % ist abgehängt (archiviert), bitte zuerst wieder anhängen.', partition, saison;
+    END IF;
+    RETURN partition;
+END
+$$;
+
+-- Bestehende Tabelle umbauen: Sequenz übernehmen, Daten mit Saison aus "Spiele" umkopieren
+ALTER TABLE "Ereignisse" RENAME TO "Ereignisse_vor_0008";
+ALTER INDEX "Ereignisse_pkey" RENAME TO "Ereignisse_vor_0008_pkey";
+ALTER TABLE "Ereignisse_vor_0008" DROP CONSTRAINT "Ereignisse_Spiel_ID_fkey", DROP CONSTRAINT "Ereignisse_Referenz_Spieler_ID_fkey";
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY NONE;
+DROP INDEX IF EXISTS idx_ereignisse_spiel, idx_ereignisse_typ, idx_ereignisse_spieler, idx_ereignisse_spieler_typ,
+                     idx_ereignisse_spieler_tore, idx_ereignisse_spiel_tore;
+
+CREATE TABLE "Ereignisse" (
+    "Ereignis_Auto_ID" INTEGER NOT NULL DEFAULT nextval('"Ereignisse_Ereignis_Auto_ID_seq"'),
+    "H4A_Ereignis_ID" INTEGER NOT NULL,
+    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Zeitstempel" BIGINT NOT NULL, "Spiel_Minute" TEXT NOT NULL, "Typ" TEXT NOT NULL,
+    "Score_Heim" INTEGER, "Score_Gast" INTEGER, "Team_Seite" TEXT, "Nachricht" TEXT,
+    "Referenz_Spieler_ID" TEXT REFERENCES "Spieler"("Spieler_ID") ON DELETE SET NULL,
+    "Spiel_Sekunde" INTEGER, "Halbzeit" SMALLINT, "Tor_Art" TEXT,
+    "Saison" TEXT NOT NULL,
+    -- Eindeutigkeit muss den Partitionsschlüssel enthalten; "Saison" hängt ohnehin am Spiel
+    PRIMARY KEY ("Ereignis_Auto_ID", "Saison"),
+    UNIQUE ("Spiel_ID", "H4A_Ereignis_ID", "Saison")
+) PARTITION BY LIST ("Saison");
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY "Ereignisse"."Ereignis_Auto_ID";
+
+SELECT ereignisse_partition_anlegen(s."Saison") FROM (SELECT DISTINCT "Saison" FROM "Spiele") s;
+
+INSERT INTO "Ereignisse" ("Ereignis_Auto_ID", "H4A_Ereignis_ID", "Spiel_ID", "Zeitstempel", "Spiel_Minute", "Typ",
+                          "Score_Heim", "Score_Gast", "Team_Seite", "Nachricht", "Referenz_Spieler_ID",
+                          "Spiel_Sekunde", "Halbzeit", "Tor_Art", "Saison")
+SELECT e."Ereignis_Auto_ID", e."H4A_Ereignis_ID", e."Spiel_ID", e."Zeitstempel", e."Spiel_Minute", e."Typ",
+       e."Score_Heim", e."Score_Gast", e."Team_Seite", e."Nachricht", e."Referenz_Spieler_ID",
+       e."Spiel_Sekunde", e."Halbzeit", e."Tor_Art", sp."Saison"
+FROM "Ereignisse_vor_0008" e
+JOIN "Spiele" sp ON sp."Spiel_ID" = e."Spiel_ID";
+
+DROP TABLE "Ereignisse_vor_0008";
+
+-- Indizes wie bisher, auf der Elterntabelle angelegt und damit für jede (auch künftige) Partition
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel ON "Ereignisse" ("Spiel_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_typ ON "Ereignisse" ("Typ");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler ON "Ereignisse" ("Referenz_Spieler_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_typ ON "Ereignisse" ("Referenz_Spieler_ID", "Typ");
+-- Die Tor-Indizes tragen "Saison" mit, damit Saisonfilter (Partitionsausschluss) Index-Only-Scans nicht verhindern
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_tore ON "Ereignisse" ("Referenz_Spieler_ID", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Spiel_ID", "Saison") WHERE "Tor_Art" IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel_tore ON "Ereignisse" ("Spiel_ID", "Halbzeit", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Team_Seite", "Saison") WHERE "Tor_Art" IS NOT NULL;
+
+-- Index-Only-Scans brauchen die Sichtbarkeitskarte: nach der Migration einmal VACUUM ANALYZE "Ereignisse"
+-- (außerhalb einer Transaktion) ausführen, sonst bis zum nächsten Autovacuum Seq Scans
+ANALYZE "Ereignisse";
@@ -0,0 +1,61 @@
+-- Zurück zu "Ereignisse" als partitionierter Tabelle mit Klartextspalten (Stand 0008).
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class c
+               WHERE c.relkind = 'r' AND c.relname LIKE 'Ereignisse\_%' AND NOT c.relispartition) THEN
+        RAISE EXCEPTION 'Abgehängte Ereignis-Partitionen vorhanden, bitte vor dem Zurückrollen von 0009 wieder anhängen.';
+    END IF;
+END
+$$;
+
+CREATE TEMP TABLE ereignisse_0009 ON COMMIT DROP AS SELECT * FROM "Ereignisse";
+
+DROP VIEW "Ereignisse";
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY NONE;
+DROP TABLE "Ereignisse_Daten";
+DROP TABLE IF EXISTS "Ereignis_Typen", "Ereignis_Seiten", "Ereignis_Vorlagen";
+DROP FUNCTION IF EXISTS ereignis_nachricht(TEXT, TEXT);
+
+CREATE TABLE "Ereignisse" (
+    "Ereignis_Auto_ID" INTEGER NOT NULL DEFAULT nextval('"Ereignisse_Ereignis_Auto_ID_seq"'),
+    "H4A_Ereignis_ID" INTEGER NOT NULL,
+    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Zeitstempel" BIGINT NOT NULL, "Spiel_Minute" TEXT NOT NULL, "Typ" TEXT NOT NULL,
+    "Score_Heim" INTEGER, "Score_Gast" INTEGER, "Team_Seite" TEXT, "Nachricht" TEXT,
+    "Referenz_Spieler_ID" TEXT REFERENCES "Spieler"("Spieler_ID") ON DELETE SET NULL,
+    "Spiel_Sekunde" INTEGER, "Halbzeit" SMALLINT, "Tor_Art" TEXT,
+    "Saison" TEXT NOT NULL,
+    PRIMARY KEY ("Ereignis_Auto_ID", "Saison"),
+    UNIQUE ("Spiel_ID", "H4A_Ereignis_ID", "Saison")
+) PARTITION BY LIST ("Saison");
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY "Ereignisse"."Ereignis_Auto_ID";
+
+CREATE OR REPLACE FUNCTION ereignisse_partition_anlegen(saison TEXT) RETURNS TEXT
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition TEXT := ereignisse_partition_name(saison);
+BEGIN
+    IF to_regclass(format('%I', partition)) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF "Ereignisse" FOR VALUES IN (%L)', partition, saison);
+    ELSIF NOT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(format('%I', partition))
+                                                  AND inhparent = '"Ereignisse"'::regclass) THEN
+        RAISE EXCEPTION 'Partition % der Saison % ist abgehängt (archiviert), bitte zuerst wieder anhängen.', partition, saison;
+    END IF;
+    RETURN partition;
+END
+$$;
+
+SELECT ereignisse_partition_anlegen(s."Saison") FROM (SELECT DISTINCT "Saison" FROM "Spiele") s;
+
+INSERT INTO "Ereignisse" SELECT * FROM ereignisse_0009;
+
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel ON "Ereignisse" ("Spiel_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_typ ON "Ereignisse" ("Typ");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler ON "Ereignisse" ("Referenz_Spieler_ID");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_typ ON "Ereignisse" ("Referenz_Spieler_ID", "Typ");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_tore ON "Ereignisse" ("Referenz_Spieler_ID", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Spiel_ID", "Saison") WHERE "Tor_Art" IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel_tore ON "Ereignisse" ("Spiel_ID", "Halbzeit", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Team_Seite", "Saison") WHERE "Tor_Art" IS NOT NULL;
+
+ANALYZE "Ereignisse";
@@ -0,0 +1,135 @@
+-- Migration 0009: kompakte Ablage der Ereignisse.
+-- "Typ" und "Team_Seite" wiederholen in jeder Zeile dieselben wenigen Texte, "Nachricht" besteht fast immer
+-- aus einer festen Vorlage mit Spielername und Rückennummer ("Tor durch Max Muster (7.)", seltener "Tor durch 7.
+-- (Max Muster)"). Die Daten liegen jetzt in "Ereignisse_Daten" mit SMALLINT-Codes aus Nachschlagetabellen und
+-- Nachricht als Vorlagen-ID plus Parametern. Die Sicht "Ereignisse" setzt die bisherigen Spalten wieder zusammen,
+-- lesende Abfragen bleiben unverändert. Geschrieben wird in "Ereignisse_Daten" (analyse_game_json.encode_events).
+-- Außerdem entfallen die Indizes auf "Spiel_ID" und "Referenz_Spieler_ID" allein (führende Spalten des
+-- Eindeutigkeits- bzw. des Spieler/Typ-Index) und "Spiel_ID" im Spieler-Tor-Index (seit 0008 ungenutzt).
+
+DO $$
+BEGIN
+    -- Abgehängte Partitionen haben noch das alte Format und ließen sich danach nicht mehr anhängen
+    IF EXISTS (SELECT 1 FROM pg_class c
+               WHERE c.relkind = 'r' AND c.relname LIKE 'Ereignisse\_%' AND NOT c.relispartition) THEN
+        RAISE EXCEPTION 'Abgehängte Ereignis-Partitionen vorhanden, bitte vor Migration 0009 wieder anhängen.';
+    END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS "Ereignis_Typen" (
+    "Typ_Code" SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    "Typ" TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS "Ereignis_Seiten" (
+    "Seite_Code" SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    "Team_Seite" TEXT NOT NULL UNIQUE
+);
+-- Vorlagen im format()-Stil: %s je Parameter, ein literales % als %%
+CREATE TABLE IF NOT EXISTS "Ereignis_Vorlagen" (
+    "Vorlage_ID" INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    "Vorlage" TEXT NOT NULL UNIQUE
+);
+
+-- Nachricht aus Vorlage und Parametern (durch E'\x1f' getrennt), Gegenstück zu analyse_game_json.split_event_message
+CREATE OR REPLACE FUNCTION ereignis_nachricht(vorlage TEXT, parameter TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT format(vorlage, VARIADIC COALESCE(string_to_array(parameter, E'\x1f'), '{}'::TEXT[]))
+$$;
+
+-- Bestand zerlegen (gleiche Regeln wie split_event_message, "Name (7.)" vor "7. (Name)") und in eine temporäre
+-- Tabelle kopieren
+CREATE TEMP TABLE ereignisse_0009 ON COMMIT DROP AS
+SELECT e.*,
+       CASE WHEN z.m IS NULL THEN REPLACE(e."Nachricht", '%', '%%')
+            ELSE REPLACE(z.m[1], '%', '%%') || z.endung END AS vorlage,
+       CASE WHEN z.m IS NOT NULL THEN z.m[2] || E'\x1f' || z.m[3] END AS parameter
+FROM "Ereignisse" e
+CROSS JOIN LATERAL (
+    SELECT CASE WHEN STRPOS(e."Nachricht", E'\x1f') = 0
+                THEN REGEXP_MATCH(e."Nachricht", '^(.* (?:durch|für) )(.+) \((\d+)\.\)$') END AS name_nummer,
+           CASE WHEN STRPOS(e."Nachricht", E'\x1f') = 0
+                THEN REGEXP_MATCH(e."Nachricht", '^(.* (?:durch|für) )(\d+)\. \((.+)\)$') END AS nummer_name
+) r
+CROSS JOIN LATERAL (
+    SELECT COALESCE(r.name_nummer, r.nummer_name) AS m,
+           CASE WHEN r.name_nummer IS NOT NULL THEN '%s (%s.)' ELSE '%s. (%s)' END AS endung
+) z;
+
+INSERT INTO "Ereignis_Typen" ("Typ") SELECT DISTINCT "Typ" FROM ereignisse_0009 ORDER BY 1;
+INSERT INTO "Ereignis_Seiten" ("Team_Seite") SELECT DISTINCT "Team_Seite" FROM ereignisse_0009 WHERE "Team_Seite" IS NOT NULL ORDER BY 1;
+INSERT INTO "Ereignis_Vorlagen" ("Vorlage") SELECT DISTINCT vorlage FROM ereignisse_0009 WHERE vorlage IS NOT NULL ORDER BY 1;
+
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY NONE;
+DROP TABLE "Ereignisse";
+
+-- Spalten nach Ausrichtung sortiert (8, 4, 2 Byte, dann Texte), das spart Füllbytes je Zeile
+CREATE TABLE "Ereignisse_Daten" (
+    "Zeitstempel" BIGINT NOT NULL,
+    "Ereignis_Auto_ID" INTEGER NOT NULL DEFAULT nextval('"Ereignisse_Ereignis_Auto_ID_seq"'),
+    "H4A_Ereignis_ID" INTEGER NOT NULL,
+    "Score_Heim" INTEGER, "Score_Gast" INTEGER, "Spiel_Sekunde" INTEGER,
+    "Vorlage_ID" INTEGER REFERENCES "Ereignis_Vorlagen"("Vorlage_ID"),
+    "Typ_Code" SMALLINT NOT NULL REFERENCES "Ereignis_Typen"("Typ_Code"),
+    "Seite_Code" SMALLINT REFERENCES "Ereignis_Seiten"("Seite_Code"),
+    "Halbzeit" SMALLINT,
+    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Saison" TEXT NOT NULL,
+    "Spiel_Minute" TEXT NOT NULL,
+    "Referenz_Spieler_ID" TEXT REFERENCES "Spieler"("Spieler_ID") ON DELETE SET NULL,
+    "Tor_Art" TEXT,
+    "Nachricht_Parameter" TEXT,
+    PRIMARY KEY ("Ereignis_Auto_ID", "Saison"),
+    UNIQUE ("Spiel_ID", "H4A_Ereignis_ID", "Saison")
+) PARTITION BY LIST ("Saison");
+ALTER SEQUENCE "Ereignisse_Ereignis_Auto_ID_seq" OWNED BY "Ereignisse_Daten"."Ereignis_Auto_ID";
+
+CREATE OR REPLACE FUNCTION ereignisse_partition_anlegen(saison TEXT) RETURNS TEXT
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition TEXT := ereignisse_partition_name(saison);
+BEGIN
+    IF to_regclass(format('%I', partition)) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF "Ereignisse_Daten" FOR VALUES IN (%L)', partition, saison);
+    ELSIF NOT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(format('%I', partition))
+                                                  AND inhparent = '"Ereignisse_Daten"'::regclass) THEN
+        RAISE EXCEPTION 'Partition % der Saison % ist abgehängt (archiviert), bitte zuerst wieder anhängen.', partition, saison;
+    END IF;
+    RETURN partition;
+END
+$$;
+
+SELECT ereignisse_partition_anlegen(s."Saison") FROM (SELECT DISTINCT "Saison" FROM "Spiele") s;
+
+INSERT INTO "Ereignisse_Daten" ("Zeitstempel", "Ereignis_Auto_ID", "H4A_Ereignis_ID", "Score_Heim", "Score_Gast",
+                                "Spiel_Sekunde", "Vorlage_ID", "Typ_Code", "Seite_Code", "Halbzeit", "Spiel_ID",
+                                "Saison", "Spiel_Minute", "Referenz_Spieler_ID", "Tor_Art", "Nachricht_Parameter")
+SELECT e."Zeitstempel", e."Ereignis_Auto_ID", e."H4A_Ereignis_ID", e."Score_Heim", e."Score_Gast",
+       e."Spiel_Sekunde", v."Vorlage_ID", t."Typ_Code", s."Seite_Code", e."Halbzeit", e."Spiel_ID",
+       e."Saison", e."Spiel_Minute", e."Referenz_Spieler_ID", e."Tor_Art", e.parameter
+FROM ereignisse_0009 e
+JOIN "Ereignis_Typen" t ON t."Typ" = e."Typ"
+LEFT JOIN "Ereignis_Seiten" s ON s."Team_Seite" = e."Team_Seite"
+LEFT JOIN "Ereignis_Vorlagen" v ON v."Vorlage" = e.vorlage;
+
+-- Bisherige Spalten in bisheriger Reihenfolge. LEFT JOINs auf eindeutige Schlüssel entfernt der Planer, wenn eine
+-- Abfrage die Spalte nicht braucht; die Codes liest der Scan aber trotzdem, deshalb tragen die Tor-Indizes sie mit
+-- (sonst kein Index-Only-Scan für die Torverteilungen).
+CREATE VIEW "Ereignisse" AS
+SELECT d."Ereignis_Auto_ID", d."H4A_Ereignis_ID", d."Spiel_ID", d."Zeitstempel", d."Spiel_Minute", t."Typ",
+       d."Score_Heim", d."Score_Gast", s."Team_Seite", ereignis_nachricht(v."Vorlage", d."Nachricht_Parameter") AS "Nachricht",
+       d."Referenz_Spieler_ID", d."Spiel_Sekunde", d."Halbzeit", d."Tor_Art", d."Saison"
+FROM "Ereignisse_Daten" d
+LEFT JOIN "Ereignis_Typen" t ON t."Typ_Code" = d."Typ_Code"
+LEFT JOIN "Ereignis_Seiten" s ON s."Seite_Code" = d."Seite_Code"
+LEFT JOIN "Ereignis_Vorlagen" v ON v."Vorlage_ID" = d."Vorlage_ID";
+
+CREATE INDEX IF NOT EXISTS idx_ereignisse_typ ON "Ereignisse_Daten" ("Typ_Code");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_typ ON "Ereignisse_Daten" ("Referenz_Spieler_ID", "Typ_Code");
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spieler_tore ON "Ereignisse_Daten" ("Referenz_Spieler_ID", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Typ_Code", "Seite_Code", "Vorlage_ID", "Saison") WHERE "Tor_Art" IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ereignisse_spiel_tore ON "Ereignisse_Daten" ("Spiel_ID", "Halbzeit", "Spiel_Sekunde")
+    INCLUDE ("Tor_Art", "Typ_Code", "Seite_Code", "Vorlage_ID", "Saison") WHERE "Tor_Art" IS NOT NULL;
+
+-- Wie nach 0008: danach einmal VACUUM ANALYZE "Ereignisse_Daten" für Index-Only-Scans
+ANALYZE "Ereignisse_Daten";
@@ -0,0 +1,35 @@
+-- Migration 0010: Spielverlauf (Score-Worm) je Spiel, beim Import aus den Ereignissen abgeleitet
+-- (utils/score_timeline.py). Der Spielverlauf-Tab las bisher alle Ereignisse des Spiels und baute den
+-- Verlauf bei jedem Aufruf in pandas; jetzt eine Zeile je Spiel: je Punkt drei int16 big-endian
+-- (Spielsekunde, Tore Heim, Tore Gast), zuerst 0:0 in Sekunde 0, dann je Änderung des Spielstands.
+-- Eigene Tabelle statt Spalte in "Spiele", damit Scans über "Spiele" nicht die Verläufe mitlesen.
+CREATE TABLE IF NOT EXISTS "Spielverlaeufe" (
+    "Spiel_ID" TEXT PRIMARY KEY REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Spielverlauf" BYTEA NOT NULL
+);
+
+-- Altbestand wie encode_score_timeline: Reihenfolge nach Zeitstempel und H4A-ID, fehlende Spieluhr erbt
+-- die zuletzt bekannte Sekunde (laufendes Maximum), Werte auf den int16-Bereich begrenzt
+WITH staende AS (
+    SELECT "Spiel_ID", "Zeitstempel", "H4A_Ereignis_ID", "Score_Heim", "Score_Gast",
+           COALESCE(MAX("Spiel_Sekunde") OVER w, 0) AS sekunde,
+           ("Score_Heim", "Score_Gast") IS DISTINCT FROM
+               (LAG("Score_Heim", 1, 0) OVER w, LAG("Score_Gast", 1, 0) OVER w) AS geaendert
+    FROM "Ereignisse"
+    WHERE "Score_Heim" IS NOT NULL AND "Score_Gast" IS NOT NULL
+    WINDOW w AS (PARTITION BY "Spiel_ID" ORDER BY "Zeitstempel", "H4A_Ereignis_ID" ROWS UNBOUNDED PRECEDING)
+), verlaeufe AS (
+    SELECT "Spiel_ID",
+           '\x000000000000'::BYTEA || COALESCE(STRING_AGG(
+               INT2SEND(LEAST(GREATEST(sekunde, 0), 32767)::SMALLINT)
+               || INT2SEND(LEAST(GREATEST("Score_Heim", 0), 32767)::SMALLINT)
+               || INT2SEND(LEAST(GREATEST("Score_Gast", 0), 32767)::SMALLINT),
+               ''::BYTEA ORDER BY "Zeitstempel", "H4A_Ereignis_ID") FILTER (WHERE geaendert), ''::BYTEA) AS verlauf
+    FROM staende
+    GROUP BY "Spiel_ID"
+)
+INSERT INTO "Spielverlaeufe" ("Spiel_ID", "Spielverlauf")
+SELECT "Spiel_ID", verlauf FROM verlaeufe
+ON CONFLICT ("Spiel_ID") DO UPDATE SET "Spielverlauf" = excluded."Spielverlauf";
+
+ANALYZE "Spielverlaeufe";
@@ -0,0 +1,2 @@
+DROP TABLE IF EXISTS "Team_Ratings";
+DROP TABLE IF EXISTS "Team_Rating_Verlauf";
@@ -0,0 +1,30 @@
+-- Migration 0011: Elo-Rating je Team über alle Ligen und Saisons (utils/team_ratings.py).
+-- "Team_Rating_Verlauf" hält je gewertetem Spiel und Team das Rating vor und nach dem Spiel, "Team_Ratings"
+-- den aktuellen Stand je Team. Gepflegt beim Import (analyse_game_json.update_team_ratings): neue Spiele
+-- werden ab dem frühesten geänderten Spiel nachgerechnet, nicht alles neu. Das Rating ist eine Folge
+-- über alle Spiele und lässt sich nicht in SQL nachfüllen; für Bestandsdaten einmal neu berechnen
+-- (Admin-Seite "Team-Ratings neu berechnen" bzw. analyse_game_json.rebuild_team_ratings).
+CREATE TABLE IF NOT EXISTS "Team_Rating_Verlauf" (
+    "Spiel_ID" TEXT NOT NULL REFERENCES "Spiele"("Spiel_ID") ON DELETE CASCADE,
+    "Team_ID" TEXT NOT NULL, -- Heim- oder Gastteam des Spiels; Team gelöscht -> Spiel gelöscht -> Zeile gelöscht
+    "Start_Zeit" BIGINT NOT NULL,
+    "Saison" TEXT NOT NULL,
+    "Heim" BOOLEAN NOT NULL,
+    "Tore" INTEGER NOT NULL, "Gegentore" INTEGER NOT NULL,
+    "Spiel_Nr" INTEGER NOT NULL,
+    "Rating_Vorher" DOUBLE PRECISION NOT NULL, "Rating_Nachher" DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY ("Spiel_ID", "Team_ID")
+);
+-- Verlauf eines Teams, letzter Stand je Team vor einem Spiel (SQL_RATING_STATE_BEFORE) und "Team_Ratings"
+CREATE INDEX IF NOT EXISTS idx_team_rating_verlauf_team ON "Team_Rating_Verlauf" ("Team_ID", "Start_Zeit", "Spiel_ID");
+-- Nachrechnen ab einem Spiel: alles ab (Start_Zeit, Spiel_ID) löschen
+CREATE INDEX IF NOT EXISTS idx_team_rating_verlauf_zeit ON "Team_Rating_Verlauf" ("Start_Zeit", "Spiel_ID");
+
+CREATE TABLE IF NOT EXISTS "Team_Ratings" (
+    "Team_ID" TEXT PRIMARY KEY REFERENCES "Teams"("Team_ID") ON DELETE CASCADE,
+    "Rating" DOUBLE PRECISION NOT NULL,
+    "Spiele" INTEGER NOT NULL,
+    "Saison" TEXT NOT NULL,
+    "Stand_Zeit" BIGINT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_team_ratings_rating ON "Team_Ratings" ("Rating" DESC);
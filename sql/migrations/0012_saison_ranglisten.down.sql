@@ -0,0 +1,2 @@
+DROP TABLE IF EXISTS "Saison_Spieler_Summen";
+-- Das nachgetragene Geschlecht der Männer-Ligen bleibt stehen (utils/league_names.py erkennt es weiterhin)
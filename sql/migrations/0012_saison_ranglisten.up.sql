@@ -0,0 +1,58 @@
+-- Migration 0012: Ligaübergreifende Ranglisten je Saison, Altersgruppe und Geschlecht.
+-- Die Ranglisten lasen bisher nur "Liga_Spieler_Summen" einer Liga; über alle Ligen hätte jede Abfrage die
+-- ganze Saison gruppieren müssen. "Saison_Spieler_Summen" hält die Summen je Spieler bereits über die Ligen
+-- einer Auswahl zusammengefasst, für jede Filterkombination eine Zeile ('Alle' = nicht gefiltert):
+--   (Altersgruppe, Geschlecht), (Altersgruppe, 'Alle'), ('Alle', Geschlecht), ('Alle', 'Alle')
+-- Je Kennzahl ein Index (Saison, Altersgruppe, Geschlecht, Kennzahl DESC): die ersten N einer Rangliste
+-- sind N Indexeinträge, unabhängig von der Zahl der Ligen und Spieler. Gepflegt beim Import für die Spieler
+-- der geänderten Rollup-Zeilen (analyse_game_json.refresh_season_player_summaries). Offizielle zählen nicht.
+-- Ligen ohne erkennbares Geschlecht (z.B. gemischte Minis) laufen unter 'x'.
+
+-- "Männer" wurde von utils/league_names.league_gender bisher nicht erkannt (Senioren-Ligen ohne Geschlecht)
+UPDATE "Ligen" SET "Geschlecht" = 'm' WHERE "Geschlecht" IS NULL AND LOWER("Name") LIKE '%männer%';
+
+CREATE TABLE IF NOT EXISTS "Saison_Spieler_Summen" (
+    "Saison" TEXT NOT NULL,
+    "Altersgruppe" TEXT NOT NULL, -- "Ligen"."Altersgruppe_Anzeige" oder 'Alle'
+    "Geschlecht" TEXT NOT NULL,   -- 'm', 'w', 'x' oder 'Alle'
+    "Spieler_ID" TEXT NOT NULL REFERENCES "Spieler"("Spieler_ID") ON DELETE CASCADE,
+    "Team_ID" TEXT NOT NULL,      -- Team und Liga mit den meisten Spielen in der Auswahl (Anzeige)
+    "Liga_ID" TEXT NOT NULL,
+    "Spiele" INTEGER NOT NULL, "Tore_Gesamt" INTEGER NOT NULL, "Tore_7m" INTEGER NOT NULL,
+    "Gelbe_Karten" INTEGER NOT NULL, "Rote_Karten" INTEGER NOT NULL, "Blaue_Karten" INTEGER NOT NULL,
+    "Zwei_Minuten_Strafen" INTEGER NOT NULL,
+    PRIMARY KEY ("Saison", "Spieler_ID", "Altersgruppe", "Geschlecht")
+);
+
+INSERT INTO "Saison_Spieler_Summen" ("Saison", "Altersgruppe", "Geschlecht", "Spieler_ID", "Team_ID", "Liga_ID",
+    "Spiele", "Tore_Gesamt", "Tore_7m", "Gelbe_Karten", "Rote_Karten", "Blaue_Karten", "Zwei_Minuten_Strafen")
+SELECT lss."Saison",
+       CASE WHEN GROUPING(l."Altersgruppe_Anzeige") = 1 THEN 'Alle' ELSE l."Altersgruppe_Anzeige" END,
+       CASE WHEN GROUPING(COALESCE(l."Geschlecht", 'x')) = 1 THEN 'Alle' ELSE COALESCE(l."Geschlecht", 'x') END,
+       lss."Spieler_ID",
+       (ARRAY_AGG(lss."Team_ID" ORDER BY lss."Spiele" DESC, lss."Liga_ID", lss."Team_ID"))[1],
+       (ARRAY_AGG(lss."Liga_ID" ORDER BY lss."Spiele" DESC, lss."Liga_ID", lss."Team_ID"))[1],
+       SUM(lss."Spiele"), SUM(lss."Tore_Gesamt"), SUM(lss."Tore_7m"), SUM(lss."Gelbe_Karten"),
+       SUM(lss."Rote_Karten"), SUM(lss."Blaue_Karten"), SUM(lss."Zwei_Minuten_Strafen")
+FROM "Liga_Spieler_Summen" lss
+JOIN "Ligen" l ON l."Liga_ID" = lss."Liga_ID"
+JOIN "Spieler" s ON s."Spieler_ID" = lss."Spieler_ID" AND s."Ist_Offizieller" = 0
+GROUP BY lss."Saison", lss."Spieler_ID",
+         GROUPING SETS ((l."Altersgruppe_Anzeige", COALESCE(l."Geschlecht", 'x')), (l."Altersgruppe_Anzeige"),
+                        (COALESCE(l."Geschlecht", 'x')), ())
+ON CONFLICT DO NOTHING;
+
+-- Top-N je Kennzahl (sql/fetch_season_leaderboards.sql); nur Spieler mit Wert > 0 stehen in einer Rangliste
+CREATE INDEX IF NOT EXISTS idx_saison_summen_tore ON "Saison_Spieler_Summen"
+    ("Saison", "Altersgruppe", "Geschlecht", "Tore_Gesamt" DESC, "Spieler_ID") WHERE "Tore_Gesamt" > 0;
+CREATE INDEX IF NOT EXISTS idx_saison_summen_zwei_minuten ON "Saison_Spieler_Summen"
+    ("Saison", "Altersgruppe", "Geschlecht", "Zwei_Minuten_Strafen" DESC, "Spieler_ID") WHERE "Zwei_Minuten_Strafen" > 0;
+CREATE INDEX IF NOT EXISTS idx_saison_summen_gelb ON "Saison_Spieler_Summen"
+    ("Saison", "Altersgruppe", "Geschlecht", "Gelbe_Karten" DESC, "Spieler_ID") WHERE "Gelbe_Karten" > 0;
+CREATE INDEX IF NOT EXISTS idx_saison_summen_rot ON "Saison_Spieler_Summen"
+    ("Saison", "Altersgruppe", "Geschlecht", "Rote_Karten" DESC, "Spieler_ID") WHERE "Rote_Karten" > 0;
+CREATE INDEX IF NOT EXISTS idx_saison_summen_blau ON "Saison_Spieler_Summen"
+    ("Saison", "Altersgruppe", "Geschlecht", "Blaue_Karten" DESC, "Spieler_ID") WHERE "Blaue_Karten" > 0;
+
+ANALYZE "Ligen";
+ANALYZE "Saison_Spieler_Summen";
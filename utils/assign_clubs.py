@@ -7,6 +7,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import db_queries_refactored as db_queries
+from utils.query_cache import SCOPE_ALL, bump_cache_versions
 
 # --- Logging Konfiguration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -59,6 +60,7 @@ def assign_clubs_to_teams():
 
         logger.info(f"{len(teams_df)} Teams gefunden. Starte die Vereinszuordnung...")
         processed_count = 0
+        changed_count = 0
 
         # 2. Durch jedes Team iterieren
         for index, team_row in teams_df.iterrows():
@@ -84,17 +86,22 @@ def assign_clubs_to_teams():
                 club_id = cursor.fetchone()[0]
                 logger.info(f"Neuer Verein '{base_club_name}' mit ID {club_id} angelegt.")
 
-            # 5. Team in der Datenbank aktualisieren und die Verein_ID zuweisen
-            cursor.execute('UPDATE "Teams" SET "Verein_ID" = %s WHERE "Team_ID" = %s', (club_id, team_id))
+            # 5. Team in der Datenbank aktualisieren und die Verein_ID zuweisen (nur bei Änderung)
+            cursor.execute('UPDATE "Teams" SET "Verein_ID" = %s WHERE "Team_ID" = %s AND "Verein_ID" IS DISTINCT FROM %s',
+                           (club_id, team_id, club_id))
+            changed_count += cursor.rowcount
 
             processed_count += 1
             if processed_count % 50 == 0:
                 logger.info(f"{processed_count}/{len(teams_df)} Teams verarbeitet...")
 
 
-        # 6. Änderungen in der Datenbank speichern
+        # 6. Änderungen in der Datenbank speichern; gecachte Ergebnisse und Suchindex aller App-Prozesse
+        #    (Vereinsübersicht, Teamlisten, Vereinssuche) hängen an der Zuordnung
+        if changed_count:
+            bump_cache_versions(cursor, [SCOPE_ALL])
         conn.commit()
-        logger.info(f"Zuordnung erfolgreich abgeschlossen! {processed_count} Teams wurden einem Verein zugeordnet.")
+        logger.info(f"Zuordnung erfolgreich abgeschlossen! {processed_count} Teams wurden einem Verein zugeordnet, {changed_count} davon neu.")
 
     except Exception as e:
         logger.error(f"Ein Fehler ist aufgetreten: {e}", exc_info=True)
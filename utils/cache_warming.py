@@ -0,0 +1,138 @@
+"""
+Vorwärmen des Ergebnis-Caches (utils/query_cache.py) im Hintergrund.
+
+Nach einem Neustart oder Import zahlt sonst der erste Besucher jeder Liga die kalten Abfragen.
+warm_caches() ruft für die Ligen mit den zuletzt beendeten Spielen (bzw. die Ligen eines Imports)
+dieselben get_*_cached Abfragen auf wie die Ligen-Seite und die Team-Analyse jeder Mannschaft.
+Bereits gecachte Ergebnisse kosten dabei nur einen Lesezugriff auf den Cache.
+
+Budgets (Umgebungsvariablen):
+    CACHE_WARM_TIME_BUDGET_SECONDS  Laufzeit je Durchgang, danach werden keine weiteren Ligen/Teams begonnen
+    CACHE_WARM_MAX_MB               neu in den Cache geschriebene Daten je Durchgang
+    CACHE_WARM_MAX_LEAGUES          Anzahl der zuletzt aktiven Ligen beim Start (nach Import: alle importierten)
+    CACHE_WARM_ON_START             "0" schaltet das Vorwärmen beim Serverstart ab
+
+Aufrufe:
+    start_cache_warming(touched["leagues"])   # nach main_batched, kehrt sofort zurück
+    start_cache_warming_on_server_start()     # aus init_session_state, einmal je Serverprozess
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional, Set
+
+import streamlit as st
+
+import db_queries_refactored as db_queries
+from utils.cached_queries import get_teams_for_league_cached, league_page_tasks, team_page_tasks
+from utils.prefetch import prefetch_cached
+from utils.query_cache import store_size_bytes
+
+logger = logging.getLogger(__name__)
+
+CACHE_WARM_TIME_BUDGET_SECONDS: float = float(os.environ.get("CACHE_WARM_TIME_BUDGET_SECONDS", "120"))
+CACHE_WARM_MAX_MB: float = float(os.environ.get("CACHE_WARM_MAX_MB", "64"))
+CACHE_WARM_MAX_LEAGUES: int = int(os.environ.get("CACHE_WARM_MAX_LEAGUES", "20"))
+CACHE_WARM_ON_START: bool = os.environ.get("CACHE_WARM_ON_START", "1") != "0"
+
+
+@dataclass
+class WarmingResult:
+    leagues: int = 0
+    teams: int = 0
+    seconds: float = 0.0
+    written_mb: float = 0.0
+    stopped_by_budget: bool = False
+
+
+def warm_caches(league_ids: Optional[Iterable[str]] = None, max_leagues: int = CACHE_WARM_MAX_LEAGUES,
+                time_budget_seconds: float = CACHE_WARM_TIME_BUDGET_SECONDS,
+                max_mb: float = CACHE_WARM_MAX_MB) -> WarmingResult:
+    """
+    Wärmt Ligen-Seite und Team-Analysen der ausgewählten Ligen (league_ids oder die zuletzt aktiven).
+    Läuft im aufrufenden Thread, die Abfragen einer Liga bzw. eines Teams parallel über prefetch_cached.
+    """
+    result = WarmingResult()
+    start = time.perf_counter()
+    start_bytes = store_size_bytes()
+
+    def budget_exceeded() -> bool:
+        result.seconds = time.perf_counter() - start
+        result.written_mb = max(store_size_bytes() - start_bytes, 0) / 1024 / 1024
+        result.stopped_by_budget = result.seconds >= time_budget_seconds or result.written_mb >= max_mb
+        return result.stopped_by_budget
+
+    leagues_df = db_queries.fetch_leagues_for_cache_warming(sorted(league_ids or []), max_leagues)
+    for league_id, season in leagues_df[["Liga_ID", "Saison"]].itertuples(index=False, name=None):
+        if budget_exceeded():
+            break
+        prefetch_cached(league_page_tasks(league_id, season))
+        result.leagues += 1
+        for team_id in get_teams_for_league_cached(league_id).get(db_queries.COL_TEAM_ID, []):
+            if budget_exceeded():
+                break
+            prefetch_cached(team_page_tasks(team_id, league_id, season))
+            result.teams += 1
+    budget_exceeded()
+    logger.info(
+        f"Cache vorgewärmt: {result.leagues} Ligen, {result.teams} Teams in {result.seconds:.1f}s, "
+        f"{result.written_mb:.1f} MB neu{' (Budget erreicht)' if result.stopped_by_budget else ''}."
+    )
+    return result
+
+
+# --- Hintergrund-Thread (höchstens einer je Prozess) ---
+_state_lock = threading.Lock()
+_running = False
+_pending_leagues: Set[str] = set()
+_pending_all = False
+
+
+def _worker() -> None:
+    global _running, _pending_all
+    while True:
+        with _state_lock:
+            if not _pending_leagues and not _pending_all:
+                _running = False
+                return
+            league_ids = sorted(_pending_leagues)
+            warm_recent = _pending_all
+            _pending_leagues.clear()
+            _pending_all = False
+        try:
+            if league_ids:
+                warm_caches(league_ids, max_leagues=len(league_ids))
+            if warm_recent:
+                warm_caches()
+        except Exception as e:
+            logger.error(f"Fehler beim Vorwärmen des Caches: {e}", exc_info=True)
+
+
+def start_cache_warming(league_ids: Optional[Iterable[str]] = None) -> None:
+    """
+    Startet warm_caches im Hintergrund und kehrt sofort zurück. league_ids=None wärmt die zuletzt
+    aktiven Ligen. Läuft bereits ein Durchgang, werden die Ligen für den nächsten vorgemerkt.
+    """
+    global _running, _pending_all
+    with _state_lock:
+        if league_ids is None:
+            _pending_all = True
+        else:
+            _pending_leagues.update(league_ids)
+        if _running or (not _pending_leagues and not _pending_all):
+            return
+        _running = True
+    threading.Thread(target=_worker, name="cache-warming", daemon=True).start()
+
+
+@st.cache_resource
+def start_cache_warming_on_server_start() -> bool:
+    """
+    Streamlit führt vor dem ersten Seitenaufruf keinen App-Code aus. Dieser Aufruf aus
+    init_session_state startet das Vorwärmen daher beim ersten Skriptlauf, einmal je Serverprozess.
+    """
+    if CACHE_WARM_ON_START:
+        start_cache_warming()
+    return CACHE_WARM_ON_START
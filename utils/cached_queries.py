@@ -1,168 +1,302 @@
 import streamlit as st
 import pandas as pd
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 import db_queries_refactored as db_queries # Importiere das refaktorierte Modul
-import re
+import logging
+import threading
+from utils.prefetch import PrefetchTask
+from utils.query_cache import SCOPE_ALL, data_version, shared_cache
+from utils.search_index import SearchEntry, SearchIndex
+from utils.standings import LeagueStandings
+from utils.momentum import LeagueMomentum
+from utils.season_simulation import SIMULATION_RUNS, SeasonSimulation, simulate_season
+from utils.league_names import FILTER_ALL, base_league_name
+
+logger = logging.getLogger(__name__)
 
 # --- Hilfsfunktionen ---
 def get_base_league_name_from_display(league_display_name_with_season: str) -> str:
-    if not isinstance(league_display_name_with_season, str): return "N/A"
-    match = re.match(r"^(.*)\s*\(\d{4}/\d{4}\)$", league_display_name_with_season)
-    if match:
-        return match.group(1).strip()
-    return league_display_name_with_season
+    return base_league_name(league_display_name_with_season)
 
 # --- Gecachte Datenladefunktionen ---
-@st.cache_data
+# Prozessübergreifend gecacht und je Liga/Saison invalidiert, siehe utils/query_cache.py
+@shared_cache
 def get_leagues_cached() -> pd.DataFrame:
-    df = db_queries.fetch_all_leagues()
-    if not df.empty:
-        name_col = db_queries.COL_NAME
-        if name_col in df.columns:
-            df['Base_League_Name'] = df[name_col].apply(get_base_league_name_from_display)
-        else:
-            df['Base_League_Name'] = "Unbekannte Liga"
-    return df
-
-@st.cache_data
+    # "Base_League_Name" wird beim Import gespeichert ("Ligen"."Basisname", utils/league_names.py)
+    return db_queries.fetch_all_leagues()
+
+@shared_cache
 def get_teams_for_league_cached(league_id: Optional[str]) -> pd.DataFrame:
     if not league_id: return pd.DataFrame()
     return db_queries.fetch_teams_for_league(league_id)
 
-@st.cache_data
+@shared_cache
+def get_league_standings_cached(league_id: Optional[str], season: Optional[str]) -> LeagueStandings:
+    """Tabellenstände zu jedem Spieltag/Zeitpunkt; Grundlage von Tabelle, Punkte- und Platzierungsverlauf."""
+    return db_queries.fetch_league_standings(league_id, season)
+
+@shared_cache
+def get_league_momentum_cached(league_id: Optional[str], season: Optional[str]) -> LeagueMomentum:
+    """Momentum-Kennzahlen aller Spiele der Liga-Saison; von Ligen- und Vereine-Seite gemeinsam genutzt."""
+    return db_queries.fetch_league_momentum(league_id, season)
+
+@shared_cache
+def get_season_simulation_cached(league_id: Optional[str], season: Optional[str], runs: int = SIMULATION_RUNS) -> SeasonSimulation:
+    """Monte-Carlo-Prognose der Abschlusstabelle aus aktuellem Stand und offenen Spielen; je Liga-Saison und Datenstand."""
+    return simulate_season(get_league_standings_cached(league_id, season), get_schedule_cached(league_id, season), runs)
+
+@shared_cache
+def get_team_rating_history_cached(team_id: Optional[str]) -> pd.DataFrame:
+    if not team_id: return pd.DataFrame()
+    return db_queries.fetch_team_rating_history(team_id)
+
+@shared_cache
+def get_season_team_ratings_cached(season: Optional[str]) -> pd.DataFrame:
+    # Kein ID-Argument, hängt an 'stammdaten' und wird damit bei jedem Import neu geladen
+    if not season: return pd.DataFrame()
+    return db_queries.fetch_season_team_ratings(season)
+
+@shared_cache
+def get_season_leaderboards_cached(season: Optional[str], age_group: str = FILTER_ALL, gender: str = FILTER_ALL, limit: int = 10) -> pd.DataFrame:
+    # Ligaübergreifend, wie get_season_team_ratings_cached an 'stammdaten'; je Abfrage ein Indexbereich je Rangliste
+    if not season: return pd.DataFrame()
+    return db_queries.fetch_season_leaderboards(season, age_group, gender, limit)
+
 def get_league_table_cached(league_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
+    # Aus den gecachten Tabellenständen abgeleitet, daher nicht selbst gecacht
     if not league_id or not season: return pd.DataFrame()
-    return db_queries.fetch_league_table(league_id, season)
+    return get_league_standings_cached(league_id, season).table()
 
-@st.cache_data
+@shared_cache
 def get_schedule_cached(league_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not league_id or not season: return pd.DataFrame()
     return db_queries.fetch_schedule_for_league(league_id, season)
 
-@st.cache_data
+@shared_cache
 def get_players_for_team_cached(team_id: Optional[str]) -> pd.DataFrame:
     if not team_id: return pd.DataFrame()
     return db_queries.fetch_players_for_team(team_id)
 
-@st.cache_data
+@shared_cache
 def get_player_season_stats_cached(player_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not player_id or not season: return pd.DataFrame()
     return db_queries.fetch_player_season_stats(player_id, season)
 
-@st.cache_data
+@shared_cache
 def get_player_game_log_cached(player_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not player_id or not season: return pd.DataFrame()
     return db_queries.fetch_player_game_log(player_id, season)
 
-@st.cache_data
+@shared_cache
 def get_game_details_cached(game_id: Optional[str]) -> Optional[Dict[str, Any]]:
     if not game_id: return None
     return db_queries.fetch_game_details(game_id)
 
-@st.cache_data
+@shared_cache
 def get_game_lineup_cached(game_id: Optional[str], team_id: Optional[str]) -> pd.DataFrame:
     if not game_id or not team_id: return pd.DataFrame()
     return db_queries.fetch_game_lineup(game_id, team_id)
 
-@st.cache_data
+@shared_cache
 def get_game_events_cached(game_id: Optional[str]) -> pd.DataFrame:
     if not game_id: return pd.DataFrame()
     return db_queries.fetch_game_events(game_id)
 
-@st.cache_data
+@shared_cache
 def get_player_all_time_stats_cached(player_id: Optional[str]) -> pd.DataFrame:
     if not player_id: return pd.DataFrame()
     return db_queries.fetch_player_all_time_stats(player_id)
 
-@st.cache_data
+@shared_cache
 def get_player_stats_vs_opponent_cached(player_id: Optional[str], opponent_team_id: Optional[str], season: Optional[str]=None) -> pd.DataFrame:
     if not player_id or not opponent_team_id: return pd.DataFrame()
     return db_queries.fetch_player_stats_vs_opponent(player_id, opponent_team_id, season)
 
-@st.cache_data
+@shared_cache
 def get_all_teams_simple_cached() -> pd.DataFrame:
     return db_queries.fetch_all_teams_simple()
 
-@st.cache_data
+@shared_cache
 def get_club_overview_cached() -> pd.DataFrame:
     return db_queries.fetch_club_overview()
 
-@st.cache_data
+@shared_cache
 def get_leagues_for_team_cached(team_id: Optional[str]) -> pd.DataFrame:
     if not team_id: return pd.DataFrame()
-    df = db_queries.fetch_leagues_for_team(team_id)
-    if not df.empty:
-        name_col = db_queries.COL_NAME
-        if name_col in df.columns:
-            df['Base_League_Name'] = df[name_col].apply(get_base_league_name_from_display)
-    return df
-
-@st.cache_data
+    return db_queries.fetch_leagues_for_team(team_id)
+
+@shared_cache
 def get_opponents_for_player_cached(player_id: Optional[str], season: Optional[str]=None) -> pd.DataFrame:
     if not player_id: return pd.DataFrame()
     return db_queries.fetch_opponents_for_player(player_id, season)
 
-@st.cache_data
-def get_points_progression_for_league_cached(league_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
-    if not league_id or not season: return pd.DataFrame()
-    return db_queries.fetch_points_progression_for_league(league_id, season)
-
-@st.cache_data
-def get_league_top_scorers_cached(league_id: Optional[str], season: Optional[str], limit: int = 10) -> pd.DataFrame:
+@shared_cache
+def get_league_leaderboards_cached(league_id: Optional[str], season: Optional[str], limit: int = 10) -> pd.DataFrame:
+    # Alle Ranglisten des Tabs in einem Eintrag, Anzeige je Rangliste mit utils/ui.display_leaderboard
     if not league_id or not season: return pd.DataFrame()
-    return db_queries.fetch_league_top_scorers(league_id, season, limit)
-
-@st.cache_data
-def get_league_penalty_leaders_cached(league_id: Optional[str], season: Optional[str], penalty_column_name: str, column_alias: str, limit: int = 10) -> pd.DataFrame:
-    if not league_id or not season: return pd.DataFrame()
-    return db_queries.fetch_league_penalty_leaders(league_id, season, penalty_column_name, column_alias, limit)
-
-@st.cache_data
-def get_team_top_scorers_cached(team_id: Optional[str], league_id: Optional[str], season: Optional[str], limit: int = 5) -> pd.DataFrame:
-    if not team_id or not league_id or not season: return pd.DataFrame()
-    return db_queries.fetch_team_top_scorers(team_id, league_id, season, limit)
+    return db_queries.fetch_league_leaderboards(league_id, season, limit)
 
-@st.cache_data
-def get_team_penalty_leaders_cached(team_id: Optional[str], league_id: Optional[str], season: Optional[str], penalty_column_name: str, column_alias: str, limit: int = 5) -> pd.DataFrame:
+@shared_cache
+def get_team_leaderboards_cached(team_id: Optional[str], league_id: Optional[str], season: Optional[str], limit: int = 5) -> pd.DataFrame:
     if not team_id or not league_id or not season: return pd.DataFrame()
-    return db_queries.fetch_team_penalty_leaders(team_id, league_id, season, penalty_column_name, column_alias, limit)
+    return db_queries.fetch_team_leaderboards(team_id, league_id, season, limit)
 
-@st.cache_data
+@shared_cache
 def get_league_home_away_balance_cached(league_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not league_id or not season: return pd.DataFrame()
     return db_queries.fetch_league_home_away_balance(league_id, season)
 
-@st.cache_data
+@shared_cache
 def get_league_average_goals_cached(league_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not league_id or not season: return pd.DataFrame()
     return db_queries.fetch_league_average_goals(league_id, season)
 
-@st.cache_data
+@shared_cache
 def get_team_performance_halves_cached(team_id: Optional[str], league_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not team_id or not league_id or not season: return pd.DataFrame()
     return db_queries.fetch_team_performance_halves(team_id, league_id, season)
 
-@st.cache_data
+@shared_cache
 def get_player_goal_contribution_to_team_cached(player_id: Optional[str], team_id: Optional[str], league_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not player_id or not team_id or not league_id or not season: return pd.DataFrame()
     return db_queries.fetch_player_goal_contribution_to_team(player_id, team_id, league_id, season)
 
-@st.cache_data
+@shared_cache
 def get_team_head_to_head_with_stats_cached(team1_id: Optional[str], team2_id: Optional[str], league_id: Optional[str]=None, season: Optional[str]=None) -> Dict[str, Any]:
     if not team1_id or not team2_id: return {"spiele_df": pd.DataFrame(), "stats": {}}
     return db_queries.fetch_team_head_to_head_with_stats(team1_id, team2_id, league_id, season)
 
-@st.cache_data
+@shared_cache
+def get_league_head_to_head_cached(league_id: Optional[str]) -> Dict[str, pd.DataFrame]:
+    """Spiele und Paarungsbilanzen einer Liga-Saison, Grundlage aller Direktvergleiche der Liga."""
+    return db_queries.fetch_league_head_to_head(league_id)
+
+@shared_cache
+def get_all_time_head_to_head_cached(teams_of_league_id: Optional[str]) -> Dict[str, pd.DataFrame]:
+    # Bewusst nicht "league_id": enthält Spiele aus allen Ligen, hängt daher am Bereich 'stammdaten'
+    return db_queries.fetch_league_head_to_head(teams_of_league_id, all_time=True)
+
+def get_head_to_head_from_league(team1_id: Optional[str], team2_id: Optional[str], league_id: Optional[str], all_time: bool = False) -> Dict[str, Any]:
+    """Direktvergleich zweier Teams aus der gecachten Matrix der Liga (ohne eigene DB-Abfrage je Paarung)."""
+    if not team1_id or not team2_id or not league_id: return {"spiele_df": pd.DataFrame(), "stats": {}}
+    h2h = get_all_time_head_to_head_cached(league_id) if all_time else get_league_head_to_head_cached(league_id)
+    return db_queries.head_to_head_for_pair(h2h["spiele"], h2h["paare"], team1_id, team2_id)
+
+@shared_cache
 def get_player_goal_timing_stats_cached(player_id: Optional[str], season: Optional[str]) -> pd.DataFrame:
     if not player_id or not season: return pd.DataFrame()
     return db_queries.fetch_player_goal_timing_stats(player_id, season)
 
-@st.cache_data
+@shared_cache
+def get_league_goal_timing_cached(league_id: Optional[str]) -> pd.DataFrame:
+    if not league_id: return pd.DataFrame()
+    return db_queries.fetch_league_goal_timing(league_id)
+
+@shared_cache
+def get_team_goal_timing_cached(team_id: Optional[str], league_id: Optional[str]) -> pd.DataFrame:
+    if not team_id or not league_id: return pd.DataFrame()
+    return db_queries.fetch_team_goal_timing(team_id, league_id)
+
+@shared_cache
 def get_players_by_name_search_cached(search_term: Optional[str]) -> pd.DataFrame:
     if not search_term or len(search_term) < 3:
         return pd.DataFrame()
     return db_queries.fetch_players_by_name_search(search_term)
 
-@st.cache_data
+@shared_cache
 def get_basic_db_stats_cached() -> Dict[str, int]:
-    return db_queries.fetch_basic_db_stats()
\ No newline at end of file
+    return db_queries.fetch_basic_db_stats()
+
+# --- Abfragen je Seite (für prefetch_cached auf den Seiten und utils/cache_warming.py) ---
+# Die Argumente müssen denen der Seiten entsprechen, sonst wärmt das Vorladen andere Cache-Schlüssel.
+def league_page_tasks(league_id: str, season: str) -> Dict[str, PrefetchTask]:
+    """Unabhängige Abfragen aller Tabs der Ligen-Seite."""
+    league_args = (league_id, season)
+    return {
+        "standings": (get_league_standings_cached, league_args),
+        "schedule": (get_schedule_cached, league_args),
+        "leaderboards": (get_league_leaderboards_cached, league_args),
+        "balance": (get_league_home_away_balance_cached, league_args),
+        "avg_goals": (get_league_average_goals_cached, league_args),
+        "momentum": (get_league_momentum_cached, league_args),
+        "season_simulation": (get_season_simulation_cached, league_args),
+        "season_ratings": (get_season_team_ratings_cached, (season,)),
+        "teams": (get_teams_for_league_cached, (league_id,)),
+        "goal_timing": (get_league_goal_timing_cached, (league_id,)),
+        "head_to_head": (get_league_head_to_head_cached, (league_id,)),
+    }
+
+def team_page_tasks(team_id: str, league_id: Optional[str], season: Optional[str]) -> Dict[str, PrefetchTask]:
+    """Unabhängige Abfragen aller Tabs der Team-Analyse (Vereine-Seite) im Kontext von Liga und Saison."""
+    tasks: Dict[str, PrefetchTask] = {
+        "all_teams": (get_all_teams_simple_cached, ()),
+        "players": (get_players_for_team_cached, (team_id,)),
+        "rating_history": (get_team_rating_history_cached, (team_id,)),
+    }
+    if league_id:
+        tasks["teams_in_league"] = (get_teams_for_league_cached, (league_id,))
+    if league_id and season:
+        team_ctx_args = (team_id, league_id, season)
+        tasks.update({
+            "schedule": (get_schedule_cached, (league_id, season)),
+            "leaderboards": (get_team_leaderboards_cached, team_ctx_args),
+            "halves": (get_team_performance_halves_cached, team_ctx_args),
+            "momentum": (get_league_momentum_cached, (league_id, season)),
+            "goal_timing": (get_team_goal_timing_cached, (team_id, league_id)),
+        })
+    return tasks
+
+# --- Globaler Suchindex (einmal pro Server, von allen Sessions geteilt) ---
+def _to_search_entries(df: pd.DataFrame) -> List[SearchEntry]:
+    return [
+        SearchEntry(typ, entity_id, name or "", None if pd.isna(detail) else detail)
+        for typ, entity_id, name, detail in df.itertuples(index=False, name=None)
+    ]
+
+def _load_search_entries() -> List[SearchEntry]:
+    return _to_search_entries(db_queries.fetch_search_index_entries())
+
+@st.cache_resource
+def _search_index_state() -> Dict[str, Any]:
+    index = SearchIndex()
+    index.build(_load_search_entries())
+    return {"index": index, "version": data_version(SCOPE_ALL), "lock": threading.Lock()}
+
+def get_search_index() -> SearchIndex:
+    """
+    Suchindex dieses Prozesses. Nach einer vollständigen Invalidierung ('alle': Admin-Seite, utils/assign_clubs.py,
+    auch aus anderen Prozessen) wird er beim nächsten Zugriff aus der DB neu gelesen.
+    """
+    state = _search_index_state()
+    version = data_version(SCOPE_ALL)
+    if version is not None and version != state["version"]:
+        _reload_search_index(state, version)
+    return state["index"]
+
+def clear_search_index() -> None:
+    """Verwirft den Index dieses Prozesses, er wird beim nächsten Zugriff neu aufgebaut (z.B. nach dem Leeren der DB)."""
+    _search_index_state.clear()
+
+def _reload_search_index(state: Dict[str, Any], version: Optional[int]) -> int:
+    with state["lock"]:
+        entries = _load_search_entries()
+        if not entries:
+            # Leeres Ergebnis heißt hier fast immer DB-Fehler, der Index bleibt dann unverändert
+            logger.warning("Suchindex nicht aktualisiert: keine Einträge aus der Datenbank erhalten.")
+            return 0
+        changed = state["index"].refresh(entries)
+        state["version"] = version
+        return changed
+
+def refresh_search_index(touched: Optional[Dict[str, Set[str]]] = None) -> int:
+    """
+    Nach Importen aufrufen: übernimmt neue/geänderte Einträge inkrementell. Mit touched (Rückgabe
+    "touched" von main_batched) werden nur diese Teams, Ligen und Spieler neu gelesen, sonst alle.
+    Von den Cache-Versionen (utils/query_cache.py) wirkt nur 'alle' auf den Index (siehe get_search_index).
+    """
+    if touched is not None:
+        df = db_queries.fetch_search_index_entries_for_ids(
+            sorted(touched.get("teams", ())), sorted(touched.get("leagues", ())), sorted(touched.get("players", ()))
+        )
+        return get_search_index().refresh(_to_search_entries(df), complete=False)
+    return _reload_search_index(_search_index_state(), data_version(SCOPE_ALL))
@@ -0,0 +1,102 @@
+"""
+Spaltenorientierter Abrufpfad für große Ergebnismengen.
+
+pd.read_sql_query baut zuerst ein Python-Tupel pro Zeile und daraus den DataFrame. Hier wird das
+Ergebnis stattdessen per COPY (...) TO STDOUT als CSV-Strom übertragen und von pyarrow (C++,
+mehrere Threads) direkt in Spalten geparst. Die Spaltentypen kommen aus der Ergebnisbeschreibung
+von PostgreSQL, nicht aus der CSV-Erkennung - eine TEXT-ID wie "123" bleibt also ein String.
+
+Unterschiede zu pd.read_sql_query:
+    - NUMERIC wird zu float64 (statt Decimal-Objekten).
+    - Nicht zugeordnete Typen (z.B. TIMESTAMPTZ, JSON) kommen als String.
+Lohnt sich ab einigen tausend Zeilen. Für kleine Ergebnisse ist der normale Weg schneller, da hier
+beim ersten Aufruf einer Abfrage eine zusätzliche Rundreise für die Spaltentypen anfällt.
+"""
+import io
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from psycopg2.extensions import encodings
+
+# PostgreSQL-Typ-OID -> Arrow-Typ
+PG_OID_TO_ARROW: Dict[int, pa.DataType] = {
+    16: pa.bool_(),
+    20: pa.int64(), 21: pa.int64(), 23: pa.int64(),
+    700: pa.float64(), 701: pa.float64(), 1700: pa.float64(),
+    1082: pa.date32(), 1114: pa.timestamp("us"),
+}
+DTYPE_BACKENDS: Tuple[str, ...] = ("numpy", "pyarrow")
+
+# Wie SQLAlchemy text(): ":name", aber nicht "::typ" und nicht innerhalb von Wörtern ("HH24:MI")
+_BIND_PARAM_PATTERN = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+_column_cache: Dict[str, List[Tuple[str, int]]] = {}
+_column_cache_lock = threading.Lock()
+
+
+def to_pyformat(query_str: str) -> str:
+    """':name'-Parameter (SQLAlchemy text) in psycopg2-Parameter '%(name)s' umschreiben."""
+    return _BIND_PARAM_PATTERN.sub(r"%(\1)s", query_str.replace("%", "%%"))
+
+
+def _strip_statement(query_str: str) -> str:
+    """COPY (...) erwartet eine einzelne Abfrage ohne abschließendes Semikolon."""
+    return query_str.strip().rstrip(";").strip()
+
+
+def _result_columns(cursor, query_str: str, params: Optional[Dict[str, Any]]) -> List[Tuple[str, int]]:
+    """(Name, Typ-OID) der Ergebnisspalten, je Abfragetext einmal ermittelt (LIMIT 0, ohne Ausführung der Zeilen)."""
+    columns = _column_cache.get(query_str)
+    if columns is None:
+        cursor.execute(f"SELECT * FROM (\n{to_pyformat(query_str)}\n) AS spalten LIMIT 0", params or {})
+        columns = [(desc[0], desc[1]) for desc in cursor.description]
+        with _column_cache_lock:
+            _column_cache[query_str] = columns
+    return columns
+
+
+def read_sql_columnar(dbapi_conn, query_str: str, params: Optional[Dict[str, Any]] = None,
+                      dtype_backend: str = "numpy") -> pd.DataFrame:
+    """
+    Führt query_str (mit ':name'-Parametern) auf einer psycopg2-Verbindung aus und liefert einen DataFrame.
+    dtype_backend="numpy" entspricht den Typen von pd.read_sql_query, "pyarrow" liefert ArrowDtype-Spalten
+    (Ganzzahlen mit NULL bleiben dann Ganzzahlen).
+    """
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f"Unbekanntes dtype_backend '{dtype_backend}', erlaubt: {DTYPE_BACKENDS}")
+    query_str = _strip_statement(query_str)
+    buffer = io.BytesIO()
+    with dbapi_conn.cursor() as cursor:
+        columns = _result_columns(cursor, query_str, params)
+        # mogrify setzt die Parameter korrekt maskiert ein, COPY selbst kennt keine Bind-Parameter
+        statement = cursor.mogrify(to_pyformat(query_str), params or {}).decode(encodings[dbapi_conn.encoding])
+        cursor.copy_expert(f"COPY (\n{statement}\n) TO STDOUT WITH (FORMAT csv)", buffer)
+    size = buffer.tell()
+    buffer.seek(0)
+
+    names = [name for name, _ in columns]
+    arrow_types = {name: PG_OID_TO_ARROW.get(oid, pa.string()) for name, oid in columns}
+    if size == 0:
+        # pyarrow lehnt leere CSV-Daten ab, leeres Ergebnis direkt aus den Spaltentypen bauen
+        table = pa.table({name: pa.array([], type=arrow_types[name]) for name in names})
+    else:
+        table = _parse_csv(buffer, names, arrow_types)
+    if dtype_backend == "pyarrow":
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+def _parse_csv(buffer: io.BytesIO, names: List[str], arrow_types: Dict[str, pa.DataType]) -> pa.Table:
+    return pa_csv.read_csv(
+        buffer,
+        read_options=pa_csv.ReadOptions(column_names=names),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=arrow_types,
+            true_values=["t"], false_values=["f"],
+            # COPY schreibt NULL als leeres Feld und '' als "" - nur Ersteres ist NULL
+            strings_can_be_null=True, quoted_strings_can_be_null=False,
+        ),
+    )
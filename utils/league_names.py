@@ -0,0 +1,65 @@
+"""
+Abgeleitete Liga-Merkmale aus Anzeigename und API-Altersgruppe.
+
+Werden beim Import einmal je Liga berechnet und als Spalten in "Ligen" gespeichert ("Basisname",
+"Geschlecht", "Altersgruppe_Anzeige"), statt sie bei jedem Seitenaufruf per Regex aus dem Namen zu ziehen.
+Die Migration 0007_ligen_dimensionen_spiele_saison füllt Bestandsdaten mit derselben Logik in SQL nach.
+
+Beispiel:
+    base_league_name("Oberliga Männer (2024/2025)")     # "Oberliga Männer"
+    translate_age_group("A-Jugend männlich", "AYouth")   # "mA-Jugend"
+"""
+import re
+from typing import Optional, Tuple
+
+SEASON_SUFFIX_PATTERN = re.compile(r"^(.*)\s*\(\d{4}/\d{4}\)$")
+
+AGE_GROUP_TRANSLATIONS = {
+    "AYouth": "A-Jugend", "BYouth": "B-Jugend", "CYouth": "C-Jugend",
+    "DYouth": "D-Jugend", "EYouth": "E-Jugend", "FYouth": "F-Jugend",
+    "Adults": "Senioren", "Mini": "Minis"
+}
+
+# Filterwerte der ligaübergreifenden Ranglisten ("Saison_Spieler_Summen", Migration 0012): 'Alle' = nicht
+# eingeschränkt, 'x' = Ligen ohne erkennbares Geschlecht
+FILTER_ALL = "Alle"
+GENDER_UNKNOWN = "x"
+GENDER_LABELS = {FILTER_ALL: "Alle", "m": "männlich", "w": "weiblich", GENDER_UNKNOWN: "gemischt/unbekannt"}
+
+def base_league_name(league_display_name_with_season: str) -> str:
+    """Liganame ohne angehängte Saison, z.B. "Oberliga (2024/2025)" -> "Oberliga"."""
+    if not isinstance(league_display_name_with_season, str): return "N/A"
+    match = SEASON_SUFFIX_PATTERN.match(league_display_name_with_season)
+    if match:
+        return match.group(1).strip()
+    return league_display_name_with_season
+
+def league_gender(league_name: Optional[str]) -> Optional[str]:
+    """'m' bzw. 'w' anhand des Liganamens, None wenn nicht erkennbar (z.B. gemischte Minis)."""
+    if not isinstance(league_name, str):
+        return None
+    ln_lower = league_name.lower()
+    if "männlich" in ln_lower or "männer" in ln_lower or "herren" in ln_lower or "jungen" in ln_lower:
+        return "m"
+    if "weiblich" in ln_lower or "frauen" in ln_lower or "mädchen" in ln_lower:
+        return "w"
+    return None
+
+def translate_age_group(league_name: Optional[str], age_group_api: Optional[str]) -> str:
+    """Übersetzt die englischen Jugendbezeichnungen ins Deutsche (mit m/w)."""
+    if not isinstance(age_group_api, str):
+        return age_group_api or "Senioren/Andere"
+
+    german_base = AGE_GROUP_TRANSLATIONS.get(age_group_api, age_group_api)
+    prefix = league_gender(league_name)
+
+    # Kombinieren, wenn es eine Jugend ist
+    if "Jugend" in german_base and prefix:
+        return f"{prefix}{german_base}"
+
+    return german_base
+
+def league_dimensions(league_display_name: str, age_group_api: Optional[str]) -> Tuple[str, Optional[str], str]:
+    """("Basisname", "Geschlecht", "Altersgruppe_Anzeige") einer Liga, wie sie beim Import gespeichert werden."""
+    return (base_league_name(league_display_name), league_gender(league_display_name),
+            translate_age_group(league_display_name, age_group_api))
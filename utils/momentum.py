@@ -0,0 +1,204 @@
+"""
+Momentum, Läufe und Schlussphasen aller Spiele einer Liga-Saison.
+
+Grundlage sind die beim Import gespeicherten Spielverläufe ("Spielverlaeufe", utils/score_timeline.py).
+Die Verläufe der Saison liegen nach decode_score_timelines in einem einzigen Array, offsets[g] ist die
+erste Zeile von Spiel g. Alle Kennzahlen entstehen mit reduceat/bincount über diese Abschnitte, ohne
+Schleife über Spiele oder Ereignisse:
+    - Führungswechsel: das führende Team wechselt (ein Gleichstand dazwischen ist noch kein Wechsel)
+    - Ausgleiche: Gleichstände nach dem Anpfiff
+    - Größte Führung je Seite
+    - Läufe: Tore einer Seite in Folge ohne Gegentor ("5:0-Lauf"), längster Lauf je Seite
+    - Aufholjagd: Sieg nach einem Rückstand von mindestens COMEBACK_MIN_DEFICIT Toren
+    - Schlussphase: Tore in den letzten CLOSING_SECONDS der regulären Spielzeit
+Die reguläre Spielzeit gilt für die ganze Liga: die kleinste übliche Spieldauer (GAME_LENGTHS_SECONDS, je
+nach Altersklasse), die mindestens der Median der letzten Torsekunde ist.
+
+Ligen-Seite (Liga-Statistiken) und Vereine-Seite (Team-Statistiken) lesen dieselbe gecachte Struktur
+(get_league_momentum_cached).
+
+Beispiel:
+    momentum = build_league_momentum(games_df)   # fetch_league_score_timelines.sql
+    momentum.league_summary()                    # Kennzahlen der Liga
+    momentum.team_table()                        # eine Zeile je Team
+    momentum.team_games(team_id)                 # Spiele eines Teams aus dessen Sicht
+"""
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.result_schema import epoch_to_datetime
+from utils.score_timeline import decode_score_timelines
+
+GAME_LENGTHS_SECONDS: np.ndarray = np.array([40 * 60, 50 * 60, 60 * 60])
+CLOSING_SECONDS: int = 5 * 60
+COMEBACK_MIN_DEFICIT: int = 3
+
+GAME_COLUMNS: Tuple[str, ...] = ("Spiel_ID", "Start_Zeit", "Heim_Team_ID", "Heimteam", "Gast_Team_ID", "Gastteam")
+# Kennzahlen je Spiel und Seite in LeagueMomentum.sides[m, Spiel, Seite], Seite 0 = Heim, 1 = Gast
+SIDE_METRICS: Tuple[str, ...] = ("Tore", "Max_Fuehrung", "Max_Lauf", "Schlussphase_Tore")
+_GOALS, _MAX_LEAD, _MAX_RUN, _CLOSING_GOALS = range(len(SIDE_METRICS))
+
+TEAM_TABLE_COLUMNS: Tuple[str, ...] = (
+    "Team", "Team_ID", "Spiele", "Ø Führungswechsel", "Größte Führung", "Größter Rückstand", "Längster Lauf",
+    "Längster Gegenlauf", "Aufholjagden", "Verspielte Führungen", "Schlussphase", "Schlussphase Diff",
+)
+TEAM_GAME_COLUMNS: Tuple[str, ...] = (
+    "Spiel_ID", "Datum", "Gegner", "Ort", "Ergebnis", "Führungswechsel", "Größte Führung", "Größter Rückstand",
+    "Längster Lauf", "Längster Gegenlauf", "Schlussphase",
+)
+
+
+@dataclass
+class LeagueMomentum:
+    games: pd.DataFrame        # GAME_COLUMNS, eine Zeile je Spiel in Spielreihenfolge
+    lead_changes: np.ndarray   # int32 (Spiele,)
+    ties: np.ndarray           # int32 (Spiele,)
+    sides: np.ndarray          # int32 (len(SIDE_METRICS), Spiele, 2)
+    regulation_seconds: int    # reguläre Spielzeit der Liga
+
+    def team_rows(self) -> pd.DataFrame:
+        """Eine Zeile je Team und Spiel aus Sicht des Teams (Heim- und Gastseite untereinander)."""
+        if self.games.empty:
+            return pd.DataFrame()
+        frames = []
+        for side, other, team_col, opponent_col, venue in ((0, 1, "Heim", "Gast", "H"), (1, 0, "Gast", "Heim", "A")):
+            frames.append(pd.DataFrame({
+                "Spiel_ID": self.games["Spiel_ID"].to_numpy(),
+                "Start_Zeit": self.games["Start_Zeit"].to_numpy(),
+                "Team_ID": self.games[f"{team_col}_Team_ID"].to_numpy(),
+                "Team": self.games[f"{team_col}team"].to_numpy(),
+                "Gegner": self.games[f"{opponent_col}team"].to_numpy(),
+                "Ort": venue,
+                "Tore": self.sides[_GOALS, :, side], "Gegentore": self.sides[_GOALS, :, other],
+                "Fuehrungswechsel": self.lead_changes, "Ausgleiche": self.ties,
+                "Max_Fuehrung": self.sides[_MAX_LEAD, :, side], "Max_Rueckstand": self.sides[_MAX_LEAD, :, other],
+                "Max_Lauf": self.sides[_MAX_RUN, :, side], "Max_Gegenlauf": self.sides[_MAX_RUN, :, other],
+                "Schlussphase_Tore": self.sides[_CLOSING_GOALS, :, side],
+                "Schlussphase_Gegentore": self.sides[_CLOSING_GOALS, :, other],
+            }))
+        rows = pd.concat(frames, ignore_index=True)
+        rows["Aufholjagd"] = (rows["Tore"] > rows["Gegentore"]) & (rows["Max_Rueckstand"] >= COMEBACK_MIN_DEFICIT)
+        rows["Verspielte_Fuehrung"] = (rows["Tore"] < rows["Gegentore"]) & (rows["Max_Fuehrung"] >= COMEBACK_MIN_DEFICIT)
+        return rows
+
+    def team_table(self) -> pd.DataFrame:
+        """Kennzahlen je Team über alle Spiele der Saison, nach Teamname sortiert."""
+        rows = self.team_rows()
+        if rows.empty:
+            return pd.DataFrame()
+        grouped = rows.groupby(["Team_ID", "Team"], sort=False).agg(
+            Spiele=("Spiel_ID", "size"), Fuehrungswechsel=("Fuehrungswechsel", "mean"),
+            Max_Fuehrung=("Max_Fuehrung", "max"), Max_Rueckstand=("Max_Rueckstand", "max"),
+            Max_Lauf=("Max_Lauf", "max"), Max_Gegenlauf=("Max_Gegenlauf", "max"),
+            Aufholjagden=("Aufholjagd", "sum"), Verspielte_Fuehrungen=("Verspielte_Fuehrung", "sum"),
+            Schlussphase_Tore=("Schlussphase_Tore", "sum"), Schlussphase_Gegentore=("Schlussphase_Gegentore", "sum"),
+        ).reset_index()
+        table = pd.DataFrame({
+            "Team": grouped["Team"],
+            "Team_ID": grouped["Team_ID"],
+            "Spiele": grouped["Spiele"],
+            "Ø Führungswechsel": grouped["Fuehrungswechsel"].round(2),
+            "Größte Führung": grouped["Max_Fuehrung"],
+            "Größter Rückstand": grouped["Max_Rueckstand"],
+            "Längster Lauf": grouped["Max_Lauf"],
+            "Längster Gegenlauf": grouped["Max_Gegenlauf"],
+            "Aufholjagden": grouped["Aufholjagden"],
+            "Verspielte Führungen": grouped["Verspielte_Fuehrungen"],
+            "Schlussphase": [f"{a}:{b}" for a, b in zip(grouped["Schlussphase_Tore"], grouped["Schlussphase_Gegentore"])],
+            "Schlussphase Diff": grouped["Schlussphase_Tore"] - grouped["Schlussphase_Gegentore"],
+        }, columns=list(TEAM_TABLE_COLUMNS))
+        return table.sort_values(["Team", "Team_ID"], kind="stable").reset_index(drop=True)
+
+    def team_games(self, team_id: str) -> pd.DataFrame:
+        """Spiele eines Teams in Spielreihenfolge aus dessen Sicht (TEAM_GAME_COLUMNS)."""
+        rows = self.team_rows()
+        if rows.empty:
+            return pd.DataFrame()
+        rows = rows[rows["Team_ID"] == team_id].sort_values(["Start_Zeit", "Spiel_ID"], kind="stable")
+        return pd.DataFrame({
+            "Spiel_ID": rows["Spiel_ID"],
+            "Datum": epoch_to_datetime(rows["Start_Zeit"]),
+            "Gegner": rows["Gegner"],
+            "Ort": rows["Ort"],
+            "Ergebnis": [f"{a}:{b}" for a, b in zip(rows["Tore"], rows["Gegentore"])],
+            "Führungswechsel": rows["Fuehrungswechsel"],
+            "Größte Führung": rows["Max_Fuehrung"],
+            "Größter Rückstand": rows["Max_Rueckstand"],
+            "Längster Lauf": rows["Max_Lauf"],
+            "Längster Gegenlauf": rows["Max_Gegenlauf"],
+            "Schlussphase": [f"{a}:{b}" for a, b in zip(rows["Schlussphase_Tore"], rows["Schlussphase_Gegentore"])],
+        }, columns=list(TEAM_GAME_COLUMNS)).reset_index(drop=True)
+
+    def league_summary(self) -> Dict[str, float]:
+        """Kennzahlen der ganzen Liga-Saison; leer ohne Spiele."""
+        if self.games.empty:
+            return {}
+        decided = self.sides[_GOALS, :, 0] != self.sides[_GOALS, :, 1]
+        winner = (self.sides[_GOALS, :, 1] > self.sides[_GOALS, :, 0]).astype(np.intp)  # Seite des Siegers
+        winner_deficit = self.sides[_MAX_LEAD, np.arange(len(winner)), 1 - winner]
+        return {
+            "Spiele": int(len(self.games)),
+            "Ø Führungswechsel": float(self.lead_changes.mean()),
+            "Ø Ausgleiche": float(self.ties.mean()),
+            "Spiele mit Führungswechsel": float((self.lead_changes > 0).mean()),
+            "Aufholjagden": float((decided & (winner_deficit >= COMEBACK_MIN_DEFICIT)).mean()),
+            "Längster Lauf": int(self.sides[_MAX_RUN].max()),
+            "Größte Führung": int(self.sides[_MAX_LEAD].max()),
+            "Ø Tore Schlussphase": float(self.sides[_CLOSING_GOALS].sum(axis=1).mean()),
+        }
+
+
+def build_league_momentum(games: pd.DataFrame) -> LeagueMomentum:
+    """Berechnet die Kennzahlen aller Spiele aus fetch_league_score_timelines.sql (ein Verlauf je Zeile)."""
+    game_info = games.reindex(columns=list(GAME_COLUMNS)).reset_index(drop=True)
+    if games.empty:
+        return LeagueMomentum(game_info, np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32),
+                              np.zeros((len(SIDE_METRICS), 0, 2), dtype=np.int32), int(GAME_LENGTHS_SECONDS[-1]))
+
+    points, offsets = decode_score_timelines(games["Spielverlauf"].tolist())
+    n_games = len(games)
+    starts, ends = offsets[:-1], offsets[1:] - 1  # jeder Verlauf beginnt mit 0:0, ist also nie leer
+    game = np.repeat(np.arange(n_games), np.diff(offsets))
+    second, home, away = points[:, 0], points[:, 1], points[:, 2]
+    diff = home - away
+    is_start = np.zeros(len(points), dtype=bool)
+    is_start[starts] = True
+
+    sides = np.zeros((len(SIDE_METRICS), n_games, 2), dtype=np.int32)
+    sides[_GOALS, :, 0], sides[_GOALS, :, 1] = home[ends], away[ends]
+    sides[_MAX_LEAD, :, 0] = np.maximum.reduceat(diff, starts)
+    sides[_MAX_LEAD, :, 1] = -np.minimum.reduceat(diff, starts)
+
+    ties = np.bincount(game[(diff == 0) & ~is_start], minlength=n_games).astype(np.int32)
+    # Führungswechsel: aufeinanderfolgende Stände mit Führung im selben Spiel, aber anderem Führenden
+    leader = np.sign(diff)
+    led = np.flatnonzero(leader)
+    switch = (game[led[1:]] == game[led[:-1]]) & (leader[led[1:]] != leader[led[:-1]])
+    lead_changes = np.bincount(game[led[1:]][switch], minlength=n_games).astype(np.int32)
+
+    # Schritte zwischen zwei Punkten desselben Spiels: wer hat getroffen?
+    step = np.flatnonzero(~is_start)
+    step_game = game[step]
+    goals_home, goals_away = home[step] - home[step - 1], away[step] - away[step - 1]
+    # 0 = beide oder keine Seite (Korrektur, Datenlücke), unterbricht jeden Lauf
+    scorer = np.where((goals_home > 0) & (goals_away <= 0), 1, np.where((goals_away > 0) & (goals_home <= 0), 2, 0))
+    if len(step):
+        new_run = np.ones(len(step), dtype=bool)
+        new_run[1:] = (scorer[1:] != scorer[:-1]) | (step_game[1:] != step_game[:-1])
+        run_start = np.flatnonzero(new_run)
+        run_goals = np.add.reduceat(np.where(scorer == 1, goals_home, np.where(scorer == 2, goals_away, 0)), run_start)
+        run_scorer = scorer[run_start]
+        scored = run_scorer > 0
+        np.maximum.at(sides[_MAX_RUN], (step_game[run_start][scored], run_scorer[scored] - 1), run_goals[scored])
+
+    # Schlussphase: letzte CLOSING_SECONDS vor dem regulären Ende der Liga
+    last_goal = np.median(second[ends])
+    regulation = int(GAME_LENGTHS_SECONDS[min(np.searchsorted(GAME_LENGTHS_SECONDS, last_goal), len(GAME_LENGTHS_SECONDS) - 1)])
+    closing = (second[step] > regulation - CLOSING_SECONDS) & (second[step] <= regulation)
+    sides[_CLOSING_GOALS, :, 0] = np.bincount(step_game[closing], weights=np.clip(goals_home[closing], 0, None), minlength=n_games)
+    sides[_CLOSING_GOALS, :, 1] = np.bincount(step_game[closing], weights=np.clip(goals_away[closing], 0, None), minlength=n_games)
+
+    return LeagueMomentum(game_info, lead_changes, ties, sides, regulation)
@@ -0,0 +1,65 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import db_queries_refactored as db_queries
+
+logger = logging.getLogger(__name__)
+
+# Mehr Threads als Pool-Verbindungen bringen nichts, sie würden nur auf eine freie Verbindung warten.
+PREFETCH_MAX_WORKERS: int = int(os.environ.get(
+    "PREFETCH_MAX_WORKERS", str(db_queries.DB_POOL_SIZE + db_queries.DB_POOL_MAX_OVERFLOW)
+))
+
+# Ein Prefetch-Auftrag: (gecachte Funktion, Positionsargumente)
+PrefetchTask = Tuple[Callable[..., Any], Sequence[Any]]
+
+
+def prefetch_cached(tasks: Dict[str, PrefetchTask], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Führt unabhängige get_*_cached Funktionen parallel auf dem gemeinsamen Engine-Pool aus.
+
+    Beispiel:
+        results = prefetch_cached({
+            "standings": (get_league_standings_cached, (league_id, season)),
+            "schedule": (get_schedule_cached, (league_id, season)),
+        })
+        results["schedule"]  # -> DataFrame
+
+    Bereits gecachte Ergebnisse kommen sofort zurück, bei kaltem Cache entspricht die
+    Gesamtdauer ungefähr der langsamsten Einzelabfrage. Schlägt ein Auftrag im Thread
+    fehl, wird er im aufrufenden Thread erneut ausgeführt, damit Fehler wie bisher
+    direkt auf der Seite sichtbar werden.
+    """
+    if not tasks:
+        return {}
+
+    workers = min(len(tasks), max_workers or PREFETCH_MAX_WORKERS)
+    # Ohne Kontext, wenn aus einem Hintergrund-Thread aufgerufen (utils/cache_warming.py)
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def _run(func: Callable[..., Any], args: Sequence[Any]) -> Any:
+        # Ohne Kontext würde Streamlit im Worker-Thread "missing ScriptRunContext" warnen.
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+
+    start = time.perf_counter()
+    results: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch") as executor:
+        futures = {name: executor.submit(_run, func, args) for name, (func, args) in tasks.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.warning(f"Prefetch '{name}' fehlgeschlagen, führe synchron aus: {e}")
+                func, args = tasks[name]
+                results[name] = func(*args)
+
+    logger.info(f"Prefetch von {len(tasks)} Abfragen in {time.perf_counter() - start:.3f}s abgeschlossen.")
+    return results
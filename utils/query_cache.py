@@ -0,0 +1,271 @@
+"""
+Prozessübergreifender Ergebnis-Cache für die get_*_cached Funktionen (utils/cached_queries.py).
+
+Ergebnisse liegen gepickelt in einer lokalen SQLite-Datei (QUERY_CACHE_PATH). Alle Streamlit-Prozesse,
+die dieselbe Datei sehen, teilen sich damit die Ergebnisse, und ein Neustart beginnt nicht mit leerem
+Cache. Mehrere Replikate auf einem Host (oder mit gemeinsamem Volume) wärmen den Cache nur einmal.
+
+Invalidierung über Datenversionen statt st.cache_data.clear():
+    Die Tabelle "Cache_Versionen" (Migrationen 0004/0005) führt je Bereich eine Versionsnummer:
+        'alle'              - in jedem Schlüssel enthalten, für vollständige Invalidierung
+        'stammdaten'        - Abfragen ohne ID-Argument (Ligenliste, alle Teams, Basisstatistiken)
+        'liga:<Liga_ID>', 'team:<Team_ID>', 'spieler:<Spieler_ID>', 'spiel:<Spiel_ID>'
+    Die Bereiche einer Funktion ergeben sich aus ihren Argumentnamen (SCOPE_ARGUMENTS), z.B. hängt
+    get_team_leaderboards_cached(team_id, league_id, season) an 'team:<team_id>' und 'liga:<league_id>'.
+    Der Schlüssel eines Ergebnisses ist (Funktion, Argumente, Versionen von 'alle' und dieser Bereiche).
+    Der Import erhöht in seiner Transaktion die Versionen der berührten Ligen, Teams, Spieler und Spiele
+    (bump_cache_versions); alle anderen Ergebnisse bleiben gültig. Ungültige Einträge werden nicht mehr
+    gefunden und später nach Alter verdrängt, sobald die Datei QUERY_CACHE_MAX_MB überschreitet.
+
+Je Prozess werden Versionen beim ersten Zugriff auf einen Bereich gelesen und danach höchstens alle
+VERSION_REFRESH_SECONDS nur die Änderungen seit dem letzten Stand. So lange kann ein anderes Replikat
+nach einem Import noch den alten Stand zeigen. Sind die Versionen nicht lesbar (Migration fehlt,
+DB-Fehler), wird ohne Cache direkt abgefragt.
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import db_queries_refactored as db_queries
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_PATH: str = os.environ.get(
+    "QUERY_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "query_cache.sqlite3"),
+)
+QUERY_CACHE_MAX_MB: int = int(os.environ.get("QUERY_CACHE_MAX_MB", "512"))
+VERSION_REFRESH_SECONDS: float = float(os.environ.get("QUERY_CACHE_VERSION_REFRESH_SECONDS", "5"))
+# Größenprüfung nur alle n Schreibvorgänge, verdrängt wird bis auf diesen Anteil der Maximalgröße
+PRUNE_EVERY_WRITES: int = 200
+PRUNE_TARGET_RATIO: float = 0.8
+
+SCOPE_ALL: str = "alle"
+SCOPE_MASTER_DATA: str = "stammdaten"
+SCOPE_LEAGUE: str = "liga"
+SCOPE_TEAM: str = "team"
+SCOPE_PLAYER: str = "spieler"
+SCOPE_GAME: str = "spiel"
+# Argumentname der get_*_cached Funktionen -> Art des Bereichs
+SCOPE_ARGUMENTS: Dict[str, str] = {
+    "league_id": SCOPE_LEAGUE,
+    "team_id": SCOPE_TEAM, "team1_id": SCOPE_TEAM, "team2_id": SCOPE_TEAM, "opponent_team_id": SCOPE_TEAM,
+    "player_id": SCOPE_PLAYER,
+    "game_id": SCOPE_GAME,
+}
+
+# "Aenderung" kommt aus einer Sequenz; deren Werte werden in Aufrufreihenfolge vergeben, nicht in Commit-
+# Reihenfolge. Liest ein Prozess "Aenderung" > since, während ein Import mit kleinerem Wert noch nicht
+# committet ist, überspringt er dessen Änderungen für immer. Alle Schreiber halten daher ab dem Erhöhen bis
+# zum Commit dieselbe Transaktionssperre: ein kleinerer Wert ist immer schon committet (oder verworfen).
+CACHE_VERSION_LOCK_KEY: int = 4_203_700_037
+SQL_LOCK_CACHE_VERSIONS: str = "SELECT pg_advisory_xact_lock(%(lock_key)s)"
+
+SQL_BUMP_CACHE_VERSIONS: str = """
+INSERT INTO "Cache_Versionen" ("Bereich", "Version")
+SELECT bereich, 1 FROM unnest(%(scopes)s::TEXT[]) AS bereich
+ON CONFLICT ("Bereich") DO UPDATE
+SET "Version" = "Cache_Versionen"."Version" + 1, "Geaendert_Am" = now(),
+    "Aenderung" = nextval('cache_versionen_aenderung_seq')
+"""
+
+
+def entity_scope(kind: str, entity_id: str) -> str:
+    return f"{kind}:{entity_id}"
+
+
+def bump_cache_versions(cursor, scopes: Iterable[str]) -> None:
+    """
+    Erhöht die Versionen der Bereiche (psycopg2-Cursor, läuft in der Transaktion des Aufrufers).
+    Erst mit dessen Commit sehen die App-Prozesse die neuen Versionen. Sperrt andere Schreiber bis zum
+    Commit (CACHE_VERSION_LOCK_KEY), daher erst am Ende der Transaktion aufrufen.
+    """
+    scopes = sorted(set(scopes))
+    if scopes:
+        cursor.execute(SQL_LOCK_CACHE_VERSIONS, {"lock_key": CACHE_VERSION_LOCK_KEY})
+        cursor.execute(SQL_BUMP_CACHE_VERSIONS, {"scopes": scopes})
+    _versions["checked_at"] = 0.0  # im eigenen Prozess beim nächsten Zugriff nachladen
+
+
+def scopes_for_touched(touched: Dict[str, Set[str]]) -> List[str]:
+    """Bereiche zu den von analyse_game_json.write_game_batch berührten IDs (plus Stammdaten)."""
+    kinds = {"leagues": SCOPE_LEAGUE, "teams": SCOPE_TEAM, "players": SCOPE_PLAYER, "games": SCOPE_GAME}
+    scopes = [SCOPE_MASTER_DATA]
+    for key, kind in kinds.items():
+        scopes.extend(entity_scope(kind, entity_id) for entity_id in touched.get(key, ()) if entity_id)
+    return scopes
+
+
+# --- Datenversionen je Prozess: bei Bedarf gelesen, danach nur Änderungen ---
+# since: höchste gesehene "Aenderung"; None, solange der Stand nicht lesbar war
+_versions: Dict[str, Any] = {"known": {}, "since": None, "checked_at": 0.0}
+_versions_lock = threading.Lock()
+
+
+def _sync_versions() -> bool:
+    """Übernimmt Änderungen seit dem letzten Stand (höchstens alle VERSION_REFRESH_SECONDS). False = nicht lesbar."""
+    if time.monotonic() - _versions["checked_at"] < VERSION_REFRESH_SECONDS:
+        return _versions["since"] is not None
+    with _versions_lock:
+        if time.monotonic() - _versions["checked_at"] >= VERSION_REFRESH_SECONDS:
+            if _versions["since"] is None:
+                # Erster Zugriff (oder nach Fehler): nur den Stand merken, Versionen kommen bei Bedarf
+                _versions["known"] = {}
+                _versions["since"] = db_queries.fetch_cache_version_watermark()
+            else:
+                changes = db_queries.fetch_cache_version_changes(_versions["since"])
+                if changes is None:
+                    _versions["since"] = None
+                elif not changes.empty:
+                    known = _versions["known"]
+                    for scope, version in zip(changes["Bereich"], changes["Version"]):
+                        if scope in known:
+                            known[scope] = int(version)
+                    _versions["since"] = int(changes["Aenderung"].max())
+            if _versions["since"] is None:
+                logger.warning("Cache-Versionen nicht lesbar (Migration 0005 angewendet?), frage ohne Cache ab.")
+            _versions["checked_at"] = time.monotonic()
+    return _versions["since"] is not None
+
+
+def _versions_for(scopes: List[str]) -> Optional[List[int]]:
+    if not _sync_versions():
+        return None
+    known = _versions["known"]
+    missing = [scope for scope in scopes if scope not in known]
+    if missing:
+        loaded = db_queries.fetch_cache_versions(missing)
+        if loaded is None:
+            return None
+        with _versions_lock:
+            for scope in missing:
+                known.setdefault(scope, loaded.get(scope, 0))
+    return [known[scope] for scope in scopes]
+
+
+def data_version(scope: str) -> Optional[int]:
+    """Aktuelle Version eines Bereichs für Caches außerhalb von shared_cache (z.B. den Suchindex). None = nicht lesbar."""
+    versions = _versions_for([scope])
+    return versions[0] if versions else None
+
+
+# --- Ablage (SQLite, eine Verbindung je Thread) ---
+_local = threading.local()
+_write_count = 0
+
+
+def _store() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(QUERY_CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(QUERY_CACHE_PATH, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")  # Leser blockieren Schreiber anderer Prozesse nicht
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ergebnisse ("
+            "schluessel TEXT PRIMARY KEY, wert BLOB NOT NULL, groesse INTEGER NOT NULL, erstellt REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_ergebnisse_erstellt ON ergebnisse (erstellt)")
+        _local.conn = conn
+    return conn
+
+
+def _read(key: str) -> Optional[bytes]:
+    try:
+        row = _store().execute("SELECT wert FROM ergebnisse WHERE schluessel = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"Ergebnis-Cache nicht lesbar: {e}")
+        return None
+    return row[0] if row else None
+
+
+def _write(key: str, value: bytes) -> None:
+    global _write_count
+    try:
+        conn = _store()
+        conn.execute(
+            "INSERT OR REPLACE INTO ergebnisse (schluessel, wert, groesse, erstellt) VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time()),
+        )
+        _write_count += 1
+        if _write_count % PRUNE_EVERY_WRITES == 0:
+            _prune(conn)
+    except sqlite3.Error as e:
+        # z.B. Datei gesperrt oder Platte voll, das Ergebnis wird dann nur nicht geteilt
+        logger.warning(f"Ergebnis-Cache nicht beschreibbar: {e}")
+
+
+def _prune(conn: sqlite3.Connection) -> None:
+    """Älteste Einträge löschen, bis die Summe unter PRUNE_TARGET_RATIO * QUERY_CACHE_MAX_MB liegt."""
+    max_bytes = QUERY_CACHE_MAX_MB * 1024 * 1024
+    total = conn.execute("SELECT COALESCE(SUM(groesse), 0) FROM ergebnisse").fetchone()[0]
+    if total <= max_bytes:
+        return
+    to_free = total - int(max_bytes * PRUNE_TARGET_RATIO)
+    freed, cutoff = 0, None
+    for erstellt, groesse in conn.execute("SELECT erstellt, groesse FROM ergebnisse ORDER BY erstellt"):
+        freed += groesse
+        cutoff = erstellt
+        if freed >= to_free:
+            break
+    conn.execute("DELETE FROM ergebnisse WHERE erstellt <= ?", (cutoff,))
+    logger.info(f"Ergebnis-Cache verkleinert: {freed / 1024 / 1024:.1f} MB freigegeben.")
+
+
+def store_size_bytes() -> int:
+    """Summe der gespeicherten Ergebnisse in Bytes (ohne SQLite-Verwaltungsdaten)."""
+    try:
+        return _store().execute("SELECT COALESCE(SUM(groesse), 0) FROM ergebnisse").fetchone()[0]
+    except sqlite3.Error as e:
+        logger.warning(f"Ergebnis-Cache nicht lesbar: {e}")
+        return 0
+
+
+def clear_result_store() -> None:
+    """Löscht alle Einträge der lokalen Datei (die Versionen in der DB bleiben unverändert)."""
+    _store().execute("DELETE FROM ergebnisse")
+
+
+# --- Decorator ---
+def shared_cache(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Ersetzt @st.cache_data. Die Bereiche ergeben sich aus den Argumenten (SCOPE_ARGUMENTS); Funktionen
+    ohne ein gesetztes ID-Argument hängen an 'stammdaten'.
+
+    Beispiel:
+        @shared_cache
+        def get_schedule_cached(league_id, season): ...   # Bereich 'liga:<league_id>'
+    """
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+    scope_params = [param for param in signature.parameters if param in SCOPE_ARGUMENTS]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        scopes = [entity_scope(SCOPE_ARGUMENTS[param], bound.arguments[param]) for param in scope_params if bound.arguments[param]]
+        versions = _versions_for([SCOPE_ALL] + (scopes or [SCOPE_MASTER_DATA]))
+        if versions is None:
+            return func(*args, **kwargs)
+        key_source = repr((name, tuple(bound.arguments.items()), versions))
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+        cached = _read(key)
+        if cached is not None:
+            try:
+                return pickle.loads(cached)
+            except Exception as e:  # z.B. mit anderer pandas-Version geschrieben
+                logger.warning(f"Cache-Eintrag für {name} nicht lesbar, berechne neu: {e}")
+        result = func(*args, **kwargs)
+        _write(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    return wrapper
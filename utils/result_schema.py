@@ -0,0 +1,66 @@
+"""
+Deklarierte Ergebnistypen für Abfragen aus sql/*.sql.
+
+Die SQL-Dateien liefern Rohwerte (z.B. "Start_Zeit" als Epoch-Sekunden statt TO_CHAR-Text). Nach dem
+Abruf werden die Spalten einmal vektorisiert in kompakte Typen umgewandelt; formatiert wird erst bei der
+Anzeige (utils/ui.py bzw. strftime in den Seiten). So landen kleinere DataFrames im st.cache_data und
+das Formatieren in der DB plus erneute Parsen in Python entfällt.
+
+Beispiel:
+    SCHEMA = {"Spieldatum": EPOCH_DATETIME, "Heimteam": CATEGORY, "Tore_Gesamt": INT32}
+    df = apply_result_schema(execute_query(query, params), SCHEMA)
+"""
+import os
+from typing import Dict
+
+import pandas as pd
+
+# Epoch-Sekunden -> datetime64 in DISPLAY_TIMEZONE (ohne Zeitzonenangabe, wie bisher die geparsten Texte)
+EPOCH_DATETIME: str = "epoch_datetime"
+# int32; enthält die Spalte NULL-Werte, wird das nullable Int32 verwendet
+INT32: str = "int32"
+FLOAT32: str = "float32"
+CATEGORY: str = "category"
+
+DISPLAY_TIMEZONE: str = os.environ.get("DISPLAY_TIMEZONE", "Europe/Berlin")
+DISPLAY_DATETIME_FORMAT: str = "%d.%m.%Y %H:%M"
+
+ResultSchema = Dict[str, str]
+
+
+def _as_numeric(values: pd.Series) -> pd.Series:
+    return values if pd.api.types.is_numeric_dtype(values) else pd.to_numeric(values, errors="coerce")
+
+
+def epoch_to_datetime(values: pd.Series) -> pd.Series:
+    """Epoch-Sekunden (UTC) -> lokale Zeit in DISPLAY_TIMEZONE als datetime64 ohne Zeitzone."""
+    utc = pd.to_datetime(_as_numeric(values), unit="s", utc=True)
+    return utc.dt.tz_convert(DISPLAY_TIMEZONE).dt.tz_localize(None)
+
+
+def apply_result_schema(df: pd.DataFrame, schema: ResultSchema) -> pd.DataFrame:
+    """Wendet schema spaltenweise an (in-place auf df, das auch zurückgegeben wird). Fehlende Spalten werden ignoriert."""
+    if df.empty:
+        return df
+    for column, kind in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if kind == EPOCH_DATETIME:
+            df[column] = epoch_to_datetime(values)
+        elif kind == INT32:
+            values = _as_numeric(values)
+            nullable = not pd.api.types.is_integer_dtype(values) and values.isna().any()
+            df[column] = values.astype("Int32" if nullable else "int32")
+        elif kind == FLOAT32:
+            df[column] = _as_numeric(values).astype("float32")
+        elif kind == CATEGORY:
+            df[column] = values.astype("category")
+        else:
+            raise ValueError(f"Unbekannter Ergebnistyp '{kind}' für Spalte '{column}'.")
+    return df
+
+
+def format_datetime(value, fallback: str = "N/A") -> str:
+    """Einzelner Zeitpunkt für die Anzeige, z.B. in Button-Beschriftungen."""
+    return value.strftime(DISPLAY_DATETIME_FORMAT) if pd.notna(value) else fallback
@@ -0,0 +1,71 @@
+"""
+Kompakter Spielverlauf (Score-Worm) je Spiel.
+
+Beim Import wird aus den Ereignissen eines Spiels einmal der Verlauf des Spielstands abgeleitet und in
+"Spielverlaeufe"."Spielverlauf" (BYTEA) gespeichert: je Punkt drei int16 (Spielsekunde, Tore Heim, Tore Gast),
+big-endian wie int2send() in PostgreSQL. Der erste Punkt ist immer 0:0 in Sekunde 0, danach folgt ein
+Punkt je Änderung des Spielstands. Ereignisse ohne Spieluhr erben die zuletzt bekannte Sekunde.
+Die Migration 0010_spielverlauf füllt Bestandsdaten mit derselben Regel in SQL nach.
+
+Beispiel:
+    blob = encode_score_timeline(events)   # Ereignisse aus extract_data_from_game_json
+    decode_score_timeline(blob)            # int16-Array (Punkte, 3): Sekunde, Heim, Gast
+    decode_score_timelines(blobs)          # alle Verläufe in einem Array plus Offsets je Spiel
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TIMELINE_DTYPE: np.dtype = np.dtype(">i2")
+TIMELINE_COLUMNS = ("Spiel_Sekunde", "Tore_Heim", "Tore_Gast")
+_INT16_MAX = np.iinfo(np.int16).max
+
+
+def encode_score_timeline(events: Iterable[Dict[str, Any]]) -> Optional[bytes]:
+    """
+    Spielverlauf aus Ereignissen (Schlüssel wie EVENT_COLS: Zeitstempel, H4A_Ereignis_ID, Spiel_Sekunde,
+    Score_Heim, Score_Gast) als Bytes für "Spielverlauf". None, wenn kein Ereignis einen Spielstand trägt.
+    """
+    scored = sorted(
+        (e for e in events if e.get("Score_Heim") is not None and e.get("Score_Gast") is not None),
+        key=lambda e: (e.get("Zeitstempel") or 0, e.get("H4A_Ereignis_ID") or 0),
+    )
+    if not scored:
+        return None
+    points: List[tuple] = [(0, 0, 0)]
+    second = 0
+    for event in scored:
+        if event.get("Spiel_Sekunde") is not None:
+            second = max(second, event["Spiel_Sekunde"])  # laufendes Maximum, die Uhr läuft nicht zurück
+        score = (event["Score_Heim"], event["Score_Gast"])
+        if score != points[-1][1:]:
+            points.append((second,) + score)
+    return np.clip(np.asarray(points), 0, _INT16_MAX).astype(TIMELINE_DTYPE).tobytes()
+
+
+def decode_score_timeline(blob: Optional[bytes]) -> np.ndarray:
+    """int16-Array (Punkte, 3) mit Spielsekunde, Tore Heim, Tore Gast; leer (0, 3) ohne Spielverlauf."""
+    if not blob:
+        return np.empty((0, len(TIMELINE_COLUMNS)), dtype=np.int16)
+    return np.frombuffer(bytes(blob), dtype=TIMELINE_DTYPE).reshape(-1, len(TIMELINE_COLUMNS)).astype(np.int16)
+
+
+def decode_score_timelines(blobs: Sequence[Optional[bytes]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Viele Spielverläufe auf einmal: int32-Array (Punkte, 3) aller Verläufe hintereinander und int64-Offsets
+    (len(blobs) + 1), Verlauf i sind die Zeilen offsets[i]:offsets[i + 1]. Ein Puffer, ein frombuffer.
+    """
+    raw = [bytes(blob) if blob else b"" for blob in blobs]
+    point_size = TIMELINE_DTYPE.itemsize * len(TIMELINE_COLUMNS)
+    offsets = np.zeros(len(raw) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter((len(b) // point_size for b in raw), dtype=np.int64, count=len(raw)), out=offsets[1:])
+    points = np.frombuffer(b"".join(raw), dtype=TIMELINE_DTYPE).reshape(-1, len(TIMELINE_COLUMNS)).astype(np.int32)
+    return points, offsets
+
+
+def step_points(timeline: np.ndarray) -> np.ndarray:
+    """Treppenform für Diagramme: vor jeder Änderung ein Punkt mit dem alten Spielstand zur neuen Sekunde."""
+    if len(timeline) < 2:
+        return timeline
+    steps = np.repeat(timeline, 2, axis=0)
+    return np.column_stack((steps[1:, 0], steps[:-1, 1:]))
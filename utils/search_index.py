@@ -0,0 +1,290 @@
+"""
+Globaler In-Memory-Suchindex (Omnibox) über Vereine, Teams, Ligen und Spieler.
+
+Aufbau:
+    - Jeder Eintrag bekommt beim Aufbau einen festen Rang (Typ, Länge des Namens, Name, ID); der Rang
+      ist zugleich seine Position in den Spalten-Arrays. Kleinere Position = weiter oben in der Trefferliste.
+    - Die normalisierten Wörter (normalize_search_text, entspricht handball_suchtext in der DB) werden
+      sortiert abgelegt, dazu je Wort die Positionen der Einträge (CSR: postings[offsets[t]:offsets[t+1]]).
+      Da die Wörter sortiert sind, bilden alle Wörter mit gleichem Präfix einen zusammenhängenden
+      Bereich [lo, hi) der Wort-IDs. Umgekehrt kennt jeder Eintrag seine Wort-IDs (entry_tokens), so
+      lässt sich für viele Kandidaten auf einmal prüfen, ob sie ein weiteres Präfix enthalten.
+    - Für Präfixe mit 1-3 Zeichen sind die TOP_K bestplatzierten Einträge vorberechnet; kurze Eingaben
+      würden sonst einen großen Teil aller Einträge als Kandidaten liefern.
+    - Aktualisierungen nach Importen landen in einem kleinen Delta-Segment, geänderte oder gelöschte
+      Einträge werden über das alive-Array ausgeblendet. Wird das Delta zu groß, wird neu aufgebaut.
+
+Abfragen lesen immer einen unveränderlichen Snapshot, Aktualisierungen ersetzen ihn atomar. Der Index
+kann daher ohne Sperre von allen Sessions gleichzeitig gelesen werden.
+"""
+import bisect
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Reihenfolge = Rang bei sonst gleich guten Treffern
+ENTITY_TYPES: Tuple[str, ...] = ("verein", "team", "liga", "spieler")
+ENTITY_TYPE_LABELS: Dict[str, str] = {"verein": "Verein", "team": "Team", "liga": "Liga", "spieler": "Spieler"}
+MIN_QUERY_LENGTH: int = 2
+DEFAULT_LIMIT: int = 10
+SHORT_PREFIX_LENGTH: int = 3
+TOP_K: int = 64
+# Delta-Segment wird neu aufgebaut, sobald es mehr als diesen Anteil (mind. COMPACT_MIN_ENTRIES) des Hauptsegments hat
+COMPACT_RATIO: float = 0.05
+COMPACT_MIN_ENTRIES: int = 5000
+
+# Umlaute auf zwei Buchstaben, Akzente auf den Grundbuchstaben (wie replace/translate in handball_suchtext)
+_FOLD_TABLE = str.maketrans({
+    **{"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"},
+    **dict(zip("áàâãåāéèêëēėíìîïīóòôõøōúùûūçćčñńšśžźżýÿłđ", "aaaaaaeeeeeeiiiiioooooouuuucccnnsszzzyyld")),
+})
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+# Erstes Zeichen nach [a-z0-9]: obere Grenze für die Präfixsuche per bisect
+_PREFIX_UPPER_BOUND: str = "{"
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def normalize_search_text(text: Optional[str]) -> str:
+    """Python-Gegenstück zu handball_suchtext (Migration 0003): 'Müller-Lüdenscheidt' -> 'mueller luedenscheidt'."""
+    if not text:
+        return ""
+    return _NON_ALNUM.sub(" ", text.lower().translate(_FOLD_TABLE)).strip()
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    typ: str
+    id: str
+    name: str
+    detail: Optional[str] = None  # Zusatz, der mit durchsucht und angezeigt wird (Team-Akronym, Liga-Saison)
+
+
+@dataclass(frozen=True)
+class _Segment:
+    first_position: int
+    tokens: List[str]
+    offsets: np.ndarray        # int64, len(tokens) + 1
+    postings: np.ndarray       # int32, globale Positionen, je Wort aufsteigend
+    entry_offsets: np.ndarray  # int64, Anzahl Einträge im Segment + 1
+    entry_tokens: np.ndarray   # int32, Wort-IDs je Eintrag
+    top_k: Dict[str, np.ndarray]
+
+    def token_range(self, word: str) -> Tuple[int, int]:
+        lo = bisect.bisect_left(self.tokens, word)
+        return lo, bisect.bisect_left(self.tokens, word + _PREFIX_UPPER_BOUND, lo)
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    typ_codes: np.ndarray  # int8, Index in ENTITY_TYPES
+    ids: List[str]
+    names: List[str]
+    details: List[Optional[str]]
+    alive: np.ndarray      # bool
+    positions: Dict[Tuple[str, str], int]
+    segments: Tuple[_Segment, ...]
+    base_size: int
+
+    def entry(self, position: int) -> SearchEntry:
+        return SearchEntry(ENTITY_TYPES[self.typ_codes[position]], self.ids[position], self.names[position], self.details[position])
+
+
+def _build_segment(token_lists: Sequence[List[str]], first_position: int, with_top_k: bool) -> _Segment:
+    """token_lists[i] = normalisierte, eindeutige Wörter des Eintrags an Position first_position + i."""
+    tokens = sorted({t for token_list in token_lists for t in token_list})
+    token_ids = {t: i for i, t in enumerate(tokens)}
+    counts = np.fromiter((len(tl) for tl in token_lists), dtype=np.int64, count=len(token_lists))
+    entry_tokens = np.fromiter((token_ids[t] for tl in token_lists for t in tl), dtype=np.int32, count=int(counts.sum()))
+    entry_positions = np.repeat(np.arange(first_position, first_position + len(token_lists), dtype=np.int32), counts)
+
+    order = np.lexsort((entry_positions, entry_tokens))
+    postings = entry_positions[order]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(entry_tokens, minlength=len(tokens)))]).astype(np.int64)
+    entry_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    top_k: Dict[str, np.ndarray] = {}
+    if with_top_k:
+        prefixes = sorted({t[:length] for t in tokens for length in range(1, SHORT_PREFIX_LENGTH + 1)})
+        for prefix in prefixes:
+            lo = bisect.bisect_left(tokens, prefix)
+            hi = bisect.bisect_left(tokens, prefix + _PREFIX_UPPER_BOUND, lo)
+            hits = postings[offsets[lo]:offsets[hi]]
+            if hits.size > TOP_K * 4:
+                hits = np.partition(hits, TOP_K * 4)[:TOP_K * 4]
+            top_k[prefix] = np.unique(hits)[:TOP_K]
+    return _Segment(first_position, tokens, offsets, postings, entry_offsets, entry_tokens, top_k)
+
+
+def _build_snapshot(entries: Iterable[SearchEntry], first_position: int = 0, with_top_k: bool = True) -> _Snapshot:
+    entries = list(entries)
+    normalized = [normalize_search_text(e.name) for e in entries]
+    # Fester Rang: Typ, kürzere Namen zuerst, alphabetisch, ID
+    order = sorted(range(len(entries)), key=lambda i: (ENTITY_TYPES.index(entries[i].typ), len(normalized[i]), normalized[i], entries[i].id))
+    ordered = [entries[i] for i in order]
+    token_lists = [
+        list(dict.fromkeys((normalized[i] + " " + normalize_search_text(entries[i].detail)).split()))
+        for i in order
+    ]
+    return _Snapshot(
+        typ_codes=np.fromiter((ENTITY_TYPES.index(e.typ) for e in ordered), dtype=np.int8, count=len(ordered)),
+        ids=[e.id for e in ordered],
+        names=[e.name for e in ordered],
+        details=[e.detail for e in ordered],
+        alive=np.ones(len(ordered), dtype=bool),
+        positions={(e.typ, e.id): first_position + i for i, e in enumerate(ordered)},
+        segments=(_build_segment(token_lists, first_position, with_top_k),),
+        base_size=len(ordered),
+    )
+
+
+def _match_counts(snapshot: _Snapshot, candidates: np.ndarray, word: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Je Kandidat: enthält er ein Wort mit Präfix word / genau das Wort word?"""
+    has_prefix = np.zeros(candidates.size, dtype=bool)
+    has_exact = np.zeros(candidates.size, dtype=bool)
+    for segment in snapshot.segments:
+        lo, hi = segment.token_range(word)
+        if lo == hi:
+            continue
+        exact_id = lo if segment.tokens[lo] == word else -1
+        in_segment = (candidates >= segment.first_position) & (candidates < segment.first_position + segment.entry_offsets.size - 1)
+        local = candidates[in_segment] - segment.first_position
+        starts, ends = segment.entry_offsets[local], segment.entry_offsets[local + 1]
+        lengths = ends - starts
+        # Wort-IDs aller Kandidaten hintereinander, owner = zugehöriger Kandidat
+        owner = np.repeat(np.arange(local.size), lengths)
+        token_ids = segment.entry_tokens[np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) + np.arange(owner.size)]
+        segment_prefix = np.zeros(local.size, dtype=bool)
+        segment_exact = np.zeros(local.size, dtype=bool)
+        segment_prefix[owner[(token_ids >= lo) & (token_ids < hi)]] = True
+        segment_exact[owner[token_ids == exact_id]] = True
+        has_prefix[in_segment] = segment_prefix
+        has_exact[in_segment] = segment_exact
+    return has_prefix, has_exact
+
+
+class SearchIndex:
+    """Präfixsuche über alle Entitäten. Aufbau mit build(), Aktualisierung mit refresh(), Abfrage mit search()."""
+
+    def __init__(self) -> None:
+        self._snapshot: _Snapshot = _build_snapshot([])
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return int(self._snapshot.alive.sum())
+
+    def build(self, entries: Iterable[SearchEntry]) -> None:
+        start = time.perf_counter()
+        self._snapshot = _build_snapshot(entries)
+        logger.info(f"Suchindex mit {self._snapshot.base_size} Einträgen in {time.perf_counter() - start:.2f}s aufgebaut.")
+
+    def refresh(self, entries: Iterable[SearchEntry], complete: bool = True) -> int:
+        """
+        Übernimmt neue und geänderte Einträge in das Delta-Segment. Mit complete=True ist entries der
+        vollständige Bestand, fehlende Einträge werden dann entfernt; mit complete=False werden nur die
+        übergebenen Einträge aktualisiert. Gibt die Anzahl geänderter Einträge zurück.
+        """
+        with self._write_lock:
+            current = self._snapshot
+            alive = current.alive.copy()
+            seen: set = set()
+            changed: List[SearchEntry] = []
+            for entry in entries:
+                key = (entry.typ, entry.id)
+                seen.add(key)
+                position = current.positions.get(key)
+                if (position is not None and alive[position] and current.names[position] == entry.name
+                        and current.details[position] == entry.detail):
+                    continue
+                if position is not None:
+                    alive[position] = False
+                changed.append(entry)
+            removed = 0
+            if complete:
+                for key, position in current.positions.items():
+                    if key not in seen and alive[position]:
+                        alive[position] = False
+                        removed += 1
+            if not changed and not removed:
+                return 0
+
+            start = time.perf_counter()
+            survivors_delta = [current.entry(p) for p in range(current.base_size, len(alive)) if alive[p]]
+            if len(survivors_delta) + len(changed) > max(COMPACT_MIN_ENTRIES, current.base_size * COMPACT_RATIO):
+                survivors_base = [current.entry(p) for p in np.flatnonzero(alive[:current.base_size])]
+                self._snapshot = _build_snapshot(survivors_base + survivors_delta + changed)
+                logger.info(f"Suchindex komplett neu aufgebaut ({len(self._snapshot.ids)} Einträge) in {time.perf_counter() - start:.2f}s.")
+                return len(changed) + removed
+
+            # Nur das (kleine) Delta-Segment neu aufbauen, das Hauptsegment wird übernommen
+            delta = _build_snapshot(survivors_delta + changed, first_position=current.base_size, with_top_k=False)
+            positions = {k: p for k, p in current.positions.items() if p < current.base_size and alive[p]}
+            positions.update(delta.positions)
+            self._snapshot = _Snapshot(
+                typ_codes=np.concatenate([current.typ_codes[:current.base_size], delta.typ_codes]),
+                ids=current.ids[:current.base_size] + delta.ids,
+                names=current.names[:current.base_size] + delta.names,
+                details=current.details[:current.base_size] + delta.details,
+                alive=np.concatenate([alive[:current.base_size], delta.alive]),
+                positions=positions,
+                segments=(current.segments[0], delta.segments[0]),
+                base_size=current.base_size,
+            )
+            logger.info(f"Suchindex aktualisiert: {len(changed)} neu/geändert, {removed} entfernt, "
+                        f"Delta {len(delta.ids)} Einträge, {time.perf_counter() - start:.2f}s.")
+            return len(changed) + removed
+
+    def _candidates(self, snapshot: _Snapshot, word: str, limit: int) -> np.ndarray:
+        """Positionen aller Einträge mit einem Wort, das mit word beginnt (bei kurzen Präfixen nur die besten)."""
+        parts: List[np.ndarray] = []
+        for segment in snapshot.segments:
+            lo, hi = segment.token_range(word)
+            if lo == hi:
+                continue
+            top = segment.top_k.get(word)
+            if top is not None and np.count_nonzero(snapshot.alive[top]) >= limit:
+                # Exakte Treffer zusätzlich, sie stehen in der Sortierung vor allen reinen Präfix-Treffern
+                parts.append(top)
+                if segment.tokens[lo] == word:
+                    parts.append(segment.postings[segment.offsets[lo]:segment.offsets[lo + 1]])
+                continue
+            parts.append(segment.postings[segment.offsets[lo]:segment.offsets[hi]])
+        return np.unique(np.concatenate(parts)) if parts else _EMPTY
+
+    def search(self, query: Optional[str], limit: int = DEFAULT_LIMIT, types: Optional[Iterable[str]] = None) -> List[SearchEntry]:
+        """
+        Alle Wörter der Anfrage müssen Wortanfänge des Eintrags sein. Sortierung: Anzahl exakt getroffener
+        Wörter, dann fester Rang (Typ, kürzere Namen, alphabetisch) - die Reihenfolge ist also stabil.
+        """
+        words = list(dict.fromkeys(normalize_search_text(query).split()))
+        if not words or sum(len(w) for w in words) < MIN_QUERY_LENGTH:
+            return []
+        snapshot = self._snapshot
+        # Das Wort mit den wenigsten Treffern liefert die Kandidaten, die übrigen Wörter filtern nur noch
+        words.sort(key=lambda w: sum(int(seg.offsets[hi] - seg.offsets[lo]) for seg in snapshot.segments
+                                     for lo, hi in [seg.token_range(w)]))
+        # Vorberechnete Bestenliste kurzer Präfixe nur ohne Typfilter (sonst fehlen evtl. Treffer des Typs)
+        shortcut_limit = limit if types is None and len(words) == 1 else TOP_K + 1
+        candidates = self._candidates(snapshot, words[0], shortcut_limit)
+        candidates = candidates[snapshot.alive[candidates]]
+        if types is not None:
+            allowed = [ENTITY_TYPES.index(t) for t in types]
+            candidates = candidates[np.isin(snapshot.typ_codes[candidates], allowed)]
+        if candidates.size == 0:
+            return []
+
+        exact_hits = np.zeros(candidates.size, dtype=np.int32)
+        for word in words:
+            has_prefix, has_exact = _match_counts(snapshot, candidates, word)
+            keep = has_prefix
+            candidates, exact_hits = candidates[keep], exact_hits[keep] + has_exact[keep]
+            if candidates.size == 0:
+                return []
+        order = np.argsort(-exact_hits, kind="stable")[:limit]
+        return [snapshot.entry(p) for p in candidates[order]]
@@ -0,0 +1,150 @@
+"""
+Monte-Carlo-Prognose der Abschlusstabelle einer laufenden Saison.
+
+Ausgangspunkt ist die aktuelle Tabelle (utils/standings.py), simuliert werden die offenen Spiele des
+Spielplans (Ergebnis 'vs'). Tormodell: Tore je Team und Spiel sind Poisson-verteilt mit
+    erwartet_heim = heimtore_liga * angriff_heim * abwehr_gast
+    erwartet_gast = gasttore_liga * angriff_gast * abwehr_heim
+Angriff und Abwehr sind Tore bzw. Gegentore je Spiel relativ zum Ligaschnitt, mit PRIOR_GAMES Spielen zum
+Ligaschnitt hin geglättet (frühe Saison, wenige Spiele). Punkte wie in der Tabelle: Sieg 2, Remis 1.
+
+Alle Läufe werden gemeinsam gerechnet: Ergebnisse als Arrays (Läufe, offene Spiele), Punkte und Tore je
+Team über eine Matrixmultiplikation mit der Zuordnung Spiel -> Team, die Plätze wie in der Tabelle
+(Punkte, Tordifferenz, Tore, Name) in einem Sortiervorgang über alle Läufe.
+
+Beispiel:
+    simulation = simulate_season(standings, schedule_df)   # get_league_standings_cached, get_schedule_cached
+    simulation.position_table()                              # Wahrscheinlichkeit je Team und Endplatz
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.standings import METRICS, LeagueStandings, table_ranks
+
+SIMULATION_RUNS: int = 100_000
+PRIOR_GAMES: float = 3.0
+SCHEDULE_COLUMNS = ("Spiel_ID", "Heim_Team_ID", "Heimteam", "Gast_Team_ID", "Gastteam", "Ergebnis")
+# Tore werden aus einer Tabelle je Spiel gezogen: Tore am Quantil (i + 0.5) / SAMPLE_BUCKETS der Poisson-
+# Verteilung, i gleichverteilt. Das ist die Inversionsmethode auf einem festen Raster; jede Torzahl weicht um
+# höchstens 1 / SAMPLE_BUCKETS von ihrer Wahrscheinlichkeit ab (weit unter dem Monte-Carlo-Fehler von 100k
+# Läufen) und ist ein Vielfaches schneller als Generator.poisson.
+SAMPLE_BUCKETS: int = 1 << 12
+# Läufe je Block; begrenzt den Speicher der Zwischenarrays (Läufe x Spiele bzw. Läufe x Teams)
+_CHUNK_RUNS: int = 20_000
+
+
+@dataclass
+class SeasonSimulation:
+    team_ids: np.ndarray         # (Teams,), nach Teamname sortiert
+    team_names: np.ndarray       # (Teams,)
+    position_counts: np.ndarray  # int64 (Teams, Teams): Läufe mit Team t auf Platz p + 1
+    mean_points: np.ndarray      # (Teams,) mittlere Punkte am Saisonende
+    runs: int
+    remaining_games: int
+
+    def position_table(self) -> pd.DataFrame:
+        """Wahrscheinlichkeit je Team (Zeile) und Endplatz (Spalten 1..Teams), sortiert nach erwartetem Platz."""
+        if not len(self.team_ids) or not self.runs:
+            return pd.DataFrame()
+        probabilities = self.position_counts / self.runs
+        expected = probabilities @ np.arange(1, len(self.team_ids) + 1)
+        table = pd.DataFrame(probabilities, columns=[str(p) for p in range(1, len(self.team_ids) + 1)])
+        table.insert(0, "Team", self.team_names)
+        table.insert(1, "Team_ID", self.team_ids)
+        table.insert(2, "Ø Platz", expected.round(2))
+        table.insert(3, "Ø Punkte", self.mean_points.round(1))
+        return table.iloc[np.argsort(expected, kind="stable")].reset_index(drop=True)
+
+
+def _strengths(goals_for: np.ndarray, goals_against: np.ndarray, games: np.ndarray, league_mean: float):
+    """Angriffs- und Abwehrfaktor je Team (1 = Ligaschnitt), mit PRIOR_GAMES Spielen Ligaschnitt geglättet."""
+    attack = (goals_for + PRIOR_GAMES * league_mean) / (games + PRIOR_GAMES) / league_mean
+    defence = (goals_against + PRIOR_GAMES * league_mean) / (games + PRIOR_GAMES) / league_mean
+    return attack, defence
+
+
+def poisson_tables(means: np.ndarray) -> np.ndarray:
+    """Je Erwartungswert die Torzahl an SAMPLE_BUCKETS gleich wahrscheinlichen Quantilen, int16 (len(means), SAMPLE_BUCKETS)."""
+    means = np.maximum(np.asarray(means, dtype=float), 0.1)
+    max_goals = int(np.ceil(means.max() + 10 * np.sqrt(means.max()))) + 10 if len(means) else 0
+    goals = np.arange(max_goals + 1)
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, max_goals + 1)))])
+    cdf = np.cumsum(np.exp(goals * np.log(means)[:, None] - means[:, None] - log_factorial), axis=1)
+    quantiles = (np.arange(SAMPLE_BUCKETS) + 0.5) / SAMPLE_BUCKETS
+    tables = np.array([np.searchsorted(row, quantiles) for row in cdf], dtype=np.int16).reshape(len(means), SAMPLE_BUCKETS)
+    return np.minimum(tables, max_goals)
+
+
+def simulate_season(standings: LeagueStandings, schedule: pd.DataFrame, runs: int = SIMULATION_RUNS,
+                    seed: Optional[int] = 0) -> SeasonSimulation:
+    """
+    Simuliert die offenen Spiele aus schedule (fetch_schedule_for_league.sql) runs-mal, ausgehend vom
+    aktuellen Tabellenstand. Teams, die noch kein gewertetes Spiel haben, starten bei null.
+    """
+    if schedule.empty:
+        schedule = pd.DataFrame(columns=SCHEDULE_COLUMNS)
+    open_games = schedule[schedule["Ergebnis"] == "vs"]
+    teams = pd.DataFrame({
+        "Team_ID": np.concatenate([standings.team_ids, open_games["Heim_Team_ID"], open_games["Gast_Team_ID"]]),
+        "Team": np.concatenate([standings.team_names, open_games["Heimteam"], open_games["Gastteam"]]),
+    }).drop_duplicates("Team_ID").sort_values(["Team", "Team_ID"]).reset_index(drop=True)
+    n_teams = len(teams)
+    if not n_teams:
+        return SeasonSimulation(np.empty(0, dtype=object), np.empty(0, dtype=object), np.zeros((0, 0), dtype=np.int64),
+                                np.zeros(0), 0, 0)
+
+    # Aktueller Stand je Team (Kennzahlen wie utils/standings.METRICS), neue Teams mit null
+    team_index = pd.Index(teams["Team_ID"])
+    totals = np.zeros((len(METRICS), n_teams), dtype=np.int64)
+    totals[:, team_index.get_indexer(standings.team_ids)] = standings.totals()
+    games = np.zeros(n_teams)
+    games[team_index.get_indexer(standings.team_ids)] = standings.games_played
+    goals_for, goals_against, points = (totals[METRICS.index(m)] for m in ("Tore", "Gegentore", "Punkte"))
+
+    # Heim- und Auswärtsschnitt der Liga aus den gespielten Spielen (ohne Spiele: Schnitt aus der Tabelle)
+    played = schedule.loc[schedule["Ergebnis"] != "vs", "Ergebnis"].str.split(":", expand=True)
+    if played.shape[0] and played.shape[1] == 2:
+        home_mean, away_mean = played.astype(float).mean().to_numpy()
+    else:
+        home_mean = away_mean = max(goals_for.sum() / max(games.sum(), 1.0), 1.0)
+    attack, defence = _strengths(goals_for, goals_against, games, (home_mean + away_mean) / 2)
+
+    home_idx = team_index.get_indexer(open_games["Heim_Team_ID"])
+    away_idx = team_index.get_indexer(open_games["Gast_Team_ID"])
+    n_games = len(home_idx)
+    expected_home = home_mean * attack[home_idx] * defence[away_idx]
+    expected_away = away_mean * attack[away_idx] * defence[home_idx]
+
+    # Zeilen 0..G-1 Heimseite, G..2G-1 Gastseite; (Teams, 2G) @ Ergebnisse (2G, Läufe) ergibt die Summen je Team
+    side_team = np.concatenate([home_idx, away_idx])
+    team_of = np.zeros((n_teams, 2 * n_games), dtype=np.float32)
+    team_of[side_team, np.arange(2 * n_games)] = 1
+    opponent_of = np.roll(team_of, n_games, axis=1)  # Gegentore: Tore der anderen Seite
+    # Punkte der Gastseite sind 2 - Heimpunkte: Summe = 2 * Auswärtsspiele + (Heim - Gast) @ Heimpunkte
+    home_minus_away = team_of[:, :n_games] - team_of[:, n_games:]
+    away_game_points = 2 * team_of[:, n_games:].sum(axis=1).astype(np.int64)
+    tables = poisson_tables(np.concatenate([expected_home, expected_away]))
+
+    rng = np.random.default_rng(seed)
+    position_counts = np.zeros(n_teams * n_teams, dtype=np.int64)
+    points_sum = np.zeros(n_teams)
+    for chunk_start in range(0, runs, _CHUNK_RUNS):
+        chunk = min(_CHUNK_RUNS, runs - chunk_start)
+        # Je Seite eine Zeile über alle Läufe; take auf die Tabellenzeile bleibt im Cache
+        buckets = rng.integers(0, SAMPLE_BUCKETS, size=(2 * n_games, chunk), dtype=np.int16)
+        goals = np.array([table.take(row) for table, row in zip(tables, buckets)], dtype=np.int16).reshape(2 * n_games, chunk)
+        home_points = np.sign(goals[:n_games] - goals[n_games:]).astype(np.float32) + 1  # Sieg 2, Remis 1, Niederlage 0
+        goals = goals.astype(np.float32)
+        final_points = points + away_game_points + (home_minus_away @ home_points).T.astype(np.int64)
+        final_for = goals_for + (team_of @ goals).T.astype(np.int64)
+        final_against = goals_against + (opponent_of @ goals).T.astype(np.int64)
+        ranks = table_ranks(final_points, final_for, final_against)
+        # Zähler je (Team, Platz) als ein bincount über alle Läufe des Blocks
+        position_counts += np.bincount((np.arange(n_teams) * n_teams + ranks - 1).ravel(), minlength=n_teams * n_teams)
+        points_sum += final_points.sum(axis=0)
+
+    return SeasonSimulation(teams["Team_ID"].to_numpy(dtype=object), teams["Team"].to_numpy(dtype=object),
+                            position_counts.reshape(n_teams, n_teams), points_sum / max(runs, 1), runs, n_games)
@@ -0,0 +1,161 @@
+"""
+Tabellenstand einer Liga-Saison zu jedem Spieltag und Zeitpunkt.
+
+Die gewerteten Spiele werden einmal geladen (db_queries.fetch_league_standings) und je Team in
+Spielreihenfolge zu Präfixsummen aufaddiert: cumulative[m, k, t] ist Kennzahl m (Siege, Tore, Punkte, ...)
+von Team t nach seinen ersten k Spielen. Nach dem letzten Spiel eines Teams bleibt der Wert stehen.
+Ein Tabellenstand ist damit ein Zugriff je Team:
+    - nach Spieltag N: Zeile N (N-tes Spiel jedes Teams, wie "Spiel_Nr" im Punkteverlauf)
+    - zum Zeitpunkt X: Zeile games_by_time[d, t], d = Anzahl der Anstoßzeiten <= X (binäre Suche)
+Sortiert wird wie in fetch_league_table.sql nach Punkten, Tordifferenz und Toren, danach nach Teamname.
+
+Aktuelle Tabelle, Punkteverlauf und Platzierungsverlauf der Ligen-Seite kommen aus derselben gecachten
+Struktur (get_league_standings_cached).
+
+Beispiel:
+    standings = build_league_standings(games_df)
+    standings.table()                    # aktuelle Tabelle
+    standings.table(after_round=10)      # nach dem 10. Spiel jedes Teams
+    standings.table(at=1700000000)       # Stand zum Zeitpunkt (Epoch-Sekunden)
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.result_schema import epoch_to_datetime
+
+METRICS: Tuple[str, ...] = ("S", "U", "N", "Tore", "Gegentore", "Punkte")
+_WINS, _DRAWS, _LOSSES, _GOALS_FOR, _GOALS_AGAINST, _POINTS = range(len(METRICS))
+
+_KEY_OFFSET: int = 1 << 16  # Tordifferenz >= -65536, Tore und Punkte < 131072
+
+TABLE_COLUMNS: Tuple[str, ...] = ("Platz", "Team", "Team_ID", "Spiele", "S", "U", "N", "Tore", "Diff", "Punkte")
+
+
+def table_ranks(points: np.ndarray, goals_for: np.ndarray, goals_against: np.ndarray) -> np.ndarray:
+    """Tabellenplätze (1 = Erster) für Arrays der Form (Stände, Teams), jede Zeile für sich sortiert."""
+    states, teams = points.shape
+    # Punkte, Tordifferenz und Tore als ein int64-Schlüssel (je 17 Bit, Tordifferenz verschoben), dann eine
+    # stabile Sortierung je Zeile: Gleichstand bleibt in Teamreihenfolge (Teams sind nach Name sortiert)
+    goals_for = np.asarray(goals_for, dtype=np.int64)
+    key = ((np.asarray(points, dtype=np.int64) << 34) | ((goals_for - goals_against + _KEY_OFFSET) << 17) | goals_for)
+    order = np.argsort(-key, axis=1, kind="stable")
+    ranks = np.empty((states, teams), dtype=np.int32)
+    np.put_along_axis(ranks, order, np.arange(1, teams + 1, dtype=np.int32)[None, :], axis=1)
+    return ranks
+
+
+@dataclass
+class LeagueStandings:
+    team_ids: np.ndarray       # (Teams,), nach Teamname sortiert
+    team_names: np.ndarray     # (Teams,)
+    cumulative: np.ndarray     # int32 (len(METRICS), Spieltage + 1, Teams)
+    games_played: np.ndarray   # int32 (Teams,)
+    kickoff_times: np.ndarray  # int64, eindeutige Anstoßzeiten aufsteigend (Epoch-Sekunden)
+    games_by_time: np.ndarray  # int32 (len(kickoff_times) + 1, Teams): Spiele je Team bis einschließlich Anstoßzeit d-1
+
+    @property
+    def rounds(self) -> int:
+        return self.cumulative.shape[1] - 1
+
+    def games_after(self, after_round: Optional[int] = None, at: Optional[int] = None) -> np.ndarray:
+        """Anzahl gewerteter Spiele je Team nach Spieltag after_round bzw. zum Zeitpunkt at (sonst alle)."""
+        if at is not None:
+            return self.games_by_time[np.searchsorted(self.kickoff_times, at, side="right")]
+        if after_round is not None:
+            return np.minimum(self.games_played, max(after_round, 0))
+        return self.games_played
+
+    def totals(self, after_round: Optional[int] = None, at: Optional[int] = None) -> np.ndarray:
+        """Kennzahlen (len(METRICS), Teams) nach Spieltag after_round bzw. zum Zeitpunkt at (sonst aktuell)."""
+        games = self.games_after(after_round, at)
+        return self.cumulative[:, games, np.arange(len(games))]
+
+    def table(self, after_round: Optional[int] = None, at: Optional[int] = None) -> pd.DataFrame:
+        """Tabelle wie fetch_league_table.sql, nach Spieltag after_round oder zum Zeitpunkt at (Epoch-Sekunden)."""
+        if not len(self.team_ids):
+            return pd.DataFrame()
+        games = self.games_after(after_round, at)
+        values = self.totals(after_round, at)
+        goals_for, goals_against, points = values[_GOALS_FOR], values[_GOALS_AGAINST], values[_POINTS]
+        ranks = table_ranks(points[None, :], goals_for[None, :], goals_against[None, :])[0]
+        table = pd.DataFrame({
+            "Platz": ranks,
+            "Team": self.team_names,
+            "Team_ID": self.team_ids,
+            "Spiele": games,
+            "S": values[_WINS],
+            "U": values[_DRAWS],
+            "N": values[_LOSSES],
+            "Tore": [f"{a}:{b}" for a, b in zip(goals_for, goals_against)],
+            "Diff": goals_for - goals_against,
+            "Punkte": [f"{p}:{2 * g - p}" for p, g in zip(points, games)],
+        }, columns=list(TABLE_COLUMNS))
+        return table.sort_values("Platz", kind="stable").reset_index(drop=True)
+
+    def points_progression(self) -> pd.DataFrame:
+        """Kumulierte Punkte nach jedem Spieltag (Index Spiel_Nr, eine Spalte je Team)."""
+        return self._by_round(self.cumulative[_POINTS, 1:, :])
+
+    def rank_progression(self) -> pd.DataFrame:
+        """Tabellenplatz nach jedem Spieltag (Index Spiel_Nr, eine Spalte je Team), alle Spieltage in einem Sortiervorgang."""
+        values = self.cumulative[:, 1:, :]
+        return self._by_round(table_ranks(values[_POINTS], values[_GOALS_FOR], values[_GOALS_AGAINST]))
+
+    def game_days(self) -> pd.Series:
+        """Letzte Anstoßzeit (Epoch-Sekunden) je Kalendertag in DISPLAY_TIMEZONE, Index = Datum."""
+        kickoffs = pd.Series(self.kickoff_times)
+        return kickoffs.groupby(epoch_to_datetime(kickoffs).dt.date.to_numpy()).max()
+
+    def _by_round(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=pd.RangeIndex(1, self.rounds + 1, name="Spiel_Nr"), columns=self.team_names)
+
+
+def build_league_standings(games: pd.DataFrame) -> LeagueStandings:
+    """
+    Baut die Präfixsummen aus fetch_league_results_for_standings.sql (Spiele nach Anstoß und Spiel_ID sortiert).
+    Ein Team-Spiel zählt nur, wenn für diese Seite offizielle Punkte vorliegen (wie in fetch_league_table.sql).
+    """
+    if games.empty:
+        empty = np.empty(0, dtype=object)
+        return LeagueStandings(empty, empty, np.zeros((len(METRICS), 1, 0), dtype=np.int32), np.zeros(0, dtype=np.int32),
+                               np.empty(0, dtype=np.int64), np.zeros((1, 0), dtype=np.int32))
+
+    home = games["Punkte_Heim"].notna().to_numpy()
+    away = games["Punkte_Gast"].notna().to_numpy()
+
+    def stacked(home_column: str, away_column: str) -> np.ndarray:
+        return np.concatenate([games[home_column].to_numpy()[home], games[away_column].to_numpy()[away]])
+
+    team_ids = stacked("Heim_Team_ID", "Gast_Team_ID")
+    teams = (pd.DataFrame({"Team_ID": team_ids, "Team": stacked("Heimteam", "Gastteam")})
+             .drop_duplicates("Team_ID").sort_values(["Team", "Team_ID"]))
+    team_idx = pd.Index(teams["Team_ID"]).get_indexer(team_ids)
+    game_pos = np.concatenate([np.flatnonzero(home), np.flatnonzero(away)])
+    kickoff = stacked("Start_Zeit", "Start_Zeit").astype(np.int64)
+    goals_for = np.nan_to_num(stacked("Tore_Heim", "Tore_Gast").astype(float)).astype(np.int32)
+    goals_against = np.nan_to_num(stacked("Tore_Gast", "Tore_Heim").astype(float)).astype(np.int32)
+    points = stacked("Punkte_Heim", "Punkte_Gast").astype(np.int32)
+
+    # Laufende Spielnummer je Team (1, 2, ...) in Spielreihenfolge
+    order = np.lexsort((game_pos, team_idx))
+    games_played = np.bincount(team_idx, minlength=len(teams)).astype(np.int32)
+    block_start = np.repeat(np.cumsum(games_played) - games_played, games_played)
+    game_no = np.empty(len(order), dtype=np.int64)
+    game_no[order] = np.arange(len(order)) - block_start + 1
+
+    increments = np.zeros((len(METRICS), int(games_played.max()) + 1, len(teams)), dtype=np.int32)
+    for metric, values in ((_WINS, points == 2), (_DRAWS, points == 1), (_LOSSES, points == 0),
+                           (_GOALS_FOR, goals_for), (_GOALS_AGAINST, goals_against), (_POINTS, points)):
+        increments[metric, game_no, team_idx] = values
+    cumulative = np.cumsum(increments, axis=1, dtype=np.int32)
+
+    kickoff_times = np.unique(kickoff)
+    games_by_time = np.zeros((len(kickoff_times) + 1, len(teams)), dtype=np.int32)
+    np.add.at(games_by_time, (np.searchsorted(kickoff_times, kickoff) + 1, team_idx), 1)
+    games_by_time = np.cumsum(games_by_time, axis=0, dtype=np.int32)
+
+    return LeagueStandings(teams["Team_ID"].to_numpy(dtype=object), teams["Team"].to_numpy(dtype=object), cumulative,
+                           games_played, kickoff_times, games_by_time)
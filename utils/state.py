@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.cache_warming import start_cache_warming_on_server_start
 
 def init_session_state():
     """Initialisiert alle notwendigen Session State Variablen, falls sie nicht existieren."""
@@ -28,4 +29,6 @@ def init_session_state():
     }
     for key, value in defaults.items():
         if key not in st.session_state:
-            st.session_state[key] = value
\ No newline at end of file
+            st.session_state[key] = value
+    # Einmal je Serverprozess den Ergebnis-Cache der aktiven Ligen im Hintergrund vorwärmen
+    start_cache_warming_on_server_start()
\ No newline at end of file
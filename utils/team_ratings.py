@@ -0,0 +1,86 @@
+"""
+Elo-Rating je Team über alle Ligen und Saisons.
+
+Alle gewerteten Spiele werden in zeitlicher Reihenfolge (Start_Zeit, Spiel_ID) nacheinander verrechnet:
+    erwartet_heim = 1 / (1 + 10 ** ((R_gast - R_heim - HOME_ADVANTAGE) / 400))
+    änderung      = K_FACTOR * tordifferenz_faktor * (ergebnis_heim - erwartet_heim)   (Sieg 1, Remis 0.5)
+Der Gast erhält die negative Änderung, ein einzelnes Spiel ändert die Summe beider Ratings also nicht
+(die Gesamtsumme schon: Saisonwechsel und neue Teams verschieben sie). Der Faktor
+1 + ln(1 + |Tordifferenz|) / 2 gewichtet deutliche Ergebnisse stärker (Remis 1, ein Tor 1.35, zehn Tore 2.2).
+Beim ersten Spiel einer neuen Saison rückt das Rating um (1 - SEASON_CARRYOVER) zurück zum Startwert.
+
+Teams verschiedener Ligen treffen selten direkt aufeinander; vergleichbar werden ihre Ratings über
+Auf- und Abstiege, Pokalspiele und gemeinsame Gegner. Alle Teams beginnen mit RATING_START.
+
+Gespeichert wird in "Team_Rating_Verlauf" (eine Zeile je Spiel und Team) und "Team_Ratings" (aktueller
+Stand), gepflegt von analyse_game_json.update_team_ratings. Dieses Modul rechnet nur, ohne Datenbank.
+
+Beispiel:
+    state = RatingState()                         # oder der Stand vor dem ersten neu zu rechnenden Spiel
+    history = rate_games(games, state)            # games: RatingGame in zeitlicher Reihenfolge
+    state.ratings["handball4all.westfalen.0_3"]   # aktuelles Rating
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple
+
+RATING_START: float = 1500.0
+K_FACTOR: float = 20.0
+HOME_ADVANTAGE: float = 50.0
+SEASON_CARRYOVER: float = 0.75
+
+
+class RatingGame(NamedTuple):
+    spiel_id: str
+    start_zeit: int
+    saison: str
+    heim_team_id: str
+    gast_team_id: str
+    tore_heim: int
+    tore_gast: int
+
+
+# Spalten von "Team_Rating_Verlauf" in der Reihenfolge der Tupel aus rate_games
+HISTORY_COLUMNS: List[str] = ["Spiel_ID", "Team_ID", "Start_Zeit", "Saison", "Heim", "Tore", "Gegentore",
+                              "Spiel_Nr", "Rating_Vorher", "Rating_Nachher"]
+
+
+@dataclass
+class RatingState:
+    """Stand je Team: Rating, Anzahl gewerteter Spiele und Saison des letzten Spiels."""
+    ratings: Dict[str, float] = field(default_factory=dict)
+    games: Dict[str, int] = field(default_factory=dict)
+    seasons: Dict[str, str] = field(default_factory=dict)
+
+
+def margin_factor(goal_difference: int) -> float:
+    return 1.0 + math.log1p(abs(goal_difference)) / 2.0
+
+
+def rate_games(games: Iterable[RatingGame], state: RatingState) -> List[tuple]:
+    """
+    Verrechnet die Spiele (zeitlich sortiert) und aktualisiert state. Gibt je Spiel zwei Zeilen für
+    "Team_Rating_Verlauf" zurück (HISTORY_COLUMNS), zuerst Heim, dann Gast.
+    """
+    ratings, played, seasons = state.ratings, state.games, state.seasons
+    history: List[tuple] = []
+    for game in games:
+        before = []
+        for team_id in (game.heim_team_id, game.gast_team_id):
+            rating = ratings.get(team_id, RATING_START)
+            if team_id in seasons and seasons[team_id] != game.saison:
+                rating = RATING_START + SEASON_CARRYOVER * (rating - RATING_START)
+            before.append(rating)
+        home_before, away_before = before
+        expected_home = 1.0 / (1.0 + 10.0 ** ((away_before - home_before - HOME_ADVANTAGE) / 400.0))
+        diff = game.tore_heim - game.tore_gast
+        result_home = 1.0 if diff > 0 else (0.0 if diff < 0 else 0.5)
+        change = K_FACTOR * margin_factor(diff) * (result_home - expected_home)
+        for team_id, rating, delta, is_home, goals, against in (
+                (game.heim_team_id, home_before, change, True, game.tore_heim, game.tore_gast),
+                (game.gast_team_id, away_before, -change, False, game.tore_gast, game.tore_heim)):
+            game_no = played.get(team_id, 0) + 1
+            ratings[team_id], played[team_id], seasons[team_id] = rating + delta, game_no, game.saison
+            history.append((game.spiel_id, team_id, game.start_zeit, game.saison, is_home, goals, against,
+                            game_no, rating, rating + delta))
+    return history
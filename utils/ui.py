@@ -2,6 +2,16 @@ import streamlit as st
 import pandas as pd
 from typing import Optional, List
 
+# Anzeigeformat für datetime64-Spalten (Moment.js-Syntax von st.column_config)
+DATETIME_COLUMN_FORMAT: str = "DD.MM.YYYY HH:mm"
+
+def _display_column_config(df: pd.DataFrame) -> dict:
+    """Formatiert Zeitpunkte erst bei der Anzeige; die DataFrames selbst behalten ihre Typen (utils/result_schema.py)."""
+    return {
+        col: st.column_config.DatetimeColumn(col, format=DATETIME_COLUMN_FORMAT)
+        for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])
+    }
+
 def display_dataframe_with_title(
     title: str,
     df: pd.DataFrame,
@@ -16,38 +26,31 @@ def display_dataframe_with_title(
         if remove_cols:
             cols_to_drop = [col for col in remove_cols if col in display_df.columns]
             display_df = display_df.drop(columns=cols_to_drop)
-        st.dataframe(display_df, hide_index=hide_index, use_container_width=use_container_width)
+        # Gemischte Spalten (z.B. 'Wert' der transponierten Statistiken) kann Arrow nicht serialisieren
+        for col in display_df.columns:
+            if display_df[col].dtype == object and display_df[col].map(type).nunique() > 1:
+                display_df[col] = display_df[col].map(lambda v: "" if v is None or v is pd.NA else str(v))
+        st.dataframe(display_df, hide_index=hide_index, use_container_width=use_container_width,
+                     column_config=_display_column_config(display_df))
     else:
         st.info(f"Keine Daten für '{title}' verfügbar.")
 
-# --- KORREKTUR: Die Funktion muss hier auf der obersten Ebene stehen ---
-def translate_age_group(league_name: Optional[str], age_group_api: Optional[str]) -> str:
-    """Übersetzt die englischen Jugendbezeichnungen ins Deutsche (mit m/w)."""
-    if not isinstance(age_group_api, str):
-        return age_group_api or "Senioren/Andere"
-    if not isinstance(league_name, str):
-        league_name = "" # Fallback für den Liganamen
+def display_leaderboard(title: str, boards_df: pd.DataFrame, board: str, value_label: str, per_game: bool = False,
+                        remove_cols: Optional[List[str]] = None):
+    """
+    Eine Rangliste aus dem Langformat von fetch_*_leaderboards ("Rangliste", "Wert", "Pro_Spiel"):
+    "Wert" heißt value_label, "Pro_Spiel" wird nur mit per_game angezeigt (als "<board> pro Spiel").
+    """
+    board_df = boards_df[boards_df["Rangliste"] == board] if "Rangliste" in boards_df.columns else boards_df
+    board_df = board_df.rename(columns={"Wert": value_label, "Pro_Spiel": f"{board} pro Spiel"})
+    hidden = ["Rangliste"] + ([] if per_game else [f"{board} pro Spiel"]) + (remove_cols or [])
+    display_dataframe_with_title(title, board_df, remove_cols=hidden)
 
-    # Mapping von API-Wert zu deutscher Bezeichnung
-    translations = {
-        "AYouth": "A-Jugend", "BYouth": "B-Jugend", "CYouth": "C-Jugend",
-        "DYouth": "D-Jugend", "EYouth": "E-Jugend", "FYouth": "F-Jugend",
-        "Adults": "Senioren", "Mini": "Minis"
-    }
-    
-    # Bestimme das Geschlecht aus dem Liganamen
-    ln_lower = league_name.lower()
-    prefix = ""
-    if "männlich" in ln_lower or "herren" in ln_lower or "jungen" in ln_lower:
-        prefix = "m"
-    elif "weiblich" in ln_lower or "frauen" in ln_lower or "mädchen" in ln_lower:
-        prefix = "w"
-        
-    # Standardübersetzung holen
-    german_base = translations.get(age_group_api, age_group_api)
-    
-    # Kombinieren, wenn es eine Jugend ist
-    if "Jugend" in german_base and prefix:
-        return f"{prefix}{german_base}"
-    
-    return german_base
\ No newline at end of file
+def display_goal_timing_chart(title: str, df: pd.DataFrame, value_cols: List[str], stack: bool = True):
+    """Balkendiagramm je Spielminute 1-60 (fetch_*_goal_timing), Minuten ohne Tor werden mit 0 aufgefüllt."""
+    st.markdown(f"##### {title}")
+    if df.empty or "Spielminute" not in df.columns:
+        st.info(f"Keine Daten für '{title}' verfügbar.")
+        return
+    by_minute = df.set_index("Spielminute")[value_cols].reindex(range(1, 61), fill_value=0).rename_axis("Spielminute")
+    st.bar_chart(by_minute, stack=stack)